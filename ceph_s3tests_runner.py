@@ -20,9 +20,15 @@
 """Test runner for ceph/s3-tests nosetests based tests."""
 import argparse
 import datetime
+import json
 import logging
 import os
+import re
 import subprocess # nosec
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from xml.etree import ElementTree  # nosec
+
 from core import runner
 from commons import params
 from commons.utils import system_utils
@@ -50,9 +56,68 @@ def parse_args():
                              "WARNING = 30 WARN = WARNING" +
                              "INFO = 20 DEBUG = 10"
                         )
+    parser.add_argument("-b", "--batch", action="store_true",
+                        help="Run all tests in a single nose/pytest invocation")
+    parser.add_argument("-p", "--processes", type=int, default=os.cpu_count(),
+                        help="Test processes in batch mode")
+    parser.add_argument("-r", "--test_runner", choices=("nose", "pytest"), default="nose",
+                        help="Test runner used in batch mode")
+    parser.add_argument("-pt", "--process_timeout", type=int, default=600,
+                        help="Timeout in seconds of a test in batch mode")
+    parser.add_argument("-sj", "--stub_jira", type=str,
+                        help="JSON file of a local Jira stub, used instead of Jira and NFS")
     return parser.parse_args()
 
 
+class LocalJiraStub:
+    """
+    Local stand in of JiraTask for dry runs of the runner.
+
+    Tests are read from a JSON file of the form
+    {"test_executions": {"TEST-1": ["TEST-2"]}, "test_plans": {"TEST-3": {"build": "1"}},
+     "tests": {"TEST-2": {"summary": "", "labels": [], "test_to_run": "module:test"}}},
+    status updates are appended as JSON lines to <file>.updates.
+    """
+
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as stub_file:
+            self.data = json.load(stub_file)
+        self.updates_path = f"{path}.updates"
+
+    def get_test_ids_from_te(self, test_exe_id, status=None):  # pylint: disable=unused-argument
+        """Tests of the test execution as (key, id) tuples."""
+        tests = self.data.get("test_executions", {}).get(test_exe_id, [])
+        return tuple((test, test) for test in tests), ""
+
+    def get_issue_details(self, issue_id):
+        """Issue like object of a test or test plan."""
+        if issue_id in self.data.get("test_plans", {}):
+            build = self.data["test_plans"][issue_id].get("build")
+            return SimpleNamespace(key=issue_id, fields=SimpleNamespace(
+                customfield_22980=[build] if build else []))
+        test = self.data["tests"][issue_id]
+        return SimpleNamespace(key=issue_id, fields=SimpleNamespace(
+            summary=test.get("summary", ""), labels=test.get("labels", []),
+            customfield_20984=test["test_to_run"]))
+
+    def get_issues_details(self, issue_ids, fields=None):  # pylint: disable=unused-argument
+        """dict of issue key to issue like object, issues which are not found are skipped."""
+        known = set(self.data.get("tests", {})) | set(self.data.get("test_plans", {}))
+        return {str(issue): self.get_issue_details(str(issue)) for issue in issue_ids
+                if str(issue) in known}
+
+    def update_tests_jira_status(self, test_exe_id, test_statuses):
+        """Record status updates."""
+        with open(self.updates_path, "a", encoding="utf-8") as updates:
+            for test_id, test_status, log_path in test_statuses:
+                updates.write(json.dumps({"te": test_exe_id, "test": test_id,
+                                          "status": test_status, "log": log_path}) + "\n")
+
+    def update_test_jira_status(self, test_exe_id, test_id, test_status, log_path=''):
+        """Record status update of a test."""
+        self.update_tests_jira_status(test_exe_id, [(test_id, test_status, log_path)])
+
+
 def get_tests_from_te(jira_obj, args, test_type=None):
     """Get tests from given test execution."""
     LOGGER.info("Fetching test list from TE : %s", args.te_ticket)
@@ -88,12 +153,166 @@ def run_nose_cmd(test_to_run=None, log_file='nosetest.log'):
     return "PASS" if prc.returncode == 0 else "FAIL"
 
 
+def collect_tests_info(jira_obj, test_list):
+    """Collect test information of all tests with a single Jira search."""
+    test_ids = [str(test[0]) for test in test_list]
+    issues = jira_obj.get_issues_details(test_ids, fields="summary,labels,customfield_20984")
+    tests_info = []
+    for test_id in test_ids:
+        if test_id not in issues:
+            LOGGER.error("Details of %s are not found in Jira", test_id)
+            continue
+        fields = issues[test_id].fields
+        tests_info.append((test_id, fields.summary, fields.labels[0] if fields.labels else '',
+                           fields.customfield_20984))
+    return tests_info
+
+
+def nose_to_pytest_id(test_to_run):
+    """Convert nose test name e.g. s3tests.functional.test_s3:test_x to pytest node id."""
+    module, _, name = test_to_run.partition(":")
+    node_id = module.replace(".", "/") + ".py"
+    return f"{node_id}::{name.replace('.', '::')}" if name else node_id
+
+
+def run_batch_cmd(tests_to_run, xunit_file, log_file, **kwargs):
+    """
+    Run all the tests in a single nosetests/pytest invocation with xunit output.
+
+    :param tests_to_run: nose test names.
+    :param xunit_file: xunit/junit xml result file.
+    :param log_file: Log file of the run.
+    :keyword processes: Test processes, nose multiprocess plugin with xunitmp or pytest-xdist.
+    :keyword test_runner: nose or pytest.
+    :keyword process_timeout: Timeout of a test in seconds.
+    :return: return code of the run.
+    """
+    processes = kwargs.get("processes", 1)
+    if kwargs.get("test_runner", "nose") == "pytest":
+        cmd_line = [f"{params.VIRTUALENV_DIR}/bin/pytest", f"--junitxml={xunit_file}",
+                    "-o", "junit_logging=all"]
+        if processes > 1:
+            cmd_line += ["-n", str(processes)]
+        cmd_line += [nose_to_pytest_id(test) for test in tests_to_run]
+    else:
+        cmd_line = [f"{params.VIRTUALENV_DIR}/bin/nosetests", "-v"]
+        if processes > 1:
+            # xunit plugin of nose does not collect results of multiprocess workers.
+            cmd_line += [f"--processes={processes}",
+                         f"--process-timeout={kwargs.get('process_timeout', 600)}",
+                         "--with-xunitmp", f"--xunitmp-file={xunit_file}"]
+        else:
+            cmd_line += ["--with-xunit", f"--xunit-file={xunit_file}"]
+        cmd_line += list(tests_to_run)
+    LOGGER.info('Running %s tests with %s processes: %s', len(tests_to_run), processes,
+                cmd_line[:8])
+    with open(log_file, 'a') as log:
+        prc = subprocess.Popen(cmd_line, stdout=log, stderr=log,  # nosec
+                               cwd=params.S3TESTS_DIR)
+        prc.communicate()
+    return prc.returncode
+
+
+def _xunit_key(classname, name):
+    """Key of a xunit testcase, parameters of generated/parametrized tests are dropped."""
+    return f"{classname}.{re.split(r'[([]', name, 1)[0]}"
+
+
+def parse_xunit_results(xunit_file):
+    """
+    Stream testcases of a xunit/junit result file.
+
+    :return: dict of test key (module.[class.]test) to (status, log text), a test with any
+        failed generated/parametrized case is FAIL.
+    """
+    results = {}
+    for _, elem in ElementTree.iterparse(xunit_file, events=("end",)):  # nosec
+        if elem.tag != "testcase":
+            continue
+        status, text = "PASS", []
+        for child in elem:
+            if child.tag in ("failure", "error"):
+                status = "FAIL"
+            elif child.tag == "skipped" and status == "PASS":
+                status = "TODO"
+            if child.tag in ("failure", "error", "skipped"):
+                text.append(f"{child.tag}: {child.get('message', '')}\n{child.text or ''}")
+            elif child.tag in ("system-out", "system-err") and child.text:
+                text.append(f"{child.tag}:\n{child.text}")
+        key = _xunit_key(elem.get("classname", ""), elem.get("name", ""))
+        prev_status, prev_text = results.get(key, ("PASS", ""))
+        if "FAIL" in (prev_status, status):
+            status = "FAIL"
+        results[key] = (status, prev_text + "\n".join(text))
+        elem.clear()
+    return results
+
+
+def publish_result(jira_obj, args, test_result, build_number, reports_dir):
+    """Write log of a test, upload it to NFS and update its status in Jira."""
+    test_id, test_to_run, test_status, log_text = test_result
+    log_file = os.path.join(reports_dir, f"{test_id}_{test_to_run}.log")
+    with open(log_file, "w") as log:
+        log.write(f"{test_to_run}: {test_status}\n{log_text}")
+    remote_path = log_file
+    if not args.stub_jira:
+        remote_path = os.path.join(params.NFS_BASE_DIR, build_number, args.test_plan,
+                                   args.te_ticket, test_id)
+        resp = system_utils.mount_upload_to_server(host_dir=params.NFS_SERVER_DIR,
+                                                   mnt_dir=params.MOUNT_DIR,
+                                                   remote_path=remote_path,
+                                                   local_path=log_file)
+        if resp[0]:
+            LOGGER.info("Log file is uploaded at location : %s", resp[1])
+        else:
+            LOGGER.info("Failed to upload log file at location : %s", resp[1])
+    return test_id, test_status, remote_path
+
+
+# pylint: disable-msg=too-many-locals
+def trigger_batch_from_te(args, jira_obj, test_list, reports_dir, build_number):
+    """Run tests of the test execution in one batch and publish results asynchronously."""
+    tests_info = collect_tests_info(jira_obj, test_list)
+    jira_obj.update_tests_jira_status(
+        args.te_ticket, [(test_id, "EXECUTING", '') for test_id, _, _, _ in tests_info])
+    xunit_file = os.path.join(reports_dir, "s3tests_xunit.xml")
+    run_batch_cmd([test[3] for test in tests_info], xunit_file,
+                  os.path.join(reports_dir, "s3tests_batch.log"), processes=args.processes,
+                  test_runner=args.test_runner, process_timeout=args.process_timeout)
+    results = parse_xunit_results(xunit_file) if os.path.exists(xunit_file) else {}
+    test_results = []
+    for test_id, _, _, test_to_run in tests_info:
+        # Tests missing in xunit output did not run e.g. worker timed out or crashed.
+        status, log_text = results.get(test_to_run.replace(":", "."),
+                                       ("ABORTED", "Result not found in xunit output"))
+        test_results.append((test_id, test_to_run, status, log_text))
+    LOGGER.info("Batch results: %s", {status: sum(res[2] == status for res in test_results)
+                                      for status in ("PASS", "FAIL", "TODO", "ABORTED")})
+    workers = 8
+    if not args.stub_jira:
+        # Mount once, concurrent uploads would race on mounting the NFS directory.
+        resp = system_utils.mount_dir(host_dir=params.NFS_SERVER_DIR, mnt_dir=params.MOUNT_DIR)
+        if not resp[0]:
+            LOGGER.warning("Failed to mount %s, publishing serially: %s",
+                           params.NFS_SERVER_DIR, resp[1])
+            workers = 1
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="publish") as executor:
+        published = list(executor.map(
+            lambda result: publish_result(jira_obj, args, result, build_number, reports_dir),
+            test_results))
+    jira_obj.update_tests_jira_status(args.te_ticket, published)
+    return published
+
+
 # pylint: disable-msg=too-many-locals
 def trigger_tests_from_te(args):
     """Trigger tests from the provided test execution."""
     LOGGER.info("Starting test execution")
-    jira_id, jira_pwd = runner.get_jira_credential()
-    jira_obj = JiraTask(jira_id, jira_pwd)
+    if args.stub_jira:
+        jira_obj = LocalJiraStub(args.stub_jira)
+    else:
+        jira_id, jira_pwd = runner.get_jira_credential()
+        jira_obj = JiraTask(jira_id, jira_pwd)
     test_list = get_tests_from_te(jira_obj, args, args.test_type)
 
     timestamp = datetime.datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
@@ -108,6 +327,10 @@ def trigger_tests_from_te(args):
 
     os.environ[params.S3TESTS_CONF_ENV] = params.S3TESTS_CONF_FILE
 
+    if args.batch:
+        trigger_batch_from_te(args, jira_obj, test_list, reports_dir, build_number)
+        return
+
     for test in test_list:
         test_id = str(test[0])
         LOGGER.info("TEST ID : %s", test_id)
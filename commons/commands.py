@@ -234,6 +234,7 @@ CMD_MKDIR = "mkdir -p {}"
 CMD_MOUNT = "mount -t nfs {} {}"
 CMD_UMOUNT = "umount {}"
 CMD_TAR = "tar -zxvf {} -C {}"
+CMD_TAR_STREAM = "set -o pipefail; tar -C {} -cf - {} | {}"
 CMD_REMOVE_DIR = "rm -rf {}"
 CMD_IFACE_IP = "netstat -ie | grep -B1 \"{}\" | head -n1 | awk '{{print $1}}'"
 CMD_GET_IP_IFACE = "/sbin/ifconfig \"{}\" | awk '/inet / {{print $2}}'"
@@ -381,6 +382,7 @@ CMD_INSTALL_TOOL = "yum install {0}"
 CMD_INCREASE_MEMORY = "stress --vm {0} --vm-bytes {1} --vm-keep -t {2}"
 CMD_MEMORY_UTILIZATION = "python3 -c 'import psutil; print(psutil.virtual_memory().percent)'"
 JMX_CMD = "sh {}/jmeter.sh -n -t {} -l {} -f -e -o {}"
+JMX_CMD_NO_DASHBOARD = "sh {}/jmeter.sh -n -t {} -l {} -f"
 SET_PIPEFAIL = "set -eu -o pipefail"
 
 # Expect utils
@@ -94,6 +94,8 @@ MSG_BUS_READER_PATH = "/root/read_message_bus.py"
 MANUAL_PATH = "/opt/seagate/sspl/low-level/tests/manual/"
 RABBIT_MQ_LOCAL_PATH = "scripts/server_scripts/rabbitmq_reader.py"
 MSG_BUS_READER_LOCAL_PATH = "scripts/server_scripts/read_message_bus.py"
+LOG_WINDOW_EXTRACTOR_LOCAL_PATH = "scripts/server_scripts/log_window_extractor.py"
+LOG_WINDOW_EXTRACTOR_REMOTE_PATH = "/root/log_window_extractor.py"
 ENCRYPTOR_FILE_PATH = "scripts/server_scripts/encryptor.py"
 STORAGE_ENCLOSURE_PATH = "/opt/seagate/cortx/provisioner/pillar/components" \
                          "/storage_enclosure.sls"
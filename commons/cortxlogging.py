@@ -19,49 +19,68 @@
 #
 """
 Extended log rotation class for cortx log files
+Test and runner logs are written by a queue listener, records are queued by the emitting thread
+and rotated files are compressed in a background process.
 """
+import atexit
 import os
+import sys
 import inspect
 import gzip
 import shutil
 import datetime
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from logging import handlers
 from commons import params
 
 LOG_FILE = 'cortx-test.log'
+LOG_MAX_BYTES = 100 * 1024 * 1024
+LOG_BACKUP_COUNT = 100
+OVERFLOW_POLICIES = ("block", "drop_new", "drop_oldest")
+COPY_BUFSIZE = 1024 * 1024
+_COMPRESSOR = None
+_COMPRESSOR_LOCK = threading.Lock()
 
 
 def init_loghandler(log, level=logging.DEBUG) -> None:
     """Initialize logging with stream and file handlers."""
     log.setLevel(level)
     make_log_dir(params.LOG_DIR_NAME)
-    fh = logging.FileHandler(os.path.join(os.getcwd(),
-                                          params.LOG_DIR_NAME,
-                                          'latest',
-                                          LOG_FILE),
-                             mode='w')
-    fh.setLevel(logging.DEBUG)
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    fh.setFormatter(formatter)
-    ch.setFormatter(formatter)
-    log.addHandler(fh)
-    log.addHandler(ch)
+    set_log_handlers(log, os.path.join(os.getcwd(), params.LOG_DIR_NAME, 'latest', LOG_FILE),
+                     mode='w', level=logging.DEBUG)
 
 
 def set_log_handlers(log, name, mode='w', level=logging.DEBUG):
-    """Set stream and file handlers."""
-    fh = logging.FileHandler(name, mode=mode)
+    """
+    Set stream and rotating file handlers run by a queue listener.
+    Listener is stopped at exit to flush queued records.
+    :return: started QueueListener
+    """
+    make_log_dir(os.path.dirname(name) or os.curdir)
+    if mode == 'w':
+        # Rotating handler always appends.
+        open(name, 'w').close()  # pylint: disable=consider-using-with
+    fh = CortxRotatingFileHandler(name, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                  background=True)
     fh.setLevel(level)
     ch = logging.StreamHandler()
     ch.setLevel(level)
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(formatter)
     ch.setFormatter(formatter)
-    log.addHandler(fh)
-    log.addHandler(ch)
+    listener = init_queue_logging(log, [fh, ch], overflow="block")
+    atexit.register(_stop_listener, listener)
+    return listener
+
+
+def _stop_listener(listener) -> None:
+    """Stop queue listener at exit if it is not already stopped."""
+    if listener._thread is not None:  # pylint: disable=protected-access
+        listener.stop()
 
 
 def make_log_dir(dirpath) -> None:
@@ -75,20 +94,62 @@ def get_frame():
     return inspect.stack()[1][3]
 
 
+def _compress_file(source, dest, level):
+    """
+    Compress rotated log file, runs in log compressor process.
+    :param source: renamed rotated log file path
+    :param dest: destination path of the gz file, written only when compression completes
+    :param level: gzip compression level
+    """
+    tmp_dest = f"{dest}.tmp"
+    with open(source, "rb") as sf:
+        with gzip.open(tmp_dest, "wb", level) as df:
+            shutil.copyfileobj(sf, df, COPY_BUFSIZE)
+    os.replace(tmp_dest, dest)
+    os.remove(source)
+    return dest
+
+
+def _get_compressor():
+    """Get log compressor pool, a single worker process shared by all the handlers."""
+    global _COMPRESSOR  # pylint: disable=global-statement
+    with _COMPRESSOR_LOCK:
+        if _COMPRESSOR is None:
+            try:
+                _COMPRESSOR = ProcessPoolExecutor(max_workers=1)
+            except (OSError, NotImplementedError):
+                _COMPRESSOR = ThreadPoolExecutor(max_workers=1,
+                                                 thread_name_prefix="log-compressor")
+        return _COMPRESSOR
+
+
 class CortxRotatingFileHandler(handlers.RotatingFileHandler):
     """
     Handler overriding the existing RotatingFileHandler for switching cortx-test log files
     when the current file reaches a certain size.
+    With background compression the rotated file is renamed in doRollover and compressed in a
+    log compressor process, next rollover waits for it before shifting the backups.
     """
 
-    def __init__(self, filename="cortx-test.log", maxBytes=10485760, backupCount=5):
+    # pylint: disable=too-many-arguments
+    def __init__(self, filename="cortx-test.log", maxBytes=10485760, backupCount=5,
+                 compress_level=6, background=False):
         """
         Initialization for cortx rotating file handler
+        :param compress_level: gzip compression level of rotated files
+        :param background: compress rotated files in log compressor process, meant for
+            handlers run by init_queue_logging listener as in set_log_handlers
         """
         self.baseFilename = filename
+        self.compress_level = compress_level
+        self.background = background
+        self._pending = None
         super().__init__(filename=self.baseFilename, maxBytes=maxBytes, backupCount=backupCount)
         self.namer = self.log_namer
         self.rotator = self.log_rotator
+        if background:
+            # Start compressor process here, not in doRollover under the handler lock.
+            _get_compressor().submit(os.getpid).result()
 
     def log_namer(self, name):
         """
@@ -104,7 +165,173 @@ class CortxRotatingFileHandler(handlers.RotatingFileHandler):
         :param source: current log file path
         :param dest: destination path for rotated file
         """
-        with open(source, "rb") as sf:
-            with gzip.open(dest, "wb", 9) as df:
-                shutil.copyfileobj(sf, df)
-        os.remove(source)
+        if not self.background:
+            _compress_file(source, dest, self.compress_level)
+            return
+        # Rename is cheap, the emitting thread continues with the new log file.
+        pending = f"{dest}.{os.getpid()}.{time.monotonic_ns()}.pending"
+        os.rename(source, pending)
+        self._pending = _get_compressor().submit(_compress_file, pending, dest,
+                                                 self.compress_level)
+
+    def wait_pending(self):
+        """Wait till the last rotated file is compressed."""
+        if self._pending is None:
+            return
+        try:
+            self._pending.result()
+        except Exception as error:  # pylint: disable=broad-except
+            sys.stderr.write(f"Failed to compress rotated log file: {error}\n")
+        self._pending = None
+
+    def doRollover(self):
+        """Shift backups once the previous rotated file is compressed to its .gz name."""
+        self.wait_pending()
+        super().doRollover()
+
+    def close(self):
+        """Wait for pending compression and close the log file."""
+        self.wait_pending()
+        super().close()
+
+
+class BoundedQueueHandler(handlers.QueueHandler):
+    """
+    Queue handler with overflow policy for bounded queues.
+    Policies: "block" waits for space, "drop_new" drops the new record and "drop_oldest"
+    drops the oldest queued record.
+    """
+
+    def __init__(self, log_queue, overflow="drop_oldest", max_message_len=None):
+        """
+        Initialization for bounded queue handler
+        :param log_queue: bounded queue.Queue
+        :param overflow: overflow policy
+        :param max_message_len: truncate formatted messages e.g. response bodies to this length
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy {overflow}, expected {OVERFLOW_POLICIES}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.max_message_len = max_message_len
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Format message in emitting thread and truncate it if required."""
+        record = super().prepare(record)
+        if self.max_message_len and len(record.msg) > self.max_message_len:
+            record.msg = f"{record.msg[:self.max_message_len]}... " \
+                         f"[truncated {len(record.msg) - self.max_message_len} chars]"
+            record.message = record.msg
+        return record
+
+    def enqueue(self, record):
+        """Enqueue record as per overflow policy."""
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.overflow == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per logger rate limiting, records below min_level are dropped when a logger emits more
+    than rate records per second over a burst.
+    """
+
+    def __init__(self, rate=100, burst=None, min_level=logging.WARNING):
+        """
+        Initialization for rate limit filter
+        :param rate: allowed records per second per logger
+        :param burst: records allowed in burst, default is rate
+        :param min_level: records at or above this level are never dropped
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or rate
+        self.min_level = min_level
+        self.dropped = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        """Return False if record is to be dropped."""
+        if record.levelno >= self.min_level:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(record.name, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[record.name] = (tokens, now)
+                self.dropped[record.name] = self.dropped.get(record.name, 0) + 1
+                return False
+            self._buckets[record.name] = (tokens - 1, now)
+        return True
+
+
+# pylint: disable=too-many-arguments
+def init_queue_logging(log, handler_list, queue_size=10000, overflow="drop_oldest",
+                       rate_limit=None, max_message_len=None):
+    """
+    Route records of the logger through a bounded queue to handlers run by a QueueListener.
+    :param log: logger object
+    :param handler_list: handlers run in listener thread e.g. CortxRotatingFileHandler
+    :param queue_size: maximum queued records
+    :param overflow: overflow policy of BoundedQueueHandler
+    :param rate_limit: per logger records per second, None to disable
+    :param max_message_len: truncate messages longer than this length
+    :return: started QueueListener, stop it to flush pending records
+    """
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, overflow=overflow,
+                                        max_message_len=max_message_len)
+    if rate_limit:
+        queue_handler.addFilter(RateLimitFilter(rate=rate_limit))
+    listener = handlers.QueueListener(log_queue, *handler_list, respect_handler_level=True)
+    listener.start()
+    log.addHandler(queue_handler)
+    return listener
+
+
+def measure_emit_latency(log, records=10000, threads=4, message_size=1024):
+    """
+    Microbenchmark of emit latency with multiple threads logging concurrently.
+    :param log: logger with handlers to be measured
+    :param records: records emitted per thread
+    :param threads: number of emitting threads
+    :param message_size: size of each message
+    :return: dict with avg, p50, p99 and max emit latency in micro seconds
+    """
+    latencies = []
+    message = "x" * message_size
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(records):
+            start = time.perf_counter()
+            log.info("IO response: %s", message)
+            local.append((time.perf_counter() - start) * 1e6)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    latencies.sort()
+    return {"avg": sum(latencies) / len(latencies),
+            "p50": latencies[len(latencies) // 2],
+            "p99": latencies[int(len(latencies) * 0.99)],
+            "max": latencies[-1]}
@@ -25,7 +25,9 @@ import re
 import shutil
 import socket
 import stat
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import List
 from typing import Tuple
@@ -40,6 +42,11 @@ from commons import commands, const
 
 LOGGER = logging.getLogger(__name__)
 
+# Bulk transfer tuning, bytes per SFTP read request, bytes in flight per file and SSH window.
+SFTP_CHUNK_SIZE = 32768
+SFTP_PREFETCH_WINDOW = 64 * 1024 * 1024
+SFTP_WINDOW_SIZE = 128 * 1024 * 1024
+
 
 class AbsHost:
     """Abstract class for establishing connections."""
@@ -647,6 +654,178 @@ class Host(AbsHost):
 
         return not self.path_exists(filename)
 
+    def _transfer_client(self) -> paramiko.SSHClient:
+        """Dedicated connection for bulk transfers, execute_cmd reconnects host_obj."""
+        transfer_host = Host(hostname=self.hostname, username=self.username,
+                             password=self.password)
+        transfer_host.connect()
+        transport = transfer_host.host_obj.get_transport()
+        # Large window for channels opened later so reads are not stalled by flow control.
+        transport.default_window_size = SFTP_WINDOW_SIZE
+        return transfer_host.host_obj
+
+    @staticmethod
+    def _get_file(sftp: paramiko.SFTPClient, remote_path: str, local_path: str,
+                  resume: bool = False, prefetch_window: int = SFTP_PREFETCH_WINDOW) -> dict:
+        """
+        Copy remote file to local path with pipelined reads.
+
+        Data is written to <local path>.part which is renamed to local path once all the bytes
+        of the remote file are copied, an existing local file is never appended to.
+        :param sftp: SFTP client (channel) of the calling thread.
+        :param remote_path: remote file path.
+        :param local_path: local file path.
+        :param resume: Resume the .part file of an interrupted copy instead of copying again.
+        :param prefetch_window: Bytes requested in flight before they are written.
+        :return: transfer metrics.
+        """
+        start = time.perf_counter()
+        size = sftp.stat(remote_path).st_size
+        part_path = f"{local_path}.part"
+        offset = 0
+        if resume and os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+            if offset > size:
+                offset = 0
+        local_dir = os.path.dirname(local_path)
+        if local_dir:
+            os.makedirs(local_dir, exist_ok=True)
+        with sftp.open(remote_path, "rb") as remote_file, \
+                open(part_path, "ab" if offset else "wb") as local_file:
+            position = offset
+            while position < size:
+                window = min(prefetch_window, size - position)
+                chunks = [(pos, min(SFTP_CHUNK_SIZE, position + window - pos))
+                          for pos in range(position, position + window, SFTP_CHUNK_SIZE)]
+                # readv sends all requests of the window before waiting for data.
+                for data in remote_file.readv(chunks):
+                    local_file.write(data)
+                position += window
+        copied = os.path.getsize(part_path)
+        if copied != size:
+            raise IOError(f"Copied {copied} bytes of {remote_path}, expected {size} bytes")
+        os.replace(part_path, local_path)
+        duration = time.perf_counter() - start
+        transferred = size - offset
+        return {"remote_path": remote_path, "local_path": local_path, "size": size,
+                "bytes": transferred, "resumed_from": offset, "duration": round(duration, 3),
+                "mbps": round(transferred / max(duration, 1e-6) / (1024 ** 2), 3),
+                "status": True, "error": None}
+
+    def bulk_copy_to_local(self, file_list: list, workers: int = 4, resume: bool = False,
+                           retries: int = 2) -> list:
+        """
+        Copy many remote files to local paths with concurrent SFTP channels.
+
+        All channels share one SSH connection, reads of each file are pipelined and a failed
+        transfer is retried from where it stopped. Failures do not stop other transfers.
+        :param file_list: list of (remote path, local path).
+        :param workers: Number of concurrent SFTP channels.
+        :param resume: Resume .part files left by an earlier interrupted copy.
+        :param retries: Retries per file.
+        :return: list of per transfer metrics, "status" is False for failed transfers.
+        """
+        if not file_list:
+            return []
+        client = self._transfer_client()
+        local = threading.local()
+        channels = []
+        lock = threading.Lock()
+
+        def _sftp():
+            if getattr(local, "sftp", None) is None:
+                local.sftp = client.open_sftp()
+                with lock:
+                    channels.append(local.sftp)
+            return local.sftp
+
+        def _copy(paths):
+            remote_path, local_path = paths
+            error = None
+            for attempt in range(retries + 1):
+                try:
+                    return self._get_file(_sftp(), remote_path, local_path,
+                                          resume=resume or attempt > 0)
+                except (OSError, SSHException, EOFError) as err:
+                    error = err
+                    LOGGER.warning("Transfer of %s failed in attempt %s: %s", remote_path,
+                                   attempt + 1, err)
+                    local.sftp = None
+            return {"remote_path": remote_path, "local_path": local_path, "status": False,
+                    "error": str(error)}
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(file_list))),
+                                    thread_name_prefix="sftp") as executor:
+                metrics = list(executor.map(_copy, file_list))
+        finally:
+            for channel in channels:
+                channel.close()
+            client.close()
+        duration = time.perf_counter() - start
+        total = sum(metric.get("bytes", 0) for metric in metrics)
+        LOGGER.info("Copied %s/%s files, %s bytes from %s in %.3fs (%.3f MB/s)",
+                    sum(metric["status"] for metric in metrics), len(metrics), total,
+                    self.hostname, duration, total / max(duration, 1e-6) / (1024 ** 2))
+        return metrics
+
+    def stream_dir_to_local(self, remote_dir: str, local_path: str,
+                            compressor: str = "zstd") -> dict:
+        """
+        Archive remote directory on the fly into a single compressed local tar stream.
+
+        :param remote_dir: remote directory path.
+        :param local_path: local archive path e.g. stats.tar.zst, .zst/.gz suffix is replaced
+            to match the compressor used.
+        :param compressor: zstd or gzip, gzip is used if zstd is not available on the host.
+        :return: transfer metrics with compressor and local_path of the archive.
+        """
+        start = time.perf_counter()
+        remote_dir = remote_dir.rstrip("/")
+        client = self._transfer_client()
+        transferred = 0
+        try:
+            if compressor == "zstd":
+                _, stdout, _ = client.exec_command("command -v zstd")  # nosec
+                if stdout.channel.recv_exit_status():
+                    LOGGER.info("zstd not found on %s, using gzip", self.hostname)
+                    compressor = "gzip"
+            compress_cmd = "zstd -c -T0 -3" if compressor == "zstd" else "gzip -c -1"
+            suffix = ".zst" if compressor == "zstd" else ".gz"
+            root, ext = os.path.splitext(local_path)
+            if ext in (".zst", ".gz"):
+                local_path = root + suffix
+            cmd = commands.CMD_TAR_STREAM.format(posixpath.dirname(remote_dir) or "/",
+                                                 posixpath.basename(remote_dir), compress_cmd)
+            _, stdout, stderr = client.exec_command(cmd)  # nosec
+            # Drain stderr while stdout is streamed, a full stderr window would stall tar.
+            error = []
+            reader = threading.Thread(target=lambda: error.append(stderr.read()), daemon=True)
+            reader.start()
+            try:
+                with open(local_path, "wb") as local_file:
+                    while True:
+                        data = stdout.read(SFTP_CHUNK_SIZE)
+                        if not data:
+                            break
+                        local_file.write(data)
+                        transferred += len(data)
+            finally:
+                exit_status = stdout.channel.recv_exit_status()
+                reader.join()
+        finally:
+            client.close()
+        duration = time.perf_counter() - start
+        metrics = {"remote_path": remote_dir, "local_path": local_path, "bytes": transferred,
+                   "duration": round(duration, 3),
+                   "mbps": round(transferred / max(duration, 1e-6) / (1024 ** 2), 3),
+                   "compressor": compressor, "status": not exit_status,
+                   "error": (error[0] if error else b"").decode(errors="ignore")
+                   if exit_status else None}
+        LOGGER.info("Streamed %s to %s: %s", remote_dir, local_path, metrics)
+        return metrics
+
 
 if __name__ == '__main__':
     hostobj = Host(hostname='<>',  # nosec
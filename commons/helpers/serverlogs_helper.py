@@ -19,15 +19,28 @@
 
 """ This helper file is used to collect logs from Nodes for the given time stamps """
 
+import gzip
+import logging
+import os
+import shlex
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+
+from commons import constants as const
 from commons.helpers import host
 from commons.utils import config_utils
+from scripts.server_scripts.log_window_extractor import LogWindow
+from scripts.server_scripts.log_window_extractor import parse_timestamp
 
 fileconf_yaml = config_utils.read_yaml("config/serverlogs_helper.yaml")
 fileconf = fileconf_yaml[1]
+LOGGER = logging.getLogger(__name__)
 
 now = datetime.now()
 current_time = now.strftime('%b  %#d %H:%M:%S')
+WINDOW_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 class node_data:
     def __init__(self):
@@ -36,138 +49,151 @@ class node_data:
         self.passwd = "seagate"
 
 def get_node_details(node_name):
-    node_obj = node_data
+    node_obj = node_data()
     node_obj.ip = fileconf["node_ip_dict"][node_name]
     node_obj.uname = fileconf['node_username']
     node_obj.passwd = fileconf['node_password']
     return node_obj
 
+def to_datetime(value, year=None):
+    """
+    Convert window time to datetime.
+
+    :param value: datetime or timestamp string e.g. "Dec 12 16:06:01", "2022-12-12 16:06:01".
+    :param year: Year for timestamps without year, defaults to current year.
+    :return: datetime
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    timestamp = parse_timestamp(value.strip(), year)
+    if timestamp is None:
+        raise ValueError(f"Unsupported timestamp format: {value}")
+    return timestamp
+
 def split_file_for_timestamp(st_time, end_time, filename, filepath, test_id):
     # split file for give time stamps and create new file with test_id
-    # appended to it
+    # appended to it. Window [st_time, end_time) is located by binary search on parsed
+    # timestamps, so only the window is read.
     path = "{}/{}".format(filepath, filename)
-    logfile = open(path, 'r')
-
     newname = "{}_{}".format(test_id, filename)
     newpath = "{}/{}".format(fileconf['log_destination'], newname)
-    newfile = open(newpath, 'w')
-
-    # timestamp format ('%b %#d %H:%M:%S') -> "Dec 12 16:06:01"
-    st_t = st_time.split()
-    en_t = end_time.split()
-    start_time = "{} {} {}".format(st_t[0], st_t[1], st_t[2])
-    end_time = "{} {} {}".format(en_t[0], en_t[1], en_t[2])
-
-    for line in logfile:
-        ls = line.split(' ')
-        # PLEASE CHECK TIMESTAMP IN LOG FILES FIRST, For every file it might be
-        # different
-        timestamp = "{} {} {}".format(ls[0], ls[1], ls[2])
-        if timestamp >= start_time and timestamp <= end_time:
-            newfile.write(line)
-
-    newfile.close()  # close it if done writing into it
-    logfile.close()
+    start = to_datetime(st_time)
+    end = to_datetime(end_time)
+    with open(path, 'rb') as logfile, open(newpath, 'wb') as newfile:
+        reference = end or start
+        LogWindow(logfile, year=reference.year, reference=reference).copy(
+            start, end, newfile)
 
     return newpath
 
-def process_and_copy_file(
-        st_time,
-        end_time,
-        file_name,
-        file_path,
-        localpath,
-        test_id,
-        sftp):
-    # Copy file from node to test client
-    nodepath = "{}/{}".format(file_path, file_name)
-    dest_path = "{}/{}".format(fileconf['log_destination'], file_name)
-    # @TODO - check sftp.get(), this call might be wrong
-    sftp.get(remotepath=nodepath, localpath=dest_path)
-
-    # 1. Fetch give file from node and Split file for given time stamp
-    newfilepath = split_file_for_timestamp(
-        st_time,
-        end_time,
-        file_name,
-        fileconf['log_destination'],
-        test_id)
-
-    # 2. Copy file from node to remote server <<< @TODO need new connection
-    # here !! MISSING !!!
-    logserver = fileconf['logserver']
-    lg_uname = fileconf['logserver_username']
-    lg_passwd = fileconf['logserver_password']
-    remote_path = fileconf['logserver_path']
-    filename = "{}_{}".format(test_id, file_name)
-    rm_path = "{}/{}".format(remote_path, filename)
-
+def fetch_log_window(ssh_client, st_time, end_time, file_path, local_path):
+    """
+    Extract window of a remote log on the node and stream it gzip compressed to local path.
+
+    :param ssh_client: Connected paramiko SSHClient of the node, extractor should be present.
+    :param st_time: Window start datetime.
+    :param end_time: Window end datetime.
+    :param file_path: Log file path on node.
+    :param local_path: Local path to write uncompressed window.
+    :return: local_path
+    """
+    cmd = "python3 {} {} --start {} --end {}".format(
+        const.LOG_WINDOW_EXTRACTOR_REMOTE_PATH, shlex.quote(file_path),
+        shlex.quote(st_time.strftime(WINDOW_TIME_FORMAT)),
+        shlex.quote(end_time.strftime(WINDOW_TIME_FORMAT)))
+    LOGGER.debug("Executing %s", cmd)
+    _, stdout, stderr = ssh_client.exec_command(cmd)  # nosec
+    # Drain stderr while stdout is streamed, a full stderr window would stall the command.
+    error = []
+    reader = threading.Thread(target=lambda: error.append(stderr.read()), daemon=True)
+    reader.start()
+    try:
+        with gzip.GzipFile(fileobj=stdout, mode="rb") as window, \
+                open(local_path, "wb") as local_file:
+            shutil.copyfileobj(window, local_file)
+    finally:
+        exit_status = stdout.channel.recv_exit_status()
+        reader.join()
+    if exit_status != 0:
+        raise IOError("Log window extraction of {} failed: {}".format(
+            file_path, (error[0] if error else b"").decode(errors="ignore")))
+    return local_path
+
+def upload_to_logserver(local_paths):
+    """Copy collected logs to log server over a single connection."""
     hostobj = host.Host(
-        hostname=logserver,
-        username=lg_uname,
-        password=lg_passwd)
+        hostname=fileconf['logserver'],
+        username=fileconf['logserver_username'],
+        password=fileconf['logserver_password'])
     hostobj.connect()
     sftp = hostobj.host_obj.open_sftp()
-    sftp.put(localpath=newfilepath, remotepath=rm_path)
-
-def collect_logs(st_time, end_time, file, node, test_id):
-    # error = False #@ TODO - error handling to be done, connection retry
-    # 1. Connect to node
+    try:
+        for local_path in local_paths:
+            rm_path = "{}/{}".format(fileconf['logserver_path'],
+                                     os.path.basename(local_path))
+            sftp.put(localpath=local_path, remotepath=rm_path)
+    finally:
+        sftp.close()
+        hostobj.disconnect()
+
+def collect_logs(st_time, end_time, file, node, test_id, max_workers=4):
+    """
+    Collect window [st_time, end_time) of logs from a node.
+
+    Node is connected once, extractor is copied to it and windows of all files are extracted
+    and fetched concurrently over channels of the same connection.
+    :return: list of local file paths.
+    """
+    start = to_datetime(st_time)
+    end = to_datetime(end_time) or datetime.now()
     node_det = get_node_details(node)
     hostobj = host.Host(
         hostname=node_det.ip,
         username=node_det.uname,
         password=node_det.passwd)
     hostobj.connect()
-    sftp = hostobj.host_obj.open_sftp()
-    localpath = "{}_{}".format(fileconf['log_destination'], test_id)
-
-    if file is "all":
-        for fname in fileconf['file_list']:
-            file_name = "{}{}".format(file, fileconf['file_exention'])
-            file_path = fileconf['file_path_dict'][fname]
-            process_and_copy_file(
-                st_time,
-                end_time,
-                file_name,
-                file_path,
-                localpath,
-                test_id,
-                sftp)
-    else:
-        file_name = "{}{}".format(file, fileconf['file_exention'])
-        file_path = fileconf['file_path_dict'][file]
-        process_and_copy_file(
-            st_time,
-            end_time,
-            file_name,
-            file_path,
-            localpath,
-            test_id,
-            sftp)
-
-    # Close connection once all file transfers are done
-    sftp.close
-
-    # @TODO Error handling
+    file_list = fileconf['file_list'] if file == "all" else [file]
+    try:
+        sftp = hostobj.host_obj.open_sftp()
+        sftp.put(localpath=const.LOG_WINDOW_EXTRACTOR_LOCAL_PATH,
+                 remotepath=const.LOG_WINDOW_EXTRACTOR_REMOTE_PATH)
+        sftp.close()
+        tasks = []
+        for fname in file_list:
+            file_name = "{}{}".format(fname, fileconf['file_exention'])
+            nodepath = "{}/{}".format(fileconf['file_path_dict'][fname], file_name)
+            dest_path = "{}/{}_{}_{}".format(fileconf['log_destination'], test_id, node,
+                                             file_name)
+            tasks.append((nodepath, dest_path))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))),
+                                thread_name_prefix=f"logs-{node}") as executor:
+            paths = list(executor.map(
+                lambda task: fetch_log_window(hostobj.host_obj, start, end, *task), tasks))
+    finally:
+        hostobj.disconnect()
+    LOGGER.info("Collected %s logs from %s", len(paths), node)
+    return paths
 
 def collect_logs_fromserver(
         st_time,
         test_suffix,
-        end_time=current_time,
+        end_time=None,
         file_type='all',
-        node='all'):
-    # Collect logs for all nodes
-
-    if node is 'all':
-        for node_name in fileconf['node_list']:
-            response = collect_logs(
-                st_time, end_time, file_type, node, test_suffix)
-    # collect from one node only
-    else:
-        response = collect_logs(
-            st_time,
-            end_time,
-            file_type,
-            node,
-            test_suffix)
+        node='all',
+        upload=True):
+    """
+    Collect logs for window [st_time, end_time) from nodes in parallel.
+
+    :return: dict of node name to list of collected local file paths.
+    """
+    node_list = fileconf['node_list'] if node == 'all' else [node]
+    end_time = end_time or datetime.now()
+    with ThreadPoolExecutor(max_workers=len(node_list), thread_name_prefix="logs") as executor:
+        futures = {node_name: executor.submit(
+            collect_logs, st_time, end_time, file_type, node_name, test_suffix)
+            for node_name in node_list}
+    response = {node_name: fut.result() for node_name, fut in futures.items()}
+    if upload:
+        upload_to_logserver([path for paths in response.values() for path in paths])
+    return response
+#TODO - need to revisit all the paths and IPs mentioned in this file
@@ -0,0 +1,451 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""
+Common benchmark result model for s3bench, hsbench and locust.
+
+Results of all the IO tools are normalised into BenchmarkResult records, stored per build
+in a local results store and compared against a stored baseline to flag regressions.
+"""
+import csv
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import defaultdict
+
+LOGGER = logging.getLogger(__name__)
+
+BENCH_RESULTS_DIR = os.path.join("log", "bench_results")
+# Metrics where a higher value is better, rest of the metrics are latencies/errors.
+HIGHER_IS_BETTER = ("throughput", "iops")
+
+_S3BENCH_OP_RE = re.compile(
+    r"^\s*(?:Operation:\s*(?P<op>\w+)|Results Summary for (?P<old_op>\w+) Operation)",
+    re.IGNORECASE)
+_S3BENCH_KV_RE = re.compile(r"^\s*(?P<key>[^:]+?)\s*:\s*(?P<value>[-+]?[\d.]+(?:e[-+]?\d+)?)",
+                            re.IGNORECASE)
+_S3BENCH_LAT_RE = re.compile(
+    r"^(?P<kind>duration|ttfb|\w+ times)\s+(?P<stat>max|min|avg|\d+(?:\.\d+)?(?:th|st|nd|rd)?"
+    r"\s*(?:%ile|-ile|%)?)$", re.IGNORECASE)
+_SIZE_RE = re.compile(r"^\s*(?P<num>[\d.]+)\s*(?P<unit>[kmgt]?i?b?)?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+def size_to_bytes(size) -> int:
+    """
+    Convert object size like 4Kb, 128MiB, 1G or 1024 to number of bytes.
+
+    :param size: object size as int or string.
+    :return: size in bytes.
+    """
+    if size is None:
+        return 0
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = _SIZE_RE.match(str(size))
+    if not match:
+        raise ValueError(f"Invalid object size: {size}")
+    unit = (match.group("unit") or "").lower()[:1]
+    return int(float(match.group("num")) * _SIZE_UNITS[unit])
+
+
+def _percentile_name(stat: str) -> str:
+    """Normalise latency stat names e.g. '99th %ile', '99%' to 'p99', 'Avg' to 'avg'."""
+    stat = stat.strip().lower()
+    if stat in ("max", "min", "avg"):
+        return stat
+    return "p" + re.match(r"[\d.]+", stat).group(0)
+
+
+class BenchmarkResult:
+    """Single benchmark result of an operation for given object size and concurrency."""
+
+    __slots__ = ("tool", "operation", "object_size", "concurrency", "throughput", "iops",
+                 "latency", "errors", "requests", "duration", "build", "timestamp", "extra")
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, tool: str, operation: str, object_size=0, concurrency: int = 0,
+                 throughput: float = 0.0, iops: float = 0.0, latency: dict = None,
+                 errors: int = 0, requests: int = 0, duration: float = 0.0, **kwargs):
+        """
+        Create benchmark result.
+
+        :param tool: Name of the tool e.g. s3bench, hsbench, locust.
+        :param operation: Operation e.g. write, read, put, get.
+        :param object_size: Object size in bytes or string like 4Kb.
+        :param concurrency: Number of parallel clients/threads.
+        :param throughput: Throughput in MB/s.
+        :param iops: Operations per second.
+        :param latency: Latency stats in seconds e.g. {"avg": 0.1, "p99": 0.3, "max": 0.5}.
+        :param errors: Number of failed requests.
+        :param requests: Total number of requests.
+        :param duration: Duration of the run in seconds.
+        :keyword build: Build number for which result was taken.
+        :keyword timestamp: Epoch time of the result.
+        :keyword extra: Tool specific data which is not part of common model.
+        """
+        self.tool = tool
+        self.operation = operation.lower()
+        self.object_size = size_to_bytes(object_size)
+        self.concurrency = int(concurrency or 0)
+        self.throughput = float(throughput or 0.0)
+        self.iops = float(iops or 0.0)
+        self.latency = latency or {}
+        self.errors = int(errors or 0)
+        self.requests = int(requests or 0)
+        self.duration = float(duration or 0.0)
+        self.build = kwargs.get("build")
+        self.timestamp = kwargs.get("timestamp", time.time())
+        self.extra = kwargs.get("extra", {})
+
+    @property
+    def key(self) -> tuple:
+        """Key used to compare results across runs."""
+        return self.tool, self.operation, self.object_size, self.concurrency
+
+    def metric(self, name: str) -> float:
+        """
+        Get metric value by name.
+
+        :param name: throughput, iops, errors or latency stat prefixed with 'latency_' e.g.
+            latency_p99, latency_avg.
+        :return: metric value or None if metric is not available.
+        """
+        if name.startswith("latency_"):
+            return self.latency.get(name[len("latency_"):])
+        return getattr(self, name, None)
+
+    def to_dict(self) -> dict:
+        """Dictionary representation of the result."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create result from dictionary created by to_dict."""
+        data = dict(data)
+        return cls(data.pop("tool"), data.pop("operation"), **data)
+
+    def __repr__(self):
+        return f"BenchmarkResult({self.to_dict()})"
+
+
+def parse_s3bench_output(output, object_size=0, concurrency: int = 0) -> list:
+    """
+    Parse s3bench console output into benchmark results.
+
+    Supports both the "Results Summary for Write Operation(s)" and "Operation: Write" report
+    layouts, parameters dump lines are ignored.
+    :param output: s3bench output string, list of outputs or log file path.
+    :param object_size: Object size used for the run, picked from output if present.
+    :param concurrency: Number of clients used for the run, picked from output if present.
+    :return: list of BenchmarkResult.
+    """
+    if isinstance(output, str) and os.path.isfile(output):
+        with open(output, "r", encoding="utf-8", errors="replace") as log_obj:
+            output = log_obj.read()
+    if isinstance(output, (list, tuple)):
+        output = "\n".join(out.decode() if isinstance(out, bytes) else out for out in output)
+    results = []
+    current = None
+    for line in output.splitlines():
+        op_match = _S3BENCH_OP_RE.match(line)
+        if op_match:
+            current = {"operation": op_match.group("op") or op_match.group("old_op"),
+                       "latency": {}, "ttfb": {}}
+            results.append(current)
+            continue
+        kv_match = _S3BENCH_KV_RE.match(line)
+        if not kv_match:
+            continue
+        key, value = kv_match.group("key").strip(), float(kv_match.group("value"))
+        lkey = key.lower()
+        if current is None:
+            if lkey == "numclients" and not concurrency:
+                concurrency = int(value)
+            elif lkey == "objectsize" and not object_size:
+                object_size = int(value * (1024 ** 2)) if "MB" in line else int(value)
+            continue
+        lat_match = _S3BENCH_LAT_RE.match(key)
+        if lat_match:
+            kind = "ttfb" if lat_match.group("kind").lower() == "ttfb" else "latency"
+            current[kind][_percentile_name(lat_match.group("stat"))] = value
+        elif "throughput" in lkey:
+            current["throughput"] = value
+        elif lkey == "rps":
+            current["iops"] = value
+        elif "error" in lkey:
+            current["errors"] = int(value)
+        elif "requests count" in lkey or "samples" in lkey:
+            current["requests"] = int(value)
+        elif "duration" in lkey:
+            current["duration"] = value
+    parsed = []
+    for res in results:
+        if not res.get("iops") and res.get("duration"):
+            res["iops"] = res.get("requests", 0) / res["duration"]
+        parsed.append(BenchmarkResult(
+            "s3bench", res.pop("operation"), object_size=object_size, concurrency=concurrency,
+            throughput=res.get("throughput"), iops=res.get("iops"), latency=res["latency"],
+            errors=res.get("errors"), requests=res.get("requests"),
+            duration=res.get("duration"), extra={"ttfb": res["ttfb"]}))
+    return parsed
+
+
+def parse_hsbench_json(file_path: str, object_size=0, concurrency: int = 0) -> list:
+    """
+    Parse hsbench JSON report into benchmark results, only TOTAL intervals are considered.
+
+    :param file_path: JSON file written by hsbench with -j option.
+    :param object_size: Object size used for the run.
+    :param concurrency: Number of threads used for the run.
+    :return: list of BenchmarkResult.
+    """
+    with open(file_path, "r", encoding="utf-8") as json_obj:
+        intervals = json.load(json_obj)
+    parsed = []
+    for data in intervals:
+        if data.get("IntervalName") != "TOTAL":
+            continue
+        # hsbench reports latencies in milliseconds.
+        latency = {name: data[field] / 1000.0 for name, field in (
+            ("min", "MinLat"), ("avg", "AvgLat"), ("p99", "NinetyNineLat"),
+            ("max", "MaxLat")) if data.get(field) is not None}
+        parsed.append(BenchmarkResult(
+            "hsbench", data["Mode"], object_size=data.get("ObjectSize", object_size),
+            concurrency=data.get("Threads", concurrency), throughput=data.get("Mbps"),
+            iops=data.get("Iops"), latency=latency, errors=data.get("Errors", 0),
+            requests=data.get("Ops"), duration=data.get("Seconds"),
+            extra={"slowdowns": data.get("Slowdowns", 0)}))
+    return parsed
+
+
+def parse_locust_stats_csv(csv_path: str, concurrency: int = 0, object_size=0) -> list:
+    """
+    Parse locust "<prefix>_stats.csv" written with --csv option into benchmark results.
+
+    :param csv_path: Path of the locust stats csv file.
+    :param concurrency: Number of locust users.
+    :param object_size: Object size used by the locust file.
+    :return: list of BenchmarkResult, one per request name including "Aggregated".
+    """
+    parsed = []
+    with open(csv_path, "r", encoding="utf-8", newline="") as csv_obj:
+        for row in csv.DictReader(csv_obj):
+            latency = {}
+            # Locust reports response times in milliseconds.
+            for column, value in row.items():
+                if not value or value == "N/A":
+                    continue
+                if column.endswith("%"):
+                    latency[f"p{column[:-1]}"] = float(value) / 1000.0
+                elif column in ("Average Response Time", "Min Response Time",
+                                "Max Response Time"):
+                    latency[column.split()[0].lower()[:3]] = float(value) / 1000.0
+            rps = float(row.get("Requests/s") or 0)
+            content_size = float(row.get("Average Content Size") or 0)
+            name = row.get("Name") or "Aggregated"
+            parsed.append(BenchmarkResult(
+                "locust", name if not row.get("Type") else f"{row['Type']}_{name}",
+                object_size=object_size, concurrency=concurrency,
+                throughput=rps * content_size / (1024 ** 2), iops=rps, latency=latency,
+                errors=int(row.get("Failure Count") or 0),
+                requests=int(row.get("Request Count") or 0)))
+    return parsed
+
+
+class BenchmarkResultStore:
+    """Local results store, keeps one JSON lines file per build."""
+
+    def __init__(self, store_dir: str = BENCH_RESULTS_DIR):
+        """
+        Initialize results store.
+
+        :param store_dir: Directory used to persist the results.
+        """
+        self.store_dir = store_dir
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def _build_file(self, build: str) -> str:
+        """Get store file path of the build."""
+        build_name = re.sub(r"[^\w.-]", "_", str(build))
+        return os.path.join(self.store_dir, f"{build_name}.jsonl")
+
+    def save(self, results: list, build: str) -> str:
+        """
+        Append results of the build to the store.
+
+        :param results: list of BenchmarkResult.
+        :param build: build number/name.
+        :return: store file path.
+        """
+        path = self._build_file(build)
+        with open(path, "a", encoding="utf-8") as store_obj:
+            for res in results:
+                res.build = build
+                store_obj.write(json.dumps(res.to_dict()) + "\n")
+        LOGGER.info("Saved %s benchmark results of build %s to %s", len(results), build, path)
+        return path
+
+    def load(self, build: str) -> list:
+        """
+        Load all the results of a build.
+
+        :param build: build number/name.
+        :return: list of BenchmarkResult.
+        """
+        path = self._build_file(build)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as store_obj:
+            return [BenchmarkResult.from_dict(json.loads(line)) for line in store_obj if line]
+
+    def builds(self) -> list:
+        """List of builds available in the store, oldest first."""
+        files = [os.path.join(self.store_dir, name) for name in os.listdir(self.store_dir)
+                 if name.endswith(".jsonl")]
+        return [os.path.basename(path)[:-len(".jsonl")]
+                for path in sorted(files, key=os.path.getmtime)]
+
+
+def _betacf(a_val: float, b_val: float, x_val: float) -> float:
+    """Continued fraction for incomplete beta function (Lentz's method)."""
+    tiny = 1e-30
+    qab, qap, qam = a_val + b_val, a_val + 1.0, a_val - 1.0
+    c_val, d_val = 1.0, 1.0 - qab * x_val / qap
+    d_val = 1.0 / (d_val if abs(d_val) > tiny else tiny)
+    result = d_val
+    for m_val in range(1, 201):
+        m2_val = 2 * m_val
+        for aa_val in (m_val * (b_val - m_val) * x_val / ((qam + m2_val) * (a_val + m2_val)),
+                       -(a_val + m_val) * (qab + m_val) * x_val / ((a_val + m2_val) * (qap + m2_val))):
+            d_val = 1.0 + aa_val * d_val
+            d_val = 1.0 / (d_val if abs(d_val) > tiny else tiny)
+            c_val = 1.0 + aa_val / c_val
+            c_val = c_val if abs(c_val) > tiny else tiny
+            result *= d_val * c_val
+        if abs(d_val * c_val - 1.0) < 3e-12:
+            break
+    return result
+
+
+def t_test_pvalue(t_stat: float, dof: float) -> float:
+    """
+    Two tailed p-value of Student's t distribution.
+
+    :param t_stat: t statistic.
+    :param dof: degrees of freedom.
+    :return: p-value.
+    """
+    x_val = dof / (dof + t_stat * t_stat)
+    a_val, b_val = dof / 2.0, 0.5
+    front = math.exp(math.lgamma(a_val + b_val) - math.lgamma(a_val) - math.lgamma(b_val)
+                     + a_val * math.log(x_val) + b_val * math.log1p(-x_val)) if 0 < x_val < 1 \
+        else 0.0
+    if x_val >= 1:
+        return 1.0
+    if x_val < (a_val + 1.0) / (a_val + b_val + 2.0):
+        return front * _betacf(a_val, b_val, x_val) / a_val
+    return 1.0 - front * _betacf(b_val, a_val, 1.0 - x_val) / b_val
+
+
+def welch_t_test(baseline: list, current: list) -> float:
+    """
+    Welch's t-test for samples with unequal variance.
+
+    :param baseline: baseline samples.
+    :param current: current samples.
+    :return: two tailed p-value, None if there are not enough samples.
+    """
+    if len(baseline) < 2 or len(current) < 2:
+        return None
+    mean_b, mean_c = sum(baseline) / len(baseline), sum(current) / len(current)
+    var_b = sum((val - mean_b) ** 2 for val in baseline) / (len(baseline) - 1)
+    var_c = sum((val - mean_c) ** 2 for val in current) / (len(current) - 1)
+    se_b, se_c = var_b / len(baseline), var_c / len(current)
+    if se_b + se_c == 0:
+        return 0.0 if mean_b != mean_c else 1.0
+    t_stat = (mean_c - mean_b) / math.sqrt(se_b + se_c)
+    dof = (se_b + se_c) ** 2 / ((se_b ** 2 / (len(baseline) - 1) if se_b else 0)
+                                + (se_c ** 2 / (len(current) - 1) if se_c else 0))
+    return t_test_pvalue(t_stat, dof)
+
+
+# pylint: disable=too-many-locals
+def compare_results(baseline: list, current: list, metrics: tuple = ("throughput", "iops",
+                                                                         "latency_p99"),
+                    threshold_pct: float = 5.0, alpha: float = 0.05) -> list:
+    """
+    Compare current results against baseline and flag regressions.
+
+    Results are grouped by (tool, operation, object size, concurrency). A metric is flagged as
+    regressed when it is worse than baseline by more than threshold_pct and, when both sides
+    have at least two samples, the difference is significant as per Welch's t-test.
+    :param baseline: list of BenchmarkResult of the baseline build.
+    :param current: list of BenchmarkResult of the current build.
+    :param metrics: metrics to be compared.
+    :param threshold_pct: minimum change in percentage to be considered.
+    :param alpha: significance level.
+    :return: list of comparison dictionaries.
+    """
+    grouped = defaultdict(lambda: ([], []))
+    for idx, results in enumerate((baseline, current)):
+        for res in results:
+            grouped[res.key][idx].append(res)
+    report = []
+    for key, (base_res, cur_res) in grouped.items():
+        if not base_res or not cur_res:
+            continue
+        for metric in metrics:
+            base_val = [res.metric(metric) for res in base_res if res.metric(metric) is not None]
+            cur_val = [res.metric(metric) for res in cur_res if res.metric(metric) is not None]
+            if not base_val or not cur_val:
+                continue
+            base_mean, cur_mean = sum(base_val) / len(base_val), sum(cur_val) / len(cur_val)
+            change = (cur_mean - base_mean) * 100.0 / base_mean if base_mean else 0.0
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            p_value = welch_t_test(base_val, cur_val)
+            significant = p_value is None or p_value < alpha
+            report.append({
+                "tool": key[0], "operation": key[1], "object_size": key[2],
+                "concurrency": key[3], "metric": metric, "baseline": base_mean,
+                "current": cur_mean, "change_pct": round(change, 2), "p_value": p_value,
+                "regression": worse > threshold_pct and significant})
+    regressions = [entry for entry in report if entry["regression"]]
+    LOGGER.info("Compared %s metrics, regressions found: %s", len(report), regressions)
+    return report
+
+
+def compare_with_baseline(current: list, baseline_build: str, store=None, **kwargs) -> list:
+    """
+    Compare results against a baseline build from results store.
+
+    :param current: list of BenchmarkResult.
+    :param baseline_build: Baseline build number/name.
+    :param store: BenchmarkResultStore, default store is used if not given.
+    :return: list of regressed metrics.
+    """
+    store = store or BenchmarkResultStore()
+    baseline = store.load(baseline_build)
+    if not baseline:
+        LOGGER.warning("No results available for baseline build %s", baseline_build)
+        return []
+    return [entry for entry in compare_results(baseline, current, **kwargs)
+            if entry["regression"]]
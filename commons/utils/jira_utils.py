@@ -19,6 +19,7 @@
 JIRA Access Utility Class
 """
 import json
+import re
 import sys
 import traceback
 import requests
@@ -254,6 +255,89 @@ class JiraTask:
                 if retry > 3:
                     return None
 
+    def get_issues_details(self, issue_ids: list, fields: str = None,
+                           batch_size: int = 200) -> dict:
+        """
+        Get details of many issues with JQL search, one query per batch_size issues.
+        Args:
+            issue_ids (list): Bug IDs or TEST IDs
+            fields (str): Comma separated fields to be fetched, all fields if None
+            batch_size (int): Issues per query
+        Returns:
+            dict of issue key to Issue, issues which are not found are skipped
+        """
+        options = {'server': self.jira_url}
+        auth_jira = JIRA(options, basic_auth=self.auth)
+        issues = {}
+        for idx in range(0, len(issue_ids), batch_size):
+            keys = [str(issue) for issue in issue_ids[idx:idx + batch_size]]
+            issues.update({issue.key: issue for issue in
+                           self._search_keys(auth_jira, keys, fields)})
+        return issues
+
+    @staticmethod
+    def _search_keys(auth_jira, keys: list, fields: str = None) -> list:
+        """
+        Search issues of keys, JQL fails with 400 if any key does not exist.
+        Keys named in the 400 error are dropped and the search is repeated, issues are
+        fetched one by one if the error does not name them.
+        """
+        retry = 0
+        while keys:
+            try:
+                return auth_jira.search_issues(f"key in ({','.join(keys)})", maxResults=False,
+                                               fields=fields)
+            except (JIRAError, requests.exceptions.RequestException) as fault:
+                if getattr(fault, "status_code", None) == HTTPStatus.BAD_REQUEST:
+                    invalid = set(re.findall(r"'([^']+)'", str(fault.text))) & set(keys)
+                    if not invalid:
+                        return JiraTask._get_each(auth_jira, keys, fields)
+                    LOGGER.warning('Skipping issues which are not found: %s', invalid)
+                    keys = [key for key in keys if key not in invalid]
+                    continue
+                LOGGER.error('Error occurred %s in searching issues %s', fault, keys)
+                retry += 1
+                if retry > 3:
+                    raise
+                time.sleep(10 * retry)
+        return []
+
+    @staticmethod
+    def _get_each(auth_jira, keys: list, fields: str = None) -> list:
+        """Get issues one by one, issues which are not found are skipped."""
+        issues = []
+        for key in keys:
+            try:
+                issues.append(auth_jira.issue(key, fields=fields))
+            except JIRAError as fault:
+                if fault.status_code not in (HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST):
+                    raise
+                LOGGER.warning('Skipping issue %s: %s', key, fault.text)
+        return issues
+
+    def update_tests_jira_status(self, test_exe_id, test_statuses: list):
+        """
+        Update status of many tests of a test execution in one xray import request.
+        Args:
+            test_exe_id: Test execution ID
+            test_statuses: list of (test_id, test_status, log_path)
+        """
+        now = datetime.datetime.now().astimezone().isoformat(timespec='seconds')
+        tests = []
+        for test_id, test_status, log_path in test_statuses:
+            status = {"testKey": test_id, "status": test_status}
+            if test_status.upper() == 'EXECUTING':
+                status["start"] = now
+            else:
+                status["finish"] = now
+                status["comment"] = log_path
+            tests.append(status)
+        data = json.dumps({"testExecutionKey": test_exe_id, "tests": tests})
+        jira_url = self.jira_url + "/rest/raven/1.0/import/execution"
+        return requests.request("POST", jira_url, data=data,
+                                auth=(self.jira_id, self.jira_password),
+                                headers=self.headers, params=None)
+
     def update_test_jira_status(self, test_exe_id, test_id, test_status, log_path=''):
         """
         Update test jira status in xray jira.
@@ -26,6 +26,7 @@ import logging
 import os
 import time
 import urllib
+from functools import lru_cache
 from hashlib import md5
 from hashlib import sha256
 from random import shuffle
@@ -39,6 +40,10 @@ from config import S3_CFG
 
 LOGGER = logging.getLogger(__name__)
 
+EMPTY_SHA256 = sha256(b"").hexdigest()
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+STREAMING_PAYLOAD = "STREAMING-AWS4-HMAC-SHA256-PAYLOAD"
+
 
 def utf8_encode(msg):
     """Encode the msg into utf-8."""
@@ -68,40 +73,32 @@ def get_canonicalized_xamz_headers(headers):
     list of values eg. headers['x-amz-authors'] = ['Jack', 'Jelly']
     example return value: x-amz-authors:Jack,Jelly\nx-amz-org:Seagate\n
     """
-    xamz_headers = ''
+    xamz_headers = []
     for header in sorted(headers.keys()):
         if header.startswith("x-amz-"):
             if isinstance(headers[header], str):
-                xamz_headers += header + ":" + headers[header] + "\n"
+                xamz_headers.append(f"{header}:{headers[header]}\n")
             elif isinstance(headers[header], list):
-                xamz_headers += header + ":" + ','.join(headers[header]) + "\n"
+                xamz_headers.append(f"{header}:{','.join(headers[header])}\n")
 
-    return xamz_headers
+    return "".join(xamz_headers)
 
 
 def create_str_to_sign(http_method, canonical_uri, headers):
     """Create the aws signature from string."""
-    str_to_sign = http_method + '\n'
-    str_to_sign += headers.get("content-md5", "") + "\n"
-    str_to_sign += headers.get("content-type", "") + "\n"
-    str_to_sign += headers.get("date", "") + "\n"
-    str_to_sign += get_canonicalized_xamz_headers(headers)
-    str_to_sign += canonical_uri
-    str_to_sign = utf8_encode(str_to_sign)
+    str_to_sign = "\n".join([http_method, headers.get("content-md5", ""),
+                             headers.get("content-type", ""), headers.get("date", ""),
+                             get_canonicalized_xamz_headers(headers) + canonical_uri])
 
-    return str_to_sign
+    return utf8_encode(str_to_sign)
 
 
 def create_canonical_request(method, canonical_uri, body, epoch_t, host):
     """Create canonical request."""
-    canonical_query_string = ""
-    signed_headers = 'host;x-amz-date'
     payload_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
-    canonical_headers = 'host:' + host + '\n' + 'x-amz-date:' + get_timestamp(epoch_t) + '\n'
-    canonical_request = method + '\n' + canonical_uri + '\n' + canonical_query_string + '\n' + \
-        canonical_headers + '\n' + signed_headers + '\n' + payload_hash
 
-    return canonical_request
+    return "\n".join([method, canonical_uri, "", f"host:{host}",
+                      f"x-amz-date:{get_timestamp(epoch_t)}", "", "host;x-amz-date", payload_hash])
 
 
 def sign(key, msg):
@@ -109,8 +106,9 @@ def sign(key, msg):
     return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
 
 
+@lru_cache(maxsize=1024)
 def get_v4_signature_key(key, date_stamp, region_name, service_name):
-    """Get the V4 signature key."""
+    """Get the V4 signature key, keys are cached per secret, date, region and service."""
     kdate = sign(('AWS4' + key).encode('utf-8'), date_stamp)
     kregion = sign(kdate, region_name)
     kservice = sign(kregion, service_name)
@@ -126,11 +124,15 @@ def create_string_to_sign_v4(method='', canonical_uri='', body='', epoch_t=None,
     host = kwargs.get("host")
     algorithm = kwargs.get("algorithm", 'AWS4-HMAC-SHA256')
     canonical_request = create_canonical_request(method, canonical_uri, body, epoch_t, host)
-    credential_scope = get_date(epoch_t) + '/' + region + '/' + service + '/' + 'aws4_request'
-    string_to_sign = algorithm + '\n' + get_timestamp(epoch_t) + '\n' + credential_scope \
-        + '\n' + hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+    credential_scope = get_credential_scope(epoch_t, region, service)
+
+    return "\n".join([algorithm, get_timestamp(epoch_t), credential_scope,
+                      hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()])
 
-    return string_to_sign
+
+def get_credential_scope(epoch_t, region, service):
+    """Get the V4 credential scope."""
+    return f"{get_date(epoch_t)}/{region}/{service}/aws4_request"
 
 
 def sign_request_v4(method=None, canonical_uri='/', body='', epoch_t=None, host='',
@@ -145,17 +147,14 @@ def sign_request_v4(method=None, canonical_uri='/', body='', epoch_t=None, host=
     region = kwargs.get("region", S3_CFG["region"])
     access_key = kwargs.get("access_key")
     secret_key = kwargs.get("secret_key")
-    credential_scope = get_date(epoch_t) + '/' + region + '/' + service + '/' + 'aws4_request'
+    credential_scope = get_credential_scope(epoch_t, region, service)
     string_to_sign = create_string_to_sign_v4(
         method, canonical_uri, body, epoch_t, algorithm='AWS4-HMAC-SHA256', host=host,
         service=service, region=region)
     signing_key = get_v4_signature_key(secret_key, get_date(epoch_t), region, service)
     signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
-    authorization_header = 'AWS4-HMAC-SHA256' + ' ' + 'Credential=' + access_key + '/' + \
-                           credential_scope + ', ' + 'SignedHeaders=' + 'host;x-amz-date' + \
-                           ', ' + 'Signature=' + signature
-
-    return authorization_header
+    return f"AWS4-HMAC-SHA256 Credential={access_key}/{credential_scope}, " \
+           f"SignedHeaders=host;x-amz-date, Signature={signature}"
 
 
 def get_headers(request=None, endpoint=None, payload=None, **kwargs) -> dict:
@@ -221,6 +220,33 @@ def poll(target, *args, condition=None, **kwargs) -> Any:
     return target(*args, **kwargs)
 
 
+# pylint: disable=broad-except
+def confirm(probe, *args, timeout: float = None, max_step: float = None) -> bool:
+    """
+    Confirm a write is visible, in place of a fixed sleep after the write.
+
+    :param probe: Callable returning True once the write is visible, called with args.
+    :param timeout: Seconds to wait, sync_delay by default.
+    :param max_step: Maximum seconds between probes, sync_step by default. First probe is
+        immediate, interval starts at 0.1s and is doubled after each probe.
+    :return: True if probe succeeded in timeout.
+    """
+    timeout = S3_CFG["sync_delay"] if timeout is None else timeout
+    max_step = S3_CFG["sync_step"] if max_step is None else max_step
+    end_time = time.time() + timeout
+    step = 0.1
+    while True:
+        try:
+            if probe(*args):
+                return True
+        except Exception as error:
+            LOGGER.debug("SYNC: probe %s failed: %s", getattr(probe, "__name__", probe), error)
+        if time.time() + step > end_time:
+            return False
+        time.sleep(step)
+        step = min(step * 2, max_step)
+
+
 def calc_checksum(file_path, part_size=0):
     """Calculate a checksum using encryption algorithm."""
     try:
@@ -254,15 +280,135 @@ def get_multipart_etag(parts):
 
     :param parts: List of dict with the format {part_number: (data_bytes, content_md5), ...}
     """
-    md5_digests = []
-    for part_number in sorted(parts.keys()):
-        # comparing ETag with s3 response so calculating it based on md5.
-        md5_digests.append(md5(parts[part_number][0]).digest())  # nosec
-    multipart_etag = md5(b''.join(md5_digests)).hexdigest() + '-' + str(len(md5_digests))  # nosec
-    return f'"{multipart_etag}"'
+    tracker = MultipartEtagTracker(sha256_digests=False)
+    for part_number, part in parts.items():
+        tracker.add_part(part_number, part[0])
+    return tracker.etag()
 
 
-def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False) -> dict:
+class MultipartEtagTracker:
+    """
+    Expected ETag and checksums of a multipart upload built as parts are uploaded.
+
+    Parts are added in any order, whole or streamed in chunks, and only their digests and sizes
+    are kept, so the data is not read again to verify ETag of the completed object.
+    """
+
+    def __init__(self, sha256_digests: bool = True):
+        """
+        :param sha256_digests: Keep sha256 digests of parts for composite checksum.
+        """
+        self.sha256_digests = sha256_digests
+        # part number: [md5 digest, sha256 digest, size, copy source range]
+        self._parts = {}
+        self._streams = {}
+
+    def __len__(self):
+        return len(self._parts)
+
+    def __contains__(self, part_number):
+        return part_number in self._parts
+
+    def update(self, part_number: int, chunk: bytes):
+        """Add a chunk of a part being streamed, see finish."""
+        if part_number not in self._streams:
+            self._streams[part_number] = [md5(), sha256() if self.sha256_digests else None, 0]
+        stream = self._streams[part_number]
+        stream[0].update(chunk)  # nosec - s3 ETag is based on md5.
+        if stream[1]:
+            stream[1].update(chunk)
+        stream[2] += len(chunk)
+
+    def finish(self, part_number: int) -> str:
+        """Complete a streamed part, returns its expected ETag."""
+        md5_obj, sha256_obj, size = self._streams.pop(part_number)
+        self._parts[part_number] = [md5_obj.digest(), sha256_obj.digest() if sha256_obj else None,
+                                    size, None]
+        return f'"{md5_obj.hexdigest()}"'
+
+    def add_part(self, part_number: int, data: bytes) -> str:
+        """Add a part, returns its expected ETag."""
+        self.update(part_number, data)
+        return self.finish(part_number)
+
+    def add_etag(self, part_number: int, etag: str, size: int = None, source_range=None):
+        """
+        Add a part by ETag returned by server, e.g. of UploadPartCopy.
+
+        :param etag: ETag of part i.e. md5 of part data.
+        :param size: Part size, needed for ranges.
+        :param source_range: (first byte, last byte) of copy source.
+        """
+        if source_range and size is None:
+            size = source_range[1] - source_range[0] + 1
+        self._parts[part_number] = [bytes.fromhex(etag.strip('"')), None, size, source_range]
+
+    def remove(self, part_number: int):
+        """Remove a part e.g. which is uploaded again."""
+        self._parts.pop(part_number, None)
+        self._streams.pop(part_number, None)
+
+    def part_etag(self, part_number: int) -> str:
+        """Expected ETag of a part."""
+        return f'"{self._parts[part_number][0].hex()}"'
+
+    def verify_part(self, part_number: int, etag: str) -> bool:
+        """Check ETag returned by server for a part."""
+        return etag.strip('"') == self._parts[part_number][0].hex()
+
+    def etag(self) -> str:
+        """Expected ETag of the completed object."""
+        digests = b"".join(self._parts[number][0] for number in sorted(self._parts))
+        return f'"{md5(digests).hexdigest()}-{len(self._parts)}"'  # nosec
+
+    def checksum(self) -> str:
+        """Composite checksum, same as calc_checksum of the object file with part size."""
+        digests = [self._parts[number][1] for number in sorted(self._parts)]
+        if None in digests:
+            raise ValueError("sha256 digest is not known for all the parts")
+        return sha256(b"".join(digests)).hexdigest() + '-' + str(len(digests))
+
+    def ranges(self) -> list:
+        """Byte range of each part in the completed object with its digests."""
+        ranges = []
+        offset = 0
+        for number in sorted(self._parts):
+            md5_digest, sha256_digest, size, source_range = self._parts[number]
+            if size is None:
+                raise ValueError(f"Size of part {number} is not known")
+            ranges.append({"PartNumber": number, "start": offset, "end": offset + size - 1,
+                           "size": size, "md5": md5_digest.hex(),
+                           "sha256": sha256_digest.hex() if sha256_digest else None,
+                           "source_range": source_range})
+            offset += size
+        return ranges
+
+    def verify_file(self, file_path: str, chunk_size: int = 1048576) -> list:
+        """
+        Verify a downloaded object in a single read.
+
+        :return: Part numbers of which the data does not match, empty if object matches.
+        """
+        mismatched = []
+        with open(file_path, "rb") as f_obj:
+            for part in self.ranges():
+                md5_obj = md5()  # nosec - s3 ETag is based on md5.
+                remaining = part["size"]
+                while remaining:
+                    data = f_obj.read(min(chunk_size, remaining))
+                    if not data:
+                        break
+                    md5_obj.update(data)
+                    remaining -= len(data)
+                if remaining or md5_obj.hexdigest() != part["md5"]:
+                    mismatched.append(part["PartNumber"])
+            if f_obj.read(1):
+                mismatched.append(None)
+        return mismatched
+
+
+def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False,
+                      tracker=None) -> dict:
     r"""
     Get aligned parts.
 
@@ -275,6 +421,7 @@ def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False
     :param file_path: Path of object file.
     :param chunk_size: chunk size used to read each check default is 5MB.
     :param random: Generate random else sequential part order.
+    :param tracker: MultipartEtagTracker to which the parts are added.
     :return: Parts details with data, checksum.
     """
     try:
@@ -289,6 +436,8 @@ def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False
                     break
                 LOGGER.info("data length %s", str(len(data)))
                 parts[i] = [data, calc_contentmd5(data)]
+                if tracker is not None:
+                    tracker.add_part(i, data)
                 i += 1
         if random:
             keys = list(parts.keys())
@@ -300,7 +449,8 @@ def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False
         raise error from OSError
 
 
-def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False) -> dict:
+def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False,
+                        tracker=None) -> dict:
     """
     Create the upload parts dict with unaligned part size(limitation: not supported more than 10G).
 
@@ -315,6 +465,7 @@ def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=Fal
     :param file_path: Path of object file.
     :param chunk_size: chunk size used to read each check default is 5MB.
     :param random: Generate random else sequential part order.
+    :param tracker: MultipartEtagTracker to which the parts are added.
     :return: Parts details with data, checksum.
     """
     try:
@@ -332,6 +483,8 @@ def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=Fal
                     break
                 LOGGER.info("data_len %s", str(len(data)))
                 parts[j] = [data, calc_contentmd5(data)]
+                if tracker is not None:
+                    tracker.add_part(j, data)
                 j += 1
         if random:
             keys = list(parts.keys())
@@ -343,13 +496,14 @@ def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=Fal
         raise error from OSError
 
 
-def get_precalculated_parts(file_path, part_list, chunk_size=1048576) -> dict:
+def get_precalculated_parts(file_path, part_list, chunk_size=1048576, tracker=None) -> dict:
     """
     Split the source file into the specified part sizes.
 
     :param file_path: Path of object file.
     :param part_list: List of dict with keys 'part_size' (in bytes) and 'count'
     :param chunk_size: chunk size used to read each check default is 1MB.
+    :param tracker: MultipartEtagTracker to which the parts are added.
     :return: Parts details with data, checksum.
     """
     total_part_list = []
@@ -362,6 +516,8 @@ def get_precalculated_parts(file_path, part_list, chunk_size=1048576) -> dict:
             for i, part_size in enumerate(total_part_list, 1):
                 data = file_pointer.read(int(part_size * chunk_size))
                 parts[i] = [data, calc_contentmd5(data)]
+                if tracker is not None:
+                    tracker.add_part(i, data)
         return parts
     except OSError as error:
         LOGGER.error(str(error))
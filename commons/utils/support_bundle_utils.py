@@ -225,7 +225,11 @@ def collect_support_bundle_k8s(local_dir_path: str, scripts_path: str = cm_const
                 LOGGER.info("Support bundle filename:%s", file)
                 remote_path = os.path.join(scripts_path, file)
                 local_path = os.path.join(local_dir_path, file)
-                m_node_obj.copy_file_to_local(remote_path, local_path)
+                metrics = m_node_obj.bulk_copy_to_local([(remote_path, local_path)])
+                if not metrics[0]["status"]:
+                    LOGGER.error("Copy of support bundle %s failed: %s", file,
+                                 metrics[0]["error"])
+                    return False
                 LOGGER.info("Support bundle %s generated and copied to %s path",
                             file, local_dir_path)
                 return flg
@@ -254,6 +258,7 @@ def collect_crash_files_k8s(local_dir_path: str):
     if m_node_obj.path_exists(crash_dir):
         m_node_obj.remove_dir(crash_dir)
 
+    file_list = []
     for pod in pod_list:
         LOGGER.info("Checking crash files for %s pod", pod)
         resp = m_node_obj.send_k8s_cmd(operation="exec", pod=pod, namespace=cm_const.NAMESPACE,
@@ -267,9 +272,13 @@ def collect_crash_files_k8s(local_dir_path: str):
             remote_path = os.path.join(crash_dir, file2)
             m_node_obj.execute_cmd(cmd=cm_cmd.K8S_CP_PV_FILE_TO_LOCAL_CMD
                                    .format(pod, resp, remote_path))
-            local_path = os.path.join(local_dir_path, file2)
-            m_node_obj.copy_file_to_local(remote_path, local_path)
+            file_list.append((remote_path, os.path.join(local_dir_path, file2)))
 
+    # Copy crash files of all the pods concurrently.
+    for metric in m_node_obj.bulk_copy_to_local(file_list):
+        if not metric["status"]:
+            LOGGER.error("Copy of crash file %s failed: %s", metric["remote_path"],
+                         metric["error"])
     if flg:
         LOGGER.info("Crash files are generated and copied to %s", local_dir_path)
     else:
@@ -966,6 +966,24 @@ def insert_into_builtins(name, obj):
         builtins.obj = obj
 
 
+def mount_dir(host_dir: str = None, mnt_dir: str = None) -> tuple:
+    """Mount NFS directory if it is not mounted
+    :param host_dir: Link of NFS server directory
+    :param mnt_dir: Path of directory to be mounted
+    :return: Bool, response"""
+    if not os.path.ismount(mnt_dir):
+        if not os.path.exists(mnt_dir):
+            LOGGER.info("Creating a mount directory to share")
+            make_dirs(dpath=mnt_dir)
+
+        cmd = commands.CMD_MOUNT.format(host_dir, mnt_dir)
+        resp = run_local_cmd(cmd=cmd)
+        if not resp[0]:
+            return resp
+
+    return True, mnt_dir
+
+
 def mount_upload_to_server(host_dir: str = None, mnt_dir: str = None,
                            remote_path: str = None, local_path: str = None) \
         -> tuple:
@@ -976,15 +994,9 @@ def mount_upload_to_server(host_dir: str = None, mnt_dir: str = None,
     :param local_path: Local path of the file to be uploaded
     :return: Bool, response"""
     try:
-        if not os.path.ismount(mnt_dir):
-            if not os.path.exists(mnt_dir):
-                LOGGER.info("Creating a mount directory to share")
-                make_dirs(dpath=mnt_dir)
-
-            cmd = commands.CMD_MOUNT.format(host_dir, mnt_dir)
-            resp = run_local_cmd(cmd=cmd)
-            if not resp[0]:
-                return resp
+        resp = mount_dir(host_dir=host_dir, mnt_dir=mnt_dir)
+        if not resp[0]:
+            return resp
 
         new_path = os.path.join(mnt_dir, remote_path)
         LOGGER.info("Creating directory on server")
@@ -112,18 +112,35 @@ class TopStatsCollection:
             self.master_node_list[0].execute_cmd(cmd=KILL_CMD.format(pid))
         return True
 
-    def copy_remove_files_from_remote(self, dir_path, local_path):
+    def copy_remove_files_from_remote(self, dir_path, local_path, workers=4, archive=False):
         """
         function to copy files from dir and remove dir from remote
+        Files are copied concurrently, remote dir is removed only if all the files are copied.
+        :param dir_path: remote stats directory
+        :param local_path: local directory
+        :param workers: number of concurrent transfers
+        :param archive: stream dir as a single compressed tar instead of copying files, archive
+            is named .tar.zst or .tar.gz as per compressor available on the node
+        :return: Boolean
         """
+        if archive:
+            archive_path = os.path.join(local_path,
+                                        f"{os.path.basename(dir_path.rstrip('/'))}.tar.zst")
+            metric = self.master_node_list[0].stream_dir_to_local(dir_path, archive_path)
+            if not metric["status"]:
+                LOGGER.info("archive of dir %s failed: %s", dir_path, metric["error"])
+                return False
+            LOGGER.debug("dir %s archived to %s", dir_path, metric["local_path"])
+            return self.master_node_list[0].delete_dir_sftp(dpath=dir_path)
         ls_dir = self.master_node_list[0].list_dir(remote_path=dir_path)
         LOGGER.debug("ls of remote dir %s", ls_dir)
-        for file in ls_dir:
-            resp = self.master_node_list[0].copy_file_to_local(os.path.join(dir_path, file),
-                                                               os.path.join(local_path, file))
-            if not resp:
-                LOGGER.info("copy of file %s failed", file)
-                return resp
+        metrics = self.master_node_list[0].bulk_copy_to_local(
+            [(os.path.join(dir_path, file), os.path.join(local_path, file)) for file in ls_dir],
+            workers=workers)
+        failed = [metric["remote_path"] for metric in metrics if not metric["status"]]
+        if failed:
+            LOGGER.info("copy of files %s failed", failed)
+            return False
         LOGGER.debug("removing dir from path of remote %s", dir_path)
         resp = self.master_node_list[0].delete_dir_sftp(dpath=dir_path)
         return resp
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Duration aware execution plan of distributed test runs.
+
+   Test durations are taken from earlier executions in reports DB (testExecutionTime of
+   reportsdb/search) and kept in a local cache, so a plan can be made when the report
+   server is not reachable. Work items are planned longest first on the target which is
+   free first (LPT). Items are published in the same order and test runners pull the next
+   item when they are free, so the plan rebalances itself when an item runs shorter or
+   longer than predicted. Items of an exclusive group are pinned to one target, sequential
+   items lock their target so they never overlap.
+"""
+
+import json
+import logging
+import os
+import statistics
+from datetime import datetime
+from http import HTTPStatus
+from typing import List
+
+import requests
+
+from commons import params
+
+LOGGER = logging.getLogger(__name__)
+
+SEARCH_EP = params.REPORT_SRV + "reportsdb/search"
+DURATION_CACHE = os.path.join(params.LOG_DIR, "test_durations.json")
+# Seconds assumed for a test without history.
+DEFAULT_DURATION = 600
+MAX_SAMPLES = 10
+QUERY_BATCH = 200
+PROJECTION = {"testID": True, "testStartTime": True, "testExecutionTime": True}
+
+
+def search_executions(test_ids: List, db_user: str, db_pwd: str, **query) -> List:
+    """
+    Test execution records of tests from reports DB.
+
+    :param test_ids: Test ids.
+    :param db_user: DB user name.
+    :param db_pwd: DB password.
+    :keyword query: Additional query fields e.g. testPlanID, buildNo.
+    :return: records with testID, testStartTime and testExecutionTime,
+        None if report server did not respond.
+    """
+    records = []
+    test_ids = sorted(set(test_ids))
+    headers = {'Content-Type': 'application/json'}
+    for idx in range(0, len(test_ids), QUERY_BATCH):
+        payload = {"query": dict(query, testID={"$in": test_ids[idx:idx + QUERY_BATCH]}),
+                   "projection": PROJECTION, "db_username": db_user, "db_password": db_pwd}
+        try:
+            response = requests.request("GET", SEARCH_EP, headers=headers,
+                                        data=json.dumps(payload), timeout=60)
+        except requests.exceptions.RequestException as error:
+            LOGGER.warning("Failed to search test executions: %s", error)
+            return None
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            continue
+        if response.status_code != HTTPStatus.OK:
+            LOGGER.warning("Failed to search test executions: %s %s", response.status_code,
+                           response.text)
+            return None
+        records.extend(response.json()["result"])
+    return records
+
+
+def _end_time(record: dict) -> float:
+    """End time of test execution record in epoch seconds."""
+    return datetime.fromisoformat(record["testStartTime"]).timestamp() + \
+        float(record["testExecutionTime"])
+
+
+class DurationHistory:
+    """Recent durations of tests from reports DB with a local cache."""
+
+    def __init__(self, cache_path: str = DURATION_CACHE, default: float = DEFAULT_DURATION,
+                 max_samples: int = MAX_SAMPLES):
+        """
+        :param cache_path: JSON file of test id to {start time: duration}.
+        :param default: Duration of a test without history.
+        :param max_samples: Latest durations kept per test.
+        """
+        self.cache_path = cache_path
+        self.default = default
+        self.max_samples = max_samples
+        self.durations = {}
+        self.load()
+
+    def load(self):
+        """Load cached durations."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                self.durations = json.load(cache_file)
+        except (OSError, ValueError) as error:
+            LOGGER.warning("Ignoring duration cache %s: %s", self.cache_path, error)
+
+    def save(self):
+        """Write cached durations, file is replaced atomically."""
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(self.durations, cache_file)
+        os.replace(tmp_path, self.cache_path)
+
+    def add(self, test_id: str, duration: float, start_time: str = ""):
+        """Add a duration, the same execution added again replaces the earlier one."""
+        samples = self.durations.setdefault(test_id, {})
+        samples[start_time] = float(duration)
+        for start in sorted(samples)[:-self.max_samples]:
+            del samples[start]
+
+    def fetch(self, test_ids: List, db_user: str, db_pwd: str, **query) -> int:
+        """
+        Add durations of earlier executions of tests from reports DB and update cache.
+
+        Cached durations are used if report server is not reachable.
+        :keyword query: Additional query fields e.g. buildType.
+        :return: Number of durations added.
+        """
+        records = search_executions(test_ids, db_user, db_pwd, **query)
+        if records is None:
+            LOGGER.warning("Using cached durations of %s tests", len(self.durations))
+            return 0
+        added = 0
+        for record in records:
+            if record.get("testExecutionTime"):
+                self.add(record["testID"], record["testExecutionTime"],
+                         record.get("testStartTime", ""))
+                added += 1
+        self.save()
+        return added
+
+    def estimate(self, test_id: str) -> float:
+        """Median of recent durations of a test, default if test has no history."""
+        samples = self.durations.get(test_id)
+        if not samples:
+            return self.default
+        return statistics.median(samples.values())
+
+
+class PlanItem:
+    """Tests published as one work item, an item runs on one target."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, tag: str, tests: List, parallel: bool, duration: float,
+                 exclusive: str = None):
+        """
+        :param tag: Tag of the tests.
+        :param tests: Test ids.
+        :param parallel: Tests are run in parallel.
+        :param duration: Predicted duration in seconds.
+        :param exclusive: Exclusive group of sequential tests which must not overlap.
+        """
+        self.tag = tag
+        self.tests = list(tests)
+        self.parallel = parallel
+        self.duration = duration
+        self.exclusive = exclusive
+        self.target = None
+        self.start = None
+
+    @property
+    def end(self) -> float:
+        """Predicted end in seconds from start of run."""
+        return None if self.start is None else self.start + self.duration
+
+    def to_dict(self) -> dict:
+        """Item as saved in plan."""
+        return {"tag": self.tag, "tests": self.tests, "parallel": self.parallel,
+                "exclusive": self.exclusive, "duration": self.duration,
+                "target": self.target, "start": self.start, "end": self.end}
+
+
+def build_items(selected_tag_map: dict, history: DurationHistory, exclusive_map: dict = None,
+                ticket_map: dict = None) -> List:
+    """
+    Work items of selected tests with predicted durations.
+
+    The parallel set of a tag is one item, test runner runs it with force_serial_run so its
+    duration is the sum of its tests. Every sequential test is an item, except sequential tests
+    of an exclusive group are one item per ticket so that they run one after another, items
+    of a group from different tickets are pinned to one target by plan_lpt.
+    :param selected_tag_map: tag to [parallel set, sequential set].
+    :param history: Test durations.
+    :param exclusive_map: test id to exclusive group.
+    :param ticket_map: test id to test execution ticket, an item is run for one ticket.
+    """
+    exclusive_map = exclusive_map or {}
+    ticket_map = ticket_map or {}
+    items, groups = [], {}
+    for tag in sorted(selected_tag_map):
+        parallel_set, sequential_set = selected_tag_map[tag]
+        if parallel_set:
+            items.append(PlanItem(tag, sorted(parallel_set), True,
+                                  sum(history.estimate(test) for test in parallel_set)))
+        for test in sorted(sequential_set):
+            group = exclusive_map.get(test)
+            key = (ticket_map.get(test), group)
+            if group is None:
+                items.append(PlanItem(tag, [test], False, history.estimate(test)))
+            elif key in groups:
+                groups[key].tests.append(test)
+                groups[key].duration += history.estimate(test)
+            else:
+                groups[key] = PlanItem(group, [test], False, history.estimate(test), group)
+                items.append(groups[key])
+    return items
+
+
+def plan_lpt(items: List, targets: List) -> List:
+    """
+    Plan items longest first, each on the target which is free first.
+
+    Items of the same exclusive group are planned on the target of the first one.
+    :return: items in publish order with target and predicted start set.
+    """
+    free = [0.0] * len(targets)
+    pinned = {}
+    ordered = sorted(items, key=lambda item: (-item.duration, item.tag, item.tests))
+    for item in ordered:
+        idx = pinned.get(item.exclusive)
+        if idx is None:
+            idx = min(range(len(targets)), key=lambda tidx: (free[tidx], tidx))
+        item.target, item.start = targets[idx], free[idx]
+        free[idx] = item.end
+        if item.exclusive is not None:
+            pinned[item.exclusive] = idx
+    return ordered
+
+
+def makespan(items: List) -> float:
+    """Predicted makespan of planned items."""
+    return max((item.end for item in items), default=0.0)
+
+
+def save_plan(items: List, targets: List, path: str, **meta) -> dict:
+    """
+    Write plan with predicted makespan as JSON.
+
+    :keyword meta: Run details e.g. test_plan, build.
+    """
+    total = sum(item.duration for item in items)
+    plan = dict(meta, targets=list(targets), predicted_makespan=makespan(items),
+                lower_bound=max(max((item.duration for item in items), default=0.0),
+                                total / max(1, len(targets))),
+                items=[item.to_dict() for item in items])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as plan_file:
+        json.dump(plan, plan_file, indent=2)
+    LOGGER.info("Execution plan of %s items on %s targets saved to %s, predicted makespan %.0fs",
+                len(items), len(targets), path, plan["predicted_makespan"])
+    return plan
+
+
+def makespan_report(plan: dict, records: List) -> dict:
+    """
+    Predicted versus actual makespan and item durations of a run.
+
+    :param plan: Plan saved by save_plan.
+    :param records: Execution records of the run, see search_executions.
+    """
+    latest = {}
+    for record in records:
+        if record.get("testStartTime") and record.get("testExecutionTime") is not None:
+            if record["testID"] not in latest or \
+                    record["testStartTime"] > latest[record["testID"]]["testStartTime"]:
+                latest[record["testID"]] = record
+    start = min((datetime.fromisoformat(rec["testStartTime"]).timestamp()
+                 for rec in latest.values()), default=None)
+    items = []
+    for item in plan["items"]:
+        executed = [latest[test] for test in item["tests"] if test in latest]
+        actual = None
+        if executed:
+            actual = max(_end_time(rec) for rec in executed) - \
+                min(datetime.fromisoformat(rec["testStartTime"]).timestamp()
+                    for rec in executed)
+        items.append({"tag": item["tag"], "target": item["target"],
+                      "predicted": item["duration"], "actual": actual,
+                      "missing": [test for test in item["tests"] if test not in latest]})
+    actual_makespan = max(_end_time(rec) for rec in latest.values()) - start \
+        if latest else None
+    predicted = plan["predicted_makespan"]
+    return {"predicted_makespan": predicted, "actual_makespan": actual_makespan,
+            "error_pct": round((actual_makespan - predicted) * 100.0 / predicted, 3)
+            if actual_makespan is not None and predicted else None,
+            "items": items}
@@ -26,6 +26,8 @@
    processes on same or different machine.
 
    It Provides a way to utilize multiple testing targets in test execution.
+   Work items are published longest first as per test durations of earlier executions,
+   see core.test_scheduler.
 
 """
 import argparse
@@ -34,9 +36,11 @@ import os
 import multiprocessing
 import threading
 import csv
+import json
 import subprocess
 import logging
 from typing import List
+from typing import Set
 from typing import Tuple
 from typing import Any
 from typing import Dict
@@ -48,6 +52,7 @@ from core import rpcserver
 from core import report_rpc
 from core import runner
 from core import producer
+from core import test_scheduler
 from commons.utils import system_utils
 from commons.utils import jira_utils
 from commons.utils import config_utils
@@ -86,6 +91,13 @@ def parse_args(argv):
                         help="Enable async reporting to Jira and MongoDB")
     parser.add_argument("-c", "--cancel_run", type=bool, default=False,
                         help="Enable Cancel run")
+    parser.add_argument("-em", "--exclusive_marks", nargs='*', type=str, default=[],
+                        help="Marks of sequential tests which must not run concurrently")
+    parser.add_argument("-dc", "--duration_cache", type=str,
+                        default=test_scheduler.DURATION_CACHE,
+                        help="Local cache of test durations")
+    parser.add_argument("-mr", "--makespan_report", type=str,
+                        help="Report predicted vs actual makespan of saved execution plan")
     return parser.parse_args(args=argv)
 
 
@@ -177,7 +189,7 @@ def run(opts: dict) -> None:
     base_components_marks = ('cluster_user_ops', 'cluster_management_ops', 's3_ops',
                              'ha', 'stress', 'longevity', 'scalability',
                              'combinational')
-    skip_test = list()
+    skip_test = set()
     selected_tag_map = dict()
     meta_file = os.path.join(log_home, 'te_meta.json')
     if not os.path.exists(meta_file):
@@ -189,6 +201,7 @@ def run(opts: dict) -> None:
                     test_map, internal_skip_marks)
 
     develop_execution_plan(rev_tag_map, selected_tag_map, skip_test, test_map, tickets)
+    plan_items = plan_execution(opts, selected_tag_map, test_map, log_home)
     kafka_admin_conf = {"bootstrap.servers": params.BOOTSTRAP_SERVERS}
     kafka_client = AdminClient(kafka_admin_conf)
     delete_topic(client=kafka_client, topics=[params.TEST_EXEC_TOPIC])
@@ -205,35 +218,74 @@ def run(opts: dict) -> None:
 
     # for parallel group create a kafka entry
     # for each non parallel group item create a kafka entry
-    for tg in selected_tag_map:
-        parallel_set, sequential_set = selected_tag_map[tg]
+    # items are published longest first, a free test runner pulls the next one
+    for item in plan_items:
         witem = Queue()
-        witem.put(parallel_set)
-        witem.tag = tg
-        witem.parallel = True
-        witem.targets = targets
-        set_t = parallel_set if len(parallel_set) else sequential_set
-        witem.tickets = test_map[next(iter(set_t))][-1]
+        witem.put(set(item.tests) if item.parallel else item.tests)
+        witem.tag = item.tag
+        witem.parallel = item.parallel
+        # Items of an exclusive group are locked on the same target one after another.
+        witem.targets = [item.target] if item.exclusive else targets
+        witem.tickets = test_map[item.tests[0]][-1]
         witem.build = opts.build
         witem.build_type = opts.build_type
         witem.test_plan = test_plan
         work_queue.put(witem)
-        for set_item in sequential_set:
-            w_item = Queue()
-            w_item.put([set_item])
-            w_item.tag = tg
-            w_item.parallel = False
-            w_item.targets = targets
-            w_item.tickets = test_map[set_item][-1]
-            w_item.build = opts.build
-            w_item.build_type = opts.build_type
-            w_item.test_plan = test_plan
-            work_queue.put(w_item)
     work_queue.put(None)  # poison
     work_queue.join()
     _producer.join()
 
 
+def plan_execution(opts, selected_tag_map: Dict, test_map: Dict, log_home: str) -> List:
+    """Plan work items longest first on targets as per durations of earlier executions."""
+    history = test_scheduler.DurationHistory(opts.duration_cache)
+    test_ids = [test for sets in selected_tag_map.values() for _set in sets for test in _set]
+    db_user, db_pwd = runner.get_db_credential()
+    history.fetch(test_ids, db_user, db_pwd)
+    exclusive_map = dict()
+    for test in test_ids:
+        for mark in test_map[test][2]:
+            if mark in opts.exclusive_marks:
+                exclusive_map[test] = mark
+                break
+    ticket_map = {test: test_map[test][3] for test in test_ids}
+    items = test_scheduler.build_items(selected_tag_map, history, exclusive_map, ticket_map)
+    items = test_scheduler.plan_lpt(items, opts.targets)
+    test_scheduler.save_plan(items, opts.targets, os.path.join(log_home, 'execution_plan.json'),
+                             test_plan=opts.test_plan, build=opts.build,
+                             build_type=opts.build_type)
+    for item in items:
+        LOGGER.info("Planned %s %s tests of %s on %s at %.0fs for %.0fs", len(item.tests),
+                    "parallel" if item.parallel else "sequential", item.tag, item.target,
+                    item.start, item.duration)
+    return items
+
+
+def report_makespan(opts) -> dict:
+    """Report predicted vs actual makespan of a saved execution plan and update durations."""
+    plan = config_utils.read_content_json(opts.makespan_report)
+    test_ids = [test for item in plan['items'] for test in item['tests']]
+    db_user, db_pwd = runner.get_db_credential()
+    records = test_scheduler.search_executions(test_ids, db_user, db_pwd,
+                                               testPlanID=plan['test_plan'],
+                                               buildNo=str(plan['build']))
+    if records is None:
+        raise RunnerException("Failed to get test executions of the plan")
+    report = test_scheduler.makespan_report(plan, records)
+    history = test_scheduler.DurationHistory(opts.duration_cache)
+    for record in records:
+        if record.get('testExecutionTime'):
+            history.add(record['testID'], record['testExecutionTime'],
+                        record.get('testStartTime', ''))
+    history.save()
+    report_path = os.path.splitext(opts.makespan_report)[0] + '_report.json'
+    with open(report_path, 'w') as fptr:
+        json.dump(report, fptr, indent=2)
+    LOGGER.info("Predicted makespan %s s, actual makespan %s s, report saved to %s",
+                report['predicted_makespan'], report['actual_makespan'], report_path)
+    return report
+
+
 def develop_execution_plan(rev_tag_map, selected_tag_map, skip_test, test_map, tickets):
     """Develop Test execution plan to be followed by test runners."""
     for ticket in tickets:
@@ -282,7 +334,7 @@ def create_test_map(base_components_marks: Tuple,
                     meta_data: Dict,
                     rev_tag_map: Dict,
                     skip_marks: Dict,
-                    skip_test: List,
+                    skip_test: Set,
                     test_map: Dict,
                     internal_skip_marks: Tuple) -> None:
     """Create a test metadata dict and tag reverse dict."""
@@ -294,7 +346,7 @@ def create_test_map(base_components_marks: Tuple,
         parent_marks = list()
         for mark in test_meta.get('marks'):
             if mark in ('skip',):
-                skip_test.append(tid)
+                skip_test.add(tid)
                 break
         parallel = False
         for mark in test_meta.get('marks'):
@@ -422,7 +474,10 @@ def main(argv=None):
 
     try:
         opts = parse_args(argv)
-        run(opts)
+        if opts.makespan_report:
+            report_makespan(opts)
+        else:
+            run(opts)
     except RunnerException as fault:
         indent = len(program_name) * " "
         sys.stderr.write(program_name + ": " + "\n")
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Pool of logged in interactive CORTX CLI sessions.
+
+Opening ssh connection and logging in to cortxcli takes longer than most of the CLI commands.
+Sessions are kept logged in per (host, ssh user, cli user) and reused by the CLI libraries,
+a session idle for longer than idle_timeout is logged in again as CLI session may expire.
+Idle sessions of the shared pool are logged out at interpreter exit.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from commons.exceptions import CTException
+import commons.errorcodes as err
+from libs.csm.cli.cortx_cli import CortxCli
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CliSessionPool:
+    """Warm logged in CORTX CLI sessions keyed by host, ssh user and cli user."""
+
+    __instance = None
+    __lock = threading.Lock()
+
+    def __init__(self, max_sessions_per_key: int = 8, idle_timeout: int = 600):
+        """
+        Initialize session pool, use get_instance to get the shared pool.
+
+        :param max_sessions_per_key: Maximum sessions logged in as same cli user on a host.
+        :param idle_timeout: Seconds after which an idle session is logged in again.
+        """
+        self.max_sessions_per_key = max_sessions_per_key
+        self.idle_timeout = idle_timeout
+        self._cond = threading.Condition()
+        self._idle = {}
+        self._count = {}
+
+    @classmethod
+    def get_instance(cls):
+        """Get shared session pool instance, idle sessions are closed at exit."""
+        if cls.__instance is None:
+            with cls.__lock:
+                if cls.__instance is None:
+                    instance = cls()
+                    atexit.register(instance.close_all)
+                    cls.__instance = instance
+        return cls.__instance
+
+    @staticmethod
+    def _login(host, ssh_user, ssh_password, cli_user, cli_password) -> CortxCli:
+        """Open connection and login to CORTX CLI."""
+        client = CortxCli(host=host, username=ssh_user, password=ssh_password)
+        client.open_connection()
+        resp = client.login_cortx_cli(username=cli_user, password=cli_password)
+        if not resp[0]:
+            client.close_connection(set_session_obj_none=True)
+            raise CTException(err.CLI_ERROR, f"CORTX CLI login failed for {cli_user}: "
+                                             f"{resp[1]}")
+        return client
+
+    # pylint: disable=too-many-arguments
+    def acquire(self, host: str, ssh_user: str, ssh_password: str, cli_user: str = None,
+                cli_password: str = None, timeout: int = 600) -> CortxCli:
+        """
+        Get logged in session, waits if max sessions of the key are in use.
+
+        :param host: host/ip of CSM server.
+        :param ssh_user: ssh user name.
+        :param ssh_password: ssh password.
+        :param cli_user: CLI user name, csm admin if None.
+        :param cli_password: CLI user password.
+        :param timeout: Seconds to wait for a free session.
+        :return: CortxCli object with logged in session.
+        """
+        key = (host, ssh_user, cli_user)
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                idle = self._idle.setdefault(key, [])
+                if idle:
+                    client, last_used = idle.pop()
+                    break
+                if self._count.get(key, 0) < self.max_sessions_per_key:
+                    self._count[key] = self._count.get(key, 0) + 1
+                    client, last_used = None, None
+                    break
+                if not self._cond.wait(max(0, deadline - time.time())):
+                    raise TimeoutError(f"No free CORTX CLI session for {key}")
+        try:
+            if client and time.time() - last_used > self.idle_timeout:
+                LOGGER.debug("Session of %s idle for %ss, logging in again", key,
+                             int(time.time() - last_used))
+                client.close_connection(set_session_obj_none=True)
+                client = None
+            if client is None:
+                client = self._login(host, ssh_user, ssh_password, cli_user, cli_password)
+        except Exception:
+            self._discard(key)
+            raise
+        return client
+
+    def release(self, client: CortxCli, cli_user: str = None, healthy: bool = True):
+        """
+        Return session to the pool.
+
+        :param client: Session returned by acquire.
+        :param cli_user: CLI user used for acquire.
+        :param healthy: False to close the session e.g. after timeout in a command.
+        """
+        key = (client.host, client.username, cli_user)
+        if not healthy:
+            try:
+                client.close_connection(set_session_obj_none=True)
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.debug("Error closing CLI session: %s", error)
+            self._discard(key)
+            return
+        with self._cond:
+            self._idle.setdefault(key, []).append((client, time.time()))
+            self._cond.notify()
+
+    def _discard(self, key):
+        """Free slot of a session which is closed."""
+        with self._cond:
+            self._count[key] = max(0, self._count.get(key, 0) - 1)
+            self._cond.notify()
+
+    # pylint: disable=too-many-arguments
+    @contextmanager
+    def session(self, host: str, ssh_user: str, ssh_password: str, cli_user: str = None,
+                cli_password: str = None):
+        """Logged in session for the duration of the context, see acquire."""
+        client = self.acquire(host, ssh_user, ssh_password, cli_user, cli_password)
+        healthy = False
+        try:
+            yield client
+            healthy = True
+        finally:
+            self.release(client, cli_user, healthy=healthy)
+
+    def close_all(self) -> int:
+        """
+        Logout and close idle sessions.
+
+        :return: Number of sessions closed.
+        """
+        with self._cond:
+            idle, self._idle = self._idle, {}
+            for key, sessions in idle.items():
+                self._count[key] = max(0, self._count.get(key, 0) - len(sessions))
+            self._cond.notify_all()
+        closed = 0
+        for sessions in idle.values():
+            for client, _ in sessions:
+                try:
+                    client.logout_cortx_cli()
+                    client.close_connection(set_session_obj_none=True)
+                except Exception as error:  # pylint: disable=broad-except
+                    LOGGER.debug("Error closing CLI session: %s", error)
+                closed += 1
+        LOGGER.info("Closed %s CORTX CLI sessions", closed)
+        return closed
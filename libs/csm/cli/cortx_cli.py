@@ -24,6 +24,8 @@ across all other libraries and test suites
 import platform
 import logging
 import json
+import re
+from contextlib import contextmanager
 import xmltodict
 
 try:
@@ -92,11 +94,20 @@ class CortxCli(CortxCliClient):
                 "usage:",
                 "command not found"]
             default_patterns.extend(patterns)
+            prompt_index = None
+            if self.cli_prompt:
+                # Return as soon as command completes instead of waiting for timeout.
+                prompt_index = len(default_patterns)
+                default_patterns.append(self.cli_prompt)
             self.log.debug("Default patterns : %s", default_patterns)
             index, output = super().execute_cli_commands(
                 cmd=cmd, patterns=default_patterns, time_out=time_out)
             if index in range(2):
                 return False, output
+            if index == prompt_index and not any(
+                    re.search(pattern, output) for pattern in patterns):
+                self.log.error("Prompt returned without expected response %s", patterns)
+                return False, output
             return True, output
         except redexpect.exceptions.ExpectTimeout as error:
             self.log.debug(
@@ -150,6 +161,7 @@ class CortxCli(CortxCliClient):
                 if "CORTX Interactive Shell" in output:
                     self.log.info(
                         "Logged in CORTX CLI as user %s successfully", username)
+                    self.detect_prompt()
                     return True, output
 
         return False, output
@@ -168,12 +180,32 @@ class CortxCli(CortxCliClient):
                 cmd=commands.CMD_LOGOUT_CORTXCLI,
                 patterns=["Successfully logged out"])[1]
             if "Successfully logged out" in output:
+                self.cli_prompt = None
                 return True, output
 
         self.log.info("Response returned: \n%s", output)
 
         return False, output
 
+    @contextmanager
+    def pooled_session(self, username: str = None, password: str = None):
+        """
+        Use warm logged in CORTX CLI session of the pool for the duration of the context
+        Session is returned to the pool instead of logging out and closing connection.
+        :param str username: CLI user name, csm admin if None
+        :param str password: CLI user password
+        """
+        # pylint: disable=import-outside-toplevel
+        from libs.csm.cli.cli_session_pool import CliSessionPool
+        saved = self.session_obj, self.cli_prompt
+        with CliSessionPool.get_instance().session(
+                self.host, self.username, self.password, username, password) as client:
+            self.session_obj, self.cli_prompt = client.session_obj, client.cli_prompt
+            try:
+                yield self
+            finally:
+                self.session_obj, self.cli_prompt = saved
+
     def format_str_to_dict(self, input_str: str) -> dict:
         """
         This function will convert the given string into dictionary.
@@ -20,6 +20,7 @@
 
 import platform
 import logging
+import re
 
 try:
     if platform.system() == "Linux":
@@ -56,6 +57,8 @@ class CortxCliClient:
         self.port = kwargs.get("port", 22)
         self.expect_timeout = kwargs.get("expect_timeout", 300)
         self.host_obj = None
+        # Anchored regex of the prompt of logged in interactive cli, see detect_prompt.
+        self.cli_prompt = kwargs.get("cli_prompt", None)
 
     def open_connection(self):
         """
@@ -92,6 +95,54 @@ class CortxCliClient:
 
         return index, output
 
+    def detect_prompt(self, time_out: int = 60) -> str:
+        """
+        Capture prompt of the current interactive shell and anchor it to end of output
+        Prompt line is read after sending an empty line, commands completed are then detected
+        with this exact prompt instead of generic pattern lists.
+        :param int time_out: time to wait for the prompt
+        :return: anchored prompt regex
+        """
+        self.session_obj.send("\n")
+        self.session_obj.expect(re_strings=[r"\n[^\n]*[\$#>:]\s*$"], timeout=time_out)
+        lines = [line for line in self.session_obj.current_output.splitlines() if line.strip()]
+        self.cli_prompt = r"(?:^|\n)" + re.escape(lines[-1].strip()) + r"\s*$"
+        self.log.debug("Detected prompt: %s", self.cli_prompt)
+        return self.cli_prompt
+
+    def _split_on_prompt(self, output: str, count: int) -> list:
+        """Split output of pipelined commands on prompt, command echo is removed."""
+        prompt = self.cli_prompt[len(r"(?:^|\n)"):-len(r"\s*$")]
+        parts = re.split(r"\n?" + prompt + r"[ \t]*", output)[:count]
+        return [part.split("\n", 1)[1] if "\n" in part else "" for part in parts]
+
+    def execute_until_prompt(self, cmd: str, time_out: int = 300) -> str:
+        """
+        Execute command and wait till prompt is back
+        :param str cmd: command to execute on shell
+        :param int time_out: time to wait for command execution output
+        :return: output of executed command
+        """
+        return self.execute_batch([cmd], time_out=time_out)[0]
+
+    def execute_batch(self, cmds: list, time_out: int = 300) -> list:
+        """
+        Send commands together and wait till prompt is back for all of them.
+        Commands reading passwords can not be pipelined as password input is flushed.
+        :param list cmds: commands which do not prompt for input
+        :param int time_out: time to wait for all the commands
+        :return: list of output of each command
+        """
+        if not self.cli_prompt:
+            self.detect_prompt()
+        prompt = self.cli_prompt[len(r"(?:^|\n)"):-len(r"\s*$")]
+        self.log.info("Sending %s commands: %s", len(cmds), cmds)
+        self.session_obj.send("".join(f"{cmd}\n" for cmd in cmds))
+        # All the prompts should be in output of single expect as extra output is not retained.
+        pattern = "".join([prompt + r"[\s\S]*?"] * (len(cmds) - 1)) + prompt + r"\s*$"
+        self.session_obj.expect(re_strings=[pattern], timeout=time_out)
+        return self._split_on_prompt(self.session_obj.current_output, len(cmds))
+
     def close_connection(self, set_session_obj_none: bool = False):
         """
         This function will close the ssh connection created in init
@@ -101,4 +152,5 @@ class CortxCliClient:
         self.session_obj.exit()
         if set_session_obj_none:
             self.session_obj = None
+            self.cli_prompt = None
         self.log.debug("Closed ssh connection with host %s", self.host)
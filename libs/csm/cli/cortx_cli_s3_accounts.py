@@ -21,6 +21,7 @@ This library contains methods for S3 Account operations using CORTX CLI
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 from commons import commands
 from libs.csm.cli.cortx_cli import CortxCli
@@ -76,6 +77,34 @@ class CortxCliS3AccountOperations(CortxCli):
 
         return False, response
 
+    def create_s3accounts_cortx_cli(self, accounts: list, workers: int = 4) -> dict:
+        """
+        This function will create s3 accounts concurrently on warm pooled CORTX CLI sessions.
+        :param list accounts: list of (account_name, account_email, password)
+        :param int workers: number of CLI sessions used
+        :return: dict of account name to (True/False, response)
+        """
+        def create_chunk(chunk):
+            cli_obj = CortxCliS3AccountOperations()
+            cli_obj.host, cli_obj.username, cli_obj.password = \
+                self.host, self.username, self.password
+            result = {}
+            with cli_obj.pooled_session():
+                for account_name, account_email, password in chunk:
+                    result[account_name] = cli_obj.create_s3account_cortx_cli(
+                        account_name, account_email, password)
+            return result
+
+        workers = max(1, min(workers, len(accounts)))
+        responses = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cli") as executor:
+            for result in executor.map(create_chunk, [accounts[idx::workers]
+                                                      for idx in range(workers)]):
+                responses.update(result)
+        LOGGER.info("Created %s/%s s3 accounts", sum(resp[0] for resp in responses.values()),
+                    len(accounts))
+        return responses
+
     def show_s3account_cortx_cli(self, output_format: str = None) -> tuple:
         """
         This function will list all S3 accounts using CORTX CLI
@@ -20,6 +20,7 @@
 """ Library for IAM users operations """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 from libs.csm.cli.cortx_cli import CortxCli
 from commons.commands import CREATE_IAM_USER, DELETE_IAM_USER, \
@@ -77,6 +78,39 @@ class CortxCliIamUser(CortxCli):
 
         return False, output
 
+    # pylint: disable=too-many-arguments
+    def create_iam_users(self, account_name: str, account_password: str, users: list,
+                         workers: int = 4) -> dict:
+        """
+        This function will create IAM users concurrently on warm pooled CORTX CLI sessions
+        logged in as the s3 account.
+        :param account_name: s3 account name
+        :param account_password: s3 account password
+        :param users: list of (user_name, password)
+        :param workers: number of CLI sessions used
+        :return: dict of user name to (Boolean/Response)
+        """
+        def create_chunk(chunk):
+            cli_obj = CortxCliIamUser()
+            cli_obj.host, cli_obj.username, cli_obj.password = \
+                self.host, self.username, self.password
+            result = {}
+            with cli_obj.pooled_session(account_name, account_password):
+                for user_name, password in chunk:
+                    result[user_name] = cli_obj.create_iam_user(
+                        user_name=user_name, password=password, confirm_password=password)
+            return result
+
+        workers = max(1, min(workers, len(users)))
+        responses = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cli") as executor:
+            for result in executor.map(create_chunk, [users[idx::workers]
+                                                      for idx in range(workers)]):
+                responses.update(result)
+        LOG.info("Created %s/%s IAM users", sum(resp[0] for resp in responses.values()),
+                 len(users))
+        return responses
+
     def list_iam_user(self, output_format: str = None,
                       help_param: bool = False) -> Tuple[bool, str]:
         """
@@ -0,0 +1,187 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Incremental tracker of data written and its placement for degraded capacity tests.
+
+Bytes written and pods which were online while writing are kept in preallocated columnar
+numpy buffers, expected healthy/degraded/critical/damaged bytes for a failure pattern are
+computed with a single matrix product. Object checksums are collected in background and
+flushed before the next fault is injected.
+"""
+import logging
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from libs.s3 import s3_misc
+
+LOGGER = logging.getLogger(__name__)
+
+# Columns of DataFrame based tracking which are not deployments.
+META_COLUMNS = ("data_written", "csum", "obj", "bucket", "akey", "skey")
+CAPACITY_STATES = ("healthy", "degraded", "critical", "damaged")
+
+
+# pylint: disable=too-many-instance-attributes
+class CapacityTracker:
+    """Columnar tracker of written data, placement and checksums."""
+
+    def __init__(self, deploy_list: list, capacity: int = 1024, checksum_workers: int = 8):
+        """
+        Init method.
+
+        :param deploy_list: Data pod deployments on which data can be placed.
+        :param capacity: Initial number of rows, buffers grow by doubling.
+        :param checksum_workers: Threads collecting object checksums.
+        """
+        self.deploy_list = list(deploy_list)
+        self._deploy_index = {deploy: idx for idx, deploy in enumerate(self.deploy_list)}
+        self.size = 0
+        self.data_written = np.zeros(capacity, dtype=np.int64)
+        self.placement = np.zeros((capacity, len(self.deploy_list)), dtype=np.bool_)
+        self.objects = []
+        self._checksums = {}
+        self._executor = ThreadPoolExecutor(max_workers=checksum_workers,
+                                            thread_name_prefix="csum")
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        """Double the buffers."""
+        capacity = max(1, len(self.data_written)) * 2
+        data_written = np.zeros(capacity, dtype=np.int64)
+        data_written[:self.size] = self.data_written[:self.size]
+        placement = np.zeros((capacity, len(self.deploy_list)), dtype=np.bool_)
+        placement[:self.size] = self.placement[:self.size]
+        self.data_written, self.placement = data_written, placement
+
+    def failed_mask(self, failed_pod: list) -> np.ndarray:
+        """Boolean mask of failed deployments."""
+        mask = np.zeros(len(self.deploy_list), dtype=np.bool_)
+        for deploy in failed_pod:
+            if deploy in self._deploy_index:
+                mask[self._deploy_index[deploy]] = True
+        return mask
+
+    # pylint: disable=too-many-arguments
+    def add(self, failed_pod: list, data_written: int, obj: str = "NA", bucket: str = "NA",
+            akey: str = "NA", skey: str = "NA") -> int:
+        """
+        Add a write, data is placed on deployments which are not failed.
+
+        :param failed_pod: Deployments failed during the write.
+        :param data_written: Bytes written.
+        :param obj: Object name, checksum is collected in background if given.
+        :return: row index.
+        """
+        if self.size == len(self.data_written):
+            self._grow()
+        row = self.size
+        self.data_written[row] = data_written
+        self.placement[row] = ~self.failed_mask(failed_pod)
+        self.objects.append((obj, bucket, akey, skey))
+        if obj != "NA":
+            self._checksums[row] = self._executor.submit(
+                s3_misc.get_object_checksum, obj, bucket, akey, skey)
+        self.size += 1
+        return row
+
+    def expected_bytecount(self, failed_pod: list, kvalue: int) -> dict:
+        """
+        Expected bytes in each capacity state for the failure pattern.
+
+        :param failed_pod: Failed deployments.
+        :param kvalue: Parity count.
+        :return: dict of healthy, degraded, critical and damaged bytes.
+        """
+        corrupt_shards = self.placement[:self.size].astype(np.int32) @ \
+            self.failed_mask(failed_pod).astype(np.int32)
+        state = np.select([corrupt_shards == 0, corrupt_shards < kvalue,
+                           corrupt_shards == kvalue], [0, 1, 2], default=3)
+        totals = np.bincount(state, weights=self.data_written[:self.size],
+                             minlength=len(CAPACITY_STATES))
+        return {name: int(total) for name, total in zip(CAPACITY_STATES, totals)}
+
+    def flush(self):
+        """Wait for checksums being collected, errors of the checksum reads are raised."""
+        for future in list(self._checksums.values()):
+            future.result()
+
+    def checksum(self, row: int):
+        """Checksum collected while writing, None if row has no object."""
+        future = self._checksums.get(row)
+        return future.result() if future else None
+
+    def verify_checksums(self) -> tuple:
+        """
+        Compare collected checksums with the current content of objects concurrently.
+
+        :return: (True if all match, list of mismatched (obj, bucket)).
+        """
+        futures = {row: self._executor.submit(s3_misc.get_object_checksum, *self.objects[row])
+                   for row in self._checksums}
+        mismatches = []
+        for row, future in futures.items():
+            expected, actual = self.checksum(row), future.result()
+            if expected != actual:
+                mismatches.append(self.objects[row][:2])
+                LOGGER.error("Check for %s object in %s bucket incorrect.",
+                             *self.objects[row][:2])
+        LOGGER.info("Checksum verified for %s objects, %s mismatches", len(futures),
+                    len(mismatches))
+        return not mismatches, mismatches
+
+    @classmethod
+    def from_frame(cls, cap_df):
+        """Create tracker from DataFrame used by append_df earlier."""
+        deploy_list = [col for col in cap_df.columns if col not in META_COLUMNS]
+        tracker = cls(deploy_list, capacity=max(len(cap_df.index), 1))
+        for _, row in cap_df.iterrows():
+            failed = [deploy for deploy in deploy_list if not row[deploy]]
+            tracker.add(failed, row.get("data_written", 0))
+            obj = row.get("obj", "NA")
+            tracker.objects[-1] = (obj, row.get("bucket", "NA"), row.get("akey", "NA"),
+                                   row.get("skey", "NA"))
+            if obj != "NA":
+                future = Future()
+                future.set_result(row.get("csum"))
+                tracker._checksums[tracker.size - 1] = future
+        return tracker
+
+    def summary(self) -> dict:
+        """Rows, total bytes written and checksums still being collected."""
+        return {"rows": self.size, "total": int(self.data_written[:self.size].sum()),
+                "pending_checksums": sum(not fut.done() for fut in self._checksums.values())}
+
+    def to_string(self) -> str:
+        """Summary used in logs instead of the whole table."""
+        return str(self.summary())
+
+    def close(self):
+        """Stop checksum workers."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -18,16 +18,144 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 """Test library for audit logs."""
+import hashlib
+import io
+import json
+import os
 import re
 import tarfile
-from pathlib import Path
-import os
-import shutil
+from collections import deque
 import commons.errorcodes as err
 from commons.exceptions import CTException
 from commons.constants import Rest as const
 from libs.csm.rest.csm_rest_test_lib import RestTestLib
 
+# request_id of a downloaded line which is not JSON e.g. key value or python repr format.
+REQUEST_ID_PATTERN = re.compile(r"""request_id['"]?\s*[:=]\s*['"]?([^'",\s}]+)""")
+
+
+def _record_keys(record):
+    """
+    Hash keys of an audit record, shown record (dict) and downloaded line (str) of the same
+    entry have at least one common key. Line which is not JSON is keyed by itself and by its
+    request_id if found.
+
+    :param record: dict from show api or line from downloaded file.
+    :return: list of 8 byte digests.
+    """
+    if isinstance(record, str):
+        line = record.strip()
+        try:
+            record = json.loads(line)
+        except ValueError:
+            keys = [hashlib.blake2b(line.encode(), digest_size=8).digest()]
+            match = REQUEST_ID_PATTERN.search(line)
+            if match:
+                keys.append(hashlib.blake2b(match.group(1).encode(), digest_size=8).digest())
+            return keys
+    if not isinstance(record, dict):
+        record = {"line": record}
+    keys = [hashlib.blake2b(json.dumps(record, sort_keys=True).encode(),
+                            digest_size=8).digest()]
+    if record.get("request_id"):
+        keys.append(hashlib.blake2b(str(record["request_id"]).encode(),
+                                    digest_size=8).digest())
+    return keys
+
+
+class _ResponseStream(io.RawIOBase):
+    """Read only file object over chunks of a streamed http response."""
+
+    def __init__(self, response, chunk_size=1024 * 1024):
+        super().__init__()
+        self._chunks = response.iter_content(chunk_size=chunk_size)
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b""
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class AuditLogMatcher:
+    """Match streamed audit log lines against shown records with hash keyed index."""
+
+    def __init__(self, show_logs, boundary=2, max_samples=20):
+        """
+        :param show_logs: logs from audit log show api response
+        :param boundary: records at each end of the time window allowed to be missing
+        :param max_samples: mismatched entries kept in report
+        """
+        self.show_logs = show_logs
+        self.boundary = boundary
+        self.max_samples = max_samples
+        self.index = {}
+        for pos, record in enumerate(show_logs):
+            for key in _record_keys(record):
+                self.index.setdefault(key, deque()).append(pos)
+        self.matched = bytearray(len(show_logs))
+        self.total_downloaded = 0
+        self.unmatched_downloaded = 0
+        self.samples = []
+        # Unmatched line numbers near the end, tolerated once total is known.
+        self._tail = deque(maxlen=boundary)
+        self._tolerated = 0
+
+    def add(self, line):
+        """
+        Match a downloaded line, matched shown record is consumed.
+
+        :param line: line from downloaded file
+        :return: True if matched
+        """
+        line_no = self.total_downloaded
+        self.total_downloaded += 1
+        for key in _record_keys(line):
+            positions = self.index.get(key)
+            while positions and self.matched[positions[0]]:
+                positions.popleft()
+            if positions:
+                self.matched[positions.popleft()] = 1
+                return True
+        self.unmatched_downloaded += 1
+        if line_no < self.boundary:
+            self._tolerated += 1
+        elif self.boundary:
+            self._tail.append(line_no)
+        if len(self.samples) < self.max_samples:
+            self.samples.append((line_no, line.strip()[:500]))
+        return False
+
+    def report(self):
+        """
+        Mismatch report, records at boundary positions of both sides are tolerated.
+
+        :return: dict with match status and mismatched samples
+        """
+        total_shown = len(self.show_logs)
+        unmatched_shown = [pos for pos in range(total_shown) if not self.matched[pos]]
+        shown_errors = [pos for pos in unmatched_shown
+                        if self.boundary <= pos < total_shown - self.boundary]
+        tolerated = self._tolerated + sum(
+            1 for line_no in self._tail if line_no >= self.total_downloaded - self.boundary)
+        download_errors = self.unmatched_downloaded - tolerated
+        return {"status": not shown_errors and not download_errors,
+                "total_shown": total_shown, "total_downloaded": self.total_downloaded,
+                "unmatched_shown": len(unmatched_shown),
+                "unmatched_downloaded": self.unmatched_downloaded,
+                "shown_mismatches": [self.show_logs[pos]
+                                     for pos in shown_errors[:self.max_samples]],
+                "downloaded_mismatches": self.samples}
+
 
 class RestAuditLogs(RestTestLib):
     """RestAuditLogs contains all the Rest Api calls for audit logs operations"""
@@ -145,12 +273,13 @@ class RestAuditLogs(RestTestLib):
                 error) from error
 
     @RestTestLib.authenticate_and_login
-    def audit_logs_csm_download(self, params, invalid_component=False):
+    def audit_logs_csm_download(self, params, invalid_component=False, stream=False):
         """
         This method will download csm audit logs
         :param params: parameters for rest call(dictonary)
         :param invalid_component: invalid component
         possible values (True/False)
+        :param stream: do not read response body, to be verified while streaming
         :return: download csm audit rest call response
         """
         try:
@@ -169,7 +298,8 @@ class RestAuditLogs(RestTestLib):
             return self.restapi.rest_call("get",
                                           endpoint=endpoint,
                                           headers=self.headers,
-                                          params=params)
+                                          params=params,
+                                          stream=stream)
         except BaseException as error:
             self.log.error("%s %s: %s",
                            const.EXCEPTION_ERROR,
@@ -499,10 +629,11 @@ class RestAuditLogs(RestTestLib):
                 error) from error
 
     @RestTestLib.authenticate_and_login
-    def audit_logs_s3_download(self, params):
+    def audit_logs_s3_download(self, params, stream=False):
         """
         This method will download s3 audit logs
         :param params: parameters for rest call(dictonary)
+        :param stream: do not read response body, to be verified while streaming
         :return: download s3 audit rest call response
         """
         try:
@@ -517,7 +648,8 @@ class RestAuditLogs(RestTestLib):
             return self.restapi.rest_call("get",
                                           endpoint=endpoint,
                                           headers=self.headers,
-                                          params=params)
+                                          params=params,
+                                          stream=stream)
         except BaseException as error:
             self.log.error("%s %s: %s",
                            const.EXCEPTION_ERROR,
@@ -572,178 +704,69 @@ class RestAuditLogs(RestTestLib):
                 err.CSM_REST_VERIFICATION_FAILED,
                 error) from error
 
-    # pylint: disable-msg=too-many-branches
-    # pylint: disable=too-many-locals
-    # pylint: disable=too-many-statements
-    # pylint: disable-msg=too-many-return-statements
-    def verify_audit_logs_show_download(self, audit_log_show_response, audit_log_download_response):
+    def verify_audit_logs_show_download(self, audit_log_show_response, audit_log_download_response,
+                                        boundary=2):
         """
         This function will verify the audit log show and audit log download contents match
+        Downloaded tar is read as a stream from the response and its lines are matched with
+        an index of the show records, so memory is bounded by the show response.
+        Download response should be requested with stream=True for large windows, it is closed
+        once verified.
         :param audit_log_show_response: response returned from audit logs show api
         :type audit_log_show_response: api response
-        :param audit_log_download_response: response returned from audit logs show api
+        :param audit_log_download_response: response returned from audit logs download api
         :type audit_log_download_response: api response
+        :param boundary: records at each end of the time window allowed to mismatch
         :return: True/False
         :rtype: bool
         """
         try:
             self.log.info(
                 "Reading the file name from the audit log download api response")
-            filename = []
             cndp = audit_log_download_response.headers.get('content-disposition')
-            if not cndp:
-                self.log.info("No file to download")
-                return False
-            else:
-                filename = re.findall('filename=(.+)', cndp)
+            filename = re.findall('filename=(.+)', cndp) if cndp else []
             if len(filename) == 0:
                 self.log.info("No file to download")
                 return False
+            filename = filename[0].strip('\"')
+            self.log.info("The filename is : %s", filename)
+            base = os.path.splitext(os.path.splitext(os.path.basename(filename))[0])[0]
+            extract_file = f"{base}.txt"
+            self.log.info("File to be verified is :%s", extract_file)
+
+            show_logs = audit_log_show_response.json()
+            self.log.info("audit_log_show_response total_records is: %s",
+                          show_logs['total_records'])
+            matcher = AuditLogMatcher(show_logs['logs'], boundary=boundary)
+            found = False
+            with tarfile.open(fileobj=_ResponseStream(audit_log_download_response),
+                              mode="r|*") as downloaded_tar_file:
+                for member in downloaded_tar_file:
+                    if not member.isfile() or os.path.normpath(member.name) != extract_file:
+                        continue
+                    found = True
+                    self.log.info("Verifying %s from downloaded tar", member.name)
+                    for line in downloaded_tar_file.extractfile(member):
+                        line = line.decode("utf-8", errors="replace")
+                        if line.strip():
+                            matcher.add(line)
+                    break
+            if not found:
+                self.log.error("%s not found in downloaded file %s", extract_file, filename)
+                return False
 
-            filename[0] = filename[0].strip('\"')
-            self.log.info("The filename is : %s", filename[0])
-
-            self.log.info("Downloading the tar file to tempdownload folder")
-            download_folder_path = f"{Path.home()}/tempdownload"
-            if not os.path.exists(download_folder_path):
-                os.mkdir(download_folder_path)
-            file_path = f"{download_folder_path}/{filename[0]}"
-            file_obj = open(file_path, 'wb')
-            file_obj.write(audit_log_download_response.content)
-            file_obj.close()
-
-            self.log.info(
-                "Path to the downloaded file is: %s", file_path)
-
-            self.log.info("File that will be extracted will be txt file")
-            base = os.path.basename(file_path)
-            file_name = os.path.splitext(base)[0]
-            file_name = os.path.splitext(file_name)[0]
-            self.log.info(file_name)
-
-            extract_file = f"{file_name}.txt"
-            self.log.info("File to be extracted is :%s", extract_file)
-
-            self.log.info("Extracting the file")
-            downloaded_tar_file = tarfile.open(file_path)
-            downloaded_tar_file.extract(extract_file, download_folder_path)
-            downloaded_tar_file.close()
-
-            self.log.info("Reading the txt file content into a list")
-            text_file_path = f"{download_folder_path}/{extract_file}"
-            text_file = open(text_file_path, "r")
-            extracted_file_content = text_file.read().splitlines()
-            text_file.close()
-
-            self.log.info("audit_log_show_response.json() length is: %s",
-                          audit_log_show_response.json()['total_records'])
-            self.log.info("extracted_file_content length is: %s",
-                          len(extracted_file_content))
-
+            report = matcher.report()
+            self.log.info("extracted_file_content length is: %s", report["total_downloaded"])
             self.log.info(
                 "Comparing the contents of audit log show api and audit log download api response")
-            if audit_log_show_response.json()['total_records'] == len(extracted_file_content):
-                if audit_log_show_response.json() == extracted_file_content:
-                    self.log.info(
-                        "The audit log show api content and audit log download"
-                        " api content content match exactly! ")
-                    self.log.info(
-                        "Deleting the files and the temporary directory...")
-                    shutil.rmtree(download_folder_path)
-                    return True
-                else:
-                    self.log.info(
-                        "Ignoring the first 2 and that last 2 records from show"
-                        " api response and verifying if the remaining ones match")
-                    log_content = audit_log_show_response.json(
-                    )['logs'][2:audit_log_show_response.json()['total_records'] - 3]
-                    result = True
-                    for log_line in log_content:
-                        if log_line['request_id'] not in extracted_file_content:
-                            self.log.error("Couldnt find %s from json in downloaded file", log_line)
-                            result = False
-
-                    # if all(x in extracted_file_content for x in log_content):
-                    if result:
-                        self.log.info(
-                            "The audit log show api content and audit log"
-                            " download api content content match exactly! ")
-                        self.log.info(
-                            "Deleting the files and the temporary directory...")
-                        shutil.rmtree(download_folder_path)
-                        return True
-                    else:
-                        self.log.debug("Audit log show API response is: %s",
-                                       audit_log_show_response.json())
-                        self.log.debug("Audit log download API response is: %s",
-                                       extracted_file_content)
-                        self.log.error("Error: Logs did not match!!")
-                        self.log.info(
-                            "Deleting the files and the temporary directory...")
-                        shutil.rmtree(download_folder_path)
-                        return False
-            val = 0
-            if audit_log_show_response.json()['total_records'] != len(extracted_file_content):
-                if audit_log_show_response.json()['total_records'] > len(extracted_file_content):
-                    self.log.info(
-                        "The audit log show response content count is greater "
-                        "than audit log download content count. Comparing the "
-                        "content of audit log download with audit log show "
-                        "content ...")
-                    for i in range(0, len(extracted_file_content)):
-                        for j in range(0, audit_log_show_response.json()['total_records']):
-                            if extracted_file_content[i] == audit_log_show_response.json()[j]:
-                                val = i + 1
-                                break
-                    if (val == len(extracted_file_content) or
-                            val == audit_log_show_response.json()['total_records']):
-                        self.log.info(
-                            "The audit log download content match with the "
-                            "audit log show api content")
-                        self.log.info(
-                            "Deleting the files and the temporary directory...")
-                        shutil.rmtree(download_folder_path)
-                        return True
-                    else:
-                        self.log.debug("Audit log show API response is: %s",
-                                       audit_log_show_response.json())
-                        self.log.debug("Audit log download API response is: %s",
-                                       extracted_file_content)
-                        self.log.error("Error: Logs did not match!!")
-                        self.log.info(
-                            "Deleting the files and the temporary directory...")
-                        shutil.rmtree(download_folder_path)
-                        return False
-                if len(extracted_file_content) > audit_log_show_response.json()['total_records']:
-                    self.log.info(
-                        "The audit log download response content count is "
-                        "greater than audit log show content count. Comparing "
-                        "the content of audit log show with audit log download "
-                        "content ...")
-                    for i in range(0, audit_log_show_response.json()['total_records']):
-                        for j in range(0, len(extracted_file_content)):
-                            if extracted_file_content[j] == audit_log_show_response.json()[i]:
-                                val = i + 1
-                                break
-                    if (val == len(extracted_file_content) or
-                            val == audit_log_show_response.json()['total_records']):
-                        self.log.info(
-                            "The audit log show api content match with the "
-                            "audit log download api content")
-                        self.log.info(
-                            "Deleting the files and the temporary directory...")
-                        shutil.rmtree(download_folder_path)
-                        return True
-                    else:
-                        self.log.debug("Audit log show API response is: %s",
-                                       audit_log_show_response.json())
-                        self.log.debug("Audit log download API response is: %s",
-                                       extracted_file_content)
-                        self.log.error("Error: Logs did not match!!")
-                        self.log.info(
-                            "Deleting the files and the temporary directory...")
-                        shutil.rmtree(download_folder_path)
-                        return False
+            if report["status"]:
+                self.log.info(
+                    "The audit log show api content and audit log download"
+                    " api content content match! Unmatched boundary records show: %s "
+                    "download: %s", report["unmatched_shown"], report["unmatched_downloaded"])
+                return True
+            self.log.error("Error: Logs did not match!! %s", report)
+            return False
         except BaseException as error:
             self.log.error("%s %s: %s",
                            const.EXCEPTION_ERROR,
@@ -752,6 +775,8 @@ class RestAuditLogs(RestTestLib):
             raise CTException(
                 err.CSM_REST_VERIFICATION_FAILED,
                 error) from error
+        finally:
+            audit_log_download_response.close()
 
     def verify_csm_audit_logs_contents(self, response_log, str_search):
         """
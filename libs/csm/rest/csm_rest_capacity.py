@@ -30,8 +30,8 @@ from commons.exceptions import CTException
 from commons.helpers.pods_helper import LogicalNode
 from commons import commands
 from commons import constants
+from libs.csm.rest.capacity_tracker import CapacityTracker
 from libs.csm.rest.csm_rest_test_lib import RestTestLib
-from libs.s3 import s3_misc
 
 
 class SystemCapacity(RestTestLib):
@@ -293,100 +293,42 @@ class SystemCapacity(RestTestLib):
 
     def append_df(self, cap_df, failed_pod, data_written, obj = "NA", bucket = "NA", akey ="NA",
                   skey="NA"):
-        """Append the value to the data frame created in the test
+        """Append the write to the capacity tracker created in the test
+        Checksums are collected before returning, tests inject the next fault after this.
+        :param cap_df: CapacityTracker, DataFrame of earlier tests is converted to tracker
+        :return: CapacityTracker, caller closes it when done
         """
-        if obj == "NA":
-            csum = 0
-        else:
-            csum = s3_misc.get_object_checksum(obj, bucket, akey, skey)
-        new_row = {"data_written":data_written,
-                    "csum": csum,
-                    "obj": obj,
-                    "bucket": bucket,
-                    "akey": akey,
-                    "skey": skey}
-        deploy_list = list(cap_df.columns)
-        if "data_written" in deploy_list:
-            deploy_list.remove("data_written")
-        if "csum" in deploy_list:
-            deploy_list.remove("csum")
-        if "obj" in deploy_list:
-            deploy_list.remove("obj")
-        if "akey" in deploy_list:
-            deploy_list.remove("akey")
-        if "skey" in deploy_list:
-            deploy_list.remove("skey")
-        if "bucket" in deploy_list:
-            deploy_list.remove("bucket")
-        for deploy in deploy_list:
-            new_row[deploy] = not deploy in failed_pod
-        cap_df = cap_df.append(new_row, ignore_index=True)
-        self.log.info("%s", cap_df.to_string())
+        if not isinstance(cap_df, CapacityTracker):
+            cap_df = CapacityTracker.from_frame(cap_df)
+        cap_df.add(failed_pod, data_written, obj, bucket, akey, skey)
+        cap_df.flush()
+        self.log.debug("Capacity tracker : %s", cap_df.to_string())
         return cap_df
 
-    # pylint: disable=too-many-branches
     def verify_flexi_protection(self, resp, cap_df, failed_pod:list, kvalue:int, err_margin:int):
         """Check byte count based on flexible protection
         """
-        healthy=0
-        degraded=0
-        critical=0
-        damaged=0
-        host_list = cap_df.columns.values.tolist()
-        if "data_written" in host_list:
-            host_list.remove("data_written")
-        if "csum" in host_list:
-            host_list.remove("csum")
-        if "obj" in host_list:
-            host_list.remove("obj")
-        if "akey" in host_list:
-            host_list.remove("akey")
-        if "skey" in host_list:
-            host_list.remove("skey")
-        if "bucket" in host_list:
-            host_list.remove("bucket")
-        for row in cap_df.index:
-            written_on = []
-            for node in host_list:
-                if cap_df[node][row]:
-                    written_on.append(node)
-            corrupt_shards = len(set(written_on) & set(failed_pod))
-            if corrupt_shards == 0:
-                self.log.debug("Checking for %s less than to K value", corrupt_shards)
-                healthy += cap_df["data_written"][row]
-            elif corrupt_shards < kvalue:
-                self.log.debug("Checking for %s greater than to K value", corrupt_shards)
-                degraded += cap_df["data_written"][row]
-            elif corrupt_shards == kvalue:
-                self.log.debug("Checking for %s greater than to K value", corrupt_shards)
-                critical += cap_df["data_written"][row]
-            else:
-                self.log.debug("Checking for %s less than to K value", corrupt_shards)
-                damaged += cap_df["data_written"][row]
-
-        total_written = healthy + degraded + critical + damaged
-        result = self.verify_degraded_capacity(resp, healthy=healthy,
-        degraded=degraded, critical=critical, damaged=damaged, err_margin=err_margin,
-        total=total_written)
+        if not isinstance(cap_df, CapacityTracker):
+            with CapacityTracker.from_frame(cap_df) as tracker:
+                return self.verify_flexi_protection(resp, tracker, failed_pod, kvalue,
+                                                    err_margin)
+        expected = cap_df.expected_bytecount(failed_pod, kvalue)
+        self.log.info("Expected byte count for failed pods %s : %s", failed_pod, expected)
+        total_written = sum(expected.values())
+        result = self.verify_degraded_capacity(resp, healthy=expected["healthy"],
+        degraded=expected["degraded"], critical=expected["critical"],
+        damaged=expected["damaged"], err_margin=err_margin, total=total_written)
         return result
 
     def verify_checksum(self, cap_df):
-        """Verify checksum of all the data with dataframe
+        """Verify checksum of all the data with capacity tracker
         """
-        checksum_match = True
-        for row in cap_df.index:
-            obj = cap_df["obj"][row]
-            if obj != "NA":
-                bucket = cap_df["bucket"][row]
-                akey = cap_df["akey"][row]
-                skey = cap_df["skey"][row]
-                expected_csum = cap_df["csum"][row]
-                actual_csm = s3_misc.get_object_checksum(obj, bucket, akey, skey)
-                checksum_match = checksum_match and (expected_csum == actual_csm)
-                if checksum_match:
-                    self.log.info("Check for %s object in %s bucket correct.", obj, bucket)
-                else:
-                    self.log.error("Check for %s object in %s bucket incorrect.", obj, bucket)
+        if not isinstance(cap_df, CapacityTracker):
+            with CapacityTracker.from_frame(cap_df) as tracker:
+                return self.verify_checksum(tracker)
+        checksum_match, mismatches = cap_df.verify_checksums()
+        if not checksum_match:
+            self.log.error("Checksum mismatch for objects : %s", mismatches)
         return checksum_match
 
     def verify_bytecount_fixed_placement(self, resp, failure_cnt, kvalue, err_margin,
@@ -55,7 +55,7 @@ class RestClient:
     # pylint: disable=too-many-arguments
     def rest_call(self, request_type, endpoint=None,
                   data=None, headers=None, params=None, json_dict=None,
-                  save_json=False):
+                  save_json=False, stream=False):
         """
         This function will request REST methods like GET, POST ,PUT etc.
         :param request_type: get/post/delete/update etc
@@ -65,6 +65,7 @@ class RestClient:
         :param headers: headers required for REST call
         :param params: parameters required for REST call
         :param save_json: In case user required to store json file
+        :param stream: Do not read the response body, caller iterates over it
         :return: response of the request
         """
         # Building final endpoint request url
@@ -87,8 +88,10 @@ class RestClient:
         # Request a REST call
         response_object = self._request[request_type](
             request_url, headers=headers,
-            data=data, params=params, verify=False, json=json_dict)
+            data=data, params=params, verify=False, json=json_dict, stream=stream)
         self.log.debug("Response Object: %s", response_object)
+        if stream:
+            return response_object
         try:
             self.log.debug("Response JSON: %s", response_object.json())
         except BaseException:
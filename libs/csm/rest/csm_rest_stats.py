@@ -25,7 +25,6 @@ import datetime
 import math
 
 import dateutil.relativedelta
-from prometheus_client.parser import text_string_to_metric_families
 
 import commons.errorcodes as err
 from commons.constants import Rest as const
@@ -33,6 +32,9 @@ from commons.exceptions import CTException
 from commons.configmanager import get_config_wrapper
 from commons.utils.config_utils import read_yaml
 from libs.csm.rest.csm_rest_test_lib import RestTestLib
+from libs.csm.rest.metrics_snapshot import MetricsScraper
+from libs.csm.rest.metrics_snapshot import MetricsSnapshot
+from libs.csm.rest.metrics_snapshot import parse_metrics
 
 
 class SystemStats(RestTestLib):
@@ -255,6 +257,21 @@ class SystemStats(RestTestLib):
             raise CTException(
                 err.CSM_REST_VERIFICATION_FAILED, error) from error
 
+    def get_metrics_snapshot(self):
+        """
+        Read perf stats and parse them into indexed snapshot
+        :return MetricsSnapshot: snapshot of perf metrics
+        """
+        return MetricsSnapshot(self.get_perf_stats())
+
+    def start_metrics_scraper(self, interval=5):
+        """
+        Record perf stats snapshots in background, stop() returns the snapshots
+        :param int interval: seconds between scrapes
+        :return MetricsScraper: started scraper
+        """
+        return MetricsScraper(self.get_perf_stats, interval=interval).start()
+
     def validate_perf_metrics(self, text, value=None):
         """
         Validate perf metrics rest api output for all metrics names and value
@@ -263,20 +280,15 @@ class SystemStats(RestTestLib):
         :return True/False: If all metrics are present in text param with provided value
         """
         self.log.info("Validating perf metrics")
-        expected_values = const.PERF_STAT_METRICS
-        family = list(text_string_to_metric_families(text))
-        for item in family:
-            items = item.samples
-            for sample in items:
-                sample_value = sample.value
-                sample_name = sample.name
-                value_matched = True
-                if value and value != sample_value:
-                    value_matched = False
-                if sample_name in expected_values and value_matched:
-                    expected_values.remove(sample_name)
-                else:
-                    return False, sample_name
+        expected_values = list(const.PERF_STAT_METRICS)
+        for (sample_name, _), sample_value in parse_metrics(text).samples.items():
+            value_matched = True
+            if value and value != sample_value:
+                value_matched = False
+            if sample_name in expected_values and value_matched:
+                expected_values.remove(sample_name)
+            else:
+                return False, sample_name
         return len(expected_values) == 0, expected_values
 
     def check_prometheus_compatibility(self, text):
@@ -287,9 +299,8 @@ class SystemStats(RestTestLib):
         """
         self.log.info("Validating perf metrics format with prometheus format")
         try:
-            for family in text_string_to_metric_families(text):
-                for sample in family.samples:
-                    self.log.info("Name: {0} Labels: {1} Value: {2}".format(*sample))
+            snapshot = parse_metrics(text)
+            self.log.info("Parsed %s samples of metrics: %s", len(snapshot), snapshot.names())
             return True
         except BaseException as error:
             self.log.error("%s %s: %s",
@@ -300,35 +311,29 @@ class SystemStats(RestTestLib):
                 err.CSM_REST_VERIFICATION_FAILED, error) from error
 
     def perf_metric_name_value_compare(self, text, metric_name,
-                                       comparison=False, compare_value=None):
+                                       comparison=False, compare_value=None, **selector):
         """Read the metric_name, compare/no_compare the value
-        :param str text: metrics text format output of rest call
+        :param str text: metrics text format output of rest call, snapshot or response
         :param str metric_name: Name of metric
         :param boolean comparison: True when need to compare value
         :param float compare_value: Value for comparison
+        :param selector: label selector for the samples
         :return True/False: (comparison=True) If metrics name value is 10 percent comparable to \
                             provided value  OR
                 value : (comparison=False) Performance metric name average value
         """
         try:
             self.log.info("Reading the '%s' stats...", metric_name)
-            metric_value_list = []
-            for family in text_string_to_metric_families(text):
-                for sample in family.samples:
-                    res = f"Name={sample[0]}\nLabels={sample[1]}\n Value={sample[2]}"
-                    out = dict(item.split("=") for item in res.split("\n"))
-                    if out['Name'] == metric_name:
-                        metric_value_list.append(float(out[' Value']))
-            self.log.info("Metric value list for '%s' is : %s", metric_name, metric_value_list)
-            data_value = None
-            if len(metric_value_list) != 0:
-                data_value = sum(metric_value_list) / len(metric_value_list)
-                self.log.info("Average Value for '%s' is : %s", metric_name, data_value)
+            if not isinstance(text, MetricsSnapshot):
+                text = parse_metrics(text if isinstance(text, str) else text.text)
+            data_value = text.value(metric_name, agg="avg", **selector)
+            self.log.info("Average Value for '%s' is : %s", metric_name, data_value)
             if comparison and compare_value is not None:
                 self.log.info("Comparing the values..")
                 near_compare = self.config["percentage_compare"]
-                return bool((compare_value + (compare_value * (near_compare / 100)) >= data_value)
-                or (compare_value - (compare_value * (near_compare / 100)) <= data_value))
+                return data_value is not None and bool(
+                    compare_value - (compare_value * (near_compare / 100)) <= data_value <=
+                    compare_value + (compare_value * (near_compare / 100)))
 
         except BaseException as error:
             self.log.error("%s %s: %s",
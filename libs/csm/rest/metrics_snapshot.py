@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Indexed snapshot of Prometheus text exposition and background metrics scraper.
+
+A scrape body is parsed once into a (name, labelset) to value map indexed by metric name.
+Samples are queried with label selectors, aggregated and compared between two snapshots
+as delta or rate. MetricsScraper records snapshots periodically e.g. while IO is running.
+"""
+import functools
+import logging
+import threading
+import time
+
+from prometheus_client.parser import text_string_to_metric_families
+
+LOGGER = logging.getLogger(__name__)
+
+AGGREGATIONS = {
+    "sum": sum,
+    "avg": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "count": len,
+}
+
+
+def _matches(labels: dict, selector: dict) -> bool:
+    """
+    Check labels against selector.
+
+    :param labels: Labels of a sample.
+    :param selector: label to expected value, compiled regex (full match) or predicate.
+    """
+    for label, expected in selector.items():
+        actual = labels.get(label)
+        if callable(expected):
+            if not expected(actual):
+                return False
+        elif hasattr(expected, "fullmatch"):
+            if actual is None or not expected.fullmatch(actual):
+                return False
+        elif actual != expected:
+            return False
+    return True
+
+
+class MetricsSnapshot:
+    """Samples of a single scrape indexed by metric name and label set."""
+
+    def __init__(self, text: str, timestamp: float = None):
+        """
+        Parse scrape body.
+
+        :param text: Prometheus text exposition format or response of the metrics api.
+        :param timestamp: Scrape time, defaults to now.
+        :raises ValueError: If text is not in Prometheus format.
+        """
+        if not isinstance(text, str):
+            text = text.text
+        self.timestamp = timestamp or time.time()
+        self.types = {}
+        self.samples = {}
+        self._index = {}
+        for family in text_string_to_metric_families(text):
+            self.types[family.name] = family.type
+            for sample in family.samples:
+                key = (sample.name, frozenset(sample.labels.items()))
+                self.samples[key] = sample.value
+                self._index.setdefault(sample.name, []).append(key)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def names(self) -> list:
+        """Sample names present in the snapshot."""
+        return list(self._index)
+
+    def query(self, name: str, **selector) -> list:
+        """
+        Get samples of a metric matching label selector.
+
+        :param name: Sample name.
+        :param selector: label=value, label=re.compile(...) or label=callable.
+        :return: list of (labels dict, value).
+        """
+        result = []
+        for key in self._index.get(name, []):
+            labels = dict(key[1])
+            if _matches(labels, selector):
+                result.append((labels, self.samples[key]))
+        return result
+
+    def value(self, name: str, agg: str = "sum", **selector):
+        """
+        Aggregate value of samples matching the selector.
+
+        :param name: Sample name.
+        :param agg: sum, avg, min, max or count.
+        :return: Aggregated value, None if no sample matches.
+        """
+        values = [value for _, value in self.query(name, **selector)]
+        if not values:
+            return None if agg != "count" else 0
+        return AGGREGATIONS[agg](values)
+
+    def delta(self, older, name: str, agg: str = "sum", **selector):
+        """
+        Increase of matching samples since older snapshot, counter resets are handled.
+
+        :param older: Earlier MetricsSnapshot.
+        :return: Aggregated delta, None if no sample matches.
+        """
+        old_values = {frozenset(labels.items()): value
+                      for labels, value in older.query(name, **selector)}
+        deltas = []
+        for labels, value in self.query(name, **selector):
+            old_value = old_values.get(frozenset(labels.items()), 0)
+            deltas.append(value - old_value if value >= old_value else value)
+        if not deltas:
+            return None
+        return AGGREGATIONS[agg](deltas)
+
+    def rate(self, older, name: str, agg: str = "sum", **selector):
+        """Per second increase of matching samples since older snapshot."""
+        delta = self.delta(older, name, agg, **selector)
+        elapsed = self.timestamp - older.timestamp
+        if delta is None or elapsed <= 0:
+            return None
+        return delta / elapsed
+
+
+@functools.lru_cache(maxsize=8)
+def parse_metrics(text: str) -> MetricsSnapshot:
+    """Parse scrape body, repeated validation of same body reuses the snapshot."""
+    return MetricsSnapshot(text)
+
+
+class MetricsScraper:
+    """Record metric snapshots periodically in background."""
+
+    def __init__(self, fetch, interval: float = 5, max_snapshots: int = 10000):
+        """
+        Init method.
+
+        :param fetch: Callable returning scrape body or response.
+        :param interval: Seconds between scrapes.
+        :param max_snapshots: Oldest snapshots are dropped beyond this count.
+        """
+        self.fetch = fetch
+        self.interval = interval
+        self.max_snapshots = max_snapshots
+        self.snapshots = []
+        self.errors = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def scrape(self) -> MetricsSnapshot:
+        """Take a snapshot now."""
+        try:
+            snapshot = MetricsSnapshot(self.fetch())
+        except Exception as error:  # pylint: disable=broad-except
+            self.errors += 1
+            LOGGER.warning("Metrics scrape failed: %s", error)
+            return None
+        self.snapshots.append(snapshot)
+        if len(self.snapshots) > self.max_snapshots:
+            self.snapshots.pop(0)
+        return snapshot
+
+    def _run(self):
+        """Scrape till stopped."""
+        while not self._stop_event.is_set():
+            start = time.time()
+            self.scrape()
+            self._stop_event.wait(max(0, self.interval - (time.time() - start)))
+
+    def start(self):
+        """Start background scraping."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-scraper", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> list:
+        """Stop scraping and take a final snapshot, returns the snapshots."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+        self.scrape()
+        LOGGER.info("Recorded %s metric snapshots, %s failed scrapes", len(self.snapshots),
+                    self.errors)
+        return self.snapshots
+
+    def series(self, name: str, agg: str = "sum", **selector) -> list:
+        """Time series of aggregated value as list of (timestamp, value)."""
+        return [(snap.timestamp, snap.value(name, agg, **selector)) for snap in self.snapshots]
+
+    def rates(self, name: str, agg: str = "sum", **selector) -> list:
+        """Per interval rate series as list of (timestamp, rate)."""
+        return [(new.timestamp, new.rate(old, name, agg, **selector))
+                for old, new in zip(self.snapshots, self.snapshots[1:])]
@@ -31,6 +31,10 @@ from libs.s3 import cortxcli_test_lib as cctl
 from libs.csm.rest.csm_rest_s3user import RestS3user
 from libs.s3.s3_restapi_test_lib import S3AccountOperationsRestAPI
 from libs.s3.iam_test_lib import IamTestLib
+from libs.s3.tenant_provisioner import BUCKET
+from libs.s3.tenant_provisioner import S3_ACCOUNT
+from libs.s3.tenant_provisioner import TenantProvisioner
+from libs.s3.tenant_provisioner import TenantSpec
 from libs.di.di_base import _init_s3_conn
 
 LOGGER = logging.getLogger(__name__)
@@ -108,11 +112,10 @@ class ManagementOPs:
         :return:
         """
         LOGGER.info(f"Creating Cortx s3 account users with {use_cortx_cli}")
-        if use_cortx_cli:
-            s3acc_obj = cctl.CortxCliTestLib()
-            s3acc_obj.open_connection()
-        else:
-            s3acc_obj = RestS3user()
+        if not use_cortx_cli:
+            return cls.provision_tenants(naccounts=nusers)
+        s3acc_obj = cctl.CortxCliTestLib()
+        s3acc_obj.open_connection()
         ts = time.strftime("%Y%m%d_%H%M%S")
         users = {"{}{}_{}".format(cls.user_prefix, i, ts): dict() for i in range(1, nusers + 1)}
         s3_user_passwd = DI_CFG["DiUserConfig"]["s3_account"]["password"]
@@ -123,18 +126,9 @@ class ManagementOPs:
             udict.update({'user_name': user})
             udict.update({'emailid': email})
             udict.update({'password': s3_user_passwd})
-            if use_cortx_cli:
-                result, acc_details = s3acc_obj.create_account_cortxcli(
-                    user, email, s3_user_passwd)
-                assert_utils.assert_true(result, 'S3 account user not created.')
-            else:
-                resp = s3acc_obj.create_an_account(
-                    user, s3_user_passwd)
-                assert_utils.assert_equal(
-                    resp.status_code, 201,
-                    'S3 account user not created.')
-                acc_details = json.loads(resp.text)
-
+            result, acc_details = s3acc_obj.create_account_cortxcli(
+                user, email, s3_user_passwd)
+            assert_utils.assert_true(result, 'S3 account user not created.')
             LOGGER.info("Created s3 account %s", user)
             udict.update({'accesskey': acc_details["access_key"]})
             udict.update({'secretkey': acc_details["secret_key"]})
@@ -142,6 +136,36 @@ class ManagementOPs:
         LOGGER.debug("Users %s created for I/O", users)
         return users
 
+    @classmethod
+    def provision_tenants(cls, naccounts: int, nbuckets: int = 0, workers: int = 16,
+                          manifest: str = None) -> dict:
+        """
+        Creates s3 accounts and their buckets concurrently using REST and S3 APIs.
+        :param naccounts: number of s3 accounts to create
+        :param nbuckets: number of buckets to create per account
+        :param workers: concurrent requests
+        :param manifest: manifest file of created entities to resume or teardown later
+        :return: users dict same as create_account_users, with buckets if nbuckets
+        """
+        spec = TenantSpec(accounts=naccounts, iam_users=0, buckets=nbuckets,
+                          prefix="{}_{}".format(cls.user_prefix, time.strftime("%Y%m%d%H%M%S")),
+                          account_password=DI_CFG["DiUserConfig"]["s3_account"]["password"])
+        provisioner = TenantProvisioner(spec, manifest, workers=workers)
+        provisioner.provision()
+        users = dict()
+        for account in provisioner.select(S3_ACCOUNT):
+            user = account["name"]
+            users[user] = {'user_name': user, 'emailid': user + cls.email_suffix,
+                           'password': spec.account_password,
+                           'accesskey': account["data"]["access_key"],
+                           'secretkey': account["data"]["secret_key"]}
+            if nbuckets:
+                users[user]["buckets"] = [bucket["name"] for bucket in
+                                          provisioner.select(BUCKET, account=user)]
+        assert_utils.assert_equal(len(users), naccounts, 'S3 account users not created.')
+        LOGGER.debug("Users %s created for I/O", users)
+        return users
+
     @classmethod
     def create_buckets(cls, nbuckets, users=None, use_cortxcli=False):
         """
@@ -261,9 +285,7 @@ class ManagementOPs:
         :param maxbuckets:
         :return:
         """
-        users = cls.create_account_users(nusers=maxusers)
-        users = cls.create_buckets(nbuckets=maxbuckets, users=users)
-        return users
+        return cls.provision_tenants(naccounts=maxusers, nbuckets=maxbuckets)
 
     @classmethod
     def create_s3_user_csm_rest(cls, user_name, passwd):
@@ -0,0 +1,211 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Parallel read/validate/delete phase executor for DTM recovery workloads.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+from config import S3_CFG
+from scripts.s3_bench import s3bench
+
+LOGGER = logging.getLogger(__name__)
+
+# Maximum keys accepted by a single DeleteObjects request.
+DELETE_BATCH_SIZE = 1000
+
+
+def drain_phase_results(queue, timeout: int = None) -> tuple:
+    """
+    Collect streamed phase events and final result from the queue.
+
+    :param queue: Queue filled by DTMRecoveryTestLib.perform_ops with stream_progress enabled.
+    :param timeout: Timeout in seconds to wait for each entry.
+    :return: (final result [bool, str], list of phase event dicts)
+    """
+    events = []
+    while True:
+        entry = queue.get(timeout=timeout)
+        if isinstance(entry, dict) and entry.get("event") == "phase":
+            events.append(entry)
+            continue
+        return entry, events
+
+
+class ClientBudget:
+    """Counting semaphore of S3 client sessions shared by concurrent workloads."""
+
+    def __init__(self, budget: int = None):
+        """
+        Init method.
+
+        :param budget: Maximum parallel clients, None for no limit.
+        """
+        self.budget = budget
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, clients: int) -> int:
+        """Wait till required clients are available, workload bigger than budget runs alone."""
+        if not self.budget:
+            return clients
+        clients = min(clients, self.budget)
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_use + clients <= self.budget)
+            self._in_use += clients
+        return clients
+
+    def release(self, clients: int):
+        """Release clients acquired for a workload."""
+        if not self.budget:
+            return
+        with self._cond:
+            self._in_use -= clients
+            self._cond.notify_all()
+
+
+class PhaseExecutor:
+    """Run read/validate and delete phases of multiple workloads concurrently."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, s3t_obj, access_key, secret_key, client_budget: int = None,
+                 queue=None, retry: int = None):
+        """
+        Init method.
+
+        :param s3t_obj: S3TestLib object used for deletes.
+        :param access_key: Access key for S3bench operations.
+        :param secret_key: Secret key for S3bench operations.
+        :param client_budget: Total parallel clients across the workloads.
+        :param queue: Queue to stream phase events into, None to disable streaming.
+        :param retry: Retry count for IOs.
+        """
+        self.s3t_obj = s3t_obj
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.budget = ClientBudget(client_budget)
+        self.queue = queue
+        self.retry = retry
+        self.events = []
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def _record(self, workload: dict, iteration: int, phase: str, start: float,
+                status: bool, **details):
+        """Record and stream a completed phase."""
+        event = {"event": "phase", "phase": phase, "bucket": workload["bucket"],
+                 "obj_size": workload["obj_size"], "iteration": iteration, "start": start,
+                 "end": time.time(), "status": status}
+        event["duration"] = round(event["end"] - start, 3)
+        event.update(details)
+        with self._lock:
+            self.events.append(event)
+        if self.queue is not None:
+            self.queue.put(event)
+        LOGGER.info("Phase %s of bucket %s completed: %s", phase, workload["bucket"], event)
+        return status
+
+    def read_phase(self, workload: dict, iteration: int, skipread: bool, validate: bool) -> bool:
+        """Read and/or validate objects of a workload using s3bench."""
+        start = time.time()
+        clients = self.budget.acquire(workload["num_clients"])
+        try:
+            resp = s3bench.s3bench(self.access_key, self.secret_key,
+                                   bucket=workload["bucket"], num_clients=clients,
+                                   num_sample=workload["num_sample"],
+                                   obj_name_pref=workload["obj_name_pref"],
+                                   obj_size=workload["obj_size"], skip_cleanup=True,
+                                   skip_write=True, skip_read=skipread, validate=validate,
+                                   log_file_prefix=f"read_workload_{workload['obj_size']}",
+                                   end_point=S3_CFG["s3_url"],
+                                   validate_certs=S3_CFG["validate_certs"],
+                                   max_retries=self.retry)
+        finally:
+            self.budget.release(clients)
+        LOGGER.info("Workload: %s objects of %s with %s parallel clients, Log Path %s",
+                    workload["num_sample"], workload["obj_size"], clients, resp[1])
+        status = not s3bench.check_log_file_error(resp[1])
+        if not status:
+            LOGGER.error("Error found in log path: %s", resp[1])
+        return self._record(workload, iteration, "read", start, status, log_path=resp[1])
+
+    def delete_phase(self, workload: dict, iteration: int) -> bool:
+        """Delete all objects of workload bucket with DeleteObjects batches while listing."""
+        start = time.time()
+        deleted, errors = 0, []
+        try:
+            paginator = self.s3t_obj.s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=workload["bucket"],
+                                           PaginationConfig={"PageSize": DELETE_BATCH_SIZE}):
+                keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+                if not keys:
+                    continue
+                resp = self.s3t_obj.s3_client.delete_objects(
+                    Bucket=workload["bucket"], Delete={"Objects": keys, "Quiet": True})
+                errors.extend(resp.get("Errors", []))
+                deleted += len(keys) - len(resp.get("Errors", []))
+        except ClientError as error:
+            errors.append(str(error))
+        if errors:
+            LOGGER.error("Observed deletion error for bucket %s: %s", workload["bucket"],
+                         errors[:10])
+        return self._record(workload, iteration, "delete", start, not errors, deleted=deleted,
+                            errors=len(errors))
+
+    def _run_workload(self, workload: dict, iteration: int, **kwargs) -> bool:
+        """Run phases of a single workload."""
+        if self.stop_event.is_set():
+            return False
+        status = True
+        if not kwargs["skipread"] or kwargs["validate"]:
+            status = self.read_phase(workload, iteration, kwargs["skipread"], kwargs["validate"])
+        if status and not kwargs["skipcleanup"]:
+            status = self.delete_phase(workload, iteration)
+        if not status:
+            self.stop_event.set()
+        return status
+
+    def run(self, workload_info: list, loop: int = 1, **kwargs) -> bool:
+        """
+        Run phases for all workloads concurrently in each iteration.
+
+        :param workload_info: List of workloads to read/validate/delete.
+        :param loop: Iteration count.
+        :keyword skipread: Skip read.
+        :keyword validate: Validate checksum.
+        :keyword skipcleanup: Skip cleanup.
+        :return: True if all the phases passed.
+        """
+        if not workload_info:
+            return True
+        with ThreadPoolExecutor(max_workers=len(workload_info),
+                                thread_name_prefix="dtm-phase") as executor:
+            for iter_cnt in range(loop):
+                LOGGER.info("Iteration count: %s", iter_cnt)
+                results = list(executor.map(
+                    lambda workload, cnt=iter_cnt: self._run_workload(workload, cnt, **kwargs),
+                    workload_info))
+                if not all(results):
+                    return False
+        return True
@@ -39,6 +39,7 @@ from config import CMN_CFG
 from config import DTM_CFG
 from config import HA_CFG
 from config import S3_CFG
+from libs.dtm.dtm_phase_executor import PhaseExecutor
 from libs.ha.ha_common_libs_k8s import HAK8s
 from libs.s3 import ACCESS_KEY, SECRET_KEY
 from libs.s3.s3_test_lib import S3TestLib
@@ -127,11 +128,12 @@ class DTMRecoveryTestLib:
             queue.put([False, f"S3bench workload for failed."
                               f" Please read log file {log_path}"])
 
+    # pylint: disable=too-many-arguments
     def perform_ops(self, workload_info: list, queue, skipread: bool = True,
                     validate: bool = True, skipcleanup: bool = False, loop: int = 1,
-                    retry: int = None):
+                    retry: int = None, client_budget: int = None, stream_progress: bool = False):
         """
-        Perform read operations
+        Perform read/validate/delete operations on workloads concurrently
         :param workload_info: List Workload to read/validate/delete
         :param queue: Multiprocessing Queue to be used for returning values (Boolean,dict)
         :param skipread: Skip read
@@ -139,56 +141,17 @@ class DTMRecoveryTestLib:
         :param skipcleanup: Skip Cleanup
         :param loop: Loop count for performing reads in iteration.
         :param retry: Retry count for IOs
+        :param client_budget: Total parallel s3bench clients shared by all the workloads
+        :param stream_progress: Put per phase timing dicts in queue as phases complete, final
+        result is put last, use drain_phase_results to collect both.
         """
-        results = list()
-        for iter_cnt in range(loop):
-            self.log.info("Iteration count: %s", iter_cnt)
-            for workload in workload_info:
-                if not skipread or validate:
-                    resp = s3bench.s3bench(self.access_key,
-                                           self.secret_key,
-                                           bucket=workload['bucket'],
-                                           num_clients=workload['num_clients'],
-                                           num_sample=workload['num_sample'],
-                                           obj_name_pref=workload['obj_name_pref'],
-                                           obj_size=workload['obj_size'],
-                                           skip_cleanup=True,
-                                           skip_write=True,
-                                           skip_read=skipread,
-                                           validate=validate,
-                                           log_file_prefix=f"read_workload_{workload['obj_size']}",
-                                           end_point=S3_CFG["s3_url"],
-                                           validate_certs=S3_CFG["validate_certs"],
-                                           max_retries=retry)
-                    self.log.info("Workload: %s objects of %s with %s parallel clients ",
-                                  workload['num_sample'], workload['obj_size'],
-                                  workload['num_clients'])
-                    self.log.info("Log Path %s", resp[1])
-                    if s3bench.check_log_file_error(resp[1]):
-                        self.log.error("Error found in log path: %s", resp[1])
-                        results.append(False)
-                        break
-                    else:
-                        results.append(True)
-                if not skipcleanup:
-                    # Delete all objects from the bucket
-                    resp = self.s3t_obj.object_list(bucket_name=workload['bucket'])
-                    obj_list = resp[1]
-                    del_res = True
-                    for obj in obj_list:
-                        try:
-                            self.s3t_obj.delete_object(bucket_name=workload['bucket'], obj_name=obj)
-                        except CTException as error:
-                            self.log.error("Error while deleting object %s from bucket %s : %s",
-                                           obj, workload['bucket'], error)
-                            del_res = False
-                    results.append(del_res)
-                    if not del_res:
-                        self.log.error("Observed deletion error for bucket %s.", workload['bucket'])
-                        break
-                    self.log.info("Objects deletion completed for bucket %s", workload['bucket'])
-
-        if all(results):
+        executor = PhaseExecutor(self.s3t_obj, self.access_key, self.secret_key,
+                                 client_budget=client_budget,
+                                 queue=queue if stream_progress else None, retry=retry)
+        result = executor.run(workload_info, loop=loop, skipread=skipread, validate=validate,
+                              skipcleanup=skipcleanup)
+        self.log.info("Phase timings: %s", executor.events)
+        if result:
             queue.put([True, "Workload successful."])
         else:
             queue.put([False, "Workload failed."])
@@ -20,13 +20,19 @@
 disk near full data storage utility methods
 """
 import copy
+import json
 import logging
+import os
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from commons.constants import MB
 from commons.helpers.health_helper import Health
 from commons.helpers.pods_helper import LogicalNode
+from commons.params import LATEST_LOG_FOLDER
+from commons.params import LOG_DIR
 from config import CMN_CFG
 from config import DURABILITY_CFG
 from config.s3 import S3_CFG
@@ -90,7 +96,8 @@ class NearFullStorage:
         :param s3userinfo: S3user dictionary with access/secret key
         :param user_data_writes: Write operation to be performed for specific bytes
         :param bucket_prefix: Bucket prefix for the data written
-        :param client (Optional): Number of client sessions
+        :param client (Optional): Number of client sessions, divided across object sizes which
+            are written concurrently
         :param bucket_list (Optional): List of pre-created buckets.
         :return : boolean, list of dictionary
                 format : [{'bucket': bucket_name, 'obj_name_pref': obj_name, 'num_clients':
@@ -98,51 +105,74 @@ class NearFullStorage:
         """
         client = kwargs.get("client", 10)
         bucket_list = kwargs.get('bucket_list', None)
+        workload = self.get_workload_sizes()
+        each_workload_byte = user_data_writes / len(workload)
+        plan = []
+        bucket_iter = iter(bucket_list) if bucket_list else None
+        LOGGER.info("Perform Write operation for object size : %s", workload)
+        sizes = [(obj_size, int(each_workload_byte / obj_size)) for obj_size in workload]
+        sizes = [(obj_size, samples) for obj_size, samples in sizes if samples > 0]
+        per_size_clients = max(1, client // max(1, len(sizes)))
+        for obj_size, samples in sizes:
+            bucket_name = f'{bucket_prefix}-{obj_size}b-{int(time.time())}'
+            if bucket_iter:
+                bucket_name = next(bucket_iter)
+            plan.append({'bucket': bucket_name, 'obj_name_pref': f'obj_{obj_size}',
+                         'num_clients': min(per_size_clients, samples), 'obj_size': obj_size,
+                         'num_sample': samples})
+        return self.write_workloads(s3userinfo, plan)
+
+    @staticmethod
+    def get_workload_sizes() -> list:
+        """Object sizes in bytes used to fill the storage."""
         workload = copy.deepcopy(DURABILITY_CFG['full_sys_writes']['vm_workload'])  # in mb
         if CMN_CFG["setup_type"] == "HW":
             workload.extend(DURABILITY_CFG['full_sys_writes']['extended_hw_workload'])
+        return [each * MB for each in workload]  # convert to bytes
 
-        workload = [each * MB for each in workload]  # convert to bytes
-        each_workload_byte = user_data_writes / len(workload)
-        return_list = []
-        if bucket_list:
-            bucket_iter = iter(bucket_list)
-        LOGGER.info("Perform Write operation for object size : %s", workload)
-        for obj_size in workload:
-            samples = int(each_workload_byte / obj_size)
-            if samples > 0:
-                temp_client = client
-                if temp_client > samples:
-                    temp_client = samples
-                bucket_name = f'{bucket_prefix}-{obj_size}b-{int(time.time())}'
-                if bucket_list:
-                    bucket_name = next(bucket_iter)
-                obj_name = f'obj_{obj_size}'
-                resp = s3bench.s3bench(s3userinfo['accesskey'],
-                                       s3userinfo['secretkey'],
-                                       bucket=bucket_name,
-                                       num_clients=temp_client,
-                                       num_sample=samples,
-                                       obj_name_pref=obj_name, obj_size=f"{obj_size}b",
-                                       skip_cleanup=True, duration=None,
-                                       log_file_prefix=f"write_workload_{obj_size}b",
-                                       end_point=S3_CFG["s3_url"],
-                                       validate_certs=S3_CFG["validate_certs"],
-                                       max_retries=self.max_retries,
-                                       httpclientimeout=self.http_client_timeout
-                                       )
-                LOGGER.info("Workload: %s objects of %s with %s parallel clients ", samples,
-                            obj_size, temp_client)
-                LOGGER.info("Log Path %s", resp[1])
-                if s3bench.check_log_file_error(resp[1]):
-                    return False, f"S3bench workload for failed for {obj_size}." \
-                                  f" Please read log file {resp[1]}"
-                return_list.append(
-                    {'bucket': bucket_name, 'obj_name_pref': obj_name, 'num_clients': temp_client,
-                     'obj_size': obj_size, 'num_sample': samples})
-            else:
-                continue
-        return True, return_list
+    def write_workload(self, s3userinfo: dict, each: dict) -> tuple:
+        """
+        Write a workload of perform_near_full_sys_writes format with s3bench
+        :param s3userinfo: S3user dictionary with access/secret key
+        :param each: workload dictionary
+        :return: boolean, log path
+        """
+        resp = s3bench.s3bench(s3userinfo['accesskey'],
+                               s3userinfo['secretkey'],
+                               bucket=each['bucket'],
+                               num_clients=each['num_clients'],
+                               num_sample=each['num_sample'],
+                               obj_name_pref=each['obj_name_pref'],
+                               obj_size=f"{each['obj_size']}b",
+                               skip_cleanup=True, duration=None,
+                               log_file_prefix=f"write_workload_{each['obj_name_pref']}",
+                               end_point=S3_CFG["s3_url"],
+                               validate_certs=S3_CFG["validate_certs"],
+                               max_retries=self.max_retries,
+                               httpclientimeout=self.http_client_timeout
+                               )
+        LOGGER.info("Workload: %s objects of %s with %s parallel clients ", each['num_sample'],
+                    each['obj_size'], each['num_clients'])
+        LOGGER.info("Log Path %s", resp[1])
+        return not s3bench.check_log_file_error(resp[1]), resp[1]
+
+    def write_workloads(self, s3userinfo: dict, plan: list) -> tuple:
+        """
+        Write all the workloads concurrently
+        :param s3userinfo: S3user dictionary with access/secret key
+        :param plan: list of workload dictionary
+        :return : boolean, list of workload dictionary written or error
+        """
+        if not plan:
+            return True, []
+        with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+            results = list(executor.map(lambda each: self.write_workload(s3userinfo, each),
+                                        plan))
+        for each, (status, log_path) in zip(plan, results):
+            if not status:
+                return False, f"S3bench workload for failed for {each['obj_size']}." \
+                              f" Please read log file {log_path}"
+        return True, plan
 
     # pylint: disable=too-many-arguments
     def perform_operations_on_pre_written_data(self, s3userinfo: dict, workload_info: list,
@@ -237,14 +267,193 @@ class NearFullStorage:
             LOGGER.warning("No bytes to be written to fill %s capacity", write_per)
             return True, None
 
-        resp = self.perform_near_full_sys_writes(
-            s3userinfo=s3userinfo,
-            user_data_writes=resp[1],
-            bucket_prefix=bucket_prefix,
-            clients=clients,
-            bucket_list=bucket_list)
+        planner = TargetFillPlanner(self, master_node, s3userinfo, bucket_prefix,
+                                    clients=clients, bucket_list=bucket_list)
+        resp = planner.fill(write_per, initial_user_bytes=resp[1])
         if not resp[0]:
             return resp
         LOGGER.info("Writes Completed.!!")
         LOGGER.info("Written buckets : %s", resp[1])
         return True, resp[1]
+
+
+# pylint: disable=too-many-instance-attributes
+class TargetFillPlanner:
+    """
+    Fill storage to a target percent with concurrent writes of all object sizes.
+
+    Writes are done in rounds, capacity is polled after each round and the bytes written per
+    raw byte consumed are measured so metadata and SNS overheads are accounted. Rounds get
+    smaller near the target so it is approached without overshoot.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, storage: NearFullStorage, master_obj: LogicalNode, s3userinfo: dict,
+                 bucket_prefix: str, clients: int = 10, bucket_list: list = None, **kwargs):
+        """
+        :param storage: NearFullStorage object used for writes
+        :param master_obj: Logical node object of Master
+        :param s3userinfo: S3user dictionary with access/secret key
+        :param bucket_prefix: Bucket prefix for the data written
+        :param clients: Total parallel clients of all the object sizes
+        :param bucket_list: Pre-created buckets, each is used by one workload, new buckets are
+            used when all are taken
+        :keyword tolerance: Stop when within tolerance percent of the target
+        :keyword slowdown_band: Rounds are halved within this percent of the target
+        :keyword max_rounds: Maximum write rounds
+        :keyword poll_interval: Seconds between capacity polls while writing
+        :keyword settle_timeout: Seconds to wait after a round for capacity to change
+        :keyword settle_interval: Seconds between capacity polls while waiting
+        """
+        self.storage = storage
+        self.master_obj = master_obj
+        self.s3userinfo = s3userinfo
+        self.bucket_prefix = bucket_prefix
+        self.clients = clients
+        self.obj_sizes = storage.get_workload_sizes()
+        self.free_buckets = list(bucket_list or [])
+        self.tolerance = kwargs.get("tolerance", 0.5)
+        self.slowdown_band = kwargs.get("slowdown_band", 5)
+        self.max_rounds = kwargs.get("max_rounds", 20)
+        self.poll_interval = kwargs.get("poll_interval", 60)
+        self.settle_timeout = kwargs.get("settle_timeout", 300)
+        self.settle_interval = kwargs.get("settle_interval", 30)
+        self.samples = []
+        self.manifest = []
+        self._health = Health(master_obj.hostname, master_obj.username, master_obj.password)
+
+    def capacity(self, health: Health = None) -> tuple:
+        """Total, used capacity and used percent."""
+        total_cap, _, used_cap = (health or self._health).get_sys_capacity()
+        used_per = used_cap / total_cap * 100
+        self.samples.append({"time": time.time(), "used": used_cap, "used_percent": used_per})
+        return total_cap, used_cap, used_per
+
+    def _poll(self, stop_event: threading.Event, target_percent: float):
+        """Poll capacity while a round is written."""
+        health = Health(self.master_obj.hostname, self.master_obj.username,
+                        self.master_obj.password)
+        while not stop_event.wait(self.poll_interval):
+            try:
+                used_per = self.capacity(health)[2]
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.debug("Capacity poll failed: %s", error)
+                continue
+            LOGGER.info("Capacity used %.2f%%, target %s%%", used_per, target_percent)
+        health.disconnect()
+
+    def settle(self, prev_used: int) -> tuple:
+        """Capacity after a round, polled till used capacity changes or settle_timeout."""
+        deadline = time.time() + self.settle_timeout
+        total_cap, used_cap, used_per = self.capacity()
+        while used_cap <= prev_used and time.time() < deadline:
+            LOGGER.info("Used capacity %s is not updated yet, waiting", used_cap)
+            time.sleep(self.settle_interval)
+            total_cap, used_cap, used_per = self.capacity()
+        return total_cap, used_cap, used_per
+
+    def plan_round(self, user_bytes: float, round_no: int) -> list:
+        """
+        Workloads of a round, bytes are divided evenly across object sizes.
+
+        Every workload gets its own bucket so a bucket is in one manifest entry only.
+        :param user_bytes: User data bytes to be written in the round
+        :param round_no: Round number used in object prefix
+        """
+        each_workload_byte = user_bytes / len(self.obj_sizes)
+        sizes = [(size, int(each_workload_byte / size)) for size in self.obj_sizes]
+        sizes = [(size, samples) for size, samples in sizes if samples > 0]
+        if not sizes:
+            smallest = min(self.obj_sizes)
+            sizes = [(smallest, max(1, int(user_bytes / smallest)))]
+        per_size_clients = max(1, self.clients // len(sizes))
+        plan = []
+        for obj_size, samples in sizes:
+            if self.free_buckets:
+                bucket = self.free_buckets.pop(0)
+            else:
+                bucket = f'{self.bucket_prefix}-{obj_size}b-r{round_no}-{int(time.time())}'
+            plan.append({'bucket': bucket, 'obj_name_pref': f'obj_{obj_size}_r{round_no}',
+                         'num_clients': min(per_size_clients, samples), 'obj_size': obj_size,
+                         'num_sample': samples, 'round': round_no})
+        return plan
+
+    def fill(self, target_percent: float, initial_user_bytes: float = None) -> tuple:
+        """
+        Write till used capacity is within tolerance of target percent.
+        :param target_percent: Expected used capacity percent
+        :param initial_user_bytes: Estimate of user bytes to reach the target e.g. from
+            get_user_data_space_in_bytes, used to derive user to raw bytes ratio of first round
+        :return: boolean, manifest of workloads written or error, manifest of completed rounds
+            is also returned as third item on error
+        """
+        total_cap, used_cap, used_per = self.capacity()
+        ratio = None
+        if initial_user_bytes and target_percent > used_per:
+            ratio = initial_user_bytes / ((target_percent - used_per) / 100 * total_cap)
+        ratio = ratio or 1.0
+        # User bytes written which are not seen in used capacity yet.
+        unaccounted = 0
+        for round_no in range(self.max_rounds):
+            error_per = target_percent - used_per
+            if error_per <= self.tolerance:
+                break
+            gain = 1.0 if error_per > self.slowdown_band else 0.5
+            remaining = ratio * error_per / 100 * total_cap - unaccounted
+            if remaining <= 0:
+                LOGGER.warning("%s bytes written are not seen in used capacity, stopping at "
+                               "%.2f%%", unaccounted, used_per)
+                break
+            user_bytes = gain * remaining
+            plan = self.plan_round(user_bytes, round_no)
+            LOGGER.info("Round %s: used %.2f%%, writing %s bytes as %s", round_no, used_per,
+                        int(user_bytes), [(each['obj_size'], each['num_sample'])
+                                          for each in plan])
+            stop_event = threading.Event()
+            poller = threading.Thread(target=self._poll, args=(stop_event, target_percent),
+                                      daemon=True)
+            poller.start()
+            try:
+                resp = self.storage.write_workloads(self.s3userinfo, plan)
+            finally:
+                stop_event.set()
+                poller.join()
+            if not resp[0]:
+                LOGGER.error("Round %s failed: %s", round_no, resp[1])
+                self.save_manifest()
+                return False, resp[1], self.manifest
+            self.manifest.extend(plan)
+            written = sum(each['obj_size'] * each['num_sample'] for each in plan)
+            prev_used = used_cap
+            total_cap, used_cap, used_per = self.settle(prev_used)
+            if used_cap > prev_used:
+                # Measured user bytes per raw byte consumed, includes metadata and SNS overhead.
+                ratio = (written + unaccounted) / (used_cap - prev_used)
+                unaccounted = 0
+            else:
+                unaccounted += written
+        else:
+            LOGGER.warning("Target %s%% not reached in %s rounds", target_percent,
+                           self.max_rounds)
+        LOGGER.info("Filled to %.2f%% of target %s%% in %s workloads", used_per, target_percent,
+                    len(self.manifest))
+        self.save_manifest()
+        return True, self.manifest
+
+    def save_manifest(self, file_name: str = None) -> str:
+        """
+        Write manifest of written workloads and capacity samples to latest log folder.
+        :param file_name: Manifest file name, default is unique per fill
+        """
+        file_name = file_name or f"fill_manifest_{time.strftime('%Y%m%d-%H%M%S')}" \
+                                 f"_{id(self):x}.json"
+        path = os.path.join(LOG_DIR, LATEST_LOG_FOLDER, file_name)
+        try:
+            with open(path, "w", encoding="utf-8") as manifest_file:
+                json.dump({"workloads": self.manifest, "capacity": self.samples}, manifest_file,
+                          indent=2)
+        except OSError as error:
+            LOGGER.warning("Could not save fill manifest: %s", error)
+            return None
+        LOGGER.info("Fill manifest: %s", path)
+        return path
@@ -49,6 +49,9 @@ from config.s3 import S3_BLKBOX_CFG
 from config.s3 import S3_CFG
 from libs.csm.rest.csm_rest_system_health import SystemHealth
 from libs.di.di_mgmt_ops import ManagementOPs
+from libs.ha.io_journal import journal_record
+from libs.ha.mpu_engine import MultipartUploadEngine
+from libs.ha.mpu_engine import file_parts
 from libs.s3.s3_multipart_test_lib import S3MultipartTestLib
 from libs.s3.s3_restapi_test_lib import S3AccountOperationsRestAPI
 from libs.s3.s3_test_lib import S3TestLib
@@ -471,15 +474,14 @@ class HAK8s:
                 mpu_id = res[1]["UploadId"]
                 LOGGER.info("Multipart Upload initiated with mpu_id %s", mpu_id)
 
-            LOGGER.info("Creating parts of data")
-            parts = self.create_multiple_data_parts(multipart_obj_size=multipart_obj_size,
-                                                    multipart_obj_path=multipart_obj_path,
-                                                    total_parts=total_parts)
+            # Parts are read from file offsets when uploaded.
+            parts = file_parts(multipart_obj_path,
+                               1048576 * (int(multipart_obj_size) // int(total_parts)))
 
             LOGGER.info("Uploading parts %s", part_numbers)
 
             for part in part_numbers:
-                resp = s3_mp_test_obj.upload_multipart(body=parts[part],
+                resp = s3_mp_test_obj.upload_multipart(body=parts(part),
                                                        bucket_name=bucket_name,
                                                        object_name=object_name,
                                                        upload_id=mpu_id,
@@ -619,7 +621,8 @@ class HAK8s:
 
     # pylint: disable-msg=too-many-locals
     def start_random_mpu(self, event, s3_data, bucket_name, object_name, file_size, total_parts,
-                         multipart_obj_path, part_numbers, parts_etag, output):
+                         multipart_obj_path, part_numbers, parts_etag, output, journal=None,
+                         **kwargs):
         """
         Helper function to start mpu (To start mpu in background, this function needs to be used)
         :param event: Thread event to be sent in case of parallel IOs
@@ -632,57 +635,48 @@ class HAK8s:
         :param part_numbers: List of random parts to be uploaded
         :param parts_etag: List containing uploaded part number with its ETag
         :param output: Queue used to fill output
+        :param journal: IOJournal in which every part upload is recorded
+        :keyword window: Parts uploaded concurrently, default 1
+        :keyword part_map: Part map file of MultipartUploadEngine, upload is resumed from it
+        if it exists
         :return: response
         """
         access_key = s3_data["s3_acc"]["accesskey"]
         secret_key = s3_data["s3_acc"]["secretkey"]
-        failed_parts = []
-        exp_failed_parts = []
         s3_test_obj = S3TestLib(access_key=access_key, secret_key=secret_key,
                                 endpoint_url=S3_CFG["s3_url"])
         s3_mp_test_obj = S3MultipartTestLib(access_key=access_key,
                                             secret_key=secret_key, endpoint_url=S3_CFG["s3_url"])
-
+        part_size = 1048576 * (int(file_size) // int(total_parts))
+        engine = MultipartUploadEngine(s3_mp_test_obj, bucket_name, object_name,
+                                       file_parts(multipart_obj_path, part_size),
+                                       part_map_path=kwargs.get("part_map"),
+                                       window=kwargs.get("window", 1), event=event,
+                                       journal=journal)
         try:
-            LOGGER.info("Creating a bucket with name : %s", bucket_name)
-            res = s3_test_obj.create_bucket(bucket_name)
-            LOGGER.info("Response: %s", res)
-            LOGGER.info("Created a bucket with name : %s", bucket_name)
-            LOGGER.info("Initiating multipart upload")
-            res = s3_mp_test_obj.create_multipart_upload(bucket_name, object_name)
-            LOGGER.info("Response: %s", res)
-            mpu_id = res[1]["UploadId"]
-            LOGGER.info("Multipart Upload initiated with mpu_id %s", mpu_id)
+            if engine.upload_id is None:
+                LOGGER.info("Creating a bucket with name : %s", bucket_name)
+                res = s3_test_obj.create_bucket(bucket_name)
+                LOGGER.info("Response: %s", res)
+                LOGGER.info("Created a bucket with name : %s", bucket_name)
+                LOGGER.info("Initiating multipart upload")
+                mpu_id = engine.start()
+            else:
+                mpu_id = engine.upload_id
+                engine.reconcile()
         except CTException as error:
             LOGGER.exception("Failed mpu due to error %s. Exiting from background process.", error)
             sys.exit(1)
 
-        LOGGER.info("Creating parts of data")
-        if os.path.exists(multipart_obj_path):
-            os.remove(multipart_obj_path)
-        system_utils.create_file(multipart_obj_path, file_size)
-        parts = self.create_multiple_data_parts(multipart_obj_size=file_size,
-                                                multipart_obj_path=multipart_obj_path,
-                                                total_parts=total_parts)
+        if not os.path.exists(multipart_obj_path) or not engine.parts:
+            LOGGER.info("Creating file of the parts")
+            if os.path.exists(multipart_obj_path):
+                os.remove(multipart_obj_path)
+            system_utils.create_file(multipart_obj_path, file_size)
         LOGGER.info("Uploading parts into bucket: %s", part_numbers)
-        for i in part_numbers:
-            try:
-                resp = s3_mp_test_obj.upload_multipart(body=parts[i], bucket_name=bucket_name,
-                                                       object_name=object_name, upload_id=mpu_id,
-                                                       part_number=i)
-                LOGGER.info("Response: %s", resp)
-                p_tag = resp[1]
-                LOGGER.debug("Part : %s", str(p_tag))
-                parts_etag.append({"PartNumber": i, "ETag": p_tag["ETag"]})
-                LOGGER.info("Uploaded part %s", i)
-            except CTException as error:
-                LOGGER.exception("Error: %s", error)
-                if event.is_set():
-                    exp_failed_parts.append(i)
-                else:
-                    failed_parts.append(i)
-                LOGGER.info("Failed to upload part %s", i)
-
+        exp_failed_parts, failed_parts = engine.upload(part_numbers)
+        parts_etag.extend(part for part in engine.parts_etag() if part not in parts_etag)
+        LOGGER.info("Uploaded parts stats: %s", engine.stats())
         res = (exp_failed_parts, failed_parts, parts_etag, mpu_id)
         output.put(res)
 
@@ -884,7 +878,8 @@ class HAK8s:
         s3_data: Dict to store bucket, object and checksum related info (Mandatory for get),
         bkts_to_wr: Mandatory param for put,
         di_check: Flag to enable/disable di check (optional),
-        bkts_to_del: Required in case of counted delete operation (optional)
+        bkts_to_del: Required in case of counted delete operation (optional),
+        journal: IOJournal in which every request is recorded (optional)
         :return: None
         """
         workload = HA_CFG["s3_bucket_data"]["workload_sizes_mbs"]
@@ -896,6 +891,7 @@ class HAK8s:
         skipdel = kwargs.get("skipdel", False)
         bkt_list = kwargs.get("bkt_list", list())
         s3_data = kwargs.get("s3_data", dict())
+        journal = kwargs.get("journal", None)
         if not skipput:
             bkts_to_wr = kwargs.get("bkts_to_wr")
             event_bkt_put = []
@@ -906,14 +902,17 @@ class HAK8s:
                 bucket_name = f"{test_prefix}-{i}-{size_mb}-{perf_counter_ns()}"
                 object_name = f"obj_{bucket_name}"
                 file_path = os.path.join(test_dir_path, f"{bucket_name}.txt")
+                in_fault = event.is_set()
                 try:
-                    s3_test_obj.create_bucket_put_object(bucket_name, object_name, file_path,
-                                                         size_mb)
+                    with journal_record(journal, "put", bucket_name, object_name,
+                                        size_mb * common_const.MB):
+                        s3_test_obj.create_bucket_put_object(bucket_name, object_name,
+                                                             file_path, size_mb)
                     upload_chm = self.cal_compare_checksum(file_list=[file_path], compare=False)[0]
                     s3_data.update({bucket_name: (object_name, upload_chm)})
                 except CTException as error:
                     LOGGER.exception("Error in %s: %s", HAK8s.put_get_delete.__name__, error)
-                    if event.is_set():
+                    if in_fault or event.is_set():
                         event_bkt_put.append(bucket_name)
                     else:
                         fail_bkt_put.append(bucket_name)
@@ -933,12 +932,14 @@ class HAK8s:
             for bkt in bkt_list:
                 download_file = "Download_" + str(bkt)
                 download_path = os.path.join(test_dir_path, download_file)
+                in_fault = event.is_set()
                 try:
-                    resp = s3_test_obj.object_download(bkt, s3_data[bkt][0], download_path)
+                    with journal_record(journal, "get", bkt, s3_data[bkt][0]):
+                        resp = s3_test_obj.object_download(bkt, s3_data[bkt][0], download_path)
                     LOGGER.info("Download object response: %s", resp)
                 except CTException as error:
                     LOGGER.exception("Error in %s: %s", HAK8s.put_get_delete.__name__, error)
-                    if event.is_set():
+                    if in_fault or event.is_set():
                         event_bkt_get.append(bkt)
                     else:
                         fail_bkt_get.append(bkt)
@@ -946,9 +947,9 @@ class HAK8s:
                 if di_check:
                     download_checksum = self.cal_compare_checksum(file_list=[download_path],
                                                                   compare=False)[0]
-                    if event.is_set():
+                    if in_fault or event.is_set():
                         event_di_bkt.append(bkt)
-                    elif not event.is_set() and s3_data[bkt][1] != download_checksum:
+                    elif s3_data[bkt][1] != download_checksum:
                         fail_di_bkt.append(bkt)
 
             res = (event_bkt_get, fail_bkt_get, event_di_bkt, fail_di_bkt)
@@ -964,11 +965,13 @@ class HAK8s:
             count = 0
             while count < bkts_to_del:
                 for _ in range(len(bucket_list)):
+                    in_fault = event.is_set()
                     try:
-                        s3_test_obj.delete_bucket(bucket_name=bucket_list[0], force=True)
+                        with journal_record(journal, "delete", bucket_list[0]):
+                            s3_test_obj.delete_bucket(bucket_name=bucket_list[0], force=True)
                     except CTException as error:
                         LOGGER.exception("Error in %s: %s", HAK8s.put_get_delete.__name__, error)
-                        if event.is_set():
+                        if in_fault or event.is_set():
                             event_del_bkt.append(bucket_list[0])
                         else:
                             fail_del_bkt.append(bucket_list[0])
@@ -1892,6 +1895,7 @@ class HAK8s:
         :keyword is_unversioned: Set to true if object is uploaded to an unversioned bucket
         Can be used for setting up pre-existing objects before enabling/suspending bucket
         versioning
+        :keyword journal: IOJournal in which every request is recorded
         :return: Tuple (bool, list)
         """
         chk_null_version = kwargs.get("chk_null_version", False)
@@ -1899,12 +1903,16 @@ class HAK8s:
         count = kwargs.get("count", 1)
         is_unversioned = kwargs.get("is_unversioned", False)
         background = kwargs.get("background", False)
+        journal = kwargs.get("journal", None)
+        nbytes = os.path.getsize(file_path) if journal and file_path else 0
         pass_put_ver = list()
         fail_put_ver = list()
         for put in range(count):
+            in_fault = event.is_set()
             try:
-                put_resp = s3_test_obj.put_object(bucket_name=bkt_name, object_name=obj_name,
-                                                  file_path=file_path)
+                with journal_record(journal, "put", bkt_name, obj_name, nbytes):
+                    put_resp = s3_test_obj.put_object(bucket_name=bkt_name, object_name=obj_name,
+                                                      file_path=file_path)
                 if is_unversioned:
                     version_id = "null"
                 else:
@@ -1920,7 +1928,7 @@ class HAK8s:
                 pass_put_ver.append(versions_dict)
             except CTException as error:
                 LOGGER.exception("Error in %s: %s", HAK8s.put_get_delete.__name__, error)
-                if event.is_set():
+                if in_fault or event.is_set():
                     continue
                 fail_put_ver.append(put)
         if fail_put_ver and not background:
@@ -1940,17 +1948,21 @@ class HAK8s:
         :param ver_etag: Target list of dictionary of uploaded versions to be GET
         :param output: Output queue in which results should be put
         :keyword background: Set to true if background function call
+        :keyword journal: IOJournal in which every request is recorded
         :return: Tuple (bool, list)
         """
         background = kwargs.get("background", False)
+        journal = kwargs.get("journal", None)
         fail_get_ver = list()
         pass_get_ver = list()
         for v_etag in ver_etag:
             v_id = list(v_etag.keys())[0]
             etag = list(v_etag.values())[0]
+            in_fault = event.is_set()
             try:
-                get_resp = s3_ver_obj.get_object_version(bucket=bkt_name, key=obj_name,
-                                                         version_id=v_id)
+                with journal_record(journal, "get", bkt_name, f"{obj_name}?versionId={v_id}"):
+                    get_resp = s3_ver_obj.get_object_version(bucket=bkt_name, key=obj_name,
+                                                             version_id=v_id)
                 if get_resp[1]["VersionId"] != v_id or get_resp[1]["ETag"] != etag:
                     failed = {v_id: [get_resp[1]["VersionId"], get_resp[1]["ETag"]]}
                     fail_get_ver.append(failed)
@@ -1958,7 +1970,7 @@ class HAK8s:
                     pass_get_ver.append(v_etag)
             except CTException as error:
                 LOGGER.exception("Error in %s: %s", HAK8s.put_get_delete.__name__, error)
-                if event.is_set():
+                if in_fault or event.is_set():
                     continue
                 fail_get_ver.append(v_etag)
         if fail_get_ver and not background:
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Per operation IO journal and fault timeline for HA tests.
+
+Every request of the background IO workers is recorded with its start/end time, status and
+size in a buffer owned by the worker thread, so recording takes no lock. The fault injector
+records its timeline through TimelineEvent, a drop in replacement of the event passed to the
+workers. classify_fault_windows joins both after the test to get availability, error rate and
+latency percentiles before, during and after each fault window.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextlib import nullcontext
+
+LOGGER = logging.getLogger(__name__)
+
+IORecord = namedtuple("IORecord", "op bucket key start end status error bytes")
+FaultWindow = namedtuple("FaultWindow", "name start end")
+
+
+class IOJournal:
+    """Journal of IO requests, each worker thread appends to its own buffer."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._buffers = []
+
+    def _buffer(self) -> list:
+        """Buffer of the calling thread."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+            # list.append is atomic, buffer is registered once per thread.
+            self._buffers.append(buffer)
+        return buffer
+
+    def add(self, op: str, bucket: str, key: str, start: float, end: float, **kwargs):
+        """
+        Add a request.
+
+        :param op: Operation e.g. put, get, delete, upload_part.
+        :keyword status: True if request passed.
+        :keyword error: Error message of failed request.
+        :keyword nbytes: Bytes transferred.
+        """
+        self._buffer().append(IORecord(op, bucket, key, start, end, kwargs.get("status", True),
+                                       kwargs.get("error"), kwargs.get("nbytes", 0)))
+
+    @contextmanager
+    def record(self, op: str, bucket: str, key: str = None, nbytes: int = 0):
+        """Record request executed in the context, exception marks it failed and is raised."""
+        start = time.time()
+        try:
+            yield
+        except Exception as error:
+            self.add(op, bucket, key, start, time.time(), status=False, error=str(error),
+                     nbytes=nbytes)
+            raise
+        self.add(op, bucket, key, start, time.time(), nbytes=nbytes)
+
+    def records(self) -> list:
+        """All the records ordered by start time."""
+        return sorted((rec for buffer in list(self._buffers) for rec in list(buffer)),
+                      key=lambda rec: rec.start)
+
+    def __len__(self):
+        return sum(len(buffer) for buffer in self._buffers)
+
+    def save(self, path: str) -> str:
+        """Write records as json lines."""
+        with open(path, "w", encoding="utf-8") as journal_file:
+            for rec in self.records():
+                journal_file.write(json.dumps(rec._asdict()) + "\n")
+        return path
+
+
+def journal_record(journal: IOJournal, op: str, bucket: str, key: str = None, nbytes: int = 0):
+    """Record context of the journal, no-op if journal is None."""
+    if journal is None:
+        return nullcontext()
+    return journal.record(op, bucket, key, nbytes)
+
+
+class TimelineEvent:
+    """Event which records when it is set and cleared, used in place of threading.Event."""
+
+    def __init__(self, event: threading.Event = None, name: str = "fault"):
+        """
+        :param event: Event to be wrapped, new threading.Event if None.
+        :param name: Name of fault windows.
+        """
+        self.event = event or threading.Event()
+        self.name = name
+        self.timeline = []
+
+    def set(self, name: str = None):
+        """Set the event and start a fault window."""
+        self.timeline.append((time.time(), name or self.name, "start"))
+        self.event.set()
+
+    def clear(self):
+        """Clear the event and end the fault window."""
+        self.event.clear()
+        self.timeline.append((time.time(), None, "end"))
+
+    def is_set(self) -> bool:
+        """Same as Event.is_set."""
+        return self.event.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Same as Event.wait."""
+        return self.event.wait(timeout)
+
+    def windows(self) -> list:
+        """Fault windows, window still open ends now."""
+        windows = []
+        current = None
+        for timestamp, name, phase in self.timeline:
+            if phase == "start" and current is None:
+                current = (name, timestamp)
+            elif phase == "end" and current is not None:
+                windows.append(FaultWindow(current[0], current[1], timestamp))
+                current = None
+        if current is not None:
+            windows.append(FaultWindow(current[0], current[1], time.time()))
+        return windows
+
+
+def in_fault_window(record: IORecord, windows: list) -> bool:
+    """True if request overlaps any fault window, its failure is expected."""
+    return any(record.start < window.end and record.end > window.start for window in windows)
+
+
+def percentile(values: list, pct: float):
+    """Nearest rank percentile of sorted values, None if empty."""
+    if not values:
+        return None
+    rank = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def io_stats(records: list, percentiles: tuple = (50, 90, 99)) -> dict:
+    """Request count, error rate, availability, bytes and latency percentiles of records."""
+    latencies = sorted(rec.end - rec.start for rec in records)
+    failed = sum(not rec.status for rec in records)
+    stats = {"requests": len(records), "failed": failed,
+             "error_rate": failed / len(records) if records else 0.0,
+             "availability": 1 - failed / len(records) if records else None,
+             "bytes": sum(rec.bytes for rec in records if rec.status)}
+    for pct in percentiles:
+        stats[f"latency_p{pct}"] = percentile(latencies, pct)
+    return stats
+
+
+def classify_fault_windows(records: list, windows: list, percentiles: tuple = (50, 90, 99),
+                           by_op: bool = False) -> list:
+    """
+    Stats of requests before, during and after each fault window.
+
+    Before and after of a window extend to the neighbouring windows, a request is during a
+    window if it overlaps it even partially.
+    :param records: IOJournal records.
+    :param windows: TimelineEvent windows.
+    :param by_op: Also split stats by operation.
+    :return: list of dict per window with before, during and after stats.
+    """
+    report = []
+    windows = sorted(windows, key=lambda window: window.start)
+    for idx, window in enumerate(windows):
+        low = windows[idx - 1].end if idx > 0 else float("-inf")
+        high = windows[idx + 1].start if idx + 1 < len(windows) else float("inf")
+        phases = {
+            "before": [rec for rec in records if rec.start >= low and rec.end <= window.start],
+            "during": [rec for rec in records if rec.start < window.end and
+                       rec.end > window.start],
+            "after": [rec for rec in records if rec.start >= window.end and rec.end <= high],
+        }
+        entry = {"name": window.name, "start": window.start, "end": window.end}
+        for phase, phase_records in phases.items():
+            entry[phase] = io_stats(phase_records, percentiles)
+            if by_op:
+                for op in sorted({rec.op for rec in phase_records}):
+                    entry[phase][op] = io_stats([rec for rec in phase_records if rec.op == op],
+                                                percentiles)
+        report.append(entry)
+    for entry in report:
+        LOGGER.info("Fault window %s: during %s, after %s", entry["name"], entry["during"],
+                    entry["after"])
+    return report
+
+
+def unexpected_failures(records: list, windows: list) -> list:
+    """Failed requests which do not overlap any fault window."""
+    return [rec for rec in records if not rec.status and not in_fault_window(rec, windows)]
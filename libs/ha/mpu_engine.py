@@ -0,0 +1,258 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Concurrent multipart upload engine for HA tests.
+
+Part bodies are read from file offsets or generated on demand when a part is submitted, at most
+window parts are in flight (and in memory) at a time. ETag, md5, size and timing of every
+uploaded part is kept in a part map which is persisted after each part, so an upload interrupted
+by a fault is resumed by uploading only the missing parts.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from commons import errorcodes as err
+from commons.exceptions import CTException
+from commons.utils.s3_utils import MultipartEtagTracker
+from libs.ha.io_journal import journal_record
+
+LOGGER = logging.getLogger(__name__)
+
+
+def file_parts(file_path: str, part_size: int):
+    """
+    Part source reading part bodies from file offsets.
+
+    :param file_path: File to be uploaded.
+    :param part_size: Part size in bytes, last part may be smaller.
+    :return: callable returning body of a part number.
+    """
+    def read_part(part_number: int) -> bytes:
+        with open(file_path, "rb") as file_obj:
+            file_obj.seek((part_number - 1) * part_size)
+            return file_obj.read(part_size)
+    return read_part
+
+
+def generated_parts(seed: int, part_size: int, total_size: int):
+    """
+    Part source generating deterministic random part bodies, no file is needed.
+
+    :param seed: Seed of the object data, a part is the same for the same seed and part number.
+    :param part_size: Part size in bytes, last part may be smaller.
+    :param total_size: Object size in bytes.
+    :return: callable returning body of a part number.
+    """
+    def generate_part(part_number: int) -> bytes:
+        size = max(0, min(part_size, total_size - (part_number - 1) * part_size))
+        return hashlib.shake_128(f"{seed}:{part_number}".encode()).digest(size)
+    return generate_part
+
+
+class MultipartUploadEngine:
+    """Upload parts of a multipart upload concurrently with resumable part map."""
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(self, s3_mp_obj, bucket_name: str, object_name: str, part_source,
+                 part_map_path: str = None, window: int = 4, **kwargs):
+        """
+        :param s3_mp_obj: S3MultipartTestLib object, its boto3 client is shared by workers.
+        :param bucket_name: Name of the bucket.
+        :param object_name: Name of the object.
+        :param part_source: callable returning body of a part number, see file_parts.
+        :param part_map_path: JSON file of upload id and uploaded parts, upload is resumed
+            from it if it exists.
+        :param window: Maximum parts in flight.
+        :keyword event: Fault event, failures while it is set are expected.
+        :keyword journal: IOJournal in which every part upload is recorded.
+        :keyword content_md5: Send Content-MD5 of every part, default True.
+        """
+        self.s3_mp_obj = s3_mp_obj
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.part_source = part_source
+        self.part_map_path = part_map_path
+        self.window = max(1, window)
+        self.event = kwargs.get("event")
+        self.journal = kwargs.get("journal")
+        self.content_md5 = kwargs.get("content_md5", True)
+        self.upload_id = None
+        self.parts = {}
+        self.tracker = MultipartEtagTracker(sha256_digests=False)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load upload id and uploaded parts of the same object from part map."""
+        if not self.part_map_path or not os.path.exists(self.part_map_path):
+            return
+        with open(self.part_map_path, "r", encoding="utf-8") as map_file:
+            part_map = json.load(map_file)
+        if (part_map["bucket"], part_map["key"]) != (self.bucket_name, self.object_name):
+            LOGGER.warning("Part map %s is of %s/%s, ignored", self.part_map_path,
+                           part_map["bucket"], part_map["key"])
+            return
+        self.upload_id = part_map["upload_id"]
+        self.parts = {int(number): part for number, part in part_map["parts"].items()}
+        for number, part in self.parts.items():
+            self.tracker.add_etag(number, part["md5"], part["size"])
+        LOGGER.info("Resuming upload %s with %s uploaded parts", self.upload_id, len(self.parts))
+
+    def save(self):
+        """Write part map, file is replaced atomically."""
+        if not self.part_map_path:
+            return
+        with self._lock:
+            part_map = {"bucket": self.bucket_name, "key": self.object_name,
+                        "upload_id": self.upload_id,
+                        "parts": {str(number): part for number, part in self.parts.items()}}
+        tmp_path = f"{self.part_map_path}.tmp"
+        with self._save_lock:
+            with open(tmp_path, "w", encoding="utf-8") as map_file:
+                json.dump(part_map, map_file)
+            os.replace(tmp_path, self.part_map_path)
+
+    def start(self) -> str:
+        """Initiate multipart upload unless it is resumed."""
+        if self.upload_id is None:
+            resp = self.s3_mp_obj.create_multipart_upload(self.bucket_name, self.object_name)
+            self.upload_id = resp[1]["UploadId"]
+            LOGGER.info("Multipart Upload initiated with mpu_id %s", self.upload_id)
+            self.save()
+        return self.upload_id
+
+    def reconcile(self) -> list:
+        """
+        Match part map with parts listed by the server, e.g. after resuming.
+
+        Parts which are missing on server or listed with another ETag are dropped from the map.
+        :return: Dropped part numbers.
+        """
+        listed = {}
+        marker = 0
+        while True:
+            resp = self.s3_mp_obj.list_parts(self.upload_id, self.bucket_name, self.object_name,
+                                             PartNumberMarker=marker)[1]
+            listed.update({part["PartNumber"]: part["ETag"] for part in resp.get("Parts", [])})
+            if not resp.get("IsTruncated"):
+                break
+            marker = resp["NextPartNumberMarker"]
+        with self._lock:
+            dropped = [number for number, part in self.parts.items()
+                       if listed.get(number) != part["etag"]]
+            for number in dropped:
+                del self.parts[number]
+                self.tracker.remove(number)
+        if dropped:
+            LOGGER.warning("Parts %s of upload %s are not on server", dropped, self.upload_id)
+            self.save()
+        return dropped
+
+    def upload_part(self, part_number: int) -> dict:
+        """Upload a part and add it to part map, CTException is raised on failure."""
+        body = self.part_source(part_number)
+        digest = hashlib.md5(body).digest()  # nosec - s3 ETag is based on md5.
+        content_md5 = base64.b64encode(digest).decode("utf-8") if self.content_md5 else None
+        start = time.time()
+        with journal_record(self.journal, "upload_part", self.bucket_name,
+                            f"{self.object_name}/{part_number}", len(body)):
+            resp = self.s3_mp_obj.upload_multipart(
+                body=body, bucket_name=self.bucket_name, object_name=self.object_name,
+                upload_id=self.upload_id, part_number=part_number, content_md5=content_md5)
+        etag = resp[1]["ETag"]
+        if etag.strip('"') != digest.hex():
+            raise CTException(err.S3_CLIENT_ERROR,
+                              f"ETag {etag} of part {part_number} is not md5 {digest.hex()}")
+        part = {"etag": etag, "md5": digest.hex(), "size": len(body), "start": start,
+                "end": time.time()}
+        with self._lock:
+            self.parts[part_number] = part
+            self.tracker.add_etag(part_number, part["md5"], part["size"])
+        self.save()
+        LOGGER.info("Uploaded part %s in %.3fs", part_number, part["end"] - start)
+        return part
+
+    def upload(self, part_numbers: list) -> tuple:
+        """
+        Upload parts which are not in part map yet, window parts at a time.
+
+        :param part_numbers: Part numbers in upload order.
+        :return: (expected failed parts, failed parts), failure is expected if fault event was
+            set at start or end of the part upload.
+        """
+        pending = [number for number in part_numbers if number not in self.parts]
+        LOGGER.info("Uploading %s parts, %s parts in flight", len(pending), self.window)
+        exp_failed_parts, failed_parts = [], []
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.window,
+                                thread_name_prefix="mpu-part") as executor:
+            while pending or in_flight:
+                while pending and len(in_flight) < self.window:
+                    number = pending.pop(0)
+                    in_fault = self.event is not None and self.event.is_set()
+                    in_flight[executor.submit(self.upload_part, number)] = (number, in_fault)
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number, in_fault = in_flight.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        continue
+                    if not isinstance(error, CTException):
+                        raise error
+                    LOGGER.error("Failed to upload part %s: %s", number, error)
+                    if in_fault or (self.event is not None and self.event.is_set()):
+                        exp_failed_parts.append(number)
+                    else:
+                        failed_parts.append(number)
+        return exp_failed_parts, failed_parts
+
+    def parts_etag(self) -> list:
+        """Uploaded parts in the format of complete_multipart_upload."""
+        return [{"PartNumber": number, "ETag": self.parts[number]["etag"]}
+                for number in sorted(self.parts)]
+
+    def expected_etag(self) -> str:
+        """ETag of the object once the uploaded parts are completed."""
+        return self.tracker.etag()
+
+    def stats(self) -> dict:
+        """Uploaded parts, bytes and throughput."""
+        if not self.parts:
+            return {"parts": 0, "bytes": 0, "duration": 0, "mb_per_sec": 0}
+        size = sum(part["size"] for part in self.parts.values())
+        duration = max(part["end"] for part in self.parts.values()) - \
+            min(part["start"] for part in self.parts.values())
+        return {"parts": len(self.parts), "bytes": size, "duration": duration,
+                "mb_per_sec": size / (1024 ** 2) / duration if duration else 0}
+
+    def complete(self) -> tuple:
+        """Complete multipart upload with uploaded parts."""
+        return self.s3_mp_obj.complete_multipart_upload(self.upload_id, self.parts_etag(),
+                                                        self.bucket_name, self.object_name)
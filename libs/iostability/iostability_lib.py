@@ -24,14 +24,11 @@ import json
 import logging
 import threading
 import time
-from datetime import datetime, timedelta
 
 from commons.mail_script_utils import Mail
-from commons.utils import system_utils
-from config.s3 import S3_CFG
+from libs.iostability.workload_scheduler import WorkloadScheduler
 from libs.s3 import ACCESS_KEY, SECRET_KEY
 from libs.s3.s3_test_lib import S3TestLib
-from scripts.s3_bench import s3bench
 
 
 class IOStabilityLib:
@@ -46,64 +43,29 @@ class IOStabilityLib:
         self.max_retries = max_retries
         self.http_client_timeout  = timeout
 
+    # pylint: disable=too-many-arguments
     def execute_workload_distribution(self, distribution, clients, total_obj,
-                                      duration_in_days, log_file_prefix, buckets_created=None):
+                                      duration_in_days, log_file_prefix, buckets_created=None,
+                                      **kwargs):
         """Execution given workload distribution.
+
+        Object size classes run concurrently with clients shared as per the distribution
+        weight, cleanup of degraded mode objects runs in background.
         :param distribution: Distribution of object size
         :param clients: No of clients
         :param total_obj: total number of objects per iteration
         :param duration_in_days: Duration expected of the test run
         :param log_file_prefix: Log file prefix for s3bench
         :param buckets_created: Buckets already created to be used for IO operations.
+        :keyword target_ops: Global ops/sec target rate.
+        :keyword target_mbps: Global MB/s target rate.
+        :keyword interval: Interval in seconds for throughput/latency snapshots.
+        :return: list of per interval throughput and latency snapshots.
         """
-        workloads = [(size, int(total_obj * percent / 100)) for size, percent in
-                     distribution.items()]
-        end_time = datetime.now() + timedelta(days=duration_in_days)
-        loop = 0
-        while datetime.now() < end_time:
-            for size, samples in workloads:
-                bucket_name = f"{log_file_prefix}-bucket-{loop}-{str(int(time.time()))}".lower()
-                skip_cleanup = False
-                if buckets_created is not None:
-                    bucket_name = buckets_created[loop % len(buckets_created)]
-                    skip_cleanup = True
-                if samples == 0:
-                    continue
-                cur_clients = clients
-                if cur_clients > samples:
-                    cur_clients = samples
-                resp = s3bench.s3bench(ACCESS_KEY, SECRET_KEY, bucket=bucket_name,
-                                       num_clients=cur_clients, num_sample=samples,
-                                       obj_name_pref="object-", obj_size=size,
-                                       skip_cleanup=skip_cleanup, duration=None,
-                                       log_file_prefix=str(log_file_prefix).upper(),
-                                       end_point=S3_CFG["s3_url"],
-                                       validate_certs=S3_CFG["validate_certs"],
-                                       max_retries=self.max_retries,
-                                       httpclientimeout=self.http_client_timeout)
-                self.log.info("Loop: %s Workload: %s objects of %s with %s parallel clients.",
-                              loop, samples, size, clients)
-                self.log.info("Log Path %s", resp[1])
-                assert not s3bench.check_log_file_error(resp[1]), \
-                    f"S3bench workload failed in loop {loop}. Please read log file {resp[1]}"
-                # delete file if operation successful.
-                system_utils.remove_file(resp[1])
-                if skip_cleanup:
-                    # delete only objects, to be used for degraded mode.
-                    self.log.info("Delete Created Objects")
-                    resp = self.s3t_obj.object_list(bucket_name=bucket_name)
-                    obj_list = resp[1]
-                    while len(obj_list):
-                        if len(obj_list) > 1000:
-                            self.s3t_obj.delete_multiple_objects(bucket_name,
-                                                                 obj_list=obj_list[0:1000])
-                            obj_list = obj_list[1000:]
-                        else:
-                            self.s3t_obj.delete_multiple_objects(bucket_name=bucket_name,
-                                                                 obj_list=obj_list)
-                            obj_list = []
-                    self.log.info("Objects deletion completed")
-            loop += 1
+        scheduler = WorkloadScheduler(self.s3t_obj, distribution, clients, total_obj,
+                                      log_file_prefix, max_retries=self.max_retries,
+                                      httpclientimeout=self.http_client_timeout, **kwargs)
+        return scheduler.run(duration_in_days, buckets_created=buckets_created)
 
 
 class MailNotification(threading.Thread):
@@ -0,0 +1,305 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Rate controlled workload scheduler for IO stability testing.
+
+Object size classes of a workload distribution run concurrently, each with its share of the
+clients. A global token bucket caps the ops/sec and/or MB/s submitted to the cluster, objects
+left behind for degraded mode runs are deleted in background and per interval throughput and
+latency are written to a JSON lines file.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from datetime import datetime, timedelta
+
+from commons.utils import system_utils
+from commons.utils.benchmark_utils import parse_s3bench_output
+from commons.utils.benchmark_utils import size_to_bytes
+from config.s3 import S3_CFG
+from libs.s3 import ACCESS_KEY, SECRET_KEY
+from scripts.s3_bench import s3bench
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Thread safe token bucket, allows a request to go into debt so large batches are paced."""
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        Init method.
+
+        :param rate: Units (ops or bytes) per second, None/0 disables the limiter.
+        :param burst: Maximum tokens accumulated while idle, defaults to one second of rate.
+        """
+        self.rate = rate
+        self.burst = burst or rate
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float, stop_event: threading.Event = None) -> bool:
+        """
+        Wait till tokens are available and consume the amount.
+
+        :param amount: Units to be consumed.
+        :param stop_event: Event to abort waiting.
+        :return: False if aborted by stop_event else True.
+        """
+        if not self.rate:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 0:
+                    self._tokens -= amount
+                    return True
+                wait_time = -self._tokens / self.rate
+            if stop_event is not None:
+                if stop_event.wait(min(wait_time, 5)):
+                    return False
+            else:
+                time.sleep(min(wait_time, 5))
+
+
+class IntervalRecorder:
+    """Aggregate throughput and latency of completed batches per interval."""
+
+    def __init__(self, file_path: str, interval: int = 300):
+        """
+        Init method.
+
+        :param file_path: JSON lines file where interval snapshots are written.
+        :param interval: Interval in seconds.
+        """
+        self.file_path = file_path
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self._stats = {}
+        self.snapshots = []
+
+    def add(self, size: str, results: list):
+        """
+        Add s3bench results of a completed batch.
+
+        :param size: Object size class of the batch.
+        :param results: list of BenchmarkResult parsed from s3bench log.
+        """
+        with self._lock:
+            for res in results:
+                stat = self._stats.setdefault((size, res.operation), {
+                    "ops": 0, "bytes": 0, "errors": 0, "lat_sum": 0.0, "p99": 0.0})
+                stat["ops"] += res.requests
+                stat["bytes"] += res.requests * res.object_size
+                stat["errors"] += res.errors
+                stat["lat_sum"] += res.latency.get("avg", res.latency.get("p50", 0.0)) * \
+                    res.requests
+                stat["p99"] = max(stat["p99"], res.latency.get("p99", 0.0))
+            if time.time() - self._start >= self.interval:
+                self._flush()
+
+    def _flush(self):
+        """Write current interval snapshot and start a new interval, lock should be held."""
+        end = time.time()
+        elapsed = max(end - self._start, 1e-6)
+        snapshot = {"start": self._start, "end": end, "classes": []}
+        for (size, operation), stat in sorted(self._stats.items()):
+            snapshot["classes"].append({
+                "size": size, "operation": operation, "ops": stat["ops"],
+                "errors": stat["errors"], "iops": round(stat["ops"] / elapsed, 3),
+                "mbps": round(stat["bytes"] / elapsed / (1024 ** 2), 3),
+                "avg_latency": round(stat["lat_sum"] / stat["ops"], 6) if stat["ops"] else 0,
+                "max_p99_latency": stat["p99"]})
+        if snapshot["classes"]:
+            with open(self.file_path, "a", encoding="utf-8") as fd_write:
+                fd_write.write(json.dumps(snapshot) + "\n")
+            self.snapshots.append(snapshot)
+            LOGGER.info("Interval stats: %s", snapshot)
+        self._stats = {}
+        self._start = end
+
+    def close(self):
+        """Flush the last partial interval."""
+        with self._lock:
+            self._flush()
+
+
+# pylint: disable=too-many-instance-attributes
+class WorkloadScheduler:
+    """Run object size classes of a workload distribution concurrently with rate control."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, s3t_obj, distribution: dict, clients: int, total_obj: int,
+                 log_file_prefix: str, **kwargs):
+        """
+        Init method.
+
+        :param s3t_obj: S3TestLib object used for background cleanup.
+        :param distribution: Distribution of object size e.g. {"4Kb": 50, "1Mb": 50}.
+        :param clients: Total number of clients, shared between size classes as per weight.
+        :param total_obj: Total number of objects per iteration.
+        :param log_file_prefix: Log file prefix for s3bench.
+        :keyword target_ops: Global ops/sec target, None for no limit.
+        :keyword target_mbps: Global MB/s target, None for no limit.
+        :keyword interval: Interval in seconds for throughput/latency snapshots.
+        :keyword max_retries: s3bench max retries.
+        :keyword httpclientimeout: s3bench http client timeout.
+        :keyword cleanup_workers: Number of background cleanup threads.
+        """
+        self.s3t_obj = s3t_obj
+        self.log_file_prefix = log_file_prefix
+        self.max_retries = kwargs.get("max_retries")
+        self.http_client_timeout = kwargs.get("httpclientimeout")
+        self.access_key = kwargs.get("access_key", ACCESS_KEY)
+        self.secret_key = kwargs.get("secret_key", SECRET_KEY)
+        total_weight = sum(distribution.values()) or 1
+        self.workloads = []
+        for size, percent in distribution.items():
+            samples = int(total_obj * percent / 100)
+            if samples == 0:
+                continue
+            size_clients = max(1, min(samples, round(clients * percent / total_weight)))
+            self.workloads.append((size, samples, size_clients))
+        target_mbps = kwargs.get("target_mbps")
+        self.ops_limiter = RateLimiter(kwargs.get("target_ops"))
+        self.bytes_limiter = RateLimiter(target_mbps * 1024 ** 2 if target_mbps else None)
+        log_dir = s3bench.LOG_DIR
+        if not system_utils.path_exists(log_dir):
+            system_utils.make_dirs(log_dir)
+        self.recorder = IntervalRecorder(
+            os.path.join(log_dir, f"{str(log_file_prefix).upper()}_workload_intervals.jsonl"),
+            kwargs.get("interval", 300))
+        self.cleanup_pool = ThreadPoolExecutor(max_workers=kwargs.get("cleanup_workers", 2),
+                                               thread_name_prefix="cleanup")
+        self.stop_event = threading.Event()
+        self.failures = []
+        self._cleanup_futures = []
+        self._lock = threading.Lock()
+
+    def cleanup_objects(self, bucket_name: str, prefix: str) -> int:
+        """
+        Delete objects with given prefix in slices of 1000 keys while listing pages.
+
+        :param bucket_name: Name of the bucket.
+        :param prefix: Object name prefix used by the batch.
+        :return: Number of deleted objects.
+        """
+        deleted = 0
+        paginator = self.s3t_obj.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            keys = [obj["Key"] for obj in page.get("Contents", [])]
+            if keys:
+                self.s3t_obj.delete_multiple_objects(bucket_name, obj_list=keys, quiet=True)
+                deleted += len(keys)
+        LOGGER.info("Deleted %s objects with prefix %s from %s", deleted, prefix, bucket_name)
+        return deleted
+
+    def _run_size_class(self, size: str, samples: int, clients: int, end_time: datetime,
+                        buckets_created: list = None):
+        """Run batches of a size class, other size classes are stopped if it fails."""
+        try:
+            self._run_batches(size, samples, clients, end_time, buckets_created)
+        except BaseException:
+            LOGGER.error("Workload of %s failed, stopping other workloads", size)
+            self.stop_event.set()
+            raise
+
+    def _run_batches(self, size: str, samples: int, clients: int, end_time: datetime,
+                     buckets_created: list = None):
+        """Run batches of a size class in loop till end time or stop event."""
+        loop = 0
+        size_bytes = size_to_bytes(size)
+        # s3bench writes, reads and deletes every sample.
+        ops_per_batch = samples * (2 if buckets_created is not None else 3)
+        while datetime.now() < end_time and not self.stop_event.is_set():
+            if not self.ops_limiter.acquire(ops_per_batch, self.stop_event) or \
+                    not self.bytes_limiter.acquire(2 * samples * size_bytes, self.stop_event):
+                break
+            skip_cleanup = buckets_created is not None
+            prefix = f"object-{size}-{loop}-".lower()
+            if skip_cleanup:
+                bucket_name = buckets_created[loop % len(buckets_created)]
+            else:
+                bucket_name = f"{self.log_file_prefix}-bucket-{size}-{loop}-" \
+                              f"{int(time.time())}".lower()
+            resp = s3bench.s3bench(self.access_key, self.secret_key, bucket=bucket_name,
+                                   num_clients=clients, num_sample=samples,
+                                   obj_name_pref=prefix, obj_size=size,
+                                   skip_cleanup=skip_cleanup, duration=None,
+                                   log_file_prefix=str(self.log_file_prefix).upper(),
+                                   end_point=S3_CFG["s3_url"],
+                                   validate_certs=S3_CFG["validate_certs"],
+                                   max_retries=self.max_retries,
+                                   httpclientimeout=self.http_client_timeout)
+            LOGGER.info("Loop: %s Workload: %s objects of %s with %s parallel clients.",
+                        loop, samples, size, clients)
+            LOGGER.info("Log Path %s", resp[1])
+            if s3bench.check_log_file_error(resp[1]):
+                self.failures.append(f"S3bench workload of {size} failed in loop {loop}. "
+                                     f"Please read log file {resp[1]}")
+                self.stop_event.set()
+                break
+            self.recorder.add(size, parse_s3bench_output(resp[1], object_size=size,
+                                                         concurrency=clients))
+            # delete file if operation successful.
+            system_utils.remove_file(resp[1])
+            if skip_cleanup:
+                # delete only objects in background, to be used for degraded mode.
+                future = self.cleanup_pool.submit(self.cleanup_objects, bucket_name, prefix)
+                with self._lock:
+                    self._cleanup_futures = [fut for fut in self._cleanup_futures
+                                             if not fut.done() or fut.exception()]
+                    self._cleanup_futures.append(future)
+            loop += 1
+
+    def run(self, duration_in_days: float, buckets_created: list = None):
+        """
+        Run workload distribution for given duration.
+
+        :param duration_in_days: Duration expected of the test run.
+        :param buckets_created: Buckets already created to be used for IO operations.
+        :return: list of interval snapshots.
+        """
+        end_time = datetime.now() + timedelta(days=duration_in_days)
+        LOGGER.info("Scheduling workloads %s till %s", self.workloads, end_time)
+        with ThreadPoolExecutor(max_workers=len(self.workloads) or 1,
+                                thread_name_prefix="workload") as executor:
+            futures = [executor.submit(self._run_size_class, size, samples, clients, end_time,
+                                       buckets_created)
+                       for size, samples, clients in self.workloads]
+            wait_futures(futures)
+        self.cleanup_pool.shutdown(wait=True)
+        self.recorder.close()
+        for fut in futures:
+            if fut.exception():
+                raise fut.exception()
+        for fut in self._cleanup_futures:
+            if fut.exception():
+                self.failures.append(str(fut.exception()))
+        assert not self.failures, f"Workload execution failed: {self.failures}"
+        return self.recorder.snapshots
@@ -26,9 +26,13 @@ import logging
 import re
 import json
 from commons.commands import JMX_CMD
+from commons.commands import JMX_CMD_NO_DASHBOARD
 from commons.utils import system_utils
 from commons.utils import config_utils
+from commons.utils.benchmark_utils import BenchmarkResultStore
+from commons.utils.benchmark_utils import compare_with_baseline
 from config import JMETER_CFG, CSM_REST_CFG
+from libs.jmeter.jtl_analyzer import analyze_jtl
 
 
 class JmeterInt():
@@ -44,6 +48,9 @@ class JmeterInt():
         self.jtl_log_path = JMETER_CFG["jtl_log_path"]
         self.test_data_csv = JMETER_CFG["test_data_csv"]
         self.log_file_path = ""
+        self.dashboard = JMETER_CFG.get("dashboard", True)
+        self.jtl_analyzer = None
+        self.dashboard_generated = False
 
     def append_log(self, log_file: str):
         """Append and verify log to the log file.
@@ -54,11 +61,17 @@ class JmeterInt():
             content = file.read()
         self.log.debug(content)
 
-    def run_jmx(self, jmx_file: str, threads:int=25, rampup:int=1, loop:int=1, test_cfg:str=None):
+    # pylint: disable=too-many-arguments
+    def run_jmx(self, jmx_file: str, threads:int=25, rampup:int=1, loop:int=1, test_cfg:str=None,
+                dashboard:bool=None):
         """Set the user properties and run the jmx file
         :param jmx_file: jmx file located in the JMX_PATH
+        :param dashboard: Generate JMeter HTML dashboard, JMeterConfig dashboard if None.
+            JTL is analyzed in either case, see analyze_jtl.
         :return [tuple]: response of command
         """
+        if dashboard is None:
+            dashboard = self.dashboard
         if test_cfg is None:
             test_cfg = os.path.join(self.jmeter_path, self.test_data_csv)
         content = {"test.environment.hostname": JMETER_CFG["mgmt_vip"],
@@ -81,16 +94,56 @@ class JmeterInt():
         log_file = jmx_file.split(".")[0] + ".jtl"
         self.log_file_path = os.path.join(self.jtl_log_path, log_file)
         self.log.info("Log file name : %s ", self.log_file_path)
-        cmd = JMX_CMD.format(self.jmeter_path, jmx_file_path, self.log_file_path, self.jtl_log_path)
+        if dashboard:
+            cmd = JMX_CMD.format(self.jmeter_path, jmx_file_path, self.log_file_path,
+                                 self.jtl_log_path)
+        else:
+            cmd = JMX_CMD_NO_DASHBOARD.format(self.jmeter_path, jmx_file_path,
+                                              self.log_file_path)
         self.log.info("Executing JMeter command : %s", cmd)
+        self.dashboard_generated = dashboard
         result, resp = system_utils.run_local_cmd(cmd, chk_stderr=True)
         if result:
             self.log.info("Jmeter execution completed.")
         else:
             assert result, "Failed to execute command."
-        self.append_log(self.log_file_path)
+        self.analyze_jtl()
         return resp
 
+    def analyze_jtl(self, jtl_path: str = None):
+        """Analyze the JTL in a single pass and save the report next to it.
+
+        :param jtl_path: JTL file path, JTL of the last run if None.
+        :return [dict]: per label and total stats with per second time series.
+        """
+        jtl_path = jtl_path or self.log_file_path
+        self.jtl_analyzer = analyze_jtl(jtl_path)
+        report = self.jtl_analyzer.save(os.path.splitext(jtl_path)[0] + "_report.json")
+        self.log.info("JTL Total : %s", json.dumps(
+            {key: value for key, value in report["total"].items() if key != "messages"}))
+        return report
+
+    def save_results(self, build: str, store: BenchmarkResultStore = None):
+        """Save per label results of the last analyzed JTL for the build.
+
+        :param build: CSM build number/name.
+        :param store: BenchmarkResultStore, default store if None.
+        :return [list]: BenchmarkResult list.
+        """
+        results = self.jtl_analyzer.to_benchmark_results(build=build)
+        (store or BenchmarkResultStore()).save(results, build)
+        return results
+
+    def compare_with_build(self, baseline_build: str, store: BenchmarkResultStore = None,
+                           **kwargs):
+        """Compare results of the last analyzed JTL with the results of a baseline build.
+
+        :param baseline_build: Baseline CSM build number/name saved with save_results.
+        :return [list]: comparison per label and metric, see compare_results.
+        """
+        return compare_with_baseline(self.jtl_analyzer.to_benchmark_results(), baseline_build,
+                                     store, **kwargs)
+
     # pylint: disable=too-many-arguments
     def run_verify_jmx(
         self,
@@ -207,8 +260,13 @@ class JmeterInt():
     def get_err_cnt(self,fpath):
         """
         Read the error count parameter from statistics.json file
+        JTL analysis of the last run is used when dashboard is not generated, statistics.json
+        of an earlier run may exist then.
         :param fpath: Statistics.json file path
         """
+        if self.jtl_analyzer is not None and not self.dashboard_generated:
+            total = self.jtl_analyzer.total()
+            return total.errors, total.requests
         data = config_utils.read_content_json(fpath)
         self.log.debug("Request Statistics : \n%s",json.dumps(data,indent=4, sort_keys=True))
         return int(data["Total"]["errorCount"]), int(data["Total"]["sampleCount"])
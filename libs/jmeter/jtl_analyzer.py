@@ -0,0 +1,256 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Streaming analyzer of JMeter JTL (CSV) result files.
+
+Samples are read once and reduced per label to counters, a log scale latency histogram
+(1% relative precision) and error breakdowns, and overall to a per second time series, so
+memory does not grow with number of samples. Results are converted to BenchmarkResult records
+to be stored and compared between builds with benchmark_utils.
+"""
+
+import csv
+import json
+import logging
+import math
+from collections import Counter
+
+from commons.utils.benchmark_utils import BenchmarkResult
+
+LOGGER = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+# Relative width of latency histogram buckets.
+BUCKET_GROWTH = 1.01
+MAX_MESSAGES = 20
+
+
+def _bucket(value: float) -> int:
+    """Histogram bucket of a latency in ms."""
+    return int(math.log(value + 1, BUCKET_GROWTH))
+
+
+def _bucket_upper(bucket: int) -> float:
+    """Upper bound in ms of a histogram bucket."""
+    return BUCKET_GROWTH ** (bucket + 1) - 1
+
+
+class LabelStats:
+    """Counters and latency histogram of samples of a label."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.sent_bytes = 0
+        self.elapsed_sum = 0
+        self.latency_sum = 0
+        self.connect_sum = 0
+        self.min = None
+        self.max = None
+        self.first = None
+        self.last = None
+        self.histogram = Counter()
+        self.response_codes = Counter()
+        self.messages = Counter()
+
+    # pylint: disable=too-many-arguments
+    def add(self, timestamp: int, elapsed: int, success: bool, code: str, message: str,
+            **kwargs):
+        """
+        Add a sample.
+
+        :param timestamp: Start time of sample in ms.
+        :param elapsed: Elapsed time of sample in ms.
+        :param success: Sample passed.
+        :param code: Response code.
+        :param message: Failure message.
+        :keyword nbytes: Received bytes.
+        :keyword sent: Sent bytes.
+        :keyword latency: Time to first byte in ms.
+        :keyword connect: Connect time in ms.
+        """
+        self.requests += 1
+        self.elapsed_sum += elapsed
+        self.bytes += kwargs.get("nbytes", 0)
+        self.sent_bytes += kwargs.get("sent", 0)
+        self.latency_sum += kwargs.get("latency", 0)
+        self.connect_sum += kwargs.get("connect", 0)
+        self.min = elapsed if self.min is None else min(self.min, elapsed)
+        self.max = elapsed if self.max is None else max(self.max, elapsed)
+        self.first = timestamp if self.first is None else min(self.first, timestamp)
+        self.last = timestamp + elapsed if self.last is None else \
+            max(self.last, timestamp + elapsed)
+        self.histogram[_bucket(elapsed)] += 1
+        if not success:
+            self.errors += 1
+            self.response_codes[code] += 1
+            if message in self.messages or len(self.messages) < MAX_MESSAGES:
+                self.messages[message] += 1
+            else:
+                self.messages["<other>"] += 1
+
+    def merge(self, other):
+        """Add counters of another LabelStats."""
+        for name in ("requests", "errors", "bytes", "sent_bytes", "elapsed_sum", "latency_sum",
+                     "connect_sum"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name, func in (("min", min), ("max", max), ("first", min), ("last", max)):
+            values = [val for val in (getattr(self, name), getattr(other, name))
+                      if val is not None]
+            setattr(self, name, func(values) if values else None)
+        self.histogram.update(other.histogram)
+        self.response_codes.update(other.response_codes)
+        self.messages.update(other.messages)
+
+    def percentile(self, pct: float) -> float:
+        """Latency percentile in ms from the histogram, within 1% of the exact value."""
+        if not self.requests:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.requests))
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return min(_bucket_upper(bucket), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """Throughput, latency and error stats of the label."""
+        duration = max((self.last or 0) - (self.first or 0), 1) / 1000.0
+        summary = {
+            "requests": self.requests, "errors": self.errors,
+            "error_pct": round(self.errors * 100.0 / self.requests, 3) if self.requests else 0,
+            "throughput": round(self.requests / duration, 3),
+            "received_kb_per_sec": round(self.bytes / 1024.0 / duration, 3),
+            "sent_kb_per_sec": round(self.sent_bytes / 1024.0 / duration, 3),
+            "duration": duration,
+            "mean": round(self.elapsed_sum / self.requests, 3) if self.requests else None,
+            "ttfb_mean": round(self.latency_sum / self.requests, 3) if self.requests else None,
+            "connect_mean": round(self.connect_sum / self.requests, 3) if self.requests else None,
+            "min": self.min, "max": self.max,
+            "response_codes": dict(self.response_codes.most_common()),
+            "messages": dict(self.messages.most_common()),
+        }
+        for pct in PERCENTILES:
+            value = self.percentile(pct)
+            summary[f"p{pct}"] = round(value, 3) if value is not None else None
+        return summary
+
+
+class JtlAnalyzer:
+    """Single pass analyzer of JTL CSV files."""
+
+    def __init__(self, interval: int = 1):
+        """
+        :param interval: Seconds per time series point.
+        """
+        self.interval = interval
+        self.labels = {}
+        # interval start in seconds to [requests, errors, elapsed sum, bytes].
+        self.timeseries = {}
+        self.threads = 0
+        self.bad_rows = 0
+
+    def add_row(self, row: dict):
+        """Add a JTL row read by csv.DictReader."""
+        try:
+            timestamp = int(row["timeStamp"])
+            elapsed = int(row["elapsed"])
+        except (KeyError, TypeError, ValueError):
+            self.bad_rows += 1
+            return
+        success = str(row.get("success", "true")).lower() == "true"
+        nbytes = int(row.get("bytes") or 0)
+        self.labels.setdefault(row.get("label", ""), LabelStats()).add(
+            timestamp, elapsed, success, row.get("responseCode", ""),
+            row.get("failureMessage") or row.get("responseMessage", ""), nbytes=nbytes,
+            sent=int(row.get("sentBytes") or 0), latency=int(row.get("Latency") or 0),
+            connect=int(row.get("Connect") or 0))
+        point = self.timeseries.setdefault(timestamp // 1000 // self.interval * self.interval,
+                                           [0, 0, 0, 0])
+        point[0] += 1
+        point[1] += int(not success)
+        point[2] += elapsed
+        point[3] += nbytes
+        self.threads = max(self.threads, int(row.get("allThreads") or 0))
+
+    def add_file(self, jtl_path: str):
+        """Stream rows of a JTL CSV file with header."""
+        with open(jtl_path, "r", encoding="utf-8", errors="replace", newline="") as jtl_file:
+            for row in csv.DictReader(jtl_file):
+                self.add_row(row)
+        if self.bad_rows:
+            LOGGER.warning("Skipped %s unparsable rows of %s", self.bad_rows, jtl_path)
+        return self
+
+    def total(self) -> LabelStats:
+        """Stats of all labels."""
+        total = LabelStats()
+        for stats in self.labels.values():
+            total.merge(stats)
+        return total
+
+    def report(self) -> dict:
+        """Per label and total summary with per interval time series."""
+        timeseries = [{"time": second, "requests": point[0], "errors": point[1],
+                       "throughput": point[0] / self.interval,
+                       "mean": round(point[2] / point[0], 3),
+                       "received_kb_per_sec": round(point[3] / 1024.0 / self.interval, 3)}
+                      for second, point in sorted(self.timeseries.items())]
+        return {"labels": {label: stats.summary() for label, stats in sorted(self.labels.items())},
+                "total": self.total().summary(), "timeseries": timeseries,
+                "threads": self.threads}
+
+    def save(self, path: str) -> dict:
+        """Write report as JSON."""
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+        LOGGER.info("JTL report saved to %s", path)
+        return report
+
+    def to_benchmark_results(self, concurrency: int = None, build: str = None) -> list:
+        """
+        BenchmarkResult per label and "Total", to be stored and compared between builds.
+
+        :param concurrency: JMeter threads, max active threads of the JTL if None.
+        :param build: Build number.
+        """
+        results = []
+        stats_list = sorted(self.labels.items()) + [("Total", self.total())]
+        for label, stats in stats_list:
+            summary = stats.summary()
+            latency = {name: summary[name] / 1000.0 for name in
+                       ["mean", "min", "max"] + [f"p{pct}" for pct in PERCENTILES]
+                       if summary[name] is not None}
+            latency["avg"] = latency.pop("mean", None)
+            results.append(BenchmarkResult(
+                "jmeter", label, concurrency=concurrency or self.threads,
+                throughput=summary["received_kb_per_sec"] / 1024.0,
+                iops=summary["throughput"], latency=latency, errors=summary["errors"],
+                requests=summary["requests"], duration=summary["duration"], build=build,
+                extra={"response_codes": summary["response_codes"]}))
+        return results
+
+
+def analyze_jtl(jtl_path: str, interval: int = 1) -> JtlAnalyzer:
+    """Analyze a JTL CSV file, see JtlAnalyzer.report for the results."""
+    return JtlAnalyzer(interval).add_file(jtl_path)
@@ -37,6 +37,8 @@ LOGGER = logging.getLogger(__name__)
 FT_CHKSUM = 1
 FT_PARITY = 2
 EMAP_CMD = 'python3 ~/error_injection.py'
+FI_RETRIES = 3
+PARSE_SIZE = 10485760
 
 
 class EmapCommand:
@@ -45,7 +47,7 @@ class EmapCommand:
     """
 
     def __init__(self):
-        self.parent_cmd = [EMAP_CMD]
+        self.parent_cmd = EMAP_CMD
         self.cmd_options = list()
         self.opts = dict()
 
@@ -117,7 +119,7 @@ class EmapCommandBuilder:
         Constructs the concrete command with provided options or arguments.
         """
         cmd = self._command
-        cmd.build_options(kwargs)
+        cmd.build_options(**kwargs)
         return cmd
 
 
@@ -143,9 +145,17 @@ class InjectCorruption(ABC):
 class MotrCorruptionAdapter(InjectCorruption):
     """Implements InjectCorruption interface to perform corruption at Motr level."""
 
-    def __init__(self, cmn_cfg, oid):
-        """Initialize connection to Nodes or Pods."""
+    def __init__(self, cmn_cfg, oid, **kwargs):
+        """
+        Initialize connection to Nodes or Pods.
+        :keyword trace_file: m0trace output file of the object IO, cob FIDs of oid are read
+            from it if they are not indexed yet
+        :keyword metadata_device: metadata device, emap list of data pods is indexed to try
+            pods holding entries of the cob first
+        """
         self.cmn_cfg = cmn_cfg
+        self.trace_file = kwargs.get("trace_file")
+        self.metadata_device = kwargs.get("metadata_device")
         self.nodes = cmn_cfg["nodes"]
         self.connections = list()
         self.oid = oid  # deals with a single oid at a moment
@@ -176,20 +186,26 @@ class MotrCorruptionAdapter(InjectCorruption):
 
     def get_object_cob_id(self, oid, dtype):
         """
-        Fetch COB ID from the M0CP trace file.
-        :param oid:
-        :param dtype:
+        Fetch COB ID of the object from metadata index built from the M0CP trace file.
+        Trace file is read with grep lookup of read_m0trace_log if the object is not indexed.
+        :param oid: object id used while reading m0trace with read_m0trace_log
+        :param dtype: FT_CHKSUM for data unit or FT_PARITY for parity unit
         :return: COB ID in FID format to be corrupted
         """
-        return ''
+        unit_type = "DATA" if dtype == FT_CHKSUM else "PARITY"
+        cobs = self.motr_obj.metadata_index.cobs(oid, unit_type=unit_type)
+        if not cobs and self.trace_file:
+            self.motr_obj.read_m0trace_log(self.trace_file, obj=oid)
+            cobs = self.motr_obj.metadata_index.cobs(oid, unit_type=unit_type)
+        return cobs[0] if cobs else ''
 
     def get_metadata_shard(self, oid):
         """
         Locate metadata shard.
         :param oid:
-        :return: COB ID in FID format to be corrupted
+        :return: metadata device given to the adapter
         """
-        return ''
+        return self.metadata_device or ''
 
     def restart_motr_container(self, index):
         """
@@ -202,11 +218,28 @@ class MotrCorruptionAdapter(InjectCorruption):
     def build_emap_command(self, ftype=FT_PARITY):
         selected_shard = self.get_metadata_shard(self.oid)
         cob_id = self.get_object_cob_id(self.oid, dtype=ftype)
-        kwargs = dict(corrupt_emap=cob_id, parse_size=10485760,
+        kwargs = dict(corrupt_emap=cob_id, parse_size=PARSE_SIZE,
                       emap_count=1, metadata_db_path=selected_shard)
-        cmd = EmapCommandBuilder.build(**kwargs)
+        cmd = EmapCommandBuilder().build(**kwargs)
         return cmd
 
+    def owner_pods(self, cob_id: str, data_pods: list) -> list:
+        """
+        Pods holding emap entries of the cob, emap list of data pods is indexed once.
+        :param cob_id: COB ID in FID format
+        :param data_pods: data pod names
+        :return: list of pod names, empty if metadata device is not given
+        """
+        if not cob_id or not self.metadata_device:
+            return []
+        index = self.motr_obj.metadata_index
+        if not index.pods_of(cob_id):
+            try:
+                index.refresh(data_pods, self.metadata_device, PARSE_SIZE)
+            except IOError as ex:
+                LOGGER.warning("emap list of data pods failed: %s", ex)
+        return index.pods_of(cob_id)
+
     def inject_fault_k8s(self, fault_type: int):
         """
         Inject fault of type checksum or parity.
@@ -217,30 +250,31 @@ class MotrCorruptionAdapter(InjectCorruption):
         try:
             data_pods = self.master_node_list[0].get_all_pods_and_ips(POD_NAME_PREFIX)
             LOGGER.debug("Data pods and ips : %s", data_pods)
-            for pod_name, pod_ip in data_pods.items():
+            command = self.build_emap_command(fault_type)
+            cob_id = self.get_object_cob_id(self.oid, dtype=fault_type)
+            # Pods holding emap entries of the cob are tried first.
+            owners = self.owner_pods(cob_id, list(data_pods))
+            pods = [pod for pod in owners if pod in data_pods] + \
+                [pod for pod in data_pods if pod not in owners]
+            for pod_name in pods:
                 motr_containers = self.master_node_list[0].get_container_of_pod(
                     pod_name, MOTR_CONTAINER_PREFIX)
-                motr_instances = len(motr_containers)
                 # select 1st motr instance
-                retries = 1
                 success = False
-                while retries > 0:
+                for attempt in range(FI_RETRIES):
                     try:
                         resp = self.master_node_list[0].send_k8s_cmd(
                             operation="exec",
                             pod=pod_name,
                             namespace=NAMESPACE,
-                            command_suffix=f"-c {motr_containers[0]} -- "
-                                           f"{self.build_emap_command(fault_type)}",
+                            command_suffix=f"-c {motr_containers[0]} -- {command}",
                             decode=True)
                         if resp:
                             success = True
                             break
                     except IOError as ex:
-                        LOGGER.exception("remaining retrying: %s")
-                        retries -= 1
-                        time.sleep(2)
-
+                        LOGGER.warning("Emap fault injection on %s failed: %s", pod_name, ex)
+                        time.sleep(min(2 ** attempt, 8))
                 if success:
                     break
             if self.restart_motr_container(0):
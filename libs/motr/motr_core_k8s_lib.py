@@ -31,6 +31,7 @@ from commons.params import LOG_DIR, LATEST_LOG_FOLDER
 from libs.motr import TEMP_PATH
 from libs.motr import FILE_BLOCK_COUNT
 from libs.motr.layouts import BSIZE_LAYOUT_MAP
+from libs.motr.motr_metadata_index import MotrMetadataIndex
 from libs.ha.ha_common_libs_k8s import HAK8s
 from config import CMN_CFG
 from commons.utils import system_utils
@@ -76,6 +77,7 @@ class MotrCoreK8s():
         self.node_dict = self._get_cluster_info
         self.node_pod_dict = self.get_node_pod_dict()
         self.ha_obj = HAK8s()
+        self.metadata_index = MotrMetadataIndex(self.node_obj)
 
 
     @property
@@ -726,96 +728,47 @@ class MotrCoreK8s():
         log.info("Resp of trace: %s", resp)
         return resp, filepath
 
-    def read_m0trace_log(self, filepath):
+    def read_m0trace_log(self, filepath, obj=None):
         """
         This method reads the log and fetch tfid belongs to DATA and PARITY block
         returns dict of tfid with DATA and PARITY.
+        obj: object id, cob fids are indexed for the object in metadata_index if given
         """
-        tfid_list = []
-        checksum_dict = {}
-        data_blk = 0
-        parity_blk = 0
         local_path = os.path.join(LOG_DIR, LATEST_LOG_FOLDER, filepath)
         self.master_node_list[0].copy_file_to_local(filepath, local_path)
         cmd = Template(common_cmd.GREP_DP_BLOCK_FID).substitute(file=filepath)
         resp = self.master_node_list[0].execute_cmd(cmd, read_lines=True)
         log.debug("output of m0trace utility %s", resp)
-        lines = str(resp).split("\\n")
-        for line in lines:
-            if "tfid" in line:
-                tfid_list.append(line)  # append the target fid in the list.
-            if '[P]' in line:
-                if tfid_list:
-                    tfid = tfid_list.pop()
-                    tfid = tfid.split(" ")
-                    fid = tfid[-1][1:-1]  # fetch target fid and strip the <>
-                    dict_schema = {"PARITY"+str(parity_blk): fid}  # create dictionary
-                    checksum_dict.update(dict_schema)
-                    parity_blk=parity_blk+1
-            if "[D]" in line:
-                if tfid_list:
-                    tfid = tfid_list.pop()
-                    tfid = tfid.split(" ")
-                    fid = tfid[-1][1:-1]  # fetch target fid and strip the <>
-                    dict_schema = {"DATA"+str(data_blk): fid}  # create dictionary
-                    checksum_dict.update(dict_schema)
-                    data_blk=data_blk+1
+        lines = resp if isinstance(resp, list) else str(resp).split("\\n")
+        checksum_dict = self.metadata_index.add_trace(obj or filepath, lines)
         log.debug("DICT is %s", checksum_dict)
         return checksum_dict
 
-    # pylint: disable=too-many-locals
     def fetch_gob(self, metadata_device, parse_size, fid:dict):
         """
         This method helps to verify the gob id by running emap_list using error_injection script
         it returns the corresponding data,parity block checksum id
+        emap list of all the pods is indexed in a single pass and gob of every fid is looked up
+        from metadata_index.
         """
         pod_list = self.node_obj.get_all_pods(common_const.POD_NAME_PREFIX)
         log.debug("pod list is %s", pod_list)
-        d_fid = []
-        p_fid = []
-        data_checksum_list = []
-        parity_checksum_list = []
-        for key, value in fid.items():
-            if "DATA" in key:        # fetch the value from dict for data block
-                fid_val = value[7:16]
-                d_fid.append(fid_val)
-            else:                   # fetch the value from dict for parity block
-                fid_val = value[7:16]
-                p_fid.append(fid_val)
-        # Iterate over data pods to copy the error_injection.py script on motr container
+        d_fid = [*{value[7:16] for key, value in fid.items() if "DATA" in key}]
+        p_fid = [*{value[7:16] for key, value in fid.items() if "DATA" not in key}]
+        log.debug("lists of d_fid, p_fid %s \n %s", d_fid, p_fid)
+        # Copy the error_injection.py script on motr container of data pods
         for pod in pod_list:
             result = self.master_node_list[0].copy_file_to_container(
                 "error_injection.py", pod, common_const.CONTAINER_PATH,
                 common_const.MOTR_CONTAINER_PREFIX+"-001")
             if not result:
                 raise FileNotFoundError
-            # Run script to list emap and dump the output to the file
-            cmd = Template(common_cmd.EMAP_LIST).substitute(path=metadata_device, size=parse_size,
-                                                            file=f"{pod}-emap_list.txt")
-            self.node_obj.send_k8s_cmd(
-                operation="exec", pod=pod, namespace=common_const.NAMESPACE,
-                command_suffix=f"-c {common_const.MOTR_CONTAINER_PREFIX}-001 "
-                               f"-- {cmd}", decode=True)
-            d_fid = [*set(d_fid)]
-            p_fid = [*set(p_fid)]
-            log.debug("lists of d_fid, p_fid %s \n %s", d_fid, p_fid)
-            # Fetch the target fid from emap list output captured in file while running
-            # emap list on motr container
-            for data_fid in d_fid:
-                cmd = common_cmd.FETCH_ID_EMAP.format(
-                    f"{pod}-emap_list.txt", data_fid)
-                d_resp = self.master_node_list[0].execute_cmd(cmd)
-                d_resp = d_resp.decode('UTF-8').strip(",\n")  # strip the resp and make it readable
-                if d_resp:
-                    # log.debug("gob data entity %s", d_resp)
-                    data_checksum_list.append(d_resp)
-            for parity_fid in p_fid:
-                cmd = common_cmd.FETCH_ID_EMAP.format(
-                    f"{pod}-emap_list.txt", parity_fid)
-                p_resp = self.master_node_list[0].execute_cmd(cmd)
-                p_resp = p_resp.decode('UTF-8').strip(",\n")  # strip the resp and make it readable
-                if p_resp:
-                    parity_checksum_list.append(p_resp)
+        self.metadata_index.refresh(pod_list, metadata_device, parse_size)
+        gobs = self.metadata_index.gobs(d_fid + p_fid)
+        data_checksum_list = [gobs[data_fid][pod] for pod in pod_list for data_fid in d_fid
+                              if pod in gobs.get(data_fid, {})]
+        parity_checksum_list = [gobs[parity_fid][pod] for pod in pod_list for parity_fid in p_fid
+                                if pod in gobs.get(parity_fid, {})]
         log.debug("gob data %s", data_checksum_list)
         log.debug("gob Parity %s", parity_checksum_list)
         return data_checksum_list, parity_checksum_list
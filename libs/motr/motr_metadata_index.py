@@ -0,0 +1,289 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+In memory index of Motr object, cob FID and GOB metadata.
+
+emap list output of every data pod is read in a single streaming pass and indexed by the FID
+tokens of each entry, later refreshes only read bytes appended after the last indexed offset.
+emap list rewrites the output file, entries of a pod are indexed again from start after it.
+Object to cob FIDs are indexed from m0trace output. FID to GOB and object to cob lookups for
+fault injection and DI checks are then served from memory for any number of objects.
+"""
+
+import logging
+import re
+import shlex
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+
+from commons import commands as common_cmd
+from commons import constants as common_const
+from commons.helpers.pods_helper import LogicalNode
+
+log = logging.getLogger(__name__)
+
+FID_TOKEN = re.compile(r"0x[0-9a-fA-F]+(?::0x[0-9a-fA-F]+)?")
+# GOB is 9th field of an emap entry, same as awk $9 of FETCH_ID_EMAP.
+GOB_FIELD = 8
+
+
+def parse_trace_lines(lines) -> dict:
+    """
+    Get target FIDs of DATA and PARITY units from m0trace output.
+
+    :param lines: Lines of "prepare io fops|UTyp" grep of m0trace output.
+    :return: dict of DATA<n>/PARITY<n> to cob FID.
+    """
+    tfid_list = []
+    cob_dict = {}
+    data_blk = parity_blk = 0
+    for line in lines:
+        if "tfid" in line:
+            tfid_list.append(line)
+        if "[P]" in line and tfid_list:
+            cob_dict[f"PARITY{parity_blk}"] = tfid_list.pop().split(" ")[-1].strip()[1:-1]
+            parity_blk += 1
+        if "[D]" in line and tfid_list:
+            cob_dict[f"DATA{data_blk}"] = tfid_list.pop().split(" ")[-1].strip()[1:-1]
+            data_blk += 1
+    return cob_dict
+
+
+def parse_emap_line(line: str):
+    """
+    Parse an emap list entry.
+
+    :return: (FID tokens, GOB) or None if line is not an emap entry.
+    """
+    fields = line.split()
+    if len(fields) <= GOB_FIELD:
+        return None
+    tokens = FID_TOKEN.findall(line)
+    if not tokens:
+        return None
+    return tokens, fields[GOB_FIELD].strip(",")
+
+
+# pylint: disable=too-many-instance-attributes
+class MotrMetadataIndex:
+    """FID to GOB and object to cob index built from emap list and m0trace output."""
+
+    def __init__(self, node_obj, container: str = f"{common_const.MOTR_CONTAINER_PREFIX}-001",
+                 max_workers: int = 8):
+        """
+        Init method.
+
+        :param node_obj: Master node LogicalNode object, its connection details are used to
+            create one connection per refresh thread.
+        :param container: Motr container of data pods in which emap list is run.
+        :param max_workers: Pods read concurrently.
+        """
+        self.node_obj = node_obj
+        self.container = container
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._nodes = []
+        self._seq = 0
+        self.offsets = {}
+        # FID token to {pod: (line sequence, GOB) of last entry of pod}.
+        self.fid_gob = {}
+        self.object_cobs = {}
+
+    def _node(self) -> LogicalNode:
+        """Connected node object of the calling thread, paramiko clients are not shared."""
+        node = getattr(self._local, "node", None)
+        if node is None:
+            node = LogicalNode(hostname=self.node_obj.hostname, username=self.node_obj.username,
+                               password=self.node_obj.password)
+            self._local.node = node
+            with self._lock:
+                self._nodes.append(node)
+        if node.host_obj is None or node.host_obj.get_transport() is None or \
+                not node.host_obj.get_transport().is_active():
+            node.connect()
+        return node
+
+    def close(self):
+        """Close connections of the refresh threads."""
+        with self._lock:
+            nodes, self._nodes = self._nodes, []
+            self._local = threading.local()
+        for node in nodes:
+            node.disconnect()
+
+    def _stream(self, pod: str, cmd: str):
+        """Yield output lines of a command run in the motr container of the pod."""
+        k8s_cmd = common_cmd.KUBECTL_CMD.format("exec", pod, common_const.NAMESPACE,
+                                                f"-c {self.container} -- {cmd}")
+        _, stdout, stderr = self._node().host_obj.exec_command(k8s_cmd)  # nosec
+        yield from stdout
+        if stdout.channel.recv_exit_status() != 0:
+            raise IOError(f"{cmd} failed on {pod}: {stderr.read().decode(errors='ignore')}")
+
+    def add_emap_lines(self, pod: str, lines) -> int:
+        """
+        Index emap list entries of a pod.
+
+        :return: Number of entries indexed.
+        """
+        count = 0
+        with self._lock:
+            for line in lines:
+                entry = parse_emap_line(line)
+                if entry is None:
+                    continue
+                tokens, gob = entry
+                self._seq += 1
+                for token in tokens:
+                    self.fid_gob.setdefault(token, {})[pod] = (self._seq, gob)
+                count += 1
+        return count
+
+    def reset_pod(self, pod: str):
+        """Drop offsets and index entries of a pod, e.g. after its emap list is rewritten."""
+        with self._lock:
+            self.offsets = {key: offset for key, offset in self.offsets.items()
+                            if key[0] != pod}
+            for token in list(self.fid_gob):
+                gobs = self.fid_gob[token]
+                if gobs.pop(pod, None) is not None and not gobs:
+                    del self.fid_gob[token]
+
+    def dump_emap(self, pod: str, metadata_device: str, parse_size: int) -> str:
+        """
+        Run emap list in the pod, output is written to <pod>-emap_list.txt in container.
+
+        The file is truncated by emap list, so the pod is indexed again from offset 0.
+        """
+        path = f"{pod}-emap_list.txt"
+        cmd = Template(common_cmd.EMAP_LIST).substitute(path=metadata_device, size=parse_size,
+                                                        file=path)
+        self._node().send_k8s_cmd(operation="exec", pod=pod, namespace=common_const.NAMESPACE,
+                                  command_suffix=f"-c {self.container} -- {cmd}", decode=True)
+        self.reset_pod(pod)
+        return path
+
+    def refresh_pod(self, pod: str, path: str) -> int:
+        """
+        Index emap entries appended to path in the pod since last refresh.
+
+        :return: Number of entries indexed.
+        """
+        key = (pod, path)
+        with self._lock:
+            offset = self.offsets.get(key, 0)
+        consumed = 0
+        lines = []
+        for raw in self._stream(pod, f"tail -c +{offset + 1} {shlex.quote(path)}"):
+            line = raw if isinstance(raw, str) else raw.decode("utf-8", errors="ignore")
+            if not line.endswith("\n"):
+                # Partial last line is read again in next refresh.
+                break
+            consumed += len(line.encode("utf-8"))
+            lines.append(line)
+        count = self.add_emap_lines(pod, lines)
+        with self._lock:
+            self.offsets[key] = offset + consumed
+        log.debug("Indexed %s emap entries of %s from offset %s", count, pod, offset)
+        return count
+
+    def refresh(self, pods: list, metadata_device: str = None, parse_size: int = None) -> int:
+        """
+        Index emap list of pods concurrently.
+
+        :param pods: Data pods.
+        :param metadata_device: Metadata device, emap list is run again if given.
+        :param parse_size: Size of metadata to be parsed.
+        :return: Number of entries indexed.
+        """
+        def refresh_one(pod):
+            if metadata_device:
+                self.dump_emap(pod, metadata_device, parse_size)
+            return self.refresh_pod(pod, f"{pod}-emap_list.txt")
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pods))),
+                                    thread_name_prefix="emap") as executor:
+                return sum(executor.map(refresh_one, pods))
+        finally:
+            self.close()
+
+    def add_trace(self, obj: str, lines) -> dict:
+        """Index cob FIDs of an object from m0trace output lines."""
+        cob_dict = parse_trace_lines(lines)
+        with self._lock:
+            self.object_cobs[obj] = cob_dict
+        return cob_dict
+
+    def cobs(self, obj: str, unit_type: str = None) -> list:
+        """
+        Cob FIDs of an object.
+
+        :param unit_type: DATA or PARITY, all units if None.
+        """
+        return [fid for unit, fid in self.object_cobs.get(obj, {}).items()
+                if unit_type is None or unit.startswith(unit_type)]
+
+    @staticmethod
+    def _merge(result: dict, gobs: dict):
+        """Keep (sequence, GOB) of the last emap line of each pod, as awk 'END{print $9}'."""
+        for pod, entry in gobs.items():
+            if pod not in result or entry[0] > result[pod][0]:
+                result[pod] = entry
+
+    def _matching(self, fid: str) -> dict:
+        """pod to GOB of entries with FID, partial FID matches any token containing it."""
+        if fid in self.fid_gob:
+            return {pod: gob for pod, (_, gob) in self.fid_gob[fid].items()}
+        result = {}
+        for token, gobs in self.fid_gob.items():
+            if fid in token:
+                self._merge(result, gobs)
+        return {pod: gob for pod, (_, gob) in result.items()}
+
+    def gob(self, fid: str, pod: str = None):
+        """
+        GOB of a FID.
+
+        :param pod: Pod of the emap entry, any pod if None.
+        :return: GOB or None.
+        """
+        gobs = self._matching(fid)
+        if pod is not None:
+            return gobs.get(pod)
+        return next(iter(gobs.values()), None)
+
+    def gobs(self, fids: list) -> dict:
+        """FID to {pod: GOB} of many FIDs, tokens are scanned once for partial FIDs."""
+        result = {fid: dict(self.fid_gob[fid]) for fid in fids if fid in self.fid_gob}
+        partial = [fid for fid in fids if fid not in result]
+        if partial:
+            for token, gobs in self.fid_gob.items():
+                for fid in partial:
+                    if fid in token:
+                        self._merge(result.setdefault(fid, {}), gobs)
+        return {fid: {pod: gob for pod, (_, gob) in gobs.items()}
+                for fid, gobs in result.items()}
+
+    def pods_of(self, fid: str) -> list:
+        """Pods with emap entries of the FID."""
+        return list(self._matching(fid))
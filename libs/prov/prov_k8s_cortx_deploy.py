@@ -31,7 +31,7 @@ import shutil
 import signal
 import string
 import time
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from string import Template
 import requests.exceptions
@@ -53,6 +53,8 @@ from config import PROV_TEST_CFG
 from config import CMN_CFG
 from libs.csm.rest.csm_rest_s3user import RestS3user
 from libs.prov.provisioner import Provisioner
+from libs.prov.service_readiness import ServiceReadinessTracker
+from libs.prov.service_readiness import compare_deploy_metrics
 from libs.s3 import S3H_OBJ
 from libs.s3.s3_test_lib import S3TestLib
 from libs.ha.ha_common_libs_k8s import HAK8s
@@ -91,6 +93,8 @@ class ProvDeployK8sCortxLib:
         self.test_dir_path = os.path.join(TEST_DATA_FOLDER, "testDeployment")
         self.data_only_list = ["data-only", "standard"]
         self.server_only_list = ["server-only", "standard"]
+        self.deploy_metrics = {}
+        self.readiness_report = None
         self.exclusive_pod_list = ["data-only", "server-pod"]
         self.patterns = "invalid release"
         self.local_sol_path = common_const.LOCAL_SOLUTION_PATH
@@ -373,13 +377,12 @@ class ProvDeployK8sCortxLib:
                 # system disk will be used mount /mnt/fs-local-volume on worker node
                 self.execute_prereq_cortx(node, self.deploy_cfg["k8s_dir"], system_disk)
 
-            thread_list = []
-            for each in worker_node_list:
-                worker_thread = Thread(target=self.pull_cortx_image, args=(each,))
-                worker_thread.start()
-                thread_list.append(worker_thread)
-            for each in thread_list:
-                each.join()
+            self.deploy_metrics["worker_prereq"] = time.time() - start_time
+            pull_start = time.time()
+            with ThreadPoolExecutor(max_workers=len(worker_node_list)) as executor:
+                # list() re-raises exception if any of the pulls failed.
+                list(executor.map(self.pull_cortx_image, worker_node_list))
+            self.deploy_metrics["image_pull"] = time.time() - pull_start
 
         def _post_deploy_check(resp):
             if not resp[1]:
@@ -403,12 +406,16 @@ class ProvDeployK8sCortxLib:
                         lines = file.read()
                         LOGGER.debug(lines)
 
+        self.deploy_metrics = {}
+        start_time = time.time()
         _operation_on_worker_node()
         self.prereq_git(master_node_list[0], git_tag)
         self.copy_sol_file(master_node_list[0], sol_file_path, self.deploy_cfg["k8s_dir"])
         pre_check_resp = self.pre_check(master_node_list[0])
         LOGGER.debug("pre-check result %s", pre_check_resp)
+        deploy_start = time.time()
         deploy_resp = self.deploy_cluster(master_node_list[0], self.deploy_cfg["k8s_dir"])
+        self.deploy_metrics["deploy_script"] = time.time() - deploy_start
         LOGGER.debug("Deploy script response %s", deploy_resp)
         _post_deploy_check(deploy_resp)
         return deploy_resp
@@ -1551,38 +1558,37 @@ class ProvDeployK8sCortxLib:
             pod_count = len(server_pod_list)
             LOGGER.debug("THE SERVER POD LIST ARE %s", server_pod_list)
         sleep_val = self.deploy_cfg["service_delay"]
-        if len(data_pod_list) > self.deploy_cfg["node_count"]:
+        if pod_count > self.deploy_cfg["node_count"]:
             sleep_val = self.deploy_cfg["service_delay_scale"]
-        start_time = int(time.time())
-        end_time = start_time + sleep_val * (pod_count * 2)  # max 32 mins timeout
-        response = list()
-        hctl_status = dict()
-        while int(time.time()) < end_time:
-            if self.deployment_type in self.data_only_list:
-                for pod_name in data_pod_list:
-                    resp = self.get_hctl_status(master_node_obj, pod_name)
-                    hctl_status.update({pod_name: resp[0]})
-                    LOGGER.debug("Service time taken from data pod is %s",
-                                 end_time - int(time.time()))
-                LOGGER.debug(hctl_status)
-            if self.deployment_type in self.server_only_list:
-                for server_pod_name in server_pod_list:
-                    resp = self.get_hctl_status(master_node_obj, server_pod_name)
-                    hctl_status.update({server_pod_name: resp[0]})
-                    LOGGER.debug("Service time taken from server pod is %s",
-                                 end_time - int(time.time()))
-                LOGGER.debug(hctl_status)
-            LOGGER.debug("services status is %s, End Time is %s", resp[0], end_time)
-            status = all(element is True for element in list(hctl_status.values()))
-            if status:
-                time_taken = time.time() - start_time
-                LOGGER.info("#### Services online. Time Taken : %s", time_taken)
-                response.append(status)
-                response.append(time_taken)
-                return response
-        LOGGER.info("hctl_status = %s", hctl_status)
-        response.extend([False, 'Timeout'])
-        return response
+        pod_list = []
+        if self.deployment_type in self.data_only_list:
+            pod_list.extend(data_pod_list)
+        if self.deployment_type in self.server_only_list:
+            pod_list.extend(server_pod_list)
+        tracker = ServiceReadinessTracker(
+            master_node_obj, pod_list,
+            max_workers=self.deploy_cfg.get("readiness_probe_workers", 8),
+            min_interval=self.deploy_cfg.get("readiness_min_interval", 5),
+            max_interval=self.deploy_cfg.get("readiness_max_interval", 60))
+        # max 32 mins timeout
+        status, time_taken = tracker.wait_until_ready(timeout=sleep_val * (pod_count * 2))
+        self.readiness_report = tracker.report(extra_metrics=self.deploy_metrics)
+        tracker.save_report(self.readiness_report)
+        LOGGER.info("Pod time to online: %s", self.readiness_report["pods"])
+        LOGGER.info("Service time to online: %s", self.readiness_report["services"])
+        return [status, time_taken]
+
+    def compare_deploy_metrics(self, build: str, baseline_build: str = None) -> list:
+        """
+        Store deploy and service startup metrics of last deployment and compare with baseline.
+        param: build: Current build number
+        param: baseline_build: Baseline build number
+        returns: list of regressed metrics
+        """
+        if not self.readiness_report:
+            return []
+        return compare_deploy_metrics(self.readiness_report, build, baseline_build,
+                                      self.deploy_cfg.get("deploy_regression_pct", 20.0))
 
     # pylint: disable=broad-except
     @staticmethod
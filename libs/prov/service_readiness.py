@@ -0,0 +1,278 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Concurrent service readiness tracker for k8s based Cortx deployments.
+
+hctl status of all the data/server pods is probed concurrently with a bounded pool, probes
+are paced adaptively and first time each service and pod is seen online is recorded as a
+timeline which can be stored and compared between builds.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from paramiko.ssh_exception import SSHException
+
+from commons import commands as common_cmd
+from commons import constants as common_const
+from commons.helpers.pods_helper import LogicalNode
+from commons.params import LATEST_LOG_FOLDER
+from commons.params import LOG_DIR
+from commons.utils.benchmark_utils import BenchmarkResult
+from commons.utils.benchmark_utils import BenchmarkResultStore
+from commons.utils.benchmark_utils import compare_with_baseline
+
+LOGGER = logging.getLogger(__name__)
+
+
+def parse_hctl_services(cluster_status: dict) -> dict:
+    """
+    Get status of every service from hctl status json.
+
+    :param cluster_status: hctl status --json output.
+    :return: dict of "<node>/<service>" to True if started.
+    """
+    services = {}
+    for node_data in cluster_status.get("nodes", []):
+        for svc in node_data.get("svcs", []):
+            if svc["name"] == common_const.MOTR_CLIENT:
+                continue
+            services[f"{node_data.get('name')}/{svc['name']}"] = svc["status"] == "started"
+    return services
+
+
+# pylint: disable=too-many-instance-attributes
+class ServiceReadinessTracker:
+    """Probe hctl status of pods concurrently till all services are online."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, master_node_obj: LogicalNode, pod_list: list, max_workers: int = 8,
+                 min_interval: int = 5, max_interval: int = 60):
+        """
+        Init method.
+
+        :param master_node_obj: Master node object, connection details are used to create one
+            connection per probe thread.
+        :param pod_list: Pods to be probed.
+        :param max_workers: Maximum concurrent probes.
+        :param min_interval: Minimum seconds between probe passes.
+        :param max_interval: Maximum seconds between probe passes when no progress is seen.
+        """
+        self.master_node_obj = master_node_obj
+        self.pod_list = list(pod_list)
+        self.max_workers = max(1, min(max_workers, len(self.pod_list)))
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._nodes = []
+        self.start_time = None
+        self.timeline = []
+        self.pod_online = {}
+        self.service_online = {}
+        self.probe_count = {pod: 0 for pod in self.pod_list}
+
+    def _node(self) -> LogicalNode:
+        """Node object of the calling probe thread, connected on first use."""
+        node = getattr(self._local, "node", None)
+        if node is None:
+            node = LogicalNode(hostname=self.master_node_obj.hostname,
+                               username=self.master_node_obj.username,
+                               password=self.master_node_obj.password)
+            self._local.node = node
+            with self._lock:
+                self._nodes.append(node)
+        transport = node.host_obj.get_transport() if node.host_obj else None
+        if transport is None or not transport.is_active():
+            node.disconnect()
+            node.connect()
+        return node
+
+    @staticmethod
+    def _execute(node: LogicalNode, cmd: str, timeout: int = 60) -> bytes:
+        """Run command on the open connection of the node, execute_cmd reconnects each time."""
+        try:
+            _, stdout, stderr = node.host_obj.exec_command(cmd, timeout=timeout)  # nosec
+            # stderr is drained while stdout is read so a full stderr window can not stall it.
+            error = []
+            reader = threading.Thread(target=lambda: error.append(stderr.read()), daemon=True)
+            reader.start()
+            output = stdout.read()
+            reader.join(timeout)
+        except SSHException as ssh_error:
+            # Connection is broken, next probe of the thread reconnects.
+            node.disconnect()
+            raise IOError(ssh_error) from ssh_error
+        if stdout.channel.recv_exit_status() != 0:
+            raise IOError((error[0] if error else b"").decode("UTF-8", errors="replace") or
+                          output)
+        return output
+
+    def close(self):
+        """Close connections of the probe threads."""
+        with self._lock:
+            nodes, self._nodes = self._nodes, []
+        for node in nodes:
+            node.disconnect()
+
+    def probe(self, pod_name: str) -> dict:
+        """
+        Get service status of a pod.
+
+        :param pod_name: Data/server pod name.
+        :return: dict of service to started status, empty if status is not retrieved.
+        """
+        try:
+            node = self._node()
+            output = self._execute(node, common_cmd.K8S_HCTL_STATUS.format(pod_name))
+            services = parse_hctl_services(json.loads(output.decode("UTF-8")))
+        except (IOError, ValueError, RuntimeError, TimeoutError) as error:
+            LOGGER.debug("hctl status not available from %s: %s", pod_name, error)
+            services = {}
+        now = time.time() - self.start_time
+        with self._lock:
+            self.probe_count[pod_name] += 1
+            for svc, started in services.items():
+                if started and svc not in self.service_online:
+                    self.service_online[svc] = now
+                    self.timeline.append({"time": round(now, 3), "pod": pod_name,
+                                          "service": svc, "status": "online"})
+            if services and all(services.values()) and pod_name not in self.pod_online:
+                self.pod_online[pod_name] = now
+                self.timeline.append({"time": round(now, 3), "pod": pod_name,
+                                      "service": None, "status": "online"})
+        return services
+
+    def wait_until_ready(self, timeout: int) -> tuple:
+        """
+        Probe pods till all the services are online or timeout.
+
+        Only pods which are not online yet are probed in each pass, interval between passes
+        is reset on progress and backs off otherwise. Readiness is confirmed with a final
+        pass on all the pods.
+        :param timeout: Timeout in seconds.
+        :return: (True/False, time taken in seconds)
+        """
+        self.start_time = time.time()
+        end_time = self.start_time + timeout
+        try:
+            return self._wait_until_ready(end_time)
+        finally:
+            self.close()
+
+    def _wait_until_ready(self, end_time: float) -> tuple:
+        """Probe passes till all the services are online or end time."""
+        interval = self.min_interval
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="readiness") as executor:
+            while time.time() < end_time:
+                pending = [pod for pod in self.pod_list if pod not in self.pod_online]
+                if not pending:
+                    statuses = list(executor.map(self.probe, self.pod_list))
+                    if all(status and all(status.values()) for status in statuses):
+                        time_taken = time.time() - self.start_time
+                        LOGGER.info("#### Services online. Time Taken : %s", time_taken)
+                        return True, time_taken
+                    # A service went offline again, track all the pods again.
+                    with self._lock:
+                        self.pod_online.clear()
+                    continue
+                online_before = len(self.service_online)
+                list(executor.map(self.probe, pending))
+                interval = self.min_interval if len(self.service_online) > online_before \
+                    else min(self.max_interval, interval * 1.5)
+                LOGGER.debug("Pods online %s/%s, services online %s, next probe in %ss",
+                             len(self.pod_online), len(self.pod_list),
+                             len(self.service_online), interval)
+                if len(self.pod_online) < len(self.pod_list):
+                    time.sleep(min(interval, max(0, end_time - time.time())))
+        LOGGER.info("Pods not online: %s",
+                    [pod for pod in self.pod_list if pod not in self.pod_online])
+        return False, "Timeout"
+
+    def report(self, extra_metrics: dict = None) -> dict:
+        """
+        Readiness report with per pod and per service time to online.
+
+        :param extra_metrics: Other deployment phase durations e.g. image pull, deploy script.
+        :return: report dict.
+        """
+        services = {}
+        for svc, online_at in self.service_online.items():
+            name = svc.split("/", 1)[-1]
+            services[name] = max(services.get(name, 0), online_at)
+        return {"start_time": self.start_time, "pods": dict(self.pod_online),
+                "services": services, "probes": dict(self.probe_count),
+                "phases": extra_metrics or {}, "timeline": list(self.timeline)}
+
+    def save_report(self, report: dict, file_name: str = "service_readiness.json") -> str:
+        """Write report to latest log folder."""
+        path = os.path.join(LOG_DIR, LATEST_LOG_FOLDER, file_name)
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+        LOGGER.info("Service readiness report: %s", path)
+        return path
+
+
+def readiness_to_bench_results(report: dict) -> list:
+    """
+    Convert readiness report to benchmark results so deploy timings are stored per build.
+
+    :param report: ServiceReadinessTracker report.
+    :return: list of BenchmarkResult with duration in latency "max".
+    """
+    results = [BenchmarkResult("k8s_deploy", f"service_{name}", latency={"max": online_at},
+                               duration=online_at)
+               for name, online_at in report["services"].items()]
+    if report["pods"]:
+        all_online = max(report["pods"].values())
+        results.append(BenchmarkResult("k8s_deploy", "services_online",
+                                       latency={"max": all_online}, duration=all_online))
+    for phase, duration in report.get("phases", {}).items():
+        results.append(BenchmarkResult("k8s_deploy", f"phase_{phase}",
+                                       latency={"max": duration}, duration=duration))
+    return results
+
+
+def compare_deploy_metrics(report: dict, build: str, baseline_build: str = None,
+                           threshold_pct: float = 20.0) -> list:
+    """
+    Store deploy metrics of the build and compare with baseline build.
+
+    :param report: ServiceReadinessTracker report.
+    :param build: Current build number.
+    :param baseline_build: Baseline build number, comparison is skipped if None.
+    :param threshold_pct: Allowed increase in time to online in percentage.
+    :return: list of regressed metrics.
+    """
+    results = readiness_to_bench_results(report)
+    store = BenchmarkResultStore()
+    store.save(results, build)
+    if not baseline_build:
+        return []
+    regressions = compare_with_baseline(results, baseline_build, store=store,
+                                        metrics=("latency_max",), threshold_pct=threshold_pct)
+    for entry in regressions:
+        LOGGER.warning("Deploy regression in %s: %ss -> %ss", entry["operation"],
+                       entry["baseline"], entry["current"])
+    return regressions
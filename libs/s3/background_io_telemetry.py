@@ -0,0 +1,228 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Live telemetry of background s3bench IO.
+
+The IO process parses each s3bench iteration appended to its log and adds it to counters in
+shared memory, the test process reads them while IO is running. TelemetryMonitor writes
+interval snapshots to disk and aborts the IO when failure thresholds are crossed.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from multiprocessing import Array
+
+from commons.utils.benchmark_utils import parse_s3bench_output
+
+LOG = logging.getLogger(__name__)
+
+# Upper bounds in seconds of latency histogram buckets, last bucket is unbounded.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNTERS = ("ops", "bytes", "errors", "iterations", "failed_iterations", "last_update",
+            "started", "max_iteration_time")
+ERROR_KEYWORDS = ("with error ", "panic", "status code", "exit status 2", "InternalError",
+                  "ServiceUnavailable")
+
+
+class IOTelemetry:
+    """Counters and latency histogram of background IO in shared memory."""
+
+    def __init__(self):
+        self._values = Array("d", len(COUNTERS) + len(LATENCY_BUCKETS) + 1)
+        self._log_offset = 0
+
+    def _index(self, name: str) -> int:
+        return COUNTERS.index(name)
+
+    def mark_started(self):
+        """Record start of IO, used for duration of the first iteration."""
+        with self._values.get_lock():
+            self._values[self._index("started")] = time.time()
+
+    def add(self, results: list, failed: bool = False):
+        """
+        Add results of an s3bench iteration.
+
+        :param results: BenchmarkResult list of the iteration.
+        :param failed: True if iteration reported errors or did not complete.
+        """
+        with self._values.get_lock():
+            values = self._values
+            for res in results:
+                values[self._index("ops")] += res.requests
+                values[self._index("bytes")] += (res.requests - res.errors) * res.object_size
+                values[self._index("errors")] += res.errors
+                # s3bench reports only summary per iteration, requests are put in the bucket
+                # of average latency.
+                latency = res.latency.get("avg", res.latency.get("p50"))
+                if latency is not None and res.requests:
+                    bucket = bisect.bisect_left(LATENCY_BUCKETS, latency)
+                    values[len(COUNTERS) + bucket] += res.requests
+            values[self._index("iterations")] += 1
+            values[self._index("failed_iterations")] += int(failed)
+            now = time.time()
+            previous = values[self._index("last_update")] or values[self._index("started")]
+            if previous:
+                values[self._index("max_iteration_time")] = max(
+                    values[self._index("max_iteration_time")], now - previous)
+            values[self._index("last_update")] = now
+
+    def consume_log(self, log_path: str):
+        """Parse s3bench output appended to the log since the last call, used in IO process."""
+        with open(log_path, "r", encoding="utf-8", errors="replace") as log_obj:
+            log_obj.seek(self._log_offset)
+            output = log_obj.read()
+            self._log_offset = log_obj.tell()
+        results = parse_s3bench_output(output)
+        failed = not results or any(res.errors for res in results) or \
+            any(error in output for error in ERROR_KEYWORDS)
+        self.add(results, failed)
+        if failed:
+            LOG.warning("s3bench iteration failed, log: %s", log_path)
+
+    def snapshot(self) -> dict:
+        """Current counters and latency histogram."""
+        with self._values.get_lock():
+            values = list(self._values)
+        snap = {name: values[idx] for idx, name in enumerate(COUNTERS)}
+        for name in ("ops", "errors", "iterations", "failed_iterations"):
+            snap[name] = int(snap[name])
+        snap["histogram"] = dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ["inf"],
+                                     [int(val) for val in values[len(COUNTERS):]]))
+        snap["error_rate"] = snap["errors"] / snap["ops"] if snap["ops"] else 0.0
+        snap["time"] = time.time()
+        return snap
+
+
+class FailureThresholds:
+    """Thresholds on background IO telemetry after which the test is aborted."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, max_error_rate: float = None, max_errors: int = None,
+                 max_failed_iterations: int = None, stall_timeout: float = None,
+                 stall_factor: float = 3):
+        """
+        :param max_error_rate: Maximum errors per request.
+        :param max_errors: Maximum failed requests.
+        :param max_failed_iterations: Maximum failed s3bench iterations.
+        :param stall_timeout: Minimum seconds without a completed iteration to call IO stalled,
+            it should cover the first iteration.
+        :param stall_factor: IO is stalled after stall_factor times the longest iteration so
+            far if that is more than stall_timeout, counters change once per iteration only.
+        """
+        self.max_error_rate = max_error_rate
+        self.max_errors = max_errors
+        self.max_failed_iterations = max_failed_iterations
+        self.stall_timeout = stall_timeout
+        self.stall_factor = stall_factor
+
+    def stall_limit(self, snap: dict) -> float:
+        """Seconds without a completed iteration after which IO is stalled."""
+        return max(self.stall_timeout, self.stall_factor * snap.get("max_iteration_time", 0))
+
+    def check(self, snap: dict, start_time: float) -> str:
+        """
+        Check snapshot against thresholds.
+
+        :return: Reason if any threshold is crossed else None.
+        """
+        if self.max_error_rate is not None and snap["error_rate"] > self.max_error_rate:
+            return f"error rate {snap['error_rate']:.4f} > {self.max_error_rate}"
+        if self.max_errors is not None and snap["errors"] > self.max_errors:
+            return f"errors {snap['errors']} > {self.max_errors}"
+        if self.max_failed_iterations is not None and \
+                snap["failed_iterations"] > self.max_failed_iterations:
+            return f"failed iterations {snap['failed_iterations']} > " \
+                   f"{self.max_failed_iterations}"
+        if self.stall_timeout is not None:
+            last = snap["last_update"] or snap.get("started") or start_time
+            limit = self.stall_limit(snap)
+            if snap["time"] - last > limit:
+                return f"no IO completed in {int(snap['time'] - last)}s > {int(limit)}s"
+        return None
+
+
+class TelemetryMonitor:
+    """Write interval snapshots of IO telemetry and abort IO on crossing thresholds."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, telemetry: IOTelemetry, snapshot_path: str, interval: float = 30,
+                 thresholds: FailureThresholds = None, on_abort=None):
+        """
+        :param telemetry: IOTelemetry shared with the IO process.
+        :param snapshot_path: JSON lines file for interval snapshots.
+        :param interval: Seconds between snapshots.
+        :param thresholds: Failure thresholds, only snapshots are written if None.
+        :param on_abort: Callable called with reason when a threshold is crossed.
+        """
+        self.telemetry = telemetry
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.thresholds = thresholds
+        self.on_abort = on_abort
+        self.abort_reason = None
+        self.start_time = None
+        self._previous = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def record(self) -> dict:
+        """Take a snapshot, write it with interval throughput and check thresholds."""
+        snap = self.telemetry.snapshot()
+        prev = self._previous or {"time": self.start_time, "ops": 0, "bytes": 0, "errors": 0}
+        elapsed = max(snap["time"] - prev["time"], 1e-9)
+        snap["interval_ops_per_sec"] = (snap["ops"] - prev["ops"]) / elapsed
+        snap["interval_mb_per_sec"] = (snap["bytes"] - prev["bytes"]) / elapsed / (1024 ** 2)
+        snap["interval_errors"] = snap["errors"] - prev["errors"]
+        self._previous = snap
+        with open(self.snapshot_path, "a", encoding="utf-8") as snap_file:
+            snap_file.write(json.dumps(snap) + "\n")
+        if self.thresholds and self.abort_reason is None:
+            reason = self.thresholds.check(snap, self.start_time)
+            if reason:
+                self.abort_reason = reason
+                LOG.error("Background IO failure threshold crossed: %s", reason)
+                if self.on_abort:
+                    self.on_abort(reason)
+        return snap
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.record()
+
+    def start(self):
+        """Start taking snapshots in background."""
+        self.start_time = time.time()
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="io-telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> dict:
+        """Stop and take final snapshot."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+        return self.record()
@@ -27,6 +27,7 @@ from typing import Union
 import boto3
 from botocore.exceptions import ClientError
 from config.s3 import S3_CFG
+from libs.s3.s3_client_cache import get_client_cache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -52,6 +53,7 @@ class IAMRest:
         :param endpoint_url: endpoint url.
         :param iam_cert_path: iam certificate path.
         :param debug: debug mode.
+        :param use_client_cache: share boto3 client/resource through credential keyed cache.
         """
         init_iam_connection = kwargs.get("init_iam_connection", True)
         debug = kwargs.get("debug", S3_CFG["debug"])
@@ -65,7 +67,15 @@ class IAMRest:
             boto3.set_stream_logger(name="botocore")
 
         try:
-            if init_iam_connection:
+            if init_iam_connection and kwargs.get("use_client_cache",
+                                                  S3_CFG.get("use_client_cache", True)):
+                client_cache = get_client_cache()
+                conn_kwargs = {"use_ssl": self.use_ssl, "verify": self.iam_cert_path}
+                self.iam = client_cache.client("iam", access_key, secret_key, endpoint_url,
+                                               **conn_kwargs)
+                self.iam_resource = client_cache.resource("iam", access_key, secret_key,
+                                                          endpoint_url, **conn_kwargs)
+            elif init_iam_connection:
                 self.iam = boto3.client("iam",
                                         use_ssl=self.use_ssl,
                                         verify=self.iam_cert_path,
@@ -145,6 +155,7 @@ class IamLib(IAMRest):
         response = self.iam.delete_access_key(
             AccessKeyId=access_key_id, UserName=user_name)
         LOGGER.debug(response)
+        get_client_cache().invalidate(access_key_id)
 
         return response
 
@@ -155,8 +166,16 @@ class IamLib(IAMRest):
         :param user_name: s3 user name.
         :return: delete user response dict.
         """
+        try:
+            access_keys = [key["AccessKeyId"] for key in self.iam.list_access_keys(
+                UserName=user_name)["AccessKeyMetadata"]]
+        except ClientError as error:
+            LOGGER.debug("Access keys of %s not listed: %s", user_name, error)
+            access_keys = []
         response = self.iam.delete_user(UserName=user_name)
         LOGGER.debug(response)
+        for access_key in access_keys:
+            get_client_cache().invalidate(access_key)
 
         return response
 
@@ -0,0 +1,267 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""
+Credential keyed cache of boto3 sessions, clients and resources.
+
+Creating a boto3 client loads the botocore service model, resolves the endpoint and creates
+a new connection pool. Libraries creating S3/IAM objects in loops share clients through this
+cache instead. boto3 clients are thread safe and shared across threads, resources are not and
+are cached per thread. Clients and resources are kept in LRU order up to max_clients, evicted
+ones are only dropped as S3 libraries may still hold them, their connection pools are released
+once unreferenced. Clients of invalidated (deleted) credentials are closed.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import boto3
+from botocore.config import Config
+
+from config import S3_CFG
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _close(client):
+    """Close connection pool of a boto3 client of invalidated credentials."""
+    try:
+        if hasattr(client, "close"):
+            client.close()
+        else:
+            # pylint: disable=protected-access
+            client._endpoint.http_session.close()
+    except Exception as error:  # pylint: disable=broad-except
+        LOGGER.debug("Failed to close invalidated client: %s", error)
+
+
+def _evict(cache: OrderedDict, max_size: int) -> int:
+    """Drop least recently used entries above max size, they are not closed."""
+    evicted = 0
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+        evicted += 1
+    return evicted
+
+
+def _config_key(config: Config) -> tuple:
+    """Hashable key of user provided botocore config options."""
+    if config is None:
+        return ()
+    # pylint: disable=protected-access
+    return tuple(sorted((key, repr(value)) for key, value in
+                        config._user_provided_options.items()))
+
+
+class Boto3ClientCache:
+    """Cache of boto3 sessions, clients and resources keyed by credentials and endpoint."""
+
+    __instance = None
+
+    def __init__(self, max_pool_connections: int = None, max_clients: int = None):
+        """
+        Initialize client cache, use get_instance to get the shared cache.
+
+        :param max_pool_connections: Connection pool size of each cached client.
+        :param max_clients: Cached clients, also sessions and resources of each thread.
+        """
+        self.max_pool_connections = max_pool_connections or \
+            S3_CFG.get("max_pool_connections", 50)
+        self.max_clients = max_clients or S3_CFG.get("client_cache_size", 64)
+        self._lock = threading.RLock()
+        self._sessions = OrderedDict()
+        self._clients = OrderedDict()
+        self._resources = threading.local()
+        # Resources cached in threads are dropped lazily on next access when generation of
+        # whole cache or of their access key is bumped by invalidate.
+        self._generation = 0
+        self._key_generation = {}
+
+    @classmethod
+    def get_instance(cls):
+        """Get shared client cache instance."""
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def _session(self, access_key, secret_key, region, session_token):
+        """Get cached session for the credentials."""
+        key = (access_key, self._hash(secret_key), region, session_token)
+        session = self._sessions.get(key)
+        if session is None:
+            session = boto3.session.Session(aws_access_key_id=access_key,
+                                            aws_secret_access_key=secret_key,
+                                            aws_session_token=session_token,
+                                            region_name=region)
+            self._sessions[key] = session
+            _evict(self._sessions, self.max_clients)
+        else:
+            self._sessions.move_to_end(key)
+        return session
+
+    @staticmethod
+    def _hash(secret_key):
+        """Secret keys are not kept in cache keys as is."""
+        return hashlib.sha256(secret_key.encode()).hexdigest() if secret_key else None
+
+    def _merge_config(self, config: Config = None) -> Config:
+        """Apply cache pool size if config does not set it."""
+        pool_config = Config(max_pool_connections=self.max_pool_connections)
+        if config is None:
+            return pool_config
+        # pylint: disable=protected-access
+        if "max_pool_connections" in config._user_provided_options:
+            return config
+        return pool_config.merge(config)
+
+    # pylint: disable=too-many-arguments
+    def _key(self, service, access_key, secret_key, endpoint_url, region, **kwargs) -> tuple:
+        """Cache key of a client/resource."""
+        return (service, access_key, self._hash(secret_key), endpoint_url, region,
+                kwargs.get("aws_session_token"), kwargs.get("use_ssl", True),
+                str(kwargs.get("verify")), _config_key(kwargs.get("config")))
+
+    def client(self, service: str, access_key: str = None, secret_key: str = None,
+               endpoint_url: str = None, region: str = None, **kwargs):
+        """
+        Get cached boto3 client.
+
+        :param service: Service name e.g. s3, iam.
+        :param access_key: access key.
+        :param secret_key: secret key.
+        :param endpoint_url: endpoint url.
+        :param region: region.
+        :keyword aws_session_token: session token.
+        :keyword use_ssl: use ssl.
+        :keyword verify: certificate path or False.
+        :keyword config: botocore Config.
+        :return: boto3 client.
+        """
+        key = self._key(service, access_key, secret_key, endpoint_url, region, **kwargs)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+            session = self._session(access_key, secret_key, region,
+                                    kwargs.get("aws_session_token"))
+            client = session.client(service, endpoint_url=endpoint_url,
+                                    use_ssl=kwargs.get("use_ssl", True),
+                                    verify=kwargs.get("verify"),
+                                    config=self._merge_config(kwargs.get("config")))
+            self._clients[key] = client
+            if _evict(self._clients, self.max_clients):
+                LOGGER.debug("Evicted least recently used client, %s clients cached",
+                             len(self._clients))
+        return client
+
+    def resource(self, service: str, access_key: str = None, secret_key: str = None,
+                 endpoint_url: str = None, region: str = None, **kwargs):
+        """
+        Get boto3 resource cached for the calling thread, parameters are same as client.
+
+        :return: boto3 resource.
+        """
+        key = self._key(service, access_key, secret_key, endpoint_url, region, **kwargs)
+        cache = getattr(self._resources, "cache", None)
+        if cache is None or self._resources.generation != self._generation:
+            cache = self._resources.cache = OrderedDict()
+            self._resources.generation = self._generation
+        generation = self._key_generation.get(access_key, 0)
+        resource, cached_generation = cache.get(key, (None, None))
+        if resource is None or cached_generation != generation:
+            with self._lock:
+                session = self._session(access_key, secret_key, region,
+                                        kwargs.get("aws_session_token"))
+                resource = session.resource(service, endpoint_url=endpoint_url,
+                                            use_ssl=kwargs.get("use_ssl", True),
+                                            verify=kwargs.get("verify"),
+                                            config=self._merge_config(kwargs.get("config")))
+            cache[key] = resource, generation
+            cache.move_to_end(key)
+            _evict(cache, self.max_clients)
+        else:
+            cache.move_to_end(key)
+        return resource
+
+    def invalidate(self, access_key: str = None) -> int:
+        """
+        Drop cached sessions, clients and resources of deleted credentials.
+
+        :param access_key: Access key to be invalidated, None to clear the whole cache.
+        :return: Number of clients removed.
+        """
+        with self._lock:
+            clients = [key for key in self._clients if access_key is None or key[1] == access_key]
+            for key in clients:
+                _close(self._clients.pop(key))
+            for key in [key for key in self._sessions if access_key is None
+                        or key[0] == access_key]:
+                del self._sessions[key]
+            # Per thread resources of the credentials are dropped lazily on next access.
+            if access_key is None:
+                self._generation += 1
+                self._key_generation.clear()
+            else:
+                self._key_generation[access_key] = self._key_generation.get(access_key, 0) + 1
+        LOGGER.debug("Invalidated %s cached clients of %s", len(clients), access_key or "all")
+        return len(clients)
+
+
+def get_client_cache() -> Boto3ClientCache:
+    """Get shared boto3 client cache."""
+    return Boto3ClientCache.get_instance()
+
+
+def measure_client_creation(iterations: int = 10, first_request: bool = False,
+                            **client_kwargs) -> dict:
+    """
+    Measure construction and first request latency of s3 clients with and without cache.
+
+    :param iterations: Number of clients created in each mode.
+    :param first_request: Also measure latency of first list_buckets call.
+    :param client_kwargs: access_key, secret_key, endpoint_url, region, verify etc.
+    :return: Average seconds per client in each mode.
+    """
+    result = {}
+    for mode in ("uncached", "cached"):
+        construct, request = 0.0, 0.0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            if mode == "cached":
+                client = get_client_cache().client("s3", **client_kwargs)
+            else:
+                client = boto3.client("s3", aws_access_key_id=client_kwargs.get("access_key"),
+                                      aws_secret_access_key=client_kwargs.get("secret_key"),
+                                      endpoint_url=client_kwargs.get("endpoint_url"),
+                                      region_name=client_kwargs.get("region"),
+                                      verify=client_kwargs.get("verify"))
+            construct += time.perf_counter() - start
+            if first_request:
+                start = time.perf_counter()
+                client.list_buckets()
+                request += time.perf_counter() - start
+        result[mode] = {"construction": construct / iterations,
+                        "first_request": request / iterations if first_request else None}
+    LOGGER.info("Client creation latency: %s", result)
+    return result
@@ -22,6 +22,7 @@
 import json
 import os
 import logging
+import signal
 from multiprocessing import Process
 from time import perf_counter_ns
 
@@ -30,6 +31,8 @@ from config.s3 import S3_CFG
 from commons.exceptions import CTException
 from commons.helpers.health_helper import Health
 from commons.helpers.node_helper import Node
+from commons.params import LATEST_LOG_FOLDER
+from commons.params import LOG_DIR
 from commons.utils import assert_utils
 from commons.utils import system_utils
 from commons.utils.system_utils import calculate_checksum
@@ -40,6 +43,8 @@ from libs.s3 import s3_acl_test_lib
 from libs.s3 import s3_bucket_policy_test_lib
 from libs.s3 import s3_multipart_test_lib
 from libs.s3 import s3_tagging_test_lib
+from libs.s3.background_io_telemetry import IOTelemetry
+from libs.s3.background_io_telemetry import TelemetryMonitor
 from libs.s3.iam_policy_test_lib import IamPolicyTestLib
 from libs.s3.s3_rest_cli_interface_lib import S3AccountOperations
 from libs.s3.s3_restapi_test_lib import S3AccountOperationsRestAPI
@@ -356,6 +361,8 @@ class S3BackgroundIO:
             perf_counter_ns())
         self.log_prefix = "parallel_io"
         self.parallel_ios = None
+        self.telemetry = None
+        self.monitor = None
         assert_utils.assert_true(path_exists(s3bench.S3_BENCH_PATH),
                                  f"S3bench tool is not installed: {s3bench.S3_BENCH_PATH}")
         try:
@@ -381,6 +388,9 @@ class S3BackgroundIO:
         kwargs.setdefault("obj_name_pref", "load_gen_")
         kwargs.setdefault("end_point", S3_CFG["s3_url"])
         kwargs.setdefault("validate_certs", S3_CFG["validate_certs"])
+        telemetry = kwargs.get("telemetry")
+        if telemetry:
+            telemetry.mark_started()
         LOG.info("STARTED: s3 io's operations.")
         access_key, secret_key = S3H_OBJ.get_local_keys()
         resp = s3bench.s3bench(
@@ -394,7 +404,8 @@ class S3BackgroundIO:
             obj_size=obj_size,
             duration=duration,
             log_file_prefix=log_file_prefix,
-            validate_certs=kwargs["validate_certs"])
+            validate_certs=kwargs["validate_certs"],
+            iteration_callback=telemetry.consume_log if telemetry else None)
         LOG.info(resp)
         assert_utils.assert_true(
             os.path.exists(
@@ -402,6 +413,12 @@ class S3BackgroundIO:
             f"failed to generate log: {resp[1]}")
         LOG.info("ENDED: s3 io's operations.")
 
+    @staticmethod
+    def s3_ios_session(*args, **kwargs) -> None:
+        """Perform IOs in a new session so that abort can kill s3bench with the process group."""
+        os.setsid()
+        S3BackgroundIO.s3_ios(*args, **kwargs)
+
     def is_alive(self) -> bool:
         """
         Check if parallel IOs are running.
@@ -421,8 +438,15 @@ class S3BackgroundIO:
 
         :param duration: Duration of the test in the format NhMm for N hours and M minutes.
         :param log_prefix: Prefix for s3bench logs.
+        :keyword thresholds: FailureThresholds, IO is stopped when crossed.
+        :keyword snapshot_interval: Seconds between telemetry snapshots written to disk.
+        :keyword on_abort: Callable called with reason when thresholds are crossed, in the
+            monitor thread. Tests call assert_healthy at checkpoints to fail on abort.
         """
         self.log_prefix = log_prefix if log_prefix else self.log_prefix
+        thresholds = kwargs.pop("thresholds", None)
+        snapshot_interval = kwargs.pop("snapshot_interval", 30)
+        on_abort = kwargs.pop("on_abort", None)
         if not self.bucket_exists:
             LOG.info("Creating IO bucket: %s", self.io_bucket_name)
             resp = self.s3_test_lib_obj.create_bucket(self.io_bucket_name)
@@ -430,15 +454,56 @@ class S3BackgroundIO:
             LOG.info("Created IO bucket: %s", self.io_bucket_name)
             self.bucket_exists = True
         LOG.info("Check s3 bench tool installed.")
+        self.telemetry = IOTelemetry()
+        kwargs["telemetry"] = self.telemetry
         self.parallel_ios = Process(
-            target=self.s3_ios,
+            target=self.s3_ios_session,
             args=(self.io_bucket_name, self.log_prefix, duration),
             kwargs=kwargs)
         if not self.parallel_ios.is_alive():
             self.parallel_ios.start()
+        snapshot_path = os.path.join(LOG_DIR, LATEST_LOG_FOLDER,
+                                     f"{self.log_prefix}_{perf_counter_ns()}_telemetry.jsonl")
+
+        def abort(reason):
+            self.abort(reason)
+            if on_abort:
+                on_abort(reason)
+
+        self.monitor = TelemetryMonitor(self.telemetry, snapshot_path, snapshot_interval,
+                                        thresholds, abort).start()
         LOG.info("Parallel IOs started: %s for duration: %s",
                  self.parallel_ios.is_alive(), duration)
 
+    def stats(self) -> dict:
+        """Live counters of ops, bytes, errors and latency histogram of the IO process."""
+        return self.telemetry.snapshot() if self.telemetry else {}
+
+    def abort(self, reason: str = None) -> None:
+        """Kill IO process and s3bench started by it e.g. when failure thresholds are crossed."""
+        if self.is_alive():
+            LOG.error("Aborting parallel IOs: %s", reason)
+            for sig in (signal.SIGTERM, signal.SIGKILL):
+                try:
+                    os.killpg(self.parallel_ios.pid, sig)
+                except ProcessLookupError:
+                    # Process group is not created yet.
+                    self.parallel_ios.terminate()
+                self.parallel_ios.join(30)
+                if not self.parallel_ios.is_alive():
+                    break
+
+    @property
+    def aborted(self) -> bool:
+        """True if IO is aborted on crossing failure thresholds."""
+        return bool(self.monitor and self.monitor.abort_reason)
+
+    def assert_healthy(self) -> None:
+        """Fail the test if failure thresholds of background IO are crossed, used at checkpoints."""
+        if self.monitor:
+            assert_utils.assert_false(self.monitor.abort_reason,
+                                      f"Background IO aborted: {self.monitor.abort_reason}")
+
     def stop(self) -> None:
         """Stop the parallel IO's/Process and validate logs."""
         if self.parallel_ios.is_alive():
@@ -446,6 +511,9 @@ class S3BackgroundIO:
             LOG.info(resp)
             self.parallel_ios.join()
             LOG.info("Parallel IOs stopped: %s", not self.parallel_ios.is_alive())
+        if self.monitor:
+            LOG.info("Background IO telemetry: %s", self.monitor.stop())
+            self.assert_healthy()
         if self.log_prefix:
             self.validate()
 
@@ -31,6 +31,7 @@ from botocore.exceptions import ClientError
 
 from commons.constants import S3_ENGINE_RGW
 from config import S3_CFG, CMN_CFG
+from libs.s3.s3_client_cache import get_client_cache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ class S3Rest:
         :param region: region.
         :param aws_session_token: aws_session_token.
         :param debug: debug mode.
+        :param use_client_cache: share boto3 client/resource through credential keyed cache.
         """
         init_s3_connection = kwargs.get("init_s3_connection", True)
         if S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
@@ -76,7 +78,16 @@ class S3Rest:
         if debug:
             self.enable_debug_mode()
         try:
-            if init_s3_connection:
+            if init_s3_connection and kwargs.get("use_client_cache",
+                                                 S3_CFG.get("use_client_cache", True)):
+                client_cache = get_client_cache()
+                conn_kwargs = {"use_ssl": self.use_ssl, "verify": self.s3_cert_path,
+                               "aws_session_token": aws_session_token, "config": config}
+                self.s3_resource = client_cache.resource("s3", access_key, secret_key,
+                                                         endpoint_url, region, **conn_kwargs)
+                self.s3_client = client_cache.client("s3", access_key, secret_key,
+                                                     endpoint_url, region, **conn_kwargs)
+            elif init_s3_connection:
                 self.s3_resource = boto3.resource("s3",
                                                   use_ssl=self.use_ssl,
                                                   verify=self.s3_cert_path,
@@ -25,6 +25,7 @@ import boto3
 from config.s3 import S3_CFG
 from commons.params import TEST_DATA_FOLDER
 from commons.utils import system_utils
+from libs.s3.s3_client_cache import get_client_cache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -326,31 +327,24 @@ def get_objects_list(bucket_name, access_key: str, secret_key: str, **kwargs):
 
 def get_object_checksum(obj_name, bucket_name, access_key: str, secret_key: str, **kwargs):
     """Get the checksum of the contents of the obj_name in the bucket_name
+    Object is fetched directly and hashed in chunks with a cached thread safe client, so it
+    can be called concurrently for many objects.
     """
     LOGGER.debug("Access Key : %s", access_key)
     LOGGER.debug("Secret Key : %s", secret_key)
     endpoint = kwargs.get("endpoint_url", S3_CFG["s3_url"])
     LOGGER.debug("S3 Endpoint : %s", endpoint)
 
-    region = S3_CFG["region"]
+    region = kwargs.get("region_name", S3_CFG["region"])
     LOGGER.debug("Region : %s", region)
 
-    s3_resource = boto3.resource('s3', verify=False,
-                        endpoint_url=endpoint,
-                        aws_access_key_id=access_key,
-                        aws_secret_access_key=secret_key,
-                        region_name=region,
-                        **kwargs)
-    LOGGER.debug("S3 boto resource created")
-    objs = s3_resource.Bucket(bucket_name).objects.all()
-    for obj in objs:
-        if obj.key == obj_name:
-            body = obj.get()['Body'].read()
-            file_hash = md5() # nosec
-            file_hash.update(body)
-            csum = file_hash.hexdigest()
-            break
-    return csum
+    s3_client = get_client_cache().client("s3", access_key=access_key, secret_key=secret_key,
+                                          endpoint_url=endpoint, region=region, verify=False)
+    body = s3_client.get_object(Bucket=bucket_name, Key=obj_name)["Body"]
+    file_hash = md5()  # nosec
+    for chunk in body.iter_chunks(chunk_size=1024 * 1024):
+        file_hash.update(chunk)
+    return file_hash.hexdigest()
 
 def delete_all_buckets(access_key: str, secret_key: str, **kwargs):
     """
@@ -129,10 +129,12 @@ class S3MultipartTestLib(Multipart):
         :param multipart_obj_size: Size of object need to be uploaded in multiples of MiB.
         :keyword total_parts: No. of parts to be uploaded.
         :keyword multipart_obj_path: Path of object file.
+        :keyword tracker: MultipartEtagTracker to which uploaded parts are added.
         :return: (Boolean, List of uploaded parts).
         """
         try:
             b_size = kwargs.get("block_size", "1M")
+            tracker = kwargs.get("tracker", None)
             total_parts = kwargs.get("total_parts", None)
             multipart_obj_path = kwargs.get("multipart_obj_path", None)
             parts = []
@@ -153,6 +155,8 @@ class S3MultipartTestLib(Multipart):
                         data, bucket_name, object_name, upload_id=mpu_id, part_number=i)
                     LOGGER.debug("Part : %s", str(part))
                     parts.append({"PartNumber": i, "ETag": part["ETag"]})
+                    if tracker is not None:
+                        tracker.add_part(i, data)
                     uploaded_bytes += len(data)
                     LOGGER.debug("%s of %s uploaded %.2f%%", uploaded_bytes, multipart_obj_size *
                                  1048576, cal_percent(uploaded_bytes, multipart_obj_size * 1048576))
@@ -239,10 +243,12 @@ class S3MultipartTestLib(Multipart):
         :param bucket_name: Name of the bucket.
         :param object_name: Name of the object.
         # :param chunks: No. of parts to be uploaded with details.
+        :keyword tracker: MultipartEtagTracker to check ETag of each part.
         :return: (Boolean, List of uploaded parts).
         """
         try:
             parts = kwargs.get("parts", None)
+            tracker = kwargs.get("tracker", None)
             parts_details = []
             for part_number in parts:
                 LOGGER.info("Uploading part: %s", part_number)
@@ -250,6 +256,12 @@ class S3MultipartTestLib(Multipart):
                                            upload_id=upload_id, part_number=part_number,
                                            content_md5=parts[part_number][1])
                 parts_details.append({"PartNumber": part_number, "ETag": resp["ETag"]})
+                if tracker is not None:
+                    if part_number not in tracker:
+                        tracker.add_part(part_number, parts[part_number][0])
+                    if not tracker.verify_part(part_number, resp["ETag"]):
+                        raise Exception(f"ETag {resp['ETag']} of part {part_number} does not "
+                                        f"match {tracker.part_etag(part_number)}")
 
             return True, parts_details
         except BaseException as error:
@@ -493,23 +505,27 @@ class S3MultipartTestLib(Multipart):
             response = self.create_multipart_upload(bucket_name, object_name)
             mpu_id = response[1]["UploadId"]
             LOGGER.info("Upload the multipart.")
+            # ETag and data of the object are verified with digests of the uploaded parts.
+            tracker = s3_utils.MultipartEtagTracker(sha256_digests=False)
             if random:
                 chunks = s3_utils.get_unaligned_parts(
-                    file_path, total_parts=total_parts, random=random)
+                    file_path, total_parts=total_parts, random=random, tracker=tracker)
                 _, parts = self.upload_parts_sequential(
-                    mpu_id, bucket_name, object_name, parts=chunks)
+                    mpu_id, bucket_name, object_name, parts=chunks, tracker=tracker)
+                del chunks
                 parts = sorted(parts, key=lambda x: x['PartNumber'])
             else:
                 _, parts = self.upload_parts(
                     mpu_id, bucket_name, object_name, file_size, total_parts=total_parts,
-                    multipart_obj_path=file_path)
-            uploaded_checksum = s3_utils.calc_checksum(file_path)
+                    multipart_obj_path=file_path, tracker=tracker)
             LOGGER.info("Do ListParts to see the parts uploaded.")
             self.list_parts(mpu_id, bucket_name, object_name)
             LOGGER.info("Get the part details and perform CompleteMultipartUpload.")
             LOGGER.info("parts: %s", parts)
             response = self.complete_multipart_upload(mpu_id, parts, bucket_name, object_name)
             upload_etag = response[1]["ETag"]
+            if upload_etag != tracker.etag():
+                raise Exception(f"ETag {upload_etag} is not expected ETag {tracker.etag()}")
             LOGGER.info("Get the uploaded object")
             resp = self.get_object(bucket_name, object_name, ranges="bytes=1-")
             get_etag = resp['ETag']
@@ -517,14 +533,13 @@ class S3MultipartTestLib(Multipart):
             if upload_etag != get_etag:
                 raise Exception(f"Failed to match ETag: {upload_etag}, {get_etag}")
             LOGGER.info("Matched ETag: %s, %s", upload_etag, get_etag)
-            LOGGER.info("Compare checksum by downloading object.")
+            LOGGER.info("Compare part checksums by downloading object.")
             resp = self.object_download(bucket_name, object_name, download_path)
             LOGGER.info(resp)
-            downloaded_checksum = s3_utils.calc_checksum(download_path)
-            if uploaded_checksum != downloaded_checksum:
-                raise Exception(f"Failed to match checksum: "
-                                f"{uploaded_checksum}, {downloaded_checksum}")
-            LOGGER.info("Matched checksum: %s, %s", uploaded_checksum, downloaded_checksum)
+            mismatched = tracker.verify_file(download_path)
+            if mismatched:
+                raise Exception(f"Failed to match checksum of parts: {mismatched}")
+            LOGGER.info("Matched checksum of %s parts", len(tracker))
         except Exception as error:
             LOGGER.exception(ERR_MSG, S3MultipartTestLib.simple_multipart_upload.__name__, error)
             raise CTException(err.S3_CLIENT_ERROR, error) from error
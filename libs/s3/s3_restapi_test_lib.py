@@ -22,20 +22,23 @@
 
 import logging
 import time
-import urllib
 from http import HTTPStatus
 
 from commons import errorcodes as err
 from commons.constants import Rest
 from commons.exceptions import CTException
-from commons.utils.s3_utils import get_headers
+from commons.utils.s3_utils import confirm
 from commons.utils.s3_utils import convert_xml_to_dict
 from libs.csm.rest.csm_rest_s3user import RestS3user
+from libs.s3.signed_request_client import SignedRequestClient
 from config.s3 import S3_CFG
 from config import CSM_REST_CFG
 
 LOGGER = logging.getLogger(__name__)
 
+# s3auth actions which only read, other actions without a probe wait sync_step to sync.
+READ_ACTIONS = ("List", "Get")
+
 
 class S3AccountOperationsRestAPI(RestS3user):
     """S3 account operations using csm rest api."""
@@ -203,6 +206,15 @@ class S3AuthServerRestAPI(RestS3user):
         """S3AutheServer operations constructor."""
         super().__init__()
         self.endpoint = S3_CFG["s3auth_endpoint"].format(host) if host else S3_CFG["iam_url"]
+        self._clients = {}
+
+    def _client(self, endpoint, access_key, secret_key) -> SignedRequestClient:
+        """Signed request client of the endpoint and credentials."""
+        key = (endpoint, access_key, secret_key)
+        if key not in self._clients:
+            self._clients[key] = SignedRequestClient(endpoint, access_key, secret_key,
+                                                     service="s3", region="US")
+        return self._clients[key]
 
     def execute_restapi_on_s3authserver(
             self, payload, access_key, secret_key, **kwargs) -> tuple:
@@ -212,39 +224,47 @@ class S3AuthServerRestAPI(RestS3user):
         :param payload: payload data used in execution.
         :param access_key: access_key of s3 user.
         :param secret_key: secret_key of s3 user.
-        :param request: s3auth restapi request.
         :param endpoint: s3auth restapi endpoint.
+        :param probe: Callable called with response data which returns True once the change is
+            visible to reads, it is polled until sync_delay. If None, changes wait sync_step
+            and reads are returned without waiting.
         """
-        request = kwargs.get("request", "post")
         endpoint = kwargs.get("endpoint", None)
+        probe = kwargs.get("probe", None)
         # S3auth server endpoint.
         endpoint = endpoint if endpoint else self.endpoint
-        # Create harder by calculate AuthV4 signature.
-        headers = get_headers(
-            request,
-            self.endpoint,
-            payload,
-            service="s3",
-            region="US",
-            access_key=access_key,
-            secret_key=secret_key)
-        LOGGER.debug(headers)
-        # Input data.
-        payload = urllib.parse.urlencode(payload)
         LOGGER.debug(payload)
-        # Fetching api response.
-        response = self.restapi.s3auth_rest_call(
-            "post", data=payload, endpoint=endpoint,
-            headers=headers)
+        # Fetching api response, request is signed with AuthV4 signature.
+        response = self._client(endpoint, access_key, secret_key).post_form(payload)
         response_data = convert_xml_to_dict(response)
         LOGGER.debug(response_data)
         if response.status_code != Rest.SUCCESS_STATUS and response.ok is not True:
             LOGGER.error("s3auth restapi request failed, reason: %s", response_data)
             return False, response_data["ErrorResponse"]["Error"]["Message"]
-        time.sleep(S3_CFG["sync_step"])  # Added for direct rest call to sync.
+        if probe and not confirm(probe, response_data):
+            LOGGER.error("%s is not visible in %ss", payload["Action"], S3_CFG["sync_delay"])
+            return False, f"{payload['Action']} is not visible in {S3_CFG['sync_delay']}s"
+        if probe is None and not payload["Action"].startswith(READ_ACTIONS):
+            time.sleep(S3_CFG["sync_step"])  # Added for direct rest call to sync.
 
         return True, response_data
 
+    def _access_key_status(self, user_name, access_key_id, access_key, secret_key):
+        """Status of an access key of the user, None if it is not listed."""
+        payload = {"Action": "ListAccessKeys"}
+        if user_name:
+            payload["UserName"] = user_name
+        status, response = self.execute_restapi_on_s3authserver(payload, access_key, secret_key)
+        if not status:
+            return None
+        metadata = response["ListAccessKeysResponse"]["ListAccessKeysResult"][
+            "AccessKeyMetadata"] or {}
+        member = metadata.get("member", [])
+        for key in [member] if isinstance(member, dict) else member:
+            if key["AccessKeyId"] == access_key_id:
+                return key["Status"]
+        return None
+
     def update_account_login_profile(
             self, user_name=None, new_password=None, access_key=None, secret_key=None) -> tuple:
         """
@@ -280,7 +300,9 @@ class S3AuthServerRestAPI(RestS3user):
             payload["UserName"] = user_name
         if password:
             payload["Password"] = password
-        status, response = self.execute_restapi_on_s3authserver(payload, access_key, secret_key)
+        status, response = self.execute_restapi_on_s3authserver(
+            payload, access_key, secret_key,
+            probe=lambda _: user_name in self.list_iam_users(access_key, secret_key)[1])
         # Create account login profile.
         payload["Action"] = "CreateLoginProfile"
         self.execute_restapi_on_s3authserver(payload, access_key, secret_key)
@@ -344,7 +366,9 @@ class S3AuthServerRestAPI(RestS3user):
         payload = {"Action": "DeleteUser"}
         if user_name:
             payload["UserName"] = user_name
-        status, response = self.execute_restapi_on_s3authserver(payload, access_key, secret_key)
+        status, response = self.execute_restapi_on_s3authserver(
+            payload, access_key, secret_key,
+            probe=lambda _: user_name not in self.list_iam_users(access_key, secret_key)[1])
 
         return status, response
 
@@ -360,7 +384,10 @@ class S3AuthServerRestAPI(RestS3user):
         payload = {"Action": "CreateAccessKey"}
         if user_name:
             payload["UserName"] = user_name
-        status, response = self.execute_restapi_on_s3authserver(payload, access_key, secret_key)
+        status, response = self.execute_restapi_on_s3authserver(
+            payload, access_key, secret_key, probe=lambda data: self._access_key_status(
+                user_name, data["CreateAccessKeyResponse"]["CreateAccessKeyResult"]["AccessKey"][
+                    "AccessKeyId"], access_key, secret_key) is not None)
         if status:
             response = response["CreateAccessKeyResponse"]["CreateAccessKeyResult"]["AccessKey"]
         LOGGER.debug("Create acesskey response: %s", response)
@@ -389,7 +416,9 @@ class S3AuthServerRestAPI(RestS3user):
         if iam_secret_key:
             payload["SecretKey"] = iam_secret_key
         status, response = self.execute_restapi_on_s3authserver(
-            payload, s3_access_key, s3_secret_key)
+            payload, s3_access_key, s3_secret_key, probe=lambda data: self._access_key_status(
+                user_name, data["CreateAccessKeyResponse"]["CreateAccessKeyResult"]["AccessKey"][
+                    "AccessKeyId"], s3_access_key, s3_secret_key) is not None)
         if status:
             response = response["CreateAccessKeyResponse"]["CreateAccessKeyResult"]["AccessKey"]
         LOGGER.debug("Create acesskey response: %s", response)
@@ -411,7 +440,9 @@ class S3AuthServerRestAPI(RestS3user):
             payload["UserName"] = user_name
         if access_key_id:
             payload["AccessKeyId"] = access_key_id
-        status, response = self.execute_restapi_on_s3authserver(payload, access_key, secret_key)
+        status, response = self.execute_restapi_on_s3authserver(
+            payload, access_key, secret_key, probe=lambda _: self._access_key_status(
+                user_name, access_key_id, access_key, secret_key) is None)
 
         return status, response
 
@@ -454,6 +485,8 @@ class S3AuthServerRestAPI(RestS3user):
             payload["UserName"] = user_name
         payload["Status"] = status
         payload["AccessKeyId"] = user_access_key
-        status, response = self.execute_restapi_on_s3authserver(payload, access_key, secret_key)
+        status, response = self.execute_restapi_on_s3authserver(
+            payload, access_key, secret_key, probe=lambda _: self._access_key_status(
+                user_name, user_access_key, access_key, secret_key) == payload["Status"])
 
         return status, response
@@ -29,6 +29,8 @@ assertions as well, with the main aim being to have leaner and cleaner code in t
 """
 import logging
 import string
+from collections import OrderedDict
+from itertools import groupby
 from secrets import SystemRandom
 from typing import Union
 
@@ -137,6 +139,208 @@ def parse_list_object_versions_response(list_response: dict) -> dict:
     return response
 
 
+DM_PLACEHOLDER = "DMO_DELETEMARKERID_PLACEHOLDER"
+
+
+def s3_key_order(key: str) -> bytes:
+    """Sort key of object keys in List Object Versions order, i.e. UTF-8 binary order."""
+    return key.encode("utf-8")
+
+
+class VersionedBucketModel:
+    """
+    Expected versions, delete markers and latest version of each key of a versioned bucket.
+
+    Versions of a key are kept in upload order in an OrderedDict, so adding, deleting and
+    finding the latest version are O(1) for any number of versions. Delete markers are stored
+    with etag None, delete markers of DeleteObjects on RGW whose VersionId is not returned are
+    stored with DM_PLACEHOLDER ids which match any non-null delete marker.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.latest = {}
+        self.dm_counts = {}
+        self.version_count = 0
+        self.deletemarker_count = 0
+        self._placeholders = 0
+
+    @classmethod
+    def from_versions_dict(cls, versions_dict: dict):
+        """Build model from versions dict of upload_versions/upload_version."""
+        model = cls()
+        for key, details in versions_dict.items():
+            history = details.get("version_history") or \
+                list(details["versions"]) + list(details["delete_markers"])
+            for version_id in history:
+                if version_id in details["versions"]:
+                    model.put(key, version_id, details["versions"][version_id])
+                elif version_id in details["delete_markers"]:
+                    model.add_delete_marker(key, version_id)
+            if details["is_latest"] is not None and details["is_latest"] != DM_PLACEHOLDER:
+                model.latest[key] = details["is_latest"]
+        return model
+
+    def _remove(self, key: str, version_id: str) -> bool:
+        """Remove a version or delete marker, True if it was a delete marker."""
+        is_dm = self.keys[key].pop(version_id) is None
+        if is_dm:
+            self.deletemarker_count -= 1
+            self.dm_counts[key] -= 1
+        else:
+            self.version_count -= 1
+        return is_dm
+
+    def _set_latest(self, key: str):
+        versions = self.keys.get(key)
+        self.latest[key] = next(reversed(versions)) if versions else None
+
+    def put(self, key: str, version_id: str, etag: str):
+        """Add uploaded version, it replaces null version/delete marker if version is null."""
+        versions = self.keys.setdefault(key, OrderedDict())
+        if version_id in versions:
+            self._remove(key, version_id)
+        versions[version_id] = etag
+        self.version_count += 1
+        self.latest[key] = version_id
+
+    def add_delete_marker(self, key: str, version_id: str = None):
+        """Add delete marker, None version_id if it is not returned by the server."""
+        versions = self.keys.setdefault(key, OrderedDict())
+        if version_id is None or version_id == DM_PLACEHOLDER:
+            self._placeholders += 1
+            version_id = f"{DM_PLACEHOLDER}#{self._placeholders}"
+        elif version_id in versions:
+            self._remove(key, version_id)
+        versions[version_id] = None
+        self.deletemarker_count += 1
+        self.dm_counts[key] = self.dm_counts.get(key, 0) + 1
+        self.latest[key] = version_id
+
+    def delete_version(self, key: str, version_id: str):
+        """Delete a version or delete marker permanently."""
+        self._remove(key, version_id)
+        if self.latest.get(key) == version_id:
+            self._set_latest(key)
+
+    def apply_delete_result(self, delete_result: list, is_versioned: bool = True):
+        """Update model for DeleteResult of DeleteObjects, see update_versions_dict_dmo."""
+        for entry in delete_result:
+            if entry.get("VersionId") is not None:
+                self.delete_version(entry["Key"], entry["VersionId"])
+            elif not is_versioned:
+                self.add_delete_marker(entry["Key"], "null")
+            else:
+                self.add_delete_marker(entry["Key"], entry.get("DeleteMarkerVersionId"))
+
+    def versions(self, key: str) -> OrderedDict:
+        """version id to etag of a key in upload order, etag is None for delete markers."""
+        return self.keys.get(key, OrderedDict())
+
+
+def iter_object_versions(s3_ver_test_obj: S3VersioningTestLib, bucket_name: str,
+                         page_size: int = 1000, **params):
+    """
+    Yield versions and delete markers of a bucket following KeyMarker/VersionIdMarker.
+
+    :param page_size: MaxKeys of each List Object Versions call.
+    :param params: Other List Object Versions params e.g. Prefix.
+    :return: generator of (key, is_delete_marker, entry) in key order.
+    """
+    list_params = dict(params, MaxKeys=page_size)
+    while True:
+        resp = s3_ver_test_obj.list_object_versions(bucket_name=bucket_name,
+                                                    optional_params=list_params)
+        assert_utils.assert_true(resp[0], resp[1])
+        page = resp[1]
+        entries = [(ver["Key"], False, ver) for ver in page.get("Versions", [])]
+        entries += [(dm["Key"], True, dm) for dm in page.get("DeleteMarkers", [])]
+        # Versions and delete markers of a page are separate lists, each sorted by key.
+        entries.sort(key=lambda entry: s3_key_order(entry[0]))
+        yield from entries
+        if not page.get("IsTruncated"):
+            return
+        list_params["KeyMarker"] = page["NextKeyMarker"]
+        list_params["VersionIdMarker"] = page["NextVersionIdMarker"]
+
+
+# pylint: disable=too-many-locals, too-many-branches
+def verify_object_versions(s3_ver_test_obj: S3VersioningTestLib, bucket_name: str,
+                           model: VersionedBucketModel, page_size: int = 1000,
+                           max_diff: int = 100) -> dict:
+    """
+    Verify paginated List Object Versions output against model in a single merge pass.
+
+    Listed keys are merged with sorted keys of the model, only entries of the current key are
+    held in memory.
+    :param model: VersionedBucketModel of the bucket.
+    :param page_size: MaxKeys of each List Object Versions call.
+    :param max_diff: Maximum entries kept per diff type, counts are always complete.
+    :return: diff report, "ok" is True if listing matches the model.
+    """
+    diff_types = ("missing_keys", "unexpected_keys", "missing", "unexpected",
+                  "etag_mismatch", "latest_mismatch", "order")
+    report = {name: [] for name in diff_types}
+    counts = dict.fromkeys(diff_types, 0)
+    listed = {"versions": 0, "delete_markers": 0}
+
+    def add(name, item):
+        counts[name] += 1
+        if len(report[name]) < max_diff:
+            report[name].append(item)
+
+    expected_keys = iter(sorted((key for key, versions in model.keys.items() if versions),
+                                key=s3_key_order))
+    next_expected = next(expected_keys, None)
+    prev_key = None
+    for key, entries in groupby(iter_object_versions(s3_ver_test_obj, bucket_name, page_size),
+                                key=lambda entry: entry[0]):
+        if prev_key is not None and s3_key_order(key) <= s3_key_order(prev_key):
+            add("order", key)
+        prev_key = key
+        while next_expected is not None and s3_key_order(next_expected) < s3_key_order(key):
+            add("missing_keys", next_expected)
+            next_expected = next(expected_keys, None)
+        if next_expected == key:
+            next_expected = next(expected_keys, None)
+        expected = model.versions(key)
+        if not expected:
+            add("unexpected_keys", key)
+        seen = set()
+        placeholders = [vid for vid in expected if vid.startswith(DM_PLACEHOLDER)]
+        latest = model.latest.get(key)
+        for _, is_dm, entry in entries:
+            listed["delete_markers" if is_dm else "versions"] += 1
+            version_id = entry["VersionId"]
+            if is_dm and version_id not in expected and placeholders and version_id != "null":
+                version_id = placeholders.pop()
+            if version_id not in expected or (expected[version_id] is None) != is_dm or \
+                    version_id in seen:
+                add("unexpected", (key, entry["VersionId"]))
+                continue
+            seen.add(version_id)
+            if not is_dm and expected[version_id] != entry["ETag"]:
+                add("etag_mismatch", (key, version_id, expected[version_id], entry["ETag"]))
+            if entry["IsLatest"] != (version_id == latest):
+                add("latest_mismatch", (key, entry["VersionId"], entry["IsLatest"]))
+        if expected and len(seen) != len(expected):
+            for version_id in expected:
+                if version_id not in seen:
+                    add("missing", (key, version_id))
+    while next_expected is not None:
+        add("missing_keys", next_expected)
+        next_expected = next(expected_keys, None)
+    report["counts"] = counts
+    report["listed"] = listed
+    report["ok"] = not any(counts.values()) and \
+        listed == {"versions": model.version_count, "delete_markers": model.deletemarker_count}
+    if report["ok"]:
+        LOG.info("List Object Versions matches expected: %s", listed)
+    else:
+        LOG.error("List Object Versions diff: %s", report)
+    return report
+
+
 # pylint: disable-msg=too-many-locals
 def check_list_object_versions(s3_ver_test_obj: S3VersioningTestLib,
                                bucket_name: str, expected_versions: dict,
@@ -146,7 +350,8 @@ def check_list_object_versions(s3_ver_test_obj: S3VersioningTestLib,
 
     :param s3_ver_test_obj: S3VersioningTestLib object to perform S3 versioning calls
     :param bucket_name: Bucket name for calling List Object Versions
-    :param expected_versions: dict containing list of versions, delete markers and flags
+    :param expected_versions: VersionedBucketModel or dict containing list of versions,
+        delete markers and flags
         Expected format of the dict -
             {"<key_name1": "versions": {"version_id1": "etag1"} ...},
                            "delete_markers": ["dm_version_id1", ...],
@@ -156,10 +361,19 @@ def check_list_object_versions(s3_ver_test_obj: S3VersioningTestLib,
     :keyword "expected_flags": Dictionary of List Object Versions flags to verify
     :keyword "expected_error": Error message string to verify in case, error is expected
     :keyword "list_params": Dictionary of query parameters to pass List Object Versions call
+    :keyword "page_size": MaxKeys of paginated listing used when expected_versions are
+        verified without list_params/expected_flags/expected_error
     """
     expected_flags = kwargs.get("expected_flags", None)
     expected_error = kwargs.get("expected_error", None)
     list_params = kwargs.get("list_params", None)
+    if expected_versions is not None and not (expected_flags or expected_error or list_params):
+        model = expected_versions if isinstance(expected_versions, VersionedBucketModel) \
+            else VersionedBucketModel.from_versions_dict(expected_versions)
+        report = verify_object_versions(s3_ver_test_obj, bucket_name, model,
+                                        page_size=kwargs.get("page_size", 1000))
+        assert_utils.assert_true(report["ok"], f"Unexpected List Object Versions: {report}")
+        return
     try:
         if list_params:
             list_response = s3_ver_test_obj.list_object_versions(bucket_name=bucket_name,
@@ -435,6 +649,9 @@ def upload_version(s3_test_obj: Union[S3TestLib, S3MultipartTestLib], bucket_nam
         else:
             assert_utils.assert_not_equal("null", version_id)
 
+    if isinstance(versions_dict, VersionedBucketModel):
+        versions_dict.put(object_name, version_id, res[1]["ETag"])
+        return
     if object_name not in versions_dict:
         versions_dict[object_name] = {}
         versions_dict[object_name]["versions"] = {}
@@ -474,6 +691,15 @@ def delete_version(s3_test_obj: S3TestLib, s3_ver_test_obj: S3VersioningTestLib,
     if check_deletemarker:
         assert_utils.assert_true(res[1]["DeleteMarker"], res[1])
 
+    if isinstance(versions_dict, VersionedBucketModel):
+        if version_id:
+            assert_utils.assert_equal(version_id, res[1]["VersionId"])
+            versions_dict.delete_version(object_name, version_id)
+        elif S3_ENGINE_RGW != CMN_CFG["s3_engine"] or \
+                not versions_dict.dm_counts.get(object_name):
+            # Additional delete markers are not placed for an object in RGW
+            versions_dict.add_delete_marker(object_name, res[1]["VersionId"])
+        return
     if version_id:
         assert_utils.assert_equal(version_id, res[1]["VersionId"])
         if version_id in versions_dict[object_name]["versions"].keys():
@@ -570,6 +796,12 @@ def update_versions_dict_dmo(versions_dict: dict, delete_result: list, is_versio
     :param is_versioned: Set to true if bucket versioning is enabled, False if Suspended
     :param delete_result: DeleteResult returned in DeleteObjects call
     """
+    if isinstance(versions_dict, VersionedBucketModel):
+        if S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
+            # DeleteMarker not returned in response for RGW
+            delete_result = [dict(entry, DeleteMarkerVersionId=None) for entry in delete_result]
+        versions_dict.apply_delete_result(delete_result, is_versioned)
+        return
     for delete_entry in delete_result:
         obj = delete_entry["Key"]
         ver = delete_entry.get("VersionId", None)
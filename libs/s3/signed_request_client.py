@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""
+AWS V4 signed raw requests for S3/IAM REST APIs.
+
+Requests of an endpoint share a keep-alive connection pool and signing keys are cached per
+secret, date, region and service (see s3_utils.get_v4_signature_key), so each request only
+signs its own canonical request. Payload is signed, unsigned or sent aws-chunked with chunk
+signatures.
+"""
+
+import datetime
+import hashlib
+import hmac
+import logging
+import threading
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.exceptions import InsecureRequestWarning
+
+from commons.utils.s3_utils import EMPTY_SHA256
+from commons.utils.s3_utils import STREAMING_PAYLOAD
+from commons.utils.s3_utils import UNSIGNED_PAYLOAD
+from commons.utils.s3_utils import get_credential_scope
+from commons.utils.s3_utils import get_timestamp
+from commons.utils.s3_utils import get_v4_signature_key
+from config.s3 import S3_CFG
+
+LOGGER = logging.getLogger(__name__)
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+PAYLOAD_MODES = ("signed", "unsigned", "chunked")
+CHUNK_SIGNATURE = ";chunk-signature="
+
+
+def _quote(value: str, safe: str = "-_.~") -> str:
+    """URI encode as per AWS V4."""
+    return urllib.parse.quote(str(value), safe=safe)
+
+
+def canonical_query_string(params: dict) -> str:
+    """Query string with sorted and encoded parameters, same string is signed and sent."""
+    if not params:
+        return ""
+    return "&".join(f"{_quote(key)}={_quote(value)}" for key, value in
+                    sorted((str(key), "" if val is None else str(val))
+                           for key, val in params.items()))
+
+
+def chunked_length(size: int, chunk_size: int) -> int:
+    """Length of aws-chunked body of a payload."""
+    sizes = [chunk_size] * (size // chunk_size) + ([size % chunk_size] if size % chunk_size
+                                                   else []) + [0]
+    return sum(len(f"{csize:x}") + len(CHUNK_SIGNATURE) + 64 + 4 + csize for csize in sizes)
+
+
+class SignedRequestClient:
+    """Client sending AWS V4 signed requests on pooled keep-alive sessions."""
+
+    _sessions = {}
+    _lock = threading.Lock()
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, endpoint: str, access_key: str, secret_key: str, service: str = "s3",
+                 region: str = None, **kwargs):
+        """
+        :param endpoint: Endpoint url e.g. https://iam.seagate.com:9443.
+        :param access_key: access key.
+        :param secret_key: secret key.
+        :param service: Service in credential scope.
+        :param region: Region in credential scope, S3_CFG region by default.
+        :keyword pool_size: Connections kept alive to the endpoint.
+        :keyword verify: certificate path or False.
+        :keyword timeout: Request timeout in seconds.
+        """
+        self.endpoint = endpoint.rstrip("/")
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.service = service
+        self.region = region or S3_CFG["region"]
+        self.pool_size = kwargs.get("pool_size", S3_CFG.get("max_pool_connections", 50))
+        self.verify = kwargs.get("verify", False)
+        self.timeout = kwargs.get("timeout")
+        url = urllib.parse.urlparse(self.endpoint)
+        self.scheme = url.scheme
+        self.host = url.netloc
+        self.base_path = url.path
+
+    @property
+    def session(self) -> requests.Session:
+        """Session of the endpoint shared by all the clients."""
+        key = (self.endpoint, self.pool_size)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._sessions[key] = session
+        return session
+
+    def sign(self, method: str, path: str, query: str, headers: dict, payload_hash: str,
+             epoch_t: datetime.datetime) -> tuple:
+        """
+        Sign request headers.
+
+        Host, content-md5, content-type, content-encoding and content-length of chunked payload
+        and x-amz-* headers are signed.
+        :param path: URI encoded path.
+        :return: (Authorization header, signature, signing key)
+        """
+        signed = sorted(name for name in headers if name in ("host", "content-md5",
+                                                             "content-type") or
+                        name.startswith("x-amz-") or
+                        (name in ("content-length", "content-encoding") and
+                         payload_hash == STREAMING_PAYLOAD))
+        canonical_headers = "".join(f"{name}:{' '.join(str(headers[name]).split())}\n"
+                                    for name in signed)
+        signed_headers = ";".join(signed)
+        canonical_request = "\n".join([method, path, query,
+                                       canonical_headers, signed_headers, payload_hash])
+        scope = get_credential_scope(epoch_t, self.region, self.service)
+        string_to_sign = "\n".join([ALGORITHM, get_timestamp(epoch_t), scope,
+                                    hashlib.sha256(canonical_request.encode()).hexdigest()])
+        key = get_v4_signature_key(self.secret_key, epoch_t.strftime("%Y%m%d"), self.region,
+                                   self.service)
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        authorization = f"{ALGORITHM} Credential={self.access_key}/{scope}, " \
+                        f"SignedHeaders={signed_headers}, Signature={signature}"
+        return authorization, signature, key
+
+    @staticmethod
+    def chunked_body(data: bytes, chunk_size: int, seed_signature: str, key: bytes,
+                     timestamp: str, scope: str) -> bytes:
+        """aws-chunked body, signature of each chunk chains to the previous one."""
+        chunks = []
+        previous = seed_signature
+        offsets = list(range(0, len(data), chunk_size)) + [len(data)]
+        for offset in offsets:
+            chunk = data[offset:offset + chunk_size]
+            string_to_sign = "\n".join(["AWS4-HMAC-SHA256-PAYLOAD", timestamp, scope, previous,
+                                        EMPTY_SHA256, hashlib.sha256(chunk).hexdigest()])
+            previous = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+            chunks.append(f"{len(chunk):x}{CHUNK_SIGNATURE}{previous}\r\n".encode() + chunk +
+                          b"\r\n")
+        return b"".join(chunks)
+
+    # pylint: disable=too-many-locals
+    def request(self, method: str, path: str = "", params: dict = None, data=b"",
+                headers: dict = None, **kwargs) -> requests.Response:
+        """
+        Send a signed request.
+
+        :param method: HTTP method.
+        :param path: Path after endpoint path e.g. /bucket/key.
+        :param params: Query parameters.
+        :param data: Payload bytes or str.
+        :param headers: Additional headers, x-amz-* headers are signed.
+        :keyword payload: signed, unsigned or chunked, default signed.
+        :keyword chunk_size: Chunk size of chunked payload, default 64KB.
+        :keyword content_sha256: Send x-amz-content-sha256 header, default True for s3 service.
+        :return: response.
+        """
+        payload = kwargs.get("payload", "signed")
+        if payload not in PAYLOAD_MODES:
+            raise ValueError(f"payload should be one of {PAYLOAD_MODES}")
+        data = data.encode("utf-8") if isinstance(data, str) else (data or b"")
+        epoch_t = datetime.datetime.utcnow()
+        timestamp = get_timestamp(epoch_t)
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        headers.update({"host": self.host, "x-amz-date": timestamp})
+        chunk_size = kwargs.get("chunk_size", 64 * 1024)
+        if payload == "signed":
+            payload_hash = hashlib.sha256(data).hexdigest()
+        elif payload == "unsigned":
+            payload_hash = UNSIGNED_PAYLOAD
+        else:
+            payload_hash = STREAMING_PAYLOAD
+            headers.update({"content-encoding": "aws-chunked",
+                            "x-amz-decoded-content-length": str(len(data)),
+                            "content-length": str(chunked_length(len(data), chunk_size))})
+        if kwargs.get("content_sha256", self.service == "s3") or payload != "signed":
+            headers["x-amz-content-sha256"] = payload_hash
+        query = canonical_query_string(params)
+        full_path = _quote(self.base_path + path or "/", safe="/-_.~")
+        headers["Authorization"], signature, key = self.sign(
+            method.upper(), full_path, query, headers, payload_hash, epoch_t)
+        if payload == "chunked":
+            data = self.chunked_body(data, chunk_size, signature, key, timestamp,
+                                     get_credential_scope(epoch_t, self.region, self.service))
+        url = f"{self.scheme}://{self.host}{full_path}" + (f"?{query}" if query else "")
+        del headers["host"]
+        LOGGER.debug("%s %s", method.upper(), url)
+        return self.session.request(method.upper(), url, data=data, headers=headers,
+                                    verify=self.verify, timeout=self.timeout)
+
+    def post_form(self, payload: dict, path: str = "") -> requests.Response:
+        """Send form encoded action of IAM/s3authserver query API, e.g. Action=CreateUser."""
+        return self.request("post", path, data=urllib.parse.urlencode(payload),
+                            headers={"content-type": "application/x-www-form-urlencoded",
+                                     "Accept": "text/plain"}, content_sha256=False)
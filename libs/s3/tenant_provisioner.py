@@ -0,0 +1,505 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Bulk provisioning of CSM users, S3 accounts, IAM users and buckets for scale tests.
+
+A TenantSpec of N accounts x M IAM users x K buckets is expanded to entities with
+deterministic names and kept in a JSON manifest. Creation and teardown run concurrently with
+per entity type rate limits, IAM users and buckets of an account are submitted as soon as the
+account is created and an account is deleted once its IAM users and buckets are deleted.
+Operations are idempotent, an entity which already exists (or is already deleted) is taken as
+done, so a run interrupted by a crash is resumed from its manifest.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+import commons.errorcodes as err
+from commons.constants import Rest as Const
+from commons.exceptions import CTException
+from libs.csm.rest.csm_rest_csmuser import RestCsmUser
+from libs.csm.rest.csm_rest_s3user import RestS3user
+from libs.iostability.workload_scheduler import RateLimiter
+from libs.s3.s3_client_cache import get_client_cache
+from libs.s3.iam_test_lib import IamTestLib
+from libs.s3.s3_test_lib import S3TestLib
+
+LOGGER = logging.getLogger(__name__)
+
+CSM_USER = "csm_user"
+S3_ACCOUNT = "s3_account"
+IAM_USER = "iam_user"
+BUCKET = "bucket"
+ENTITY_TYPES = (CSM_USER, S3_ACCOUNT, IAM_USER, BUCKET)
+
+PENDING = "pending"
+CREATED = "created"
+DELETED = "deleted"
+FAILED = "failed"
+
+EXISTS_ERRORS = ("BucketAlreadyOwnedByYou", "EntityAlreadyExists", "already exists",
+                 "conflict")
+NOT_FOUND_ERRORS = ("NoSuchBucket", "NoSuchEntity", "not found", "does not exist")
+
+TenantSpec = namedtuple("TenantSpec", "accounts iam_users buckets csm_users prefix "
+                                      "account_password csm_password",
+                        defaults=(0, "tenant", None, None))
+
+
+class RestTenantOps:
+    """Create/delete tenant entities with CSM REST and S3/IAM APIs, clients are per thread."""
+
+    def __init__(self, max_clients: int = 64):
+        """
+        :param max_clients: Clients kept per thread in LRU order.
+        """
+        self.max_clients = max_clients
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._caches = []
+
+    def _client(self, name: str, factory, *args):
+        """Client of the calling thread, created once per thread and args."""
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = OrderedDict()
+            with self._lock:
+                self._caches.append(clients)
+        key = (name,) + args
+        with self._lock:
+            if key in clients:
+                clients.move_to_end(key)
+                return clients[key]
+        client = factory(*args)
+        with self._lock:
+            clients[key] = client
+            while len(clients) > self.max_clients:
+                clients.popitem(last=False)
+        return client
+
+    def forget(self, access_key: str):
+        """Drop clients of an access key from the caches of all threads."""
+        with self._lock:
+            for clients in self._caches:
+                for key in [key for key in clients if access_key in key[1:]]:
+                    del clients[key]
+
+    def _s3(self, account: dict) -> S3TestLib:
+        return self._client(BUCKET, lambda access, secret: S3TestLib(
+            access_key=access, secret_key=secret), account["access_key"], account["secret_key"])
+
+    def _iam(self, account: dict) -> IamTestLib:
+        return self._client(IAM_USER, lambda access, secret: IamTestLib(
+            access_key=access, secret_key=secret), account["access_key"], account["secret_key"])
+
+    def create_csm_user(self, name: str, password: str) -> dict:
+        """Create CSM user with manage role."""
+        csm_obj = self._client(CSM_USER, RestCsmUser)
+        resp = csm_obj.create_csm_user(user_type="valid", user_role="manage", user_name=name,
+                                       user_email=f"{name}@seagate.com", user_password=password)
+        if resp.status_code not in (Const.SUCCESS_STATUS_FOR_POST, Const.CONFLICT):
+            raise CTException(err.CSM_REST_POST_REQUEST_FAILED,
+                              f"Create CSM user {name} failed: {resp.status_code} {resp.text}")
+        return {"username": name, "password": password}
+
+    def delete_csm_user(self, entity: dict):
+        """Delete CSM user, missing user is taken as deleted."""
+        resp = self._client(CSM_USER, RestCsmUser).delete_csm_user(entity["name"])
+        if resp.status_code not in (Const.SUCCESS_STATUS, Const.METHOD_NOT_FOUND):
+            raise CTException(err.CSM_REST_DELETE_REQUEST_FAILED,
+                              f"Delete CSM user {entity['name']} failed: "
+                              f"{resp.status_code} {resp.text}")
+
+    def create_s3_account(self, name: str, password: str) -> dict:
+        """Create S3 account, keys of an account which already exists can not be recovered."""
+        resp = self._client(S3_ACCOUNT, RestS3user).create_an_account(name, password)
+        if resp.status_code == Const.CONFLICT:
+            raise CTException(err.CSM_REST_POST_REQUEST_FAILED,
+                              f"S3 account {name} already exists, its keys are unknown")
+        if resp.status_code != Const.SUCCESS_STATUS_FOR_POST:
+            raise CTException(err.CSM_REST_POST_REQUEST_FAILED,
+                              f"Create S3 account {name} failed: {resp.status_code} {resp.text}")
+        data = resp.json()
+        return {"account_name": name, "access_key": data["access_key"],
+                "secret_key": data["secret_key"], "canonical_id": data.get("canonical_id")}
+
+    def delete_s3_account(self, entity: dict, password: str = None):
+        """Delete S3 account, as the account if password is given else as CSM admin."""
+        s3acc_obj = self._client(S3_ACCOUNT, RestS3user)
+        if password:
+            # pylint: disable=unexpected-keyword-arg
+            resp = s3acc_obj.delete_s3_account_user(
+                username=entity["name"], login_as={"username": entity["name"],
+                                                   "password": password})
+        else:
+            resp = s3acc_obj.delete_s3_account_user(entity["name"])
+        if resp.status_code not in (Const.SUCCESS_STATUS, Const.METHOD_NOT_FOUND):
+            raise CTException(err.CSM_REST_DELETE_REQUEST_FAILED,
+                              f"Delete S3 account {entity['name']} failed: "
+                              f"{resp.status_code} {resp.text}")
+        if (entity.get("data") or {}).get("access_key"):
+            self.forget(entity["data"]["access_key"])
+            get_client_cache().invalidate(entity["data"]["access_key"])
+
+    def create_iam_user(self, account: dict, name: str) -> dict:
+        """Create IAM user in the account."""
+        self._iam(account).create_user(name)
+        return {"user_name": name}
+
+    def delete_iam_user(self, account: dict, entity: dict):
+        """Delete IAM user of the account."""
+        self._iam(account).delete_user(entity["name"])
+
+    def create_bucket(self, account: dict, name: str) -> dict:
+        """Create bucket in the account."""
+        self._s3(account).create_bucket(name)
+        return {"bucket_name": name}
+
+    def delete_bucket(self, account: dict, entity: dict):
+        """Delete bucket with its objects."""
+        self._s3(account).delete_bucket(entity["name"], force=True)
+
+    def list_iam_users(self, account: dict) -> list:
+        """IAM user names of the account."""
+        return [user["UserName"] for user in self._iam(account).list_users()[1]]
+
+    def list_buckets(self, account: dict) -> list:
+        """Bucket names of the account."""
+        return list(self._s3(account).bucket_list()[1])
+
+
+# pylint: disable=too-many-instance-attributes
+class TenantProvisioner:
+    """Create and delete tenants of a TenantSpec concurrently, state is kept in a manifest."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, spec: TenantSpec = None, manifest_path: str = None, ops=None,
+                 workers: int = 16, **kwargs):
+        """
+        Init method, spec and entities are loaded from manifest_path if it exists.
+
+        :param spec: TenantSpec, may be None when resuming from a manifest.
+        :param manifest_path: JSON manifest of entities and their state.
+        :param ops: Entity operations, RestTenantOps if None.
+        :param workers: Concurrent requests.
+        :keyword rates: dict of entity type to max requests per second, default unlimited.
+        :keyword retries: Attempts per entity operation.
+        :keyword backoff: Seconds before first retry, doubled per retry.
+        :keyword save_interval: Minimum seconds between manifest writes, accounts are written
+            immediately as their keys can not be recovered.
+        """
+        self.manifest_path = manifest_path
+        self.ops = ops or RestTenantOps()
+        self.workers = workers
+        self.retries = kwargs.get("retries", 3)
+        self.backoff = kwargs.get("backoff", 1)
+        self.save_interval = kwargs.get("save_interval", 2)
+        rates = kwargs.get("rates") or {}
+        self.limiters = {etype: RateLimiter(rates.get(etype), 1) for etype in ENTITY_TYPES}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._last_save = 0
+        self.stats = {}
+        self.entities = {}
+        if manifest_path and os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as manifest:
+                data = json.load(manifest)
+            spec = spec or TenantSpec(**data["spec"])
+            self.entities = data["entities"]
+            LOGGER.info("Loaded %s entities from %s", len(self.entities), manifest_path)
+        if spec is None:
+            raise ValueError("spec is required when manifest does not exist")
+        self.spec = spec
+        self.plan()
+
+    @staticmethod
+    def key(etype: str, name: str) -> str:
+        """Manifest key of an entity."""
+        return f"{etype}:{name}"
+
+    def _add(self, etype: str, name: str, account: str = None):
+        self.entities.setdefault(self.key(etype, name), {
+            "type": etype, "name": name, "account": account, "state": PENDING, "data": {}})
+
+    def plan(self):
+        """Add entities of the spec which are not in the manifest."""
+        prefix = self.spec.prefix
+        for idx in range(1, self.spec.csm_users + 1):
+            self._add(CSM_USER, f"csm{prefix}{idx:05d}")
+        for idx in range(1, self.spec.accounts + 1):
+            account = f"{prefix}-acc{idx:05d}"
+            self._add(S3_ACCOUNT, account)
+            for num in range(1, self.spec.iam_users + 1):
+                self._add(IAM_USER, f"{account}-iam{num:04d}", account)
+            for num in range(1, self.spec.buckets + 1):
+                bucket = f"{account}-bkt{num:04d}".replace("_", "-").lower()
+                self._add(BUCKET, bucket, account)
+
+    def _update(self, entity: dict, **fields):
+        """Update an entity, entities are changed under lock so that save sees a whole state."""
+        with self._lock:
+            entity.update(fields)
+
+    def save(self, force: bool = True):
+        """
+        Write manifest atomically, skipped if last write is within save_interval.
+
+        A copy of the state taken under lock is written, so workers are not blocked while
+        the file is written.
+        """
+        if not self.manifest_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not force and time.time() - self._last_save < self.save_interval:
+                    return
+                self._last_save = time.time()
+                state = copy.deepcopy({"spec": self.spec._asdict(), "entities": self.entities,
+                                       "stats": self.stats})
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as manifest:
+                json.dump(state, manifest)
+            os.replace(tmp_path, self.manifest_path)
+
+    def select(self, etype: str, state: str = CREATED, account: str = None) -> list:
+        """Entities of a type in the state, optionally of an account."""
+        return [entity for entity in list(self.entities.values())
+                if entity["type"] == etype and entity["state"] == state and
+                (account is None or entity["account"] == account)]
+
+    def created(self, etype: str) -> list:
+        """Data of created entities of a type e.g. keys of S3 accounts."""
+        return [entity["data"] for entity in self.select(etype)]
+
+    def _account(self, entity: dict) -> dict:
+        return self.entities[self.key(S3_ACCOUNT, entity["account"])]["data"]
+
+    def _record(self, action: str, etype: str, start: float, end: float, status: bool):
+        with self._lock:
+            stat = self.stats.setdefault(action, {}).setdefault(
+                etype, {"count": 0, "failed": 0, "busy": 0.0, "first": start, "last": end})
+            stat["count"] += 1
+            stat["failed"] += int(not status)
+            stat["busy"] += end - start
+            stat["first"] = min(stat["first"], start)
+            stat["last"] = max(stat["last"], end)
+
+    def _execute(self, action: str, entity: dict, func, *args):
+        """Run operation with rate limit and retries, entity state is updated."""
+        etype = entity["type"]
+        error = None
+        for attempt in range(self.retries):
+            self.limiters[etype].acquire(1)
+            start = time.time()
+            try:
+                result = func(*args)
+                self._record(action, etype, start, time.time(), True)
+                return result
+            except Exception as exc:  # pylint: disable=broad-except
+                self._record(action, etype, start, time.time(), False)
+                message = str(exc).lower()
+                if action == "create" and any(msg.lower() in message for msg in EXISTS_ERRORS):
+                    return {}
+                if action == "delete" and any(msg.lower() in message
+                                              for msg in NOT_FOUND_ERRORS):
+                    return None
+                error = exc
+                LOGGER.warning("%s %s %s failed (attempt %s): %s", action, etype,
+                               entity["name"], attempt + 1, exc)
+                if attempt + 1 < self.retries:
+                    time.sleep(self.backoff * 2 ** attempt)
+        raise error
+
+    def _create(self, entity: dict) -> dict:
+        etype, name = entity["type"], entity["name"]
+        if etype == CSM_USER:
+            return self._execute("create", entity, self.ops.create_csm_user, name,
+                                 self.spec.csm_password)
+        if etype == S3_ACCOUNT:
+            return self._execute("create", entity, self.ops.create_s3_account, name,
+                                 self.spec.account_password)
+        account = self._account(entity)
+        func = self.ops.create_iam_user if etype == IAM_USER else self.ops.create_bucket
+        return self._execute("create", entity, func, account, name)
+
+    def _delete(self, entity: dict, account_password: str = None):
+        etype = entity["type"]
+        if etype == CSM_USER:
+            return self._execute("delete", entity, self.ops.delete_csm_user, entity)
+        if etype == S3_ACCOUNT:
+            return self._execute("delete", entity, self.ops.delete_s3_account, entity,
+                                 account_password)
+        account = self._account(entity)
+        func = self.ops.delete_iam_user if etype == IAM_USER else self.ops.delete_bucket
+        return self._execute("delete", entity, func, account, entity)
+
+    def _run(self, first: list, task, on_done=None) -> list:
+        """
+        Run task over entities concurrently.
+
+        :param first: Entities to be submitted first.
+        :param task: Callable on an entity, True if it passed.
+        :param on_done: Callable on a completed entity and its status, returns entities to
+            be submitted next.
+        :return: Failed entities.
+        """
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="tenant") as executor:
+            pending = {executor.submit(task, entity): entity for entity in first}
+            while pending:
+                done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entity = pending.pop(future)
+                    status = future.result()
+                    if not status:
+                        failed.append(entity)
+                    for nxt in (on_done(entity, status) if on_done else []):
+                        pending[executor.submit(task, nxt)] = nxt
+                self.save(force=False)
+        self.save()
+        return failed
+
+    def _create_task(self, entity: dict) -> bool:
+        try:
+            data = self._create(entity)
+        except Exception as error:  # pylint: disable=broad-except
+            self._update(entity, state=FAILED, error=str(error))
+            LOGGER.error("Failed to create %s %s: %s", entity["type"], entity["name"], error)
+            return False
+        self._update(entity, data=data or entity["data"] or {"name": entity["name"]},
+                     state=CREATED, error=None)
+        if entity["type"] == S3_ACCOUNT:
+            self.save()
+        return True
+
+    def provision(self) -> dict:
+        """
+        Create pending and failed entities of the spec.
+
+        :return: Throughput report of create per entity type.
+        """
+        def todo(etype, account=None):
+            return self.select(etype, PENDING, account) + self.select(etype, FAILED, account)
+
+        def children(entity, status):
+            if entity["type"] != S3_ACCOUNT or not status:
+                return []
+            if not entity["data"].get("access_key"):
+                LOGGER.error("Keys of existing S3 account %s are unknown, its IAM users and "
+                             "buckets are not created", entity["name"])
+                return []
+            return todo(IAM_USER, entity["name"]) + todo(BUCKET, entity["name"])
+
+        first = todo(CSM_USER) + todo(S3_ACCOUNT)
+        for account in self.select(S3_ACCOUNT):
+            first += children(account, True)
+        LOGGER.info("Provisioning %s", self.spec)
+        failed = self._run(first, self._create_task, children)
+        if failed:
+            LOGGER.error("Failed to create %s entities", len(failed))
+        return self.report("create")
+
+    def discover(self):
+        """Add IAM users and buckets which are created in the accounts outside of the spec."""
+        for account in self.select(S3_ACCOUNT):
+            for etype, names in ((IAM_USER, self.ops.list_iam_users(account["data"])),
+                                 (BUCKET, self.ops.list_buckets(account["data"]))):
+                for name in names:
+                    key = self.key(etype, name)
+                    with self._lock:
+                        if key not in self.entities:
+                            self._add(etype, name, account["name"])
+                            self.entities[key].update(state=CREATED, data={"name": name})
+
+    def teardown(self, account_password: str = None, discover: bool = True) -> dict:
+        """
+        Delete created entities, accounts after their IAM users and buckets.
+
+        :param account_password: Delete S3 accounts logged in as the account, as CSM admin
+            if None.
+        :param discover: Also delete IAM users and buckets listed in the accounts.
+        :return: Throughput report of delete per entity type.
+        """
+        if discover:
+            self.discover()
+        to_delete = [entity for entity in self.entities.values()
+                     if entity["state"] in (CREATED, FAILED) and entity["data"]]
+        remaining = {}
+        for entity in to_delete:
+            if entity["type"] in (IAM_USER, BUCKET):
+                remaining[entity["account"]] = remaining.get(entity["account"], 0) + 1
+
+        def task(entity):
+            try:
+                self._delete(entity, account_password)
+            except Exception as error:  # pylint: disable=broad-except
+                self._update(entity, state=FAILED, error=str(error))
+                LOGGER.error("Failed to delete %s %s: %s", entity["type"], entity["name"],
+                             error)
+                return False
+            self._update(entity, state=DELETED, error=None)
+            return True
+
+        # Accounts with a child which failed to delete are not deleted.
+        failed_accounts = set()
+
+        def release_account(entity, status):
+            if entity["type"] not in (IAM_USER, BUCKET):
+                return []
+            with self._lock:
+                remaining[entity["account"]] -= 1
+                if not status:
+                    failed_accounts.add(entity["account"])
+                if remaining[entity["account"]]:
+                    return []
+                if entity["account"] in failed_accounts:
+                    LOGGER.error("S3 account %s is not deleted as its IAM users or buckets "
+                                 "failed to delete", entity["account"])
+                    return []
+            account = self.entities[self.key(S3_ACCOUNT, entity["account"])]
+            return [account] if any(account is entity for entity in to_delete) else []
+
+        first = [entity for entity in to_delete if entity["type"] != S3_ACCOUNT or
+                 not remaining.get(entity["name"])]
+        failed = self._run(first, task, release_account)
+        if failed:
+            LOGGER.error("Failed to delete %s entities", len(failed))
+        return self.report("delete")
+
+    def report(self, action: str) -> dict:
+        """Requests, failures and requests per second per entity type of an action."""
+        report = {}
+        for etype, stat in self.stats.get(action, {}).items():
+            elapsed = max(stat["last"] - stat["first"], 1e-9)
+            report[etype] = {"requests": stat["count"], "failed": stat["failed"],
+                             "per_sec": round(stat["count"] / elapsed, 2),
+                             "avg_latency": round(stat["busy"] / stat["count"], 4)}
+        LOGGER.info("Tenant %s throughput: %s", action, report)
+        return report
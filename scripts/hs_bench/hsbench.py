@@ -25,8 +25,8 @@
 import logging
 from datetime import datetime
 import json
-import pandas as pd
 
+from commons.utils.benchmark_utils import parse_hsbench_json
 from commons.utils.config_utils import read_yaml
 from commons.utils.system_utils import path_exists, run_local_cmd, make_dirs
 
@@ -167,22 +167,24 @@ def parse_hsbench_output(file_path):
     :file_path: Generated JSON file after hsbench tool
     :return: dictionary/list of the content
     """
-    json_data = []
     keys = ['Mode', 'Seconds', 'Ops', 'Mbps',
             'Iops', 'MinLat', 'AvgLat', 'MaxLat']
-    values = []
     with open(file_path, 'r', encoding="utf-8") as list_ops:
         json_data = json.load(list_ops)
-    for data in json_data:
-        value = []
-        if data['IntervalName'] == 'TOTAL':
-            for key in keys:
-                value.append(data[key])
-            values.append(value)
-    table_op = pd.DataFrame(values, columns=keys)
-    table_op.reset_index(inplace=False)
-    data_dict = table_op.to_dict("records")
-    return data_dict
+    return [{key: data[key] for key in keys}
+            for data in json_data if data['IntervalName'] == 'TOTAL']
+
+
+def get_bench_results(file_path, obj_size=0, threads=0):
+    """
+    To parse hsbench output into common benchmark results
+    :param file_path: Generated JSON file after hsbench tool
+    :param obj_size: Object size used for the run
+    :param threads: Number of threads used for the run
+    :return: list of BenchmarkResult
+    """
+    return parse_hsbench_json(file_path, object_size=obj_size, concurrency=threads)
+
 
 def parse_metrics_value(metric_name, mode_type, operation, parse_data):
     """
@@ -197,12 +199,10 @@ def parse_metrics_value(metric_name, mode_type, operation, parse_data):
             if in_line_data['Mode'] == mode_type[0]:
                 if in_line_data[operation]:
                     return metric_name, str(in_line_data[operation]), in_line_data['Seconds']
-    vv1 = []
-    tt1 = []
+    total_value = 0
+    total_time = 0
     for in_line_data in parse_data:
-        for modes in mode_type:
-            if in_line_data['Mode'] == modes:
-                if in_line_data[operation]:
-                    vv1.append(int(in_line_data[operation]))
-                    tt1.append(int(in_line_data['Seconds']))
-    return metric_name, str(vv1[0]+vv1[1]), tt1[0]+tt1[1]
+        if in_line_data['Mode'] in mode_type and in_line_data[operation]:
+            total_value += int(in_line_data[operation])
+            total_time += int(in_line_data['Seconds'])
+    return metric_name, str(total_value), total_time
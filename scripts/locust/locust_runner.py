@@ -64,15 +64,17 @@ def run_locust(
     :param users: number of concurrent users
     :param hatch_rate: rate at which number of user to be increase per sec
     :param duration: total time for execution
-    :return: tupple resp with over all execution and log and html file path
+    :return: tupple resp with over all execution and log, html and stats csv file path
     """
     upper_limit_cmd = "ulimit -n 100000"
     log_dir = "log/latest/"
     time_str = str(time.strftime("%Y%m%d-%H%M%S"))
     log_file = f"{log_dir}{test_id}-{LOCUST_CFG['default']['LOGFILE']}-{time_str}.log"
     html_file = f"{log_dir}{test_id}-{LOCUST_CFG['default']['HTMLFILE']}-{time_str}.html"
+    csv_prefix = f"{log_dir}{test_id}-{LOCUST_CFG['default']['HTMLFILE']}-{time_str}"
     locust_run_cmd = \
-        "locust --host={} -f {} --headless -u {} -r {} --run-time {} --html {} --logfile {}"
+        "locust --host={} -f {} --headless -u {} -r {} --run-time {} --html {} --logfile {} " \
+        "--csv {}"
     LOGGER.info("Setting ulimit for locust\n")
     locust_run_cmd = locust_run_cmd.format(
         host,
@@ -81,11 +83,13 @@ def run_locust(
         hatch_rate,
         duration,
         html_file,
-        log_file)
+        log_file,
+        csv_prefix)
     cmd = "{}; {}\n".format(upper_limit_cmd, locust_run_cmd)
     res = run_local_cmd(cmd)
     LOGGER.info("Locust run completed.")
-    res1 = {"log-file": log_file, "html-file": html_file}
+    res1 = {"log-file": log_file, "html-file": html_file,
+            "stats-csv-file": f"{csv_prefix}_stats.csv"}
 
     return res, res1
 
@@ -27,6 +27,7 @@ import os
 from datetime import datetime, timedelta
 
 from commons.utils import assert_utils
+from commons.utils.benchmark_utils import parse_s3bench_output
 from commons.utils.config_utils import read_yaml
 from commons.utils.system_utils import path_exists, run_local_cmd, make_dirs
 from libs.s3 import ACCESS_KEY, SECRET_KEY
@@ -109,6 +110,17 @@ def create_json_reps(list_resp):
     return js_res
 
 
+def get_bench_results(log_path, obj_size=0, num_clients=0):
+    """
+    Parse s3bench log into common benchmark results
+    :param log_path: s3bench log file path
+    :param obj_size: object size used for the run
+    :param num_clients: number of clients used for the run
+    :return: list of BenchmarkResult
+    """
+    return parse_s3bench_output(log_path, object_size=obj_size, concurrency=num_clients)
+
+
 # pylint: disable-msg=too-many-arguments
 def s3bench_workload(end_point, bucket_name, log_prefix, object_size, client, sample,
                      access_key=ACCESS_KEY, secret_key=SECRET_KEY, validate_certs=True):
@@ -200,9 +212,11 @@ def s3bench(
     :keyword int max_retries: maximum retry for any request
     :keyword int response_header_timeout: Response header Timeout in ms
     :keyword int httpclientimeout: Time limit in ms for requests made by this Client.
+    :keyword iteration_callback: Callable called with log path after every s3bench run
     :return: tuple with json response and log path
     """
     max_retries = kwargs.get("max_retries", None)
+    iteration_callback = kwargs.get("iteration_callback", None)
     response_header_timeout = kwargs.get("response_header_timeout", None)
     httpclientimeout = kwargs.get("httpclientimeout", None)
     result = []
@@ -246,10 +260,14 @@ def s3bench(
             res1 = run_local_cmd(cmd)
             LOGGER.debug("Response: %s", res1)
             result.append(res1[1])
+            if iteration_callback:
+                iteration_callback(log_path)
     else:  # In case duration is None
         res1 = run_local_cmd(cmd)
         LOGGER.debug("Response: %s", res1)
         result.append(res1[1])
+        if iteration_callback:
+            iteration_callback(log_path)
     LOGGER.info("Workload execution completed.")
 
     # Creating json response this function skips the verbose data
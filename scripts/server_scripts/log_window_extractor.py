@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Extract lines of a log file logged in time window [start, end).
+This script is copied to and executed on the nodes, it should only use standard library.
+
+Log lines are expected in time order, start and end of the window are located by binary
+search on byte offsets so only O(log n) lines are parsed. Lines without a timestamp e.g.
+trace backs belong to the preceding entry. Window is written gzip compressed to stdout or
+to the output file.
+usage: log_window_extractor.py --start "2022-12-12 16:06:01" --end "..." <log file>
+"""
+
+import argparse
+import gzip
+import os
+import re
+import shutil
+import sys
+from datetime import datetime
+from datetime import timedelta
+
+# (pattern, strptime format) of supported timestamp prefixes.
+TIMESTAMP_FORMATS = [
+    (re.compile(r"^\[?(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})"), "%Y-%m-%d %H:%M:%S"),
+    (re.compile(r"^\[?(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})"), "%Y/%m/%d %H:%M:%S"),
+    (re.compile(r"^([A-Z][a-z]{2} +\d{1,2} \d{2}:\d{2}:\d{2})"), "%b %d %H:%M:%S"),
+]
+# Lines read after a seek to find a timestamped line, window is copied as is beyond it.
+MAX_SCAN_LINES = 1000
+CHUNK_SIZE = 1024 * 1024
+
+
+def parse_timestamp(line, year=None):
+    """
+    Parse timestamp at the start of a log line.
+
+    :param line: Log line as str or bytes.
+    :param year: Year for formats without year e.g. syslog "Dec 12 16:06:01".
+    :return: datetime or None if line does not start with a timestamp.
+    """
+    if isinstance(line, bytes):
+        line = line[:64].decode("utf-8", errors="ignore")
+    for pattern, fmt in TIMESTAMP_FORMATS:
+        match = pattern.match(line)
+        if not match:
+            continue
+        value = " ".join(match.group(1).replace("T", " ").split())
+        try:
+            if "%Y" in fmt:
+                return datetime.strptime(value, fmt)
+            # Parse with year, Feb 29 is not valid in default year 1900.
+            return datetime.strptime(f"{year or datetime.now().year} {value}", f"%Y {fmt}")
+        except ValueError:
+            return None
+    return None
+
+
+class LogWindow:
+    """Locate and copy time window of a time ordered log file."""
+
+    def __init__(self, fobj, year=None, reference=None):
+        """
+        Init method.
+
+        :param fobj: Log file opened in binary mode.
+        :param year: Year for timestamps without year.
+        :param reference: Timestamps without year later than reference by more than half a
+            year are taken from previous year, so windows around new year are handled.
+        """
+        self.fobj = fobj
+        self.year = year
+        self.reference = reference
+        self.fobj.seek(0, os.SEEK_END)
+        self.size = self.fobj.tell()
+
+    def _timestamp(self, line):
+        """Parse timestamp of a line with year rollover."""
+        timestamp = parse_timestamp(line, self.year)
+        if timestamp and self.reference and timestamp - self.reference > timedelta(days=183):
+            timestamp = timestamp.replace(year=timestamp.year - 1)
+        return timestamp
+
+    def line_at(self, offset):
+        """
+        Get first timestamped line starting at or after offset.
+
+        :return: (line offset, timestamp) or (size, None) at end of file.
+        """
+        if offset > 0:
+            self.fobj.seek(offset - 1)
+            # Skip the rest of line containing offset - 1.
+            self.fobj.readline()
+        else:
+            self.fobj.seek(0)
+        for _ in range(MAX_SCAN_LINES):
+            pos = self.fobj.tell()
+            line = self.fobj.readline()
+            if not line:
+                break
+            timestamp = self._timestamp(line)
+            if timestamp:
+                return pos, timestamp
+        return self.size, None
+
+    def find_offset(self, target):
+        """Offset of first timestamped line logged at or after target."""
+        low, high = 0, self.size
+        while low < high:
+            mid = (low + high) // 2
+            _, timestamp = self.line_at(mid)
+            if timestamp is None or timestamp >= target:
+                high = mid
+            else:
+                low = mid + 1
+        return self.line_at(low)[0]
+
+    def window(self, start, end):
+        """Byte range [start offset, end offset) of lines logged in [start, end)."""
+        start_offset = self.find_offset(start) if start else 0
+        end_offset = self.find_offset(end) if end else self.size
+        return start_offset, max(start_offset, end_offset)
+
+    def copy(self, start, end, out_fobj):
+        """
+        Copy lines of the window to out_fobj.
+
+        :return: Number of bytes copied.
+        """
+        start_offset, end_offset = self.window(start, end)
+        self.fobj.seek(start_offset)
+        remaining = end_offset - start_offset
+        while remaining > 0:
+            chunk = self.fobj.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            out_fobj.write(chunk)
+            remaining -= len(chunk)
+        return end_offset - start_offset
+
+
+def extract(path, start, end, out_fobj, compress_level=6):
+    """
+    Write gzip compressed lines of path logged in [start, end) to out_fobj.
+
+    :return: Number of uncompressed bytes written.
+    """
+    with open(path, "rb") as log_file, \
+            gzip.GzipFile(fileobj=out_fobj, mode="wb", compresslevel=compress_level) as gz_out:
+        reference = end or start
+        return LogWindow(log_file, year=reference.year, reference=reference).copy(
+            start, end, gz_out)
+
+
+def main():
+    """Parse arguments and extract window."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="Log file path")
+    parser.add_argument("--start", required=True, help="Window start '%%Y-%%m-%%d %%H:%%M:%%S'")
+    parser.add_argument("--end", required=True, help="Window end '%%Y-%%m-%%d %%H:%%M:%%S'")
+    parser.add_argument("--output", default="-", help="Output .gz file, '-' for stdout")
+    parser.add_argument("--level", type=int, default=6, help="gzip compression level")
+    args = parser.parse_args()
+    start = datetime.strptime(args.start, "%Y-%m-%d %H:%M:%S")
+    end = datetime.strptime(args.end, "%Y-%m-%d %H:%M:%S")
+    if args.output == "-":
+        extract(args.path, start, end, sys.stdout.buffer, args.level)
+        sys.stdout.buffer.flush()
+    else:
+        with open(args.output + ".tmp", "wb") as out_file:
+            extract(args.path, start, end, out_file, args.level)
+        shutil.move(args.output + ".tmp", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,10 +32,10 @@ from commons.constants import Rest as Const
 from commons.ct_fail_on import CTFailOn
 from commons.errorcodes import error_handler
 from commons.exceptions import CTException
+from commons.params import LATEST_LOG_FOLDER, LOG_DIR
 from commons.params import TEST_DATA_PATH, S3_BKT_TEST_CONFIG
 from commons.utils import assert_utils
 from commons.utils import system_utils
-from commons.utils.assert_utils import assert_true
 from config import CSM_CFG, CMN_CFG
 from libs.csm.csm_setup import CSMConfigsCheck
 from libs.csm.rest.csm_rest_bucket import RestS3Bucket
@@ -47,6 +47,8 @@ from libs.s3 import iam_test_lib
 from libs.s3.s3_bucket_policy_test_lib import S3BucketPolicyTestLib
 from libs.s3.s3_multipart_test_lib import S3MultipartTestLib
 from libs.s3.s3_test_lib import S3TestLib
+from libs.s3.tenant_provisioner import BUCKET, CSM_USER, DELETED, IAM_USER, S3_ACCOUNT
+from libs.s3.tenant_provisioner import TenantProvisioner, TenantSpec
 from robot_gui.utils.call_robot_test import trigger_robot
 
 
@@ -78,6 +80,7 @@ class TestS3IOSystemLimits:
         cls.created_s3_users = []
         cls.created_iam_users = []
         cls.created_buckets = []
+        cls.provisioner = None
         cls.csm_user_obj = RestCsmUser()
         cls.s3_account_obj = RestS3user()
         cls.iam_user_obj = RestIamUser()
@@ -126,92 +129,6 @@ class TestS3IOSystemLimits:
                 self.test_dir_path,
                 resp)
 
-    def create_csm_accounts(self, count):
-        """
-        Create new CSM user with Manager role
-        :param count:
-        :return:
-        """
-        csm_users = []
-        for _ in range(count):
-            self.log.info("Creating new CSM user...")
-            time.sleep(1)
-            response = self.csm_user_obj.create_csm_user(user_type="valid", user_role="manage")
-            self.log.info("Verifying if user was created successfully")
-            assert response.status_code == Const.SUCCESS_STATUS_FOR_POST, \
-                "Unable to create CSM account"
-            self.log.info("Response : %s", self.csm_user_obj.recently_created_csm_user)
-            csm_users.append(self.csm_user_obj.recently_created_csm_user)
-            self.log.info("CSM Manage user created ...")
-        self.log.info("CSM Users created: %s", csm_users)
-        return csm_users
-
-    def create_s3_accounts(self, count):
-        """
-        Create given number of S3 accounts
-        :param count: S3 account count
-        :return: list of S3 accounts created
-        """
-        s3_users = []
-        for _ in range(count):
-            self.log.info("Creating new S3 account...")
-            res = self.s3_account_obj.create_s3_account()
-            assert res.status_code == Const.SUCCESS_STATUS_FOR_POST, \
-                f"Status code mismatch, expected {Const.SUCCESS_STATUS_FOR_POST} and " \
-                f"got {res.status_code} "
-            s3_data = res.json()
-            s3_block = {"account_name": s3_data["account_name"],
-                        "access_key": s3_data["access_key"],
-                        "secret_key": s3_data["secret_key"],
-                        "canonical_id": s3_data["canonical_id"]}
-            s3_users.append(s3_block)
-            self.log.info("New S3 account created ... %s", s3_users)
-        self.log.info("S3 Accounts created: %s", s3_users)
-        return s3_users
-
-    def create_iam_per_s3_account(self, count):
-        """
-        Create given number of IAMs per s3 account
-        :param count: IAM counts
-        :return: list of IAMs created
-        """
-        iam_users = []
-        for s3_acc in self.created_s3_users:
-            self.log.info("creating %s IAMs for %s s3 user", count, s3_acc)
-            for _ in range(count):
-                iam_user = self.iam_user_prefix + str(int(time.time()))
-                self.log.info("Creating new iam user %s", iam_user)
-                iam_obj = iam_test_lib.IamTestLib(
-                    access_key=s3_acc["access_key"],
-                    secret_key=s3_acc["secret_key"])
-                resp = iam_obj.create_user(iam_user)
-                assert_true(resp[0], resp[1])
-                iam_users.append(iam_user)
-        self.log.info("Total IAM Users created: %s", iam_users)
-        return iam_users
-
-    def create_bucket_per_s3_account(self, count):
-        """
-        Create given number of buckets per s3 account
-        :param count: bucket count
-        :return: list of buckets created
-        """
-        buckets = []
-        for s3_acc in self.created_s3_users:
-            user = s3_acc['account_name']
-            access = s3_acc['access_key']
-            secret = s3_acc['secret_key']
-            for num in range(count):
-                s3_test_l = S3TestLib(access_key=access, secret_key=secret)
-                bucket_name = f"{self.bucket_prefix}-{user}-{str(num)}"
-                self.log.info("Creating new S3 bucket...")
-                resp = s3_test_l.create_bucket(bucket_name)
-                assert_utils.assert_true(resp[0], resp[1])
-                buckets.append(resp[1])
-                del s3_test_l
-        self.log.info("S3 Buckets created: %s", buckets)
-        return buckets
-
     def create(self, test):
         """
         Create given number of accounts and buckets
@@ -222,14 +139,24 @@ class TestS3IOSystemLimits:
         s3_count = test_cfg['s3_count']
         iam_count = test_cfg['iam_count']
         bucket_count = test_cfg['bucket_count']
-        self.created_csm_users = self.create_csm_accounts(csm_count)
+        spec = TenantSpec(accounts=s3_count, iam_users=iam_count, buckets=bucket_count,
+                          csm_users=csm_count, prefix=f"test{int(time.time())}",
+                          account_password=self.s3_original_password,
+                          csm_password=self.csm_original_password)
+        common_cfg = self.cft_test_cfg["system_limit_common"]
+        self.provisioner = TenantProvisioner(
+            spec, os.path.join(LOG_DIR, LATEST_LOG_FOLDER, f"{test}_tenants.json"),
+            workers=common_cfg.get("provision_workers", 16),
+            rates=common_cfg.get("provision_rates"))
+        self.provisioner.provision()
+        self.created_csm_users = self.provisioner.created(CSM_USER)
         assert len(self.created_csm_users) == csm_count, "Created csm user count not matching"
-        self.created_s3_users = self.create_s3_accounts(s3_count)
+        self.created_s3_users = self.provisioner.created(S3_ACCOUNT)
         assert len(self.created_s3_users) == s3_count, "Created s3 user count not matching"
-        self.created_iam_users = self.create_iam_per_s3_account(iam_count)
+        self.created_iam_users = [iam["name"] for iam in self.provisioner.select(IAM_USER)]
         assert len(
             self.created_iam_users) == iam_count * s3_count, "Created iamuser count not matching"
-        self.created_buckets = self.create_bucket_per_s3_account(bucket_count)
+        self.created_buckets = [bucket["name"] for bucket in self.provisioner.select(BUCKET)]
         assert len(
             self.created_buckets) == bucket_count * s3_count, "Created bucket count not matching"
 
@@ -300,50 +227,10 @@ class TestS3IOSystemLimits:
         """
         Delete all csm, s3, IAM accounts and buckets
         """
-        created_s3users = self.created_s3_users
-
-        for s3_acc in created_s3users:
-            s3_name = s3_acc["account_name"]
-            access = s3_acc["access_key"]
-            secret = s3_acc["secret_key"]
-            # Get all IAMs under S3 account
-            iam_user_in_s3 = self.get_iam_accounts(access, secret)
-
-            # Get all buckets under S3 account
-            buckets_in_s3 = self.get_buckets(access, secret)
-
-            # Delete all iam users from S3 account
-            for iam in iam_user_in_s3:
-                self.log.info("Deleting IMA user %s...", iam)
-                iam_obj = iam_test_lib.IamTestLib(
-                    access_key=s3_acc["access_key"],
-                    secret_key=s3_acc["secret_key"])
-                iam_obj.delete_user(iam)
-                del iam_obj
-
-            # Delete all buckets from S3 account
-            s3_test_l = S3TestLib(access_key=access, secret_key=secret)
-            s3_test_l.delete_multiple_buckets(buckets_in_s3)
-
-            # Delete S3 account
-            self.log.info("Deleting S3 account %s", s3_name)
-            # pylint: disable=C0302, E1123
-            res = self.s3_account_obj.delete_s3_account_user(
-                username=s3_name,
-                login_as={
-                    "username": s3_name,
-                    "password": s3_password
-                })
-            assert res.status_code == Const.SUCCESS_STATUS, \
-                f"Status code mismatch, expected {Const.SUCCESS_STATUS} and got {res.status_code}"
-
-        created_csm_users = self.created_csm_users
-        for csm in created_csm_users:
-            self.log.info("Deleting CSM user : %s", csm["username"])
-            res = self.csm_user_obj.delete_csm_user(csm["username"])
-            assert res.status_code == Const.SUCCESS_STATUS, \
-                f"Status code mismatch, expected {Const.SUCCESS_STATUS} and got {res.status_code}"
-            self.log.info("CSM user with manage role %s deleted", csm["username"])
+        self.provisioner.teardown(account_password=s3_password)
+        remaining = [entity["name"] for entity in self.provisioner.entities.values()
+                     if entity["state"] != DELETED and entity["data"]]
+        assert not remaining, f"Accounts/buckets not deleted: {remaining}"
 
         self.created_csm_users = []
         self.created_s3_users = []
@@ -294,19 +294,20 @@ class TestAuditLogs:
         self.log.info("Step 2: Sending audit log download request for start "
                       "time: %s and end time: %s",
                       start_time, end_time)
-        audit_log_download_response = self.audit_logs.audit_logs_csm_download(
-            params=params, invalid_component=False)
-        self.log.info("Verifying if success response was returned")
-        assert_utils.assert_equals(audit_log_download_response.status_code,
-                                   const.SUCCESS_STATUS)
-        self.log.info("Step 2: Verified that audit log show request returned status: %s",
-                      audit_log_download_response.status_code)
+        with self.audit_logs.audit_logs_csm_download(
+                params=params, invalid_component=False,
+                stream=True) as audit_log_download_response:
+            self.log.info("Verifying if success response was returned")
+            assert_utils.assert_equals(audit_log_download_response.status_code,
+                                       const.SUCCESS_STATUS)
+            self.log.info("Step 2: Verified that audit log show request returned status: %s",
+                          audit_log_download_response.status_code)
 
-        self.log.info(
-            "Step 3:Comparing and verifying if the audit log show api content "
-            "and the downloaded file content with audit log download api match")
-        assert self.audit_logs.verify_audit_logs_show_download(
-            audit_log_show_response, audit_log_download_response)
+            self.log.info(
+                "Step 3:Comparing and verifying if the audit log show api content "
+                "and the downloaded file content with audit log download api match")
+            assert self.audit_logs.verify_audit_logs_show_download(
+                audit_log_show_response, audit_log_download_response)
         self.log.info(
             "Step 3:Verified the audit log show api content and the downloaded "
             "file content with audit log download api match ")
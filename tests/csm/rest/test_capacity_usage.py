@@ -39,6 +39,7 @@ from config.s3 import S3_CFG
 from libs.ha.ha_common_libs_k8s import HAK8s
 from libs.s3 import s3_misc
 from libs.csm.csm_interface import csm_api_factory
+from libs.csm.rest.capacity_tracker import CapacityTracker
 from libs.s3 import s3_test_lib
 from libs.prov.prov_k8s_cortx_deploy import ProvDeployK8sCortxLib
 from scripts.s3_bench.s3bench import s3bench
@@ -174,6 +175,8 @@ class TestSystemCapacity():
         Teardowm method for deleting s3 account created in setup.
         """
         self.log.info("[START] Teardown Method")
+        if isinstance(self.cap_df, CapacityTracker):
+            self.cap_df.close()
         if self.restore_pod:
             self.log.info("Failed deployments : %s", self.failed_pod)
             for deploy_name in self.failed_pod:
@@ -327,7 +330,7 @@ class TestSystemCapacity():
         self.log.info("##### Test started -  %s #####", test_case_name)
 
         test_cfg = self.csm_conf["test_33919"]
-        cap_df = pandas.DataFrame(columns=self.deploy_list)
+        cap_df = self.cap_df = CapacityTracker(self.deploy_list)
 
         resp = self.csm_obj.get_degraded_all(self.hlth_master)
         total_written = s3_misc.get_total_used(self.akey, self.skey)
@@ -436,7 +439,7 @@ class TestSystemCapacity():
         self.log.info("##### Test started -  %s #####", test_case_name)
 
         test_cfg = self.csm_conf["test_33920"]
-        cap_df = pandas.DataFrame(columns=self.deploy_list)
+        cap_df = self.cap_df = CapacityTracker(self.deploy_list)
 
         resp = self.csm_obj.get_degraded_all(self.hlth_master)
         total_written = s3_misc.get_total_used(self.akey, self.skey)
@@ -634,7 +637,7 @@ class TestSystemCapacity():
         self.log.info("##### Test started -  %s #####", test_case_name)
 
         test_cfg = self.csm_conf["test_33929"]
-        cap_df = pandas.DataFrame(columns=self.deploy_list)
+        cap_df = self.cap_df = CapacityTracker(self.deploy_list)
 
         resp = self.csm_obj.get_degraded_all(self.hlth_master)
         total_written = resp["healthy"]
@@ -742,7 +745,7 @@ class TestSystemCapacity():
         self.log.info("##### Test started -  %s #####", test_case_name)
 
         test_cfg = self.csm_conf["test_33928"]
-        cap_df = pandas.DataFrame(columns=self.deploy_list)
+        cap_df = self.cap_df = CapacityTracker(self.deploy_list)
 
         resp = self.csm_obj.get_degraded_all(self.hlth_master)
         total_written = resp["healthy"]
@@ -1025,7 +1028,8 @@ class TestSystemCapacity():
         total_written = s3_misc.get_total_used(self.akey, self.skey)
         self.log.info("Bytes written : %s", total_written)
 
-        cap_df = self.csm_obj.append_df(self.cap_df, self.failed_pod, resp["healthy"])
+        cap_df = self.cap_df = self.csm_obj.append_df(self.cap_df, self.failed_pod,
+                                                      resp["healthy"])
         self.log.debug("Collected data frame : %s", cap_df.to_string())
 
         result = self.csm_obj.verify_degraded_capacity(
@@ -316,7 +316,8 @@ class TestIOWorkloadDegradedPath:
         assert_utils.assert_true(resp[0], resp[1])
         if resp[1] is not None:
             for each in resp[1]:
-                avail_buckets.remove(each['bucket'])
+                if each['bucket'] in avail_buckets:
+                    avail_buckets.remove(each['bucket'])
             workload_info_list.extend(resp[1])
             self.log.info("Write Completed.")
 
@@ -347,7 +348,8 @@ class TestIOWorkloadDegradedPath:
                 assert_utils.assert_true(resp[0], resp[1])
                 if resp[1] is not None:
                     for each in resp[1]:
-                        avail_buckets.remove(each['bucket'])
+                        if each['bucket'] in avail_buckets:
+                            avail_buckets.remove(each['bucket'])
                     workload_info_list.extend(resp[1])
                     self.log.info("Write Completed.")
 
@@ -16,17 +16,33 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
-"""Data generator by honouring the data distribution."""
-import random
+"""
+Data generator by honouring the data distribution.
+
+Files are written in parallel by worker processes, one per core by default. Content of each
+chunk of a file comes from a keystream seeded by the file seed and chunk index, so chunks are
+independent and any file can be re-created from its manifest entry. md5 and sha256 of every
+file are computed while writing and recorded in the manifest with path, size and seed.
+Lines ('path', size) of created files are printed to stdout as before.
+usage: generate_dataset.py dataset-S.cfg N_files Rand_seed Ndirs Depth [--manifest ...]
+       generate_dataset.py --recreate manifest.jsonl | --verify manifest.jsonl
+"""
+import argparse
+import hashlib
+import json
 import os
-import sys
+import random
 import string
-from multiprocessing import Process, Value, Lock
-from struct import pack
-from platform import system
-from struct import unpack
+import sys
+from collections import namedtuple
+from functools import partial
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-randmax = 2147483647 / 256
 
 fileextbin1k = 646 * ['dat'] + 1074 * ['png'] + 105 * ['sol'] + 89 * ['jpg'] + 72 * ['lex'] + 7739 * ['gif'] + 947 * [
     'cookie'] + 642 * ['aae'] + 324 * ['sth'] + 285 * ['tbl'] + 262 * ['old'] + 248 * ['vcrd'] + 150 * [
@@ -100,225 +116,256 @@ files_depth_variation = [4, 6, 3, 3, 3, 3, 2, 5, 14, 6, 7, 3, 4]
 fileslevel = len(files_depth_dist)
 
 
-def randname(min=4, max=10):
-    a = ''
-    for i in range(random.randrange(min, max)):
-        a = a + random.choice(string.ascii_letters + string.digits)
-    return a
-
-
-def randfilename(size, min=5, max=40):
-    fname = ''
-    for i in range(random.randrange(min, max)):
-        fname += random.choice(string.ascii_letters + string.digits + '_-')
+binary_exts = frozenset(binary)
 
-    if size < 1024:
-        ext = random.choice(fileexttxt1k + fileextbin1k)
-    elif (size >= 1024) & (size < 10240):
-        ext = random.choice(fileexttxt10k + fileextbin10k)
-    elif (size >= 10240) & (size < 102400):
-        ext = random.choice(fileexttxt100k + fileextbin100k)
-    elif (size >= 102400) & (size < 1024 * 1024):
-        ext = random.choice(fileexttxt1m + fileextbin1m)
-    elif (size >= 1024 * 1024) & (size < 1024 * 10240):
-        ext = random.choice(fileexttxt10m + fileextbin10m)
-    elif (size >= 1024 * 10240) & (size < 10240 * 10240):
-        ext = random.choice(fileexttxt100m + fileextbin100m)
-    elif (size >= 10240 * 10240) & (size < 1024 * 1024 * 1024):
-        ext = random.choice(fileexttxt1g + fileextbin1g)
-    elif size >= 1024 * 1024 * 1024:
-        ext = random.choice(fileextbin10g)
-    return fname, ext
+CHUNK_SIZE = 4 * 1024 * 1024
+TREE_SEED = 143
+# Random bytes of text files are mapped to printable characters.
+TEXT_TABLE = bytes(ord(string.printable[i % len(string.printable)]) for i in range(256))
+FILL_BYTE = {"bin": b"\0", "text": b" "}
 
-
-def randtext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
-    else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
-
-
-def randbytes(bytes):
-    a = ''.join(pack('q', random.randrange(randmax))
-                for _ in range(bytes / 8))
-    if (bytes % 8) == 0:
-        pass
-    else:
-        a += (''.join(pack('q', random.randrange(randmax))))[0:bytes % 8]
-    return a
+FileSpec = namedtuple("FileSpec", "path size seed kind compress rng chunk_size")
 
 
-def bufferbin(size):
-    buf = ''
-    for i in range(size / 8):
-        buf = buf + pack('q', random.randrange(randmax))
-    return buf
+def randname(rng, min=4, max=10):
+    return ''.join(rng.choice(string.ascii_letters + string.digits)
+                   for _ in range(rng.randrange(min, max)))
 
 
-def buffertext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
+def randfilename(size, rng, min=5, max=40):
+    fname = ''.join(rng.choice(string.ascii_letters + string.digits + '_-')
+                    for _ in range(rng.randrange(min, max)))
+    if size < 1024:
+        ext = rng.choice(fileexttxt1k + fileextbin1k)
+    elif size < 10240:
+        ext = rng.choice(fileexttxt10k + fileextbin10k)
+    elif size < 102400:
+        ext = rng.choice(fileexttxt100k + fileextbin100k)
+    elif size < 1024 * 1024:
+        ext = rng.choice(fileexttxt1m + fileextbin1m)
+    elif size < 1024 * 10240:
+        ext = rng.choice(fileexttxt10m + fileextbin10m)
+    elif size < 10240 * 10240:
+        ext = rng.choice(fileexttxt100m + fileextbin100m)
+    elif size < 1024 * 1024 * 1024:
+        ext = rng.choice(fileexttxt1g + fileextbin1g)
     else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
+        ext = rng.choice(fileextbin10g)
+    return fname, ext
 
 
-def make_dirs(name, number):
-    dirs = []
-    for i in range(0, number, 1):
-        dirname = randname()
-        path = name + '/' + dirname
-        dirs.append(path)
-    return dirs
+def make_dirs(name, number, rng):
+    return [name + '/' + randname(rng) for _ in range(number)]
 
 
-def make_dirtree(topdir, depth, number):
+def make_dirtree(topdir, depth, number, rng):
+    """Directories of files, a directory is repeated as per files per depth distribution."""
     all_dirs = []
     top = [topdir]
-    temp = []
-    if (depth <= fileslevel):
+    if depth <= fileslevel:
         filefact = int(round(1000.0 * files_depth_dist[-depth] / len(top)))
         all_dirs.extend(top * filefact)
     depth -= 1
-    while (depth):
+    while depth:
         variation = dir_depth_variation[-depth]
         nextdirs = int(round((dir_depth_dist[-depth - 1] * number / 100)))
-        if (len(top) > nextdirs):
-            samplesize = nextdirs
-        else:
-            samplesize = len(top)
-
-        for x in random.sample(variation * top, samplesize):
-            numberdirs = int(nextdirs / samplesize)
-            temp.extend(make_dirs(x, numberdirs))
-        top = temp
-        print(top)
-
+        samplesize = min(len(top), nextdirs)
         temp = []
+        for x in rng.sample(variation * top, samplesize):
+            temp.extend(make_dirs(x, int(nextdirs / samplesize), rng))
+        top = temp
         if depth <= fileslevel:
             filefact = int(round(1000.0 * files_depth_dist[-depth] / len(top)))
             filevariation = files_depth_variation[-depth]
             sampletop = top
-            for it in range(7 * filevariation):
-                sampletop = random.sample(filevariation * sampletop, len(top))
+            for _ in range(7 * filevariation):
+                sampletop = rng.sample(filevariation * sampletop, len(top))
             all_dirs.extend(filefact * (sampletop + top))
-
         depth -= 1
     return all_dirs
 
 
-def create_fileset(fsize_percent, randseed, numfiles, alldirs, lock):
-    mycwd = os.getcwd()
-    isWindows = False
-    if system() == 'Windows':
-        isWindows = True
-    fs = 0
-    random.seed(randseed)
-    block = 1024 * 1024 * 40
-    buftxt = buffertext(block)
-    bufbin = bufferbin(block)
-    for fs_pc in fsize_percent:
-        isize = fs_pc[0] - fs
-        for fno in range(int(round(fs_pc[1] * numfiles / 100))):
-            randno = random.randrange(randmax)
-            if (isize > 1):
-                size = fs + isize * randno / randmax
-            else:
-                size = fs + isize
-            filename, ext = randfilename(size)
-            dira = random.choice(alldirs)
-            if ext:
-                filename = filename + '.' + ext
-            lock.acquire()
-            printstring = (str(dira + '/' + filename), size)
-            print(printstring)
-            lock.release()
-
-            if isWindows:
-                dira = '\\\\?\\' + mycwd + '\\' + dira.replace('/', '\\')
-                filename = dira + '\\' + filename
-            else:
-                filename = dira + '/' + filename
-
-            try:
-                os.makedirs(dira)
-            except:
-                pass
-            f = open(filename, 'wb', 512 * 1024)
-            if (size < 1024):
-                iosize = 128
-            elif (size >= 1024) & (size < 1024 * 1024):
-                iosize = 4096
-            elif (size >= 1024 * 1024):
-                iosize = 1024 * 64
-
-            sizew = size / iosize
-            randn = len(bufbin[:-iosize])
-            for z in range(0, sizew, 1):
-                noff = random.randrange(randn)
-                if ext in binary:
-                    f.write(bufbin[noff:noff + iosize])
-                else:
-                    f.write(buftxt[noff:noff + iosize])
-            x = size - f.tell()
-            if (x > 0):
-                if ext in binary:
-                    f.write(randbytes(x))
-                else:
-                    f.write(randtext(x))
-            f.close()
-        fs = fs_pc[0]
-    return 1
+def make_fanout_dirs(topdir, fanout, depth):
+    """Leaf directories of a balanced tree with fanout sub directories at each level."""
+    dirs = [topdir]
+    for _ in range(depth):
+        dirs = [f"{parent}/d{idx:03d}" for parent in dirs for idx in range(fanout)]
+    return dirs
 
 
-if __name__ == "__main__":
-    if (len(sys.argv) < 4):
-        print("generate_dataset.py dataset-S.cfg N_files Rand_seed Ndirs Depth")
-        exit()
-
-    infile = sys.argv[1]
-    nfiles = int(sys.argv[2])
-    randnew = int(sys.argv[3])
-    ndirs = int(sys.argv[4])
-    depth = int(sys.argv[5])
-    randseed = 143
-
-    percent = []
-    fsize = []
-
-    f = open(infile)
-    fsize_percent = [[float(x) if '.' in x else int(x) for x in line.split()] for line in f]
-
-    print("")
-    print("")
-    print("")
-    print("")
-    random.seed(randseed)
-    # topdira=str(random.randrange(randmax))
-    topdira = randname()
+def chunk_seed(seed, index):
+    """Seed of a chunk, chunks of a file are independent of each other."""
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=16).digest()
+    return int.from_bytes(digest, "little")
+
+
+def keystream(seed, size, rng="shake128"):
+    """Deterministic random bytes, pcg64 needs NumPy."""
+    if rng == "pcg64":
+        if np is None:
+            raise RuntimeError("NumPy is required for pcg64 keystream")
+        return np.random.Generator(np.random.PCG64(seed)).bytes(size)
+    return hashlib.shake_128(seed.to_bytes(16, "little")).digest(size)
+
+
+def chunk_data(spec, index, size):
+    """
+    Content of a chunk of a file.
+
+    :param spec: FileSpec of the file.
+    :param index: Chunk index.
+    :param size: Chunk size, last chunk may be smaller than spec.chunk_size.
+    """
+    rand_len = size - int(size * spec.compress)
+    data = keystream(chunk_seed(spec.seed, index), rand_len, spec.rng) if rand_len else b""
+    if spec.kind == "text":
+        data = data.translate(TEXT_TABLE)
+    return data + FILL_BYTE[spec.kind] * (size - rand_len)
+
+
+def write_file(spec, root="."):
+    """
+    Write file of the spec and compute checksums of the written data.
+
+    :return: Manifest entry of the file.
+    """
+    path = os.path.join(root, spec.path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    md5, sha256 = hashlib.md5(), hashlib.sha256()
+    with open(path, "wb") as fobj:
+        for index, offset in enumerate(range(0, spec.size, spec.chunk_size)):
+            data = chunk_data(spec, index, min(spec.chunk_size, spec.size - offset))
+            md5.update(data)
+            sha256.update(data)
+            fobj.write(data)
+    entry = spec._asdict()
+    entry.update(md5=md5.hexdigest(), sha256=sha256.hexdigest())
+    return entry
+
+
+def verify_file(entry, root="."):
+    """Check md5 of a file against its manifest entry."""
+    md5 = hashlib.md5()
     try:
-        os.mkdir(topdira)
-    except:
-        pass
-    alldirs = make_dirtree(topdira, depth, ndirs)
-    nthr = 2
-    nf = nfiles / nthr
-    randseed = randnew
-    randseed = randseed + 110
-    lock = Lock()
-    for i in range(nthr):
-        if (i == nthr - 1) & (nf < nfiles):
-            nf = nfiles - (nthr - 1) * nf
-        fileset = Process(target=create_fileset,
-                          args=(fsize_percent, randseed, nf, alldirs, lock))
-        fileset.start()
-        randseed = randseed + 10
+        with open(os.path.join(root, entry["path"]), "rb") as fobj:
+            for data in iter(lambda: fobj.read(CHUNK_SIZE), b""):
+                md5.update(data)
+    except OSError:
+        return entry["path"], False
+    return entry["path"], md5.hexdigest() == entry["md5"]
+
+
+def spec_from_entry(entry):
+    """FileSpec to re-create a file from its manifest entry."""
+    return FileSpec(**{field: entry[field] for field in FileSpec._fields})
+
+
+# pylint: disable=too-many-arguments, too-many-locals
+def plan_files(fsize_percent, nfiles, seed, alldirs, compressible=0.0, compress_ratio=0.5,
+               rng_name="shake128", chunk_size=CHUNK_SIZE):
+    """
+    Specs of the files of dataset, sizes are uniform within each size bucket of the config.
+
+    :param fsize_percent: list of (bucket upper size, percent of files).
+    :param nfiles: Number of files.
+    :param seed: Random seed of the dataset.
+    :param alldirs: Directories, files are placed in a randomly chosen directory.
+    :param compressible: Fraction of files which are compressible.
+    :param compress_ratio: Fraction of compressible files filled with constant bytes.
+    """
+    rng = random.Random(seed)
+    seen = set()
+    low = 0
+    for upper, percent in fsize_percent:
+        isize = upper - low
+        for _ in range(int(round(percent * nfiles / 100))):
+            size = low + int(isize * rng.random()) if isize > 1 else low + isize
+            dira = rng.choice(alldirs)
+            path = None
+            while path is None or path in seen:
+                filename, ext = randfilename(size, rng)
+                path = dira + '/' + filename + ('.' + ext if ext else '')
+            seen.add(path)
+            compress = compress_ratio if rng.random() < compressible else 0.0
+            yield FileSpec(path, size, rng.getrandbits(63),
+                           "bin" if ext in binary_exts else "text", compress, rng_name,
+                           chunk_size)
+        low = upper
+
+
+def read_manifest(manifest):
+    with open(manifest) as fobj:
+        return [json.loads(line) for line in fobj if line.strip()]
+
+
+def run_pool(func, items, workers):
+    """Run func over items on worker processes, results are yielded as completed."""
+    with Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(func, items, chunksize=4)
+
+
+def generate(args):
+    with open(args.config) as fobj:
+        fsize_percent = [[float(x) if '.' in x else int(x) for x in line.split()]
+                         for line in fobj if line.strip()]
+    tree_rng = random.Random(TREE_SEED)
+    topdira = randname(tree_rng)
+    if args.fanout:
+        alldirs = make_fanout_dirs(topdira, args.fanout, args.depth)
+    else:
+        alldirs = make_dirtree(topdira, args.depth, args.ndirs, tree_rng)
+    specs = plan_files(fsize_percent, args.nfiles, args.seed, alldirs, args.compressible,
+                       args.compress_ratio, args.rng, args.chunk_size)
+    total = 0
+    with open(args.manifest, "w") as manifest:
+        for entry in run_pool(partial(write_file, root=args.root), specs, args.workers):
+            print((entry["path"], entry["size"]), flush=True)
+            manifest.write(json.dumps(entry) + "\n")
+            total += entry["size"]
+    print(f"Generated {total} bytes, manifest {args.manifest}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("config", nargs="?", help="Size distribution e.g. dataset-S.cfg")
+    parser.add_argument("nfiles", nargs="?", type=int, help="Number of files")
+    parser.add_argument("seed", nargs="?", type=int, help="Random seed")
+    parser.add_argument("ndirs", nargs="?", type=int, help="Number of directories")
+    parser.add_argument("depth", nargs="?", type=int, help="Directory depth")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes, defaults to number of cores")
+    parser.add_argument("--root", default=".", help="Directory in which dataset is created")
+    parser.add_argument("--manifest", default="manifest.jsonl", help="Manifest file")
+    parser.add_argument("--compressible", type=float, default=0.0,
+                        help="Fraction of files which are compressible")
+    parser.add_argument("--compress-ratio", type=float, default=0.5,
+                        help="Fraction of a compressible file filled with constant bytes")
+    parser.add_argument("--fanout", type=int, default=0,
+                        help="Sub directories per level, ndirs distribution is used if 0")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--rng", choices=("shake128", "pcg64"),
+                        default="pcg64" if np is not None else "shake128")
+    parser.add_argument("--recreate", metavar="MANIFEST",
+                        help="Re-create files of the manifest instead of generating")
+    parser.add_argument("--verify", metavar="MANIFEST",
+                        help="Verify md5 of files of the manifest")
+    args = parser.parse_args()
+    if args.verify:
+        failed = [path for path, ok in run_pool(partial(verify_file, root=args.root),
+                                                read_manifest(args.verify), args.workers)
+                  if not ok]
+        for path in failed:
+            print(f"Mismatch: {path}")
+        sys.exit(1 if failed else 0)
+    if args.recreate:
+        specs = [spec_from_entry(entry) for entry in read_manifest(args.recreate)]
+        for entry in run_pool(partial(write_file, root=args.root), specs, args.workers):
+            print((entry["path"], entry["size"]), flush=True)
+        return
+    if args.depth is None:
+        parser.error("generate_dataset.py dataset-S.cfg N_files Rand_seed Ndirs Depth")
+    generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""UnitTest of live telemetry and failure thresholds of background s3bench IO."""
+
+import json
+import time
+
+from commons.utils.benchmark_utils import BenchmarkResult
+from libs.s3.background_io_telemetry import FailureThresholds
+from libs.s3.background_io_telemetry import IOTelemetry
+from libs.s3.background_io_telemetry import TelemetryMonitor
+
+S3BENCH_OUTPUT = (
+    "Results Summary for Write Operation(s)\nTotal Transferred: 15.259 MB\n"
+    "Total Throughput:  0.36 MB/s\nTotal Duration:    42.434 s\nNumber of Errors:  0\n"
+    "------------------------------------\nWrite times Max:       15.592 s\n"
+    "Write times 99th %ile: 15.589 s\nWrite times 50th %ile: 7.367 s\n"
+    "Write times Min:       1.719 s\n")
+
+
+def result(requests: int, errors: int = 0, latency: float = 0.2) -> BenchmarkResult:
+    """s3bench result of an operation."""
+    return BenchmarkResult("s3bench", "write", object_size=1024, requests=requests,
+                           errors=errors, latency={"avg": latency})
+
+
+class TestIOTelemetry:
+    """Class to test counters of background IO telemetry."""
+
+    def test_add(self):
+        """Requests, bytes, errors and latency histogram are added per iteration."""
+        telemetry = IOTelemetry()
+        telemetry.mark_started()
+        telemetry.add([result(10, 2), result(5, latency=3)])
+        telemetry.add([], failed=True)
+        snap = telemetry.snapshot()
+        assert (snap["ops"], snap["errors"], snap["bytes"]) == (15, 2, 13 * 1024)
+        assert (snap["iterations"], snap["failed_iterations"]) == (2, 1)
+        assert snap["histogram"]["0.25"] == 10 and snap["histogram"]["5"] == 5
+        assert snap["error_rate"] == 2 / 15
+        assert snap["last_update"] >= snap["started"]
+        assert 0 <= snap["max_iteration_time"] <= snap["last_update"] - snap["started"]
+
+    def test_consume_log(self, tmp_path):
+        """Only output appended since the last call is parsed."""
+        log_path = tmp_path / "s3bench.log"
+        log_path.write_text(S3BENCH_OUTPUT, encoding="utf-8")
+        telemetry = IOTelemetry()
+        telemetry.consume_log(str(log_path))
+        with open(log_path, "a", encoding="utf-8") as log_obj:
+            log_obj.write("panic: runtime error\n")
+        telemetry.consume_log(str(log_path))
+        snap = telemetry.snapshot()
+        assert snap["iterations"] == 2 and snap["failed_iterations"] == 1
+
+
+class TestFailureThresholds:
+    """Class to test failure thresholds of background IO."""
+
+    @staticmethod
+    def snap(**values) -> dict:
+        """Snapshot of a healthy IO."""
+        now = time.time()
+        snap = {"ops": 100, "errors": 0, "error_rate": 0.0, "failed_iterations": 0,
+                "last_update": now, "started": now - 60, "max_iteration_time": 0.0,
+                "time": now}
+        snap.update(values)
+        return snap
+
+    def test_thresholds(self):
+        """Each threshold is reported when crossed."""
+        thresholds = FailureThresholds(max_error_rate=0.1, max_errors=5,
+                                       max_failed_iterations=1)
+        assert thresholds.check(self.snap(), 0) is None
+        assert "error rate" in thresholds.check(self.snap(errors=20, error_rate=0.2), 0)
+        assert "errors 6" in thresholds.check(self.snap(errors=6, error_rate=0.06), 0)
+        assert "failed iterations" in thresholds.check(self.snap(failed_iterations=2), 0)
+
+    def test_stall_scaled_by_iteration_time(self):
+        """Stall limit grows with the longest iteration."""
+        thresholds = FailureThresholds(stall_timeout=60, stall_factor=3)
+        now = time.time()
+        assert thresholds.check(self.snap(last_update=now - 61), 0) is not None
+        assert thresholds.check(self.snap(last_update=now - 200, max_iteration_time=100),
+                                0) is None
+        assert thresholds.check(self.snap(last_update=now - 301, max_iteration_time=100),
+                                0) is not None
+        # Before the first iteration stall is counted from start of IO.
+        assert thresholds.check(self.snap(last_update=0, started=now - 30), 0) is None
+
+
+class TestTelemetryMonitor:
+    """Class to test snapshots and abort of telemetry monitor."""
+
+    def test_record_and_abort(self, tmp_path):
+        """Snapshots are written and abort is called once when thresholds are crossed."""
+        telemetry = IOTelemetry()
+        reasons = []
+        snapshot_path = tmp_path / "telemetry.jsonl"
+        monitor = TelemetryMonitor(telemetry, str(snapshot_path), interval=3600,
+                                   thresholds=FailureThresholds(max_errors=1),
+                                   on_abort=reasons.append).start()
+        telemetry.add([result(10)])
+        assert monitor.record()["interval_ops_per_sec"] > 0
+        assert monitor.abort_reason is None
+        telemetry.add([result(10, errors=5)])
+        monitor.record()
+        final = monitor.stop()
+        assert final["interval_errors"] == 0
+        assert reasons == [monitor.abort_reason] and "errors 5" in reasons[0]
+        with open(snapshot_path, encoding="utf-8") as snap_file:
+            snaps = [json.loads(line) for line in snap_file]
+        assert [snap["errors"] for snap in snaps] == [0, 5, 5]
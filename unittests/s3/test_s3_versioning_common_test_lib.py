@@ -0,0 +1,127 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""UnitTest of versioned bucket model and paginated List Object Versions verification."""
+
+from libs.s3.s3_versioning_common_test_lib import DM_PLACEHOLDER
+from libs.s3.s3_versioning_common_test_lib import VersionedBucketModel
+from libs.s3.s3_versioning_common_test_lib import s3_key_order
+from libs.s3.s3_versioning_common_test_lib import verify_object_versions
+
+
+class FakeVersionLister:
+    """List Object Versions over entries in S3 order with KeyMarker/VersionIdMarker."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.calls = []
+
+    def list_object_versions(self, bucket_name, optional_params):  # pylint: disable=unused-argument
+        """Page of entries after the markers."""
+        self.calls.append(dict(optional_params))
+        start = 0
+        key_marker = optional_params.get("KeyMarker")
+        if key_marker is not None:
+            positions = [(entry["Key"], entry["VersionId"]) for entry in self.entries]
+            if optional_params.get("VersionIdMarker"):
+                start = positions.index((key_marker, optional_params["VersionIdMarker"])) + 1
+            else:
+                start = sum(1 for key, _ in positions
+                            if s3_key_order(key) <= s3_key_order(key_marker))
+        end = start + optional_params["MaxKeys"]
+        page = self.entries[start:end]
+        resp = {"Versions": [entry for entry in page if entry["ETag"] is not None],
+                "DeleteMarkers": [entry for entry in page if entry["ETag"] is None],
+                "IsTruncated": end < len(self.entries)}
+        if resp["IsTruncated"]:
+            resp["NextKeyMarker"] = page[-1]["Key"]
+            resp["NextVersionIdMarker"] = page[-1]["VersionId"]
+        return True, resp
+
+
+def listing(model):
+    """Entries of the model in S3 order, newest first in a key, server ids for placeholders."""
+    entries = []
+    for key in sorted(model.keys, key=s3_key_order):
+        for version_id, etag in reversed(model.versions(key).items()):
+            listed_id = version_id.replace(f"{DM_PLACEHOLDER}#", "dm-server-")
+            entries.append({"Key": key, "VersionId": listed_id, "ETag": etag,
+                            "IsLatest": version_id == model.latest[key]})
+    return entries
+
+
+def bucket_model():
+    """Model with null versions, delete markers and non ASCII keys."""
+    model = VersionedBucketModel()
+    for key in ("obj", "Obj", "obj/a", "été", "\U0001f600", "｡"):
+        model.put(key, "null", f"{key}-null")
+        model.put(key, f"{key}-v1", f"{key}-e1")
+        model.put(key, f"{key}-v2", f"{key}-e2")
+    model.add_delete_marker("obj", "obj-dm1")
+    model.add_delete_marker("Obj")
+    model.delete_version("obj/a", "obj/a-v2")
+    return model
+
+
+def test_model_null_version_and_delete_markers():
+    """Null version is replaced, deleting latest version makes previous one latest."""
+    model = VersionedBucketModel()
+    model.put("key", "null", "e0")
+    model.put("key", "null", "e1")
+    assert list(model.versions("key").items()) == [("null", "e1")]
+    model.put("key", "v1", "e2")
+    model.apply_delete_result([{"Key": "key"}], is_versioned=False)
+    assert list(model.versions("key").items()) == [("v1", "e2"), ("null", None)]
+    assert (model.version_count, model.deletemarker_count) == (1, 1)
+    assert model.latest["key"] == "null"
+    model.delete_version("key", "null")
+    assert model.latest["key"] == "v1"
+    model.apply_delete_result([{"Key": "key", "DeleteMarkerVersionId": "dm1"},
+                               {"Key": "key", "VersionId": "v1"}])
+    assert model.latest["key"] == "dm1"
+    assert (model.version_count, model.deletemarker_count, model.dm_counts["key"]) == (0, 1, 1)
+
+
+def test_verify_paginated_listing():
+    """Pages split within versions of a key and between keys match the model."""
+    model = bucket_model()
+    lister = FakeVersionLister(listing(model))
+    report = verify_object_versions(lister, "bucket", model, page_size=2)
+    assert report["ok"], report
+    assert report["listed"] == {"versions": 17, "delete_markers": 2}
+    assert any("VersionIdMarker" in call for call in lister.calls)
+    keys = [entry["Key"] for entry in lister.entries]
+    assert keys == sorted(keys, key=lambda key: key.encode("utf-8"))
+
+
+def test_verify_diff():
+    """Missing, unexpected, etag and latest mismatches are reported."""
+    model = bucket_model()
+    entries = listing(model)
+    entries = [entry for entry in entries if entry["VersionId"] != "obj-v1"]
+    next(entry for entry in entries if entry["VersionId"] == "Obj-v2")["ETag"] = "bad"
+    latest = next(entry for entry in entries if entry["VersionId"] == "obj/a-v1")
+    latest["IsLatest"] = False
+    entries.append({"Key": "\U0001f601", "VersionId": "x", "ETag": "e", "IsLatest": True})
+    report = verify_object_versions(FakeVersionLister(entries), "bucket", model, page_size=3)
+    assert not report["ok"]
+    assert report["missing"] == [("obj", "obj-v1")]
+    assert report["unexpected_keys"] == ["\U0001f601"]
+    assert report["etag_mismatch"] == [("Obj", "Obj-v2", "Obj-e2", "bad")]
+    assert report["latest_mismatch"] == [("obj/a", "obj/a-v1", False)]
+    assert not report["counts"]["order"]
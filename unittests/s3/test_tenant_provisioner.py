@@ -0,0 +1,144 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""UnitTest of tenant provisioner with fake entity operations."""
+
+import threading
+
+from commons.exceptions import CTException
+import commons.errorcodes as err
+from libs.s3 import tenant_provisioner as tp
+
+
+class FakeOps:
+    """Entity operations keeping entities in memory, names in fail are failed."""
+
+    def __init__(self, fail=(), conflict=()):
+        self.fail = set(fail)
+        self.conflict = set(conflict)
+        self.calls = []
+        self.entities = set()
+        self._lock = threading.Lock()
+
+    def _call(self, action, name):
+        with self._lock:
+            self.calls.append((action, name))
+        if name in self.fail:
+            raise CTException(err.S3_CLIENT_ERROR, f"{action} {name} failed")
+        if action == "create":
+            self.entities.add(name)
+        else:
+            self.entities.discard(name)
+
+    def create_csm_user(self, name, password):
+        """Create CSM user."""
+        self._call("create", name)
+        return {"username": name, "password": password}
+
+    def create_s3_account(self, name, password):  # pylint: disable=unused-argument
+        """Create S3 account, accounts in conflict exist already."""
+        if name in self.conflict:
+            with self._lock:
+                self.calls.append(("create", name))
+            raise CTException(err.CSM_REST_POST_REQUEST_FAILED,
+                              f"S3 account {name} already exists, its keys are unknown")
+        self._call("create", name)
+        return {"account_name": name, "access_key": f"{name}-ak", "secret_key": "sk"}
+
+    def create_iam_user(self, account, name):
+        """Create IAM user."""
+        assert account["access_key"]
+        self._call("create", name)
+        return {"user_name": name}
+
+    def create_bucket(self, account, name):
+        """Create bucket."""
+        assert account["access_key"]
+        self._call("create", name)
+        return {"bucket_name": name}
+
+    def delete_csm_user(self, entity):
+        """Delete CSM user."""
+        self._call("delete", entity["name"])
+
+    def delete_s3_account(self, entity, password=None):  # pylint: disable=unused-argument
+        """Delete S3 account."""
+        self._call("delete", entity["name"])
+
+    def delete_iam_user(self, account, entity):  # pylint: disable=unused-argument
+        """Delete IAM user."""
+        self._call("delete", entity["name"])
+
+    def delete_bucket(self, account, entity):  # pylint: disable=unused-argument
+        """Delete bucket."""
+        self._call("delete", entity["name"])
+
+    @staticmethod
+    def list_iam_users(account):  # pylint: disable=unused-argument
+        """No IAM users outside of the spec."""
+        return []
+
+    @staticmethod
+    def list_buckets(account):  # pylint: disable=unused-argument
+        """No buckets outside of the spec."""
+        return []
+
+
+def provisioner(ops, tmp_path, accounts=2):
+    """Provisioner of accounts with an IAM user and two buckets each."""
+    spec = tp.TenantSpec(accounts=accounts, iam_users=1, buckets=2, csm_users=1, prefix="ut")
+    return tp.TenantProvisioner(spec, str(tmp_path / "manifest.json"), ops=ops, workers=4,
+                                retries=2, backoff=0)
+
+
+def test_provision_and_resume(tmp_path):
+    """Failed entities are created again when provisioning is resumed from manifest."""
+    ops = FakeOps(fail={"ut-acc00002-bkt0001"})
+    report = provisioner(ops, tmp_path).provision()
+    assert report[tp.BUCKET]["failed"] == 2
+    assert len(ops.entities) == 8
+    ops.fail.clear()
+    resumed = provisioner(ops, tmp_path)
+    assert len(resumed.select(tp.BUCKET, tp.FAILED)) == 1
+    resumed.provision()
+    assert len(ops.entities) == 9
+    assert not resumed.select(tp.BUCKET, tp.FAILED)
+
+
+def test_account_conflict(tmp_path):
+    """Existing account is not retried and its children are skipped as keys are unknown."""
+    ops = FakeOps(conflict={"ut-acc00001"})
+    tenant = provisioner(ops, tmp_path)
+    tenant.provision()
+    assert ops.calls.count(("create", "ut-acc00001")) == 1
+    assert tenant.entities[tenant.key(tp.S3_ACCOUNT, "ut-acc00001")]["state"] == tp.CREATED
+    assert [entity["name"] for entity in tenant.select(tp.BUCKET, tp.PENDING)] == [
+        "ut-acc00001-bkt0001", "ut-acc00001-bkt0002"]
+
+
+def test_teardown_keeps_account_of_failed_child(tmp_path):
+    """Account is deleted only if all its IAM users and buckets are deleted."""
+    ops = FakeOps()
+    tenant = provisioner(ops, tmp_path)
+    tenant.provision()
+    ops.fail = {"ut-acc00001-bkt0001"}
+    report = tenant.teardown()
+    assert report[tp.BUCKET]["failed"] == 2
+    assert ops.entities == {"ut-acc00001", "ut-acc00001-bkt0001"}
+    assert tenant.entities[tenant.key(tp.S3_ACCOUNT, "ut-acc00001")]["state"] == tp.CREATED
+    assert tenant.entities[tenant.key(tp.S3_ACCOUNT, "ut-acc00002")]["state"] == tp.DELETED
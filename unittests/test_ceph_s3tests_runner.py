@@ -0,0 +1,100 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Unit tests of batch mode helpers of Ceph s3-tests runner."""
+import json
+
+from ceph_s3tests_runner import LocalJiraStub
+from ceph_s3tests_runner import collect_tests_info
+from ceph_s3tests_runner import nose_to_pytest_id
+from ceph_s3tests_runner import parse_xunit_results
+
+XUNIT = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="nosetests" tests="5" errors="1" failures="1" skip="1">
+  <testcase classname="s3tests.functional.test_s3" name="test_bucket_list_empty" time="0.1">
+    <system-out>listed</system-out>
+  </testcase>
+  <testcase classname="s3tests.functional.test_s3" name="test_object_write(1,)" time="0.1"/>
+  <testcase classname="s3tests.functional.test_s3" name="test_object_write(2,)" time="0.1">
+    <failure type="AssertionError" message="409 != 200">Traceback</failure>
+  </testcase>
+  <testcase classname="s3tests.functional.test_s3" name="test_sse_kms" time="0.0">
+    <skipped type="SkipTest" message="kms not configured"/>
+  </testcase>
+  <testcase classname="s3tests.functional.test_iam.TestUser" name="test_user[p1]" time="0.1">
+    <error type="ConnectionError" message="refused"/>
+  </testcase>
+</testsuite>
+"""
+
+
+def test_nose_to_pytest_id():
+    """Nose names map to pytest node ids of module, class and test."""
+    assert nose_to_pytest_id("s3tests.functional.test_s3:test_bucket_list_empty") == \
+        "s3tests/functional/test_s3.py::test_bucket_list_empty"
+    assert nose_to_pytest_id("s3tests.functional.test_iam:TestUser.test_user") == \
+        "s3tests/functional/test_iam.py::TestUser::test_user"
+    assert nose_to_pytest_id("s3tests.functional.test_s3") == "s3tests/functional/test_s3.py"
+
+
+def test_parse_xunit_results(tmp_path):
+    """Generated cases are merged into their test, any failed case fails the test."""
+    xunit_file = tmp_path / "xunit.xml"
+    xunit_file.write_text(XUNIT, encoding="utf-8")
+    results = parse_xunit_results(str(xunit_file))
+    assert {key: status for key, (status, _) in results.items()} == {
+        "s3tests.functional.test_s3.test_bucket_list_empty": "PASS",
+        "s3tests.functional.test_s3.test_object_write": "FAIL",
+        "s3tests.functional.test_s3.test_sse_kms": "TODO",
+        "s3tests.functional.test_iam.TestUser.test_user": "FAIL"}
+    assert "409 != 200" in results["s3tests.functional.test_s3.test_object_write"][1]
+    assert "listed" in results["s3tests.functional.test_s3.test_bucket_list_empty"][1]
+
+
+def test_parse_xunit_results_empty(tmp_path):
+    """A run without testcases has no results."""
+    xunit_file = tmp_path / "xunit.xml"
+    xunit_file.write_text('<testsuite name="nosetests" tests="0"/>', encoding="utf-8")
+    assert not parse_xunit_results(str(xunit_file))
+
+
+def test_local_jira_stub(tmp_path):
+    """Stub serves tests of a test execution and records status updates."""
+    stub_file = tmp_path / "jira.json"
+    stub_file.write_text(json.dumps({
+        "test_executions": {"TEST-1": ["TEST-2", "TEST-3", "TEST-9"]},
+        "test_plans": {"TEST-4": {"build": "42"}},
+        "tests": {"TEST-2": {"summary": "list", "labels": ["s3"],
+                             "test_to_run": "s3tests.functional.test_s3:test_bucket_list"},
+                  "TEST-3": {"test_to_run": "s3tests.functional.test_s3:test_object_write"}}}),
+        encoding="utf-8")
+    stub = LocalJiraStub(str(stub_file))
+    test_list, _ = stub.get_test_ids_from_te("TEST-1")
+    assert [test[0] for test in test_list] == ["TEST-2", "TEST-3", "TEST-9"]
+    assert stub.get_issue_details("TEST-4").fields.customfield_22980 == ["42"]
+    # TEST-9 is not found and skipped like missing issues of a Jira search.
+    assert collect_tests_info(stub, test_list) == [
+        ("TEST-2", "list", "s3", "s3tests.functional.test_s3:test_bucket_list"),
+        ("TEST-3", "", "", "s3tests.functional.test_s3:test_object_write")]
+    stub.update_tests_jira_status("TEST-1", [("TEST-2", "PASS", "log2"),
+                                             ("TEST-3", "FAIL", "log3")])
+    stub.update_test_jira_status("TEST-1", "TEST-2", "EXECUTING")
+    with open(f"{stub_file}.updates", encoding="utf-8") as updates:
+        lines = [json.loads(line) for line in updates]
+    assert [(line["test"], line["status"]) for line in lines] == [
+        ("TEST-2", "PASS"), ("TEST-3", "FAIL"), ("TEST-2", "EXECUTING")]
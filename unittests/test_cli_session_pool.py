@@ -0,0 +1,122 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Unit tests of CORTX CLI session pool with fake interactive sessions."""
+import re
+
+import pytest
+
+from libs.csm.cli import cli_session_pool
+from libs.csm.cli.cli_session_pool import CliSessionPool
+from libs.csm.cli.cortx_cli import CortxCli
+
+
+class FakeSession:
+    """Interactive session which replies with scripted output to each command."""
+
+    def __init__(self, replies=None):
+        self.replies = replies or {}
+        self.current_output = ""
+        self.sent = []
+        self.closed = False
+
+    def send(self, data):
+        """Record command and prepare its output."""
+        self.sent.append(data)
+        self.current_output = self.replies.get(data.strip(), "") + "\ncortxcli$ "
+
+    def expect(self, re_strings, timeout=None):  # pylint: disable=unused-argument
+        """Index of first pattern found in output."""
+        for index, pattern in enumerate(re_strings):
+            if re.search(pattern, self.current_output):
+                return index
+        raise TimeoutError(re_strings)
+
+    def exit(self):
+        """Close session."""
+        self.closed = True
+
+
+def fake_cli(host="host", ssh_user="root", replies=None):
+    """Logged in CortxCli on a fake session."""
+    client = CortxCli(host=host, username=ssh_user, password="pass",
+                      session_obj=FakeSession(replies))
+    client.cli_prompt = r"(?:^|\n)cortxcli\$\s*$"
+    return client
+
+
+@pytest.fixture(name="pool")
+def fixture_pool(monkeypatch):
+    """Session pool logging in to fake sessions."""
+    logins = []
+
+    def login(host, ssh_user, ssh_password, cli_user, cli_password):
+        # pylint: disable=unused-argument
+        logins.append((host, ssh_user, cli_user))
+        return fake_cli(host, ssh_user, {"users show": "admin"})
+
+    monkeypatch.setattr(CliSessionPool, "_login", staticmethod(login))
+    pool = CliSessionPool(max_sessions_per_key=1, idle_timeout=600)
+    pool.logins = logins
+    return pool
+
+
+def test_session_reuse(pool):
+    """Released session is reused for same key, unhealthy one is closed and logged in again."""
+    with pool.session("host", "root", "pass", "admin") as client:
+        first = client
+    with pool.session("host", "root", "pass", "admin") as client:
+        assert client is first
+    assert len(pool.logins) == 1
+    with pytest.raises(TimeoutError):
+        with pool.session("host", "root", "pass", "admin"):
+            raise TimeoutError("command timed out")
+    assert first.session_obj is None
+    with pool.session("host", "root", "pass", "admin") as client:
+        assert client is not first
+    assert len(pool.logins) == 2
+    with pool.session("host", "root", "pass", "other"):
+        pass
+    assert pool.close_all() == 2
+
+
+def test_acquire_timeout(pool):
+    """Acquire waits for a free session of the key."""
+    client = pool.acquire("host", "root", "pass", "admin")
+    with pytest.raises(TimeoutError):
+        pool.acquire("host", "root", "pass", "admin", timeout=0)
+    pool.release(client, "admin")
+    assert pool.acquire("host", "root", "pass", "admin", timeout=0) is client
+
+
+def test_get_instance(monkeypatch):
+    """Shared pool is created once and its sessions are closed at exit."""
+    registered = []
+    monkeypatch.setattr(CliSessionPool, "_CliSessionPool__instance", None)
+    monkeypatch.setattr(cli_session_pool.atexit, "register", registered.append)
+    pool = CliSessionPool.get_instance()
+    assert CliSessionPool.get_instance() is pool
+    assert registered == [pool.close_all]
+
+
+def test_execute_prompt_without_expected_response():
+    """Command fails when prompt is back but its expected response is not in output."""
+    client = fake_cli(replies={"users show": "admin", "users delete": "Deleting user"})
+    assert client.execute_cli_commands("users show", ["admin"]) == (True, "admin\ncortxcli$ ")
+    resp = client.execute_cli_commands("users delete", ["User deleted"])
+    assert not resp[0]
@@ -0,0 +1,149 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Tests and emit latency microbenchmark for queue based cortx logging."""
+import glob
+import gzip
+import logging
+import os
+import queue
+import time
+
+from commons import cortxlogging
+
+
+def _logger(name):
+    """Get a logger without any handlers."""
+    log = logging.getLogger(name)
+    log.handlers = []
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    return log
+
+
+def _wait_for_gz(path, timeout=30):
+    """Wait till background compressor writes rotated files."""
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        gz_files = glob.glob(f"{path}-*.gz")
+        if gz_files and not glob.glob(f"{path}-*.pending"):
+            return gz_files
+        time.sleep(0.1)
+    return []
+
+
+def test_background_compression(tmp_path):
+    """Rotated file is compressed out of the emitting thread."""
+    path = os.path.join(tmp_path, "cortx-test.log")
+    log = _logger("test_background_compression")
+    handler = cortxlogging.CortxRotatingFileHandler(path, maxBytes=64 * 1024, backupCount=2,
+                                                    compress_level=1, background=True)
+    log.addHandler(handler)
+    for _ in range(200):
+        log.info("x" * 1024)
+    handler.close()
+    assert _wait_for_gz(path)
+
+
+def test_set_log_handlers(tmp_path):
+    """Runner log handlers are run by queue listener and existing log is truncated."""
+    path = os.path.join(tmp_path, "latest", "testrunner.log")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w") as log_file:
+        log_file.write("previous run\n")
+    log = _logger("test_set_log_handlers")
+    listener = cortxlogging.set_log_handlers(log, path)
+    assert [type(handler) for handler in log.handlers] == [cortxlogging.BoundedQueueHandler]
+    log.info("queued record")
+    listener.stop()
+    file_handler = listener.handlers[0]
+    assert file_handler.background
+    file_handler.close()
+    with open(path) as log_file:
+        content = log_file.read()
+    assert "previous run" not in content
+    assert "queued record" in content
+
+
+def test_background_rotation_keeps_records(tmp_path):
+    """No record is lost when rollovers happen while earlier files are being compressed."""
+    path = os.path.join(tmp_path, "cortx-test.log")
+    log = _logger("test_background_rotation_keeps_records")
+    handler = cortxlogging.CortxRotatingFileHandler(path, maxBytes=16 * 1024, backupCount=100,
+                                                    compress_level=9, background=True)
+    log.addHandler(handler)
+    for idx in range(1000):
+        log.info("record-%s %s", idx, "x" * 256)
+    handler.close()
+    lines = []
+    for gz_file in glob.glob(f"{path}-*.gz"):
+        with gzip.open(gz_file, "rt") as gz_obj:
+            lines.extend(gz_obj.read().splitlines())
+    with open(path, "r") as log_file:
+        lines.extend(log_file.read().splitlines())
+    assert len(lines) == 1000
+    assert not glob.glob(f"{path}-*.pending") + glob.glob(f"{path}-*.tmp")
+
+
+def test_overflow_policies():
+    """Bounded queue handler drops records as per overflow policy."""
+    log = _logger("test_overflow_policies")
+    log_queue = queue.Queue(maxsize=2)
+    handler = cortxlogging.BoundedQueueHandler(log_queue, overflow="drop_oldest",
+                                               max_message_len=5)
+    log.addHandler(handler)
+    for idx in range(4):
+        log.info("message-%s", idx)
+    assert handler.dropped == 2
+    assert log_queue.get_nowait().msg.startswith("messa")
+    assert "message-3" not in log_queue.get_nowait().msg
+
+
+def test_rate_limit():
+    """Records above rate are dropped but warnings always pass."""
+    rate_filter = cortxlogging.RateLimitFilter(rate=5)
+    log = _logger("test_rate_limit")
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    handler.addFilter(rate_filter)
+    log.addHandler(handler)
+    for _ in range(50):
+        log.info("io")
+    log.warning("warn")
+    assert len(records) < 50
+    assert records[-1].levelno == logging.WARNING
+
+
+def test_emit_latency_benchmark(tmp_path):
+    """Compare emit latency of direct gzip rotation with queue based logging."""
+    direct = _logger("bench_direct")
+    direct.addHandler(cortxlogging.CortxRotatingFileHandler(
+        os.path.join(tmp_path, "direct.log"), maxBytes=1024 * 1024, compress_level=9,
+        background=False))
+    direct_stats = cortxlogging.measure_emit_latency(direct, records=2000)
+
+    queued = _logger("bench_queued")
+    listener = cortxlogging.init_queue_logging(queued, [cortxlogging.CortxRotatingFileHandler(
+        os.path.join(tmp_path, "queued.log"), maxBytes=1024 * 1024, compress_level=9,
+        background=True)],
+                                               overflow="block")
+    queued_stats = cortxlogging.measure_emit_latency(queued, records=2000)
+    listener.stop()
+    logging.getLogger(__name__).info("Emit latency(us) direct: %s queued: %s", direct_stats,
+                                     queued_stats)
+    assert set(queued_stats) == {"avg", "p50", "p99", "max"}
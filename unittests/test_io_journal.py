@@ -0,0 +1,39 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Unit tests of IO journal fault window classification."""
+from libs.ha.io_journal import FaultWindow
+from libs.ha.io_journal import IOJournal
+from libs.ha.io_journal import classify_fault_windows
+from libs.ha.io_journal import unexpected_failures
+
+
+def test_classify_fault_windows():
+    """Slow request started before the fault is classified as during the fault."""
+    journal = IOJournal()
+    journal.add("put", "bkt", "obj1", 1.0, 2.0)
+    journal.add("put", "bkt", "obj2", 8.0, 12.0, status=False, error="timeout")
+    journal.add("get", "bkt", "obj1", 11.0, 11.5, status=False, error="503")
+    journal.add("get", "bkt", "obj2", 21.0, 22.0, status=False, error="500")
+    journal.add("get", "bkt", "obj1", 23.0, 24.0)
+    windows = [FaultWindow("pod_down", 10.0, 20.0)]
+    report = classify_fault_windows(journal.records(), windows)
+    assert report[0]["before"]["requests"] == 1
+    assert report[0]["during"]["failed"] == 2
+    assert report[0]["after"]["error_rate"] == 0.5
+    assert [rec.key for rec in unexpected_failures(journal.records(), windows)] == ["obj2"]
@@ -0,0 +1,81 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Unit tests of streaming JMeter JTL analyzer."""
+import math
+
+from libs.jmeter.jtl_analyzer import analyze_jtl
+
+HEADER = "timeStamp,elapsed,label,responseCode,responseMessage,success,failureMessage,bytes," \
+         "sentBytes,allThreads,Latency,Connect\n"
+
+
+def write_jtl(tmp_path, rows):
+    """Write JTL CSV with header and return its path."""
+    jtl_path = tmp_path / "run.jtl"
+    jtl_path.write_text(HEADER + "".join(row + "\n" for row in rows), encoding="utf-8")
+    return str(jtl_path)
+
+
+def test_percentiles(tmp_path):
+    """Percentiles are within 1% of the nearest rank value of the samples."""
+    rows = [f"{1600000000000 + idx},{elapsed},login,200,OK,true,,100,50,10,5,1"
+            for idx, elapsed in enumerate(range(1, 1001))]
+    analyzer = analyze_jtl(write_jtl(tmp_path, rows))
+    summary = analyzer.report()["labels"]["login"]
+    assert summary["requests"] == 1000 and summary["errors"] == 0
+    assert summary["min"] == 1 and summary["max"] == 1000
+    for pct in (50, 90, 95, 99):
+        exact = math.ceil(pct / 100 * 1000)
+        assert abs(summary[f"p{pct}"] - exact) <= exact * 0.01 + 1
+    assert analyzer.threads == 10
+
+
+def test_error_count(tmp_path):
+    """Failed samples are counted per label and in total with their codes and messages."""
+    rows = ["1600000000000,10,login,200,OK,true,,100,50,1,5,1",
+            "1600000000010,20,login,401,Unauthorized,false,bad token,0,50,1,5,1",
+            "1600000000020,30,users,500,Error,false,,0,50,1,5,1",
+            "1600000000030,40,users,200,OK,true,,100,50,1,5,1"]
+    analyzer = analyze_jtl(write_jtl(tmp_path, rows))
+    total = analyzer.total()
+    assert (total.errors, total.requests) == (2, 4)
+    report = analyzer.report()
+    assert report["labels"]["login"]["response_codes"] == {"401": 1}
+    assert report["labels"]["login"]["messages"] == {"bad token": 1}
+    assert report["labels"]["users"]["messages"] == {"Error": 1}
+    assert report["total"]["error_pct"] == 50.0
+
+
+def test_empty_jtl(tmp_path):
+    """JTL without samples has no requests and no percentiles."""
+    analyzer = analyze_jtl(write_jtl(tmp_path, []))
+    report = analyzer.report()
+    assert report["labels"] == {} and report["timeseries"] == []
+    assert report["total"]["requests"] == 0 and report["total"]["p99"] is None
+
+
+def test_malformed_rows(tmp_path):
+    """Rows without numeric time stamp or elapsed time are skipped and counted."""
+    rows = ["1600000000000,10,login,200,OK,true,,100,50,1,5,1",
+            "not-a-time,10,login,200,OK,true,,100,50,1,5,1",
+            "1600000000010,,login,200,OK,true,,100,50,1,5,1",
+            "1600000000020"]
+    analyzer = analyze_jtl(write_jtl(tmp_path, rows))
+    assert analyzer.bad_rows == 3
+    assert analyzer.total().requests == 1
@@ -0,0 +1,92 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Unit tests of Motr metadata index parsing and emap adapter cob lookup."""
+from types import SimpleNamespace
+
+from libs.motr.emap_fi_adapter import FT_CHKSUM
+from libs.motr.emap_fi_adapter import FT_PARITY
+from libs.motr.emap_fi_adapter import MotrCorruptionAdapter
+from libs.motr.motr_metadata_index import MotrMetadataIndex
+from libs.motr.motr_metadata_index import parse_emap_line
+from libs.motr.motr_metadata_index import parse_trace_lines
+
+TRACE_LINES = [
+    " tfid <0x200000000000002:0x1>",
+    " UTyp [D]",
+    " tfid <0x200000000000002:0x2>",
+    " UTyp [D]",
+    " tfid <0x200000000000002:0x3>",
+    " UTyp [P]",
+    " UTyp [P]",
+]
+EMAP_LINE = "18 emap k:0x6500000000000000:0x21 0x200000000000002:0x1 0x0 0x1000 0xdead " \
+            "0 0xabcd1234, cksum:0\n"
+
+
+def test_parse_trace_lines():
+    """Each DATA/PARITY unit takes the last tfid before it, unit without tfid is skipped."""
+    assert parse_trace_lines(TRACE_LINES) == {"DATA0": "0x200000000000002:0x1",
+                                              "DATA1": "0x200000000000002:0x2",
+                                              "PARITY0": "0x200000000000002:0x3"}
+    assert parse_trace_lines(["", " UTyp [D]"]) == {}
+
+
+def test_parse_emap_line():
+    """FID tokens and GOB field of an emap entry, other lines are skipped."""
+    tokens, gob = parse_emap_line(EMAP_LINE)
+    assert tokens == ["0x6500000000000000:0x21", "0x200000000000002:0x1", "0x0", "0x1000",
+                      "0xdead", "0xabcd1234"]
+    assert gob == "0xabcd1234"
+    assert parse_emap_line("emap list of device done\n") is None
+    assert parse_emap_line("a b c d e f g h i j\n") is None
+
+
+def test_index_lookup():
+    """GOB of last emap entry of a pod is served for full and partial FIDs."""
+    index = MotrMetadataIndex(node_obj=None)
+    index.add_emap_lines("pod-1", [EMAP_LINE, "not an entry\n",
+                                   EMAP_LINE.replace("0xabcd1234", "0xbeef")])
+    index.add_emap_lines("pod-2", [EMAP_LINE])
+    assert index.gob("0x200000000000002:0x1", "pod-1") == "0xbeef"
+    assert index.gobs(["00000002:0x1"]) == {"00000002:0x1": {"pod-1": "0xbeef",
+                                                              "pod-2": "0xabcd1234"}}
+    assert sorted(index.pods_of("0x200000000000002:0x1")) == ["pod-1", "pod-2"]
+    index.reset_pod("pod-1")
+    assert index.pods_of("0x200000000000002:0x1") == ["pod-2"]
+
+
+def test_adapter_cob_lookup():
+    """Adapter reads trace file with grep lookup when the object is not indexed."""
+    index = MotrMetadataIndex(node_obj=None)
+    reads = []
+
+    def read_m0trace_log(filepath, obj=None):
+        reads.append(filepath)
+        return index.add_trace(obj, TRACE_LINES)
+
+    adapter = MotrCorruptionAdapter.__new__(MotrCorruptionAdapter)
+    adapter.motr_obj = SimpleNamespace(metadata_index=index, read_m0trace_log=read_m0trace_log)
+    adapter.trace_file = None
+    adapter.metadata_device = None
+    assert adapter.get_object_cob_id("obj1", FT_CHKSUM) == ""
+    adapter.trace_file = "m0trace.txt"
+    assert adapter.get_object_cob_id("obj1", FT_PARITY) == "0x200000000000002:0x3"
+    assert adapter.get_object_cob_id("obj1", FT_CHKSUM) == "0x200000000000002:0x1"
+    assert reads == ["m0trace.txt"]
+    assert adapter.owner_pods("0x200000000000002:0x1", ["pod-1"]) == []
@@ -0,0 +1,152 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Unit tests of concurrent resumable multipart upload engine with a fake S3 client."""
+import hashlib
+import json
+import threading
+
+import pytest
+
+from commons import errorcodes as err
+from commons.exceptions import CTException
+from libs.ha.mpu_engine import MultipartUploadEngine
+from libs.ha.mpu_engine import file_parts
+from libs.ha.mpu_engine import generated_parts
+
+PART_SIZE = 1024
+
+
+class FakeMultipartClient:
+    """Multipart upload calls of S3MultipartTestLib keeping parts in memory."""
+
+    def __init__(self, page_size=2):
+        self.page_size = page_size
+        self.uploads = {}
+        self.fail_parts = set()
+        self.bad_etag_parts = set()
+        self.uploaded = []
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, bucket_name, object_name):
+        """Initiate upload."""
+        upload_id = f"{bucket_name}-{object_name}-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return True, {"UploadId": upload_id}
+
+    # pylint: disable=too-many-arguments, unused-argument
+    def upload_multipart(self, body, bucket_name, object_name, upload_id, part_number,
+                         content_md5=None):
+        """Upload part, ETag is md5 of the body unless part is in bad_etag_parts."""
+        if part_number in self.fail_parts:
+            raise CTException(err.S3_CLIENT_ERROR, f"Part {part_number} failed")
+        etag = hashlib.md5(body).hexdigest()  # nosec
+        if part_number in self.bad_etag_parts:
+            etag = hashlib.md5(body + b"x").hexdigest()  # nosec
+        with self._lock:
+            self.uploads[upload_id][part_number] = (f'"{etag}"', body)
+            self.uploaded.append(part_number)
+        return True, {"ETag": f'"{etag}"'}
+
+    def list_parts(self, upload_id, bucket_name, object_name, PartNumberMarker=0):
+        """Parts after marker, page_size parts per page."""
+        # pylint: disable=invalid-name, unused-argument
+        numbers = sorted(number for number in self.uploads[upload_id]
+                         if number > PartNumberMarker)
+        page = numbers[:self.page_size]
+        resp = {"Parts": [{"PartNumber": number, "ETag": self.uploads[upload_id][number][0]}
+                          for number in page], "IsTruncated": len(numbers) > self.page_size}
+        if resp["IsTruncated"]:
+            resp["NextPartNumberMarker"] = page[-1]
+        return True, resp
+
+    def complete_multipart_upload(self, upload_id, parts, bucket_name, object_name):
+        """Complete upload, ETag is md5 of part md5s and part count."""
+        # pylint: disable=unused-argument
+        stored = self.uploads[upload_id]
+        assert [part["ETag"] for part in parts] == [stored[part["PartNumber"]][0]
+                                                    for part in parts]
+        digests = b"".join(bytes.fromhex(stored[part["PartNumber"]][0].strip('"'))
+                           for part in parts)
+        return True, {"ETag": f'"{hashlib.md5(digests).hexdigest()}-{len(parts)}"'}  # nosec
+
+
+def engine(client, tmp_path, **kwargs):
+    """Engine uploading 5 generated parts with part map in tmp_path."""
+    return MultipartUploadEngine(client, "bkt", "obj", generated_parts(7, PART_SIZE, 4500),
+                                 str(tmp_path / "parts.json"), window=2, **kwargs)
+
+
+def test_upload_and_complete(tmp_path):
+    """Parts are uploaded concurrently, part map and expected ETag match the upload."""
+    client = FakeMultipartClient()
+    mpu = engine(client, tmp_path)
+    mpu.start()
+    assert mpu.upload([1, 2, 3, 4, 5]) == ([], [])
+    with open(tmp_path / "parts.json", "r", encoding="utf-8") as map_file:
+        part_map = json.load(map_file)
+    assert part_map["upload_id"] == mpu.upload_id
+    assert sorted(part_map["parts"]) == ["1", "2", "3", "4", "5"]
+    assert part_map["parts"]["5"]["size"] == 4500 - 4 * PART_SIZE
+    assert [part["PartNumber"] for part in mpu.parts_etag()] == [1, 2, 3, 4, 5]
+    assert mpu.complete()[1]["ETag"] == mpu.expected_etag()
+    assert mpu.stats()["bytes"] == 4500
+
+
+def test_resume_and_reconcile(tmp_path):
+    """Resumed upload uploads missing parts and re-uploads parts removed on server."""
+    client = FakeMultipartClient()
+    client.fail_parts = {2}
+    first = engine(client, tmp_path)
+    first.start()
+    assert first.upload([1, 2, 3, 4, 5]) == ([], [2])
+    client.fail_parts.clear()
+    client.uploaded.clear()
+    resumed = engine(client, tmp_path)
+    assert resumed.upload_id == first.upload_id
+    assert sorted(resumed.parts) == [1, 3, 4, 5]
+    del client.uploads[resumed.upload_id][4]
+    client.uploads[resumed.upload_id][1] = ('"other"', b"")
+    assert sorted(resumed.reconcile()) == [1, 4]
+    assert resumed.upload([1, 2, 3, 4, 5]) == ([], [])
+    assert sorted(client.uploaded) == [1, 2, 4]
+    assert resumed.complete()[1]["ETag"] == resumed.expected_etag()
+
+
+def test_etag_mismatch(tmp_path):
+    """Part with ETag other than its md5 is failed, expected failure while fault is set."""
+    client = FakeMultipartClient()
+    client.bad_etag_parts = {3}
+    mpu = engine(client, tmp_path)
+    mpu.start()
+    with pytest.raises(CTException):
+        mpu.upload_part(3)
+    assert 3 not in mpu.parts
+    event = threading.Event()
+    event.set()
+    mpu.event = event
+    assert mpu.upload([1, 3]) == ([3], [])
+
+
+def test_file_parts(tmp_path):
+    """File part source reads part bodies from offsets."""
+    path = tmp_path / "data"
+    path.write_bytes(bytes(range(256)) * 10)
+    read_part = file_parts(str(path), PART_SIZE)
+    assert read_part(1) == path.read_bytes()[:PART_SIZE]
+    assert len(read_part(3)) == 2560 - 2 * PART_SIZE
@@ -16,7 +16,6 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 """Test server log library."""
-import pytest
 from commons.helpers import serverlogs_helper
 from datetime import datetime
 
@@ -35,3 +34,33 @@ def test_serverlogs_lib():
                                               node="node1",
                                               test_suffix="0707")
     
+
+
+def test_log_window_extractor(tmp_path):
+    """Binary searched window matches linear scan across month boundary."""
+    import gzip
+    import io
+    from datetime import timedelta
+    from scripts.server_scripts import log_window_extractor
+
+    base = datetime(2021, 12, 31, 23, 50, 0)
+    lines = []
+    for idx in range(2000):
+        stamp = (base + timedelta(seconds=idx)).strftime("%b %e %H:%M:%S")
+        lines.append(f"{stamp} node1 motr: message {idx}\n")
+        if idx % 7 == 0:
+            lines.append("    continuation of message\n")
+    log_path = tmp_path / "motr.log"
+    log_path.write_text("".join(lines))
+    start, end = base + timedelta(seconds=500), base + timedelta(seconds=1500)
+    expected, keep = [], False
+    for line in lines:
+        stamp = log_window_extractor.parse_timestamp(line, 2022)
+        if stamp:
+            stamp = stamp.replace(year=2021) if stamp.month == 12 else stamp
+            keep = start <= stamp < end
+        if keep:
+            expected.append(line)
+    out = io.BytesIO()
+    log_window_extractor.extract(str(log_path), start, end, out)
+    assert gzip.decompress(out.getvalue()).decode() == "".join(expected)
@@ -0,0 +1,57 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Unit tests of duration aware execution plan."""
+from core.test_scheduler import DurationHistory
+from core.test_scheduler import build_items
+from core.test_scheduler import makespan
+from core.test_scheduler import makespan_report
+from core.test_scheduler import plan_lpt
+
+
+def test_plan_lpt():
+    """Longest items are planned first, exclusive tests are one item and report has actuals."""
+    history = DurationHistory(cache_path=None, default=100)
+    for test, duration in (("TEST-1", 7200), ("TEST-2", 600), ("TEST-3", 300),
+                           ("TEST-4", 400), ("TEST-5", 500)):
+        history.add(test, duration)
+    history.add("TEST-1", 3600, "2022-01-01T00:00:00+00:00")
+    selected_tag_map = {"ha": [set(), {"TEST-1", "TEST-4", "TEST-5"}],
+                        "s3_ops": [{"TEST-2", "TEST-3"}, {"TEST-6"}]}
+    exclusive_map = {"TEST-4": "ha", "TEST-5": "ha"}
+    split = build_items(selected_tag_map, history, exclusive_map,
+                        {"TEST-1": "TEST-10", "TEST-4": "TEST-10", "TEST-5": "TEST-11"})
+    assert sorted(len(item.tests) for item in split) == [1, 1, 1, 1, 2]
+    # Items of exclusive group ha from two tickets run on one target without overlap.
+    group = [item for item in plan_lpt(split, ["target1", "target2"]) if item.exclusive]
+    assert len(group) == 2 and group[0].target == group[1].target
+    assert group[1].start >= group[0].end
+    items = build_items(selected_tag_map, history, exclusive_map)
+    assert sorted(len(item.tests) for item in items) == [1, 1, 2, 2]
+    items = plan_lpt(items, ["target1", "target2"])
+    assert [item.duration for item in items] == [5400, 900, 900, 100]
+    assert items[0].target == "target1" and items[1].start == 0
+    assert makespan(items) == 5400
+    plan = {"predicted_makespan": 5400, "items": [item.to_dict() for item in items]}
+    records = [{"testID": "TEST-1", "testStartTime": "2022-02-01T00:00:00+00:00",
+                "testExecutionTime": 6000},
+               {"testID": "TEST-2", "testStartTime": "2022-02-01T00:00:10+00:00",
+                "testExecutionTime": 500}]
+    report = makespan_report(plan, records)
+    assert report["actual_makespan"] == 6000
+    assert report["items"][-1]["missing"] == ["TEST-6"]
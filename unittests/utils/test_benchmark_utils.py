@@ -0,0 +1,84 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test benchmark result utility library module."""
+
+import json
+import logging
+import os
+
+from commons.utils import benchmark_utils
+
+S3BENCH_OUTPUT = (
+    "Test parameters\nendpoint(s):      [https://s3.seagate.com]\nbucket:           dd-bucket\n"
+    "objectNamePrefix: loadgen_test_\nobjectSize:       0.0763 MB\nnumClients:       40\n"
+    "numSamples:       200\n\n\nResults Summary for Write Operation(s)\nTotal Transferred: "
+    "15.259 MB\nTotal Throughput:  0.36 MB/s\nTotal Duration:    42.434 s\nNumber of "
+    "Errors:  0\n------------------------------------\nWrite times Max:       15.592 s\n"
+    "Write times 99th %ile: 15.589 s\nWrite times 50th %ile: 7.367 s\nWrite times Min:       "
+    "1.719 s\n\n\nResults Summary for Read Operation(s)\nTotal Transferred: 15.259 MB\n"
+    "Total Throughput:  1.23 MB/s\nTotal Duration:    12.395 s\nNumber of Errors:  2\n"
+    "Read times Max:       4.764 s\nRead times 99th %ile: 4.575 s\n")
+
+
+class TestBenchmarkUtils:
+    """Test benchmark result utility library class."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.log = logging.getLogger(__name__)
+
+    def test_parse_s3bench_output(self):
+        """Test parsing s3bench output into benchmark results."""
+        results = benchmark_utils.parse_s3bench_output(S3BENCH_OUTPUT)
+        assert [res.operation for res in results] == ["write", "read"]
+        assert results[0].concurrency == 40
+        assert results[0].throughput == 0.36
+        assert results[0].latency["p99"] == 15.589
+        assert results[1].errors == 2
+
+    def test_parse_hsbench_json(self, tmp_path):
+        """Test parsing hsbench json report, only TOTAL intervals are used."""
+        path = os.path.join(tmp_path, "hsbench.json")
+        with open(path, "w", encoding="utf-8") as json_obj:
+            json.dump([{"IntervalName": "0", "Mode": "PUT", "Mbps": 1},
+                       {"IntervalName": "TOTAL", "Mode": "PUT", "Seconds": 10, "Ops": 100,
+                        "Mbps": 4.0, "Iops": 10.0, "MinLat": 1, "AvgLat": 2, "MaxLat": 5}],
+                      json_obj)
+        results = benchmark_utils.parse_hsbench_json(path, object_size="4Kb", concurrency=2)
+        assert len(results) == 1
+        assert results[0].object_size == 4096
+        assert results[0].latency["max"] == 0.005
+
+    def test_result_store_and_compare(self, tmp_path):
+        """Test storing results and flagging regressions against baseline."""
+        store = benchmark_utils.BenchmarkResultStore(str(tmp_path))
+        store.save([benchmark_utils.BenchmarkResult("s3bench", "write", "1Mb", 8,
+                                                    throughput=val)
+                    for val in (100.0, 101.0, 99.0, 100.5)], "build-1")
+        current = [benchmark_utils.BenchmarkResult("s3bench", "write", "1Mb", 8, throughput=val)
+                   for val in (80.0, 81.0, 79.5, 80.5)]
+        regressions = benchmark_utils.compare_with_baseline(
+            current, "build-1", store=store, metrics=("throughput",))
+        assert len(regressions) == 1
+        assert regressions[0]["p_value"] < 0.05
+        same = [benchmark_utils.BenchmarkResult("s3bench", "write", "1Mb", 8, throughput=val)
+                for val in (100.0, 99.5, 101.0, 100.0)]
+        assert not benchmark_utils.compare_with_baseline(
+            same, "build-1", store=store, metrics=("throughput",))
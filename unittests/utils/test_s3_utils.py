@@ -119,3 +119,26 @@ class TestS3Utils:
         resp = s3_utils.get_unaligned_parts(self.fpath, total_parts=total_parts, random=True)
         self.log.info(resp.keys())
         self.log.info("ENDED: get aligned parts.")
+
+    def test_multipart_etag_tracker(self):
+        """Test expected multipart ETag and checksums built from parts in any order."""
+        self.log.info("STARTED: Test multipart ETag tracker.")
+        resp = system_utils.create_file(self.fpath, count=10, dev="/dev/urandom")
+        assert_utils.assert_true(resp[0], resp[1])
+        tracker = s3_utils.MultipartEtagTracker()
+        parts = s3_utils.get_aligned_parts(self.fpath, total_parts=2, random=True,
+                                           tracker=tracker)
+        expected = md5(b"".join(md5(parts[number][0]).digest()  # nosec
+                                for number in sorted(parts))).hexdigest() + f"-{len(parts)}"
+        assert_utils.assert_equal(tracker.etag(), f'"{expected}"')
+        assert_utils.assert_equal(tracker.checksum(), s3_utils.calc_checksum(self.fpath, 5242880))
+        assert_utils.assert_false(tracker.verify_file(self.fpath))
+        streamed = s3_utils.MultipartEtagTracker()
+        for part_number in sorted(parts, reverse=True):
+            data = parts[part_number][0]
+            for offset in range(0, len(data), 1048576):
+                streamed.update(part_number, data[offset:offset + 1048576])
+            assert_utils.assert_equal(streamed.finish(part_number),
+                                      tracker.part_etag(part_number))
+        assert_utils.assert_equal(streamed.etag(), tracker.etag())
+        self.log.info("ENDED: Test multipart ETag tracker.")